@@ -0,0 +1,219 @@
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.db.queries import overlaps_time_range
+from frigate.models import Event, Previews, Recordings, ReviewSegment
+
+parser = argparse.ArgumentParser(
+    description="Check the query plans and latency of the hot time range queries."
+)
+parser.add_argument("--recordings", type=int, default=2_000_000)
+parser.add_argument("--cameras", type=int, default=10)
+parser.add_argument("--runs", type=int, default=5)
+parser.add_argument(
+    "--budget-ms", type=float, default=50, help="max latency of each query"
+)
+parser.add_argument(
+    "--max-growth",
+    type=float,
+    default=2,
+    help="max latency ratio of the full archive to one a tenth of its size",
+)
+args = parser.parse_args()
+
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+
+db = SqliteExtDatabase(None)
+db.bind([Event, Previews, Recordings, ReviewSegment])
+cameras = [f"camera_{i}" for i in range(args.cameras)]
+# reviews have no max duration so their start_time can't be bounded from below
+# and the index search reaches back to the oldest review of the camera
+UNBOUNDED_QUERIES = {"review"}
+
+
+def seed(recordings: int) -> tuple[float, float]:
+    """Seed a new db with an archive of recordings, returns its time range."""
+    db_path = os.path.join(tempfile.mkdtemp(), "frigate.db")
+    db.init(db_path, pragmas={"journal_mode": "off", "synchronous": 0})
+    Router(db, migrate_dir=os.path.join(os.path.dirname(__file__), "migrations")).run()
+
+    segment_count = recordings // args.cameras
+    end = time.time()
+    start = end - segment_count * 10
+
+    # 10 second recordings, one review segment and event every 5 minutes
+    # and one preview every hour for each camera
+    random.seed(0)
+    seed_start = time.time()
+
+    with db.atomic():
+        for camera in cameras:
+            db.connection().executemany(
+                "INSERT INTO recordings (id, camera, path, start_time, end_time, duration, motion, objects, dBFS, segment_size, regions) VALUES (?, ?, ?, ?, ?, 10, ?, ?, 0, 1, 0)",
+                (
+                    (
+                        f"{camera}-{i}",
+                        camera,
+                        f"/media/frigate/recordings/{camera}/{i}.mp4",
+                        start + i * 10,
+                        start + (i + 1) * 10,
+                        random.randint(0, 100),
+                        random.randint(0, 5),
+                    )
+                    for i in range(segment_count)
+                ),
+            )
+            db.connection().executemany(
+                "INSERT INTO reviewsegment (id, camera, start_time, end_time, severity, thumb_path, data) VALUES (?, ?, ?, ?, 'detection', ?, '{}')",
+                (
+                    (
+                        f"{camera}-{i}",
+                        camera,
+                        start + i * 300,
+                        start + i * 300 + 30,
+                        f"/media/frigate/clips/review/{camera}-{i}.webp",
+                    )
+                    for i in range(segment_count // 30)
+                ),
+            )
+            db.connection().executemany(
+                "INSERT INTO event (id, label, camera, start_time, end_time, top_score, false_positive, zones, thumbnail, has_clip, has_snapshot, retain_indefinitely, data) VALUES (?, 'person', ?, ?, ?, 0.8, 0, '[]', '', 1, 1, 0, '{}')",
+                (
+                    (f"{camera}-{i}", camera, start + i * 300, start + i * 300 + 30)
+                    for i in range(segment_count // 30)
+                ),
+            )
+            db.connection().executemany(
+                "INSERT INTO previews (id, camera, path, start_time, end_time, duration) VALUES (?, ?, ?, ?, ?, 3600)",
+                (
+                    (
+                        f"{camera}-{i}",
+                        camera,
+                        f"/media/frigate/clips/previews/{camera}/{i}.mp4",
+                        start + i * 3600,
+                        start + (i + 1) * 3600,
+                    )
+                    for i in range(segment_count // 360)
+                ),
+            )
+
+    db.execute_sql("ANALYZE")
+    print(
+        f"Seeded {segment_count * len(cameras)} recordings in {time.time() - seed_start:.1f}s"
+    )
+    return start, end
+
+
+def get_queries(start: float, end: float) -> dict:
+    """Query name -> (query, indexes the query is expected to search)."""
+    camera = cameras[len(cameras) // 2]
+    hour_start = end - 86400
+    hour_end = hour_start + 3600
+    day_start = end - 86400 * 2
+    day_end = day_start + 86400
+
+    return {
+        "vod": (
+            Recordings.select(
+                Recordings.path, Recordings.start_time, Recordings.end_time
+            )
+            .where(overlaps_time_range(Recordings, hour_start, hour_end))
+            .where(Recordings.camera == camera)
+            .order_by(Recordings.start_time.asc()),
+            ("recordings_camera_", "recordings_api_recordings_summary"),
+        ),
+        "expire recordings": (
+            Recordings.select(Recordings.id, Recordings.start_time, Recordings.end_time)
+            .where(
+                Recordings.camera == camera,
+                Recordings.start_time < start + 3600,
+                Recordings.end_time < start + 3600,
+            )
+            .order_by(Recordings.start_time),
+            ("recordings_camera_", "recordings_api_recordings_summary"),
+        ),
+        "review": (
+            ReviewSegment.select()
+            .where(overlaps_time_range(ReviewSegment, day_start, day_end))
+            .where(ReviewSegment.camera << [camera])
+            .order_by(ReviewSegment.start_time.desc()),
+            ("review_segment_camera_",),
+        ),
+        "events": (
+            Event.select()
+            .where(
+                Event.camera == camera,
+                Event.start_time >= day_start,
+                Event.start_time < day_end,
+            )
+            .order_by(Event.start_time.desc()),
+            ("event_camera_",),
+        ),
+        "previews": (
+            Previews.select(Previews.path, Previews.duration)
+            .where(overlaps_time_range(Previews, day_start, day_end))
+            .where(Previews.camera == camera)
+            .order_by(Previews.start_time.asc()),
+            ("previews_camera_",),
+        ),
+    }
+
+
+def time_queries(queries: dict) -> dict[str, tuple[float, int, list[str], bool]]:
+    """Query name -> (min latency in ms, rows, query plan, if an expected index is searched)."""
+    results = {}
+
+    for name, (query, expected_indexes) in queries.items():
+        sql, params = query.sql()
+        plan = [row[-1] for row in db.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params)]
+        # every camera query must search a camera composite index, not scan the table
+        uses_index = any(
+            step.startswith("SEARCH") and f"INDEX {index}" in step
+            for step in plan
+            for index in expected_indexes
+        )
+
+        timings = []
+        rows = 0
+
+        for _ in range(args.runs):
+            run_start = time.perf_counter()
+            rows = len(db.execute_sql(sql, params).fetchall())
+            timings.append((time.perf_counter() - run_start) * 1000)
+
+        results[name] = (min(timings), rows, plan, uses_index)
+
+    return results
+
+
+# the queries read a fixed window, their latency must not grow with the archive
+small = time_queries(get_queries(*seed(args.recordings // 10)))
+db.close()
+full = time_queries(get_queries(*seed(args.recordings)))
+db.close()
+failed = False
+
+for name, (latency, rows, plan, uses_index) in full.items():
+    small_latency = small[name][0]
+    # 1ms of slack so timer noise on very fast queries doesn't fail the ratio
+    ok = (
+        uses_index
+        and latency <= args.budget_ms
+        and (
+            name in UNBOUNDED_QUERIES or latency <= small_latency * args.max_growth + 1
+        )
+    )
+    failed |= not ok
+    print(
+        f"{'ok' if ok else 'FAIL':4} {name:18} {latency:8.2f}ms ({small_latency:.2f}ms at 1/10) {rows:6} rows  {'; '.join(plan)}"
+    )
+
+sys.exit(1 if failed else 0)
@@ -0,0 +1,134 @@
+import argparse
+import datetime
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.config import RecordConfig
+from frigate.models import Previews, Recordings, RecordingsRollup, ReviewSegment
+from frigate.record.cleanup import RecordingCleanup
+
+parser = argparse.ArgumentParser(
+    description="Time the nightly recording retention run of a camera archive."
+)
+parser.add_argument("--cameras", type=int, default=100)
+parser.add_argument("--days", type=int, default=30, help="retained days")
+parser.add_argument(
+    "--expired-days", type=float, default=1, help="days expiring in the run"
+)
+parser.add_argument("--budget-s", type=float, default=60, help="max run time")
+args = parser.parse_args()
+
+logging.getLogger("peewee_migrate").setLevel(logging.WARNING)
+
+tmp_dir = tempfile.mkdtemp()
+db_path = os.path.join(tmp_dir, "frigate.db")
+db = SqliteExtDatabase(db_path, pragmas={"journal_mode": "wal", "synchronous": 0})
+Router(db, migrate_dir=os.path.join(os.path.dirname(__file__), "migrations")).run()
+db.bind([Previews, Recordings, RecordingsRollup, ReviewSegment])
+
+cameras = [f"camera_{i}" for i in range(args.cameras)]
+expire_date = (datetime.datetime.now() - datetime.timedelta(days=args.days)).timestamp()
+start = int(expire_date - args.expired_days * 86400)
+end = int(time.time())
+
+# 10 second recordings with motion in half of them, a 30 second review every
+# 5 minutes and one preview every hour, only the expiring recordings have files
+random.seed(0)
+seed_start = time.time()
+
+with db.atomic():
+    for camera in cameras:
+        record_dir = os.path.join(tmp_dir, camera)
+        os.makedirs(record_dir)
+        db.connection().executemany(
+            "INSERT INTO recordings (id, camera, path, start_time, end_time, duration, motion, objects, dBFS, segment_size, regions) VALUES (?, ?, ?, ?, ?, 10, ?, ?, 0, 1, 0)",
+            (
+                (
+                    f"{camera}-{t}",
+                    camera,
+                    os.path.join(record_dir, f"{t}.mp4"),
+                    t,
+                    t + 10,
+                    random.randint(0, 1) * 100,
+                    random.randint(0, 1),
+                )
+                for t in range(start, end, 10)
+            ),
+        )
+        db.connection().executemany(
+            "INSERT INTO reviewsegment (id, camera, start_time, end_time, severity, thumb_path, data) VALUES (?, ?, ?, ?, ?, ?, '{}')",
+            (
+                (
+                    f"{camera}-{t}",
+                    camera,
+                    t,
+                    t + 30,
+                    random.choice(["alert", "detection"]),
+                    os.path.join(record_dir, f"{t}.webp"),
+                )
+                for t in range(start, end, 300)
+            ),
+        )
+        db.connection().executemany(
+            "INSERT INTO previews (id, camera, path, start_time, end_time, duration) VALUES (?, ?, ?, ?, ?, 3600)",
+            (
+                (
+                    f"{camera}-{t}",
+                    camera,
+                    os.path.join(record_dir, f"{t}.preview"),
+                    t,
+                    t + 3600,
+                )
+                for t in range(start, end, 3600)
+            ),
+        )
+
+        for t in range(start, int(expire_date), 10):
+            open(os.path.join(record_dir, f"{t}.mp4"), "w").close()
+
+db.execute_sql("ANALYZE")
+recording_count = Recordings.select().count()
+print(
+    f"Seeded {recording_count} recordings of {args.cameras} cameras in {time.time() - seed_start:.1f}s"
+)
+
+# reviews outlive the expiring recordings
+review_days = args.days + args.expired_days + 1
+record_config = RecordConfig(
+    retain={"days": args.days},
+    alerts={"retain": {"days": review_days}},
+    detections={"retain": {"days": review_days}},
+)
+config = SimpleNamespace(
+    record=record_config,
+    cameras={
+        camera: SimpleNamespace(name=camera, record=record_config) for camera in cameras
+    },
+)
+cleanup = RecordingCleanup(config, threading.Event())
+
+run_start = time.perf_counter()
+cleanup.expire_recordings()
+duration = time.perf_counter() - run_start
+
+deleted = recording_count - Recordings.select().count()
+remaining_files = sum(
+    len(os.listdir(os.path.join(tmp_dir, camera))) for camera in cameras
+)
+ok = duration <= args.budget_s and deleted > 0
+print(
+    f"{'ok' if ok else 'FAIL':4} expired {deleted} recordings in {duration:.1f}s, {remaining_files} files kept"
+)
+
+cleanup.delete_executor.shutdown()
+db.close()
+sys.exit(0 if ok else 1)
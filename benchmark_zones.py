@@ -0,0 +1,64 @@
+import datetime
+
+import cv2
+import numpy as np
+
+from frigate.util.zone import ZoneRaster
+
+# synthetic 20 zone camera at 1280x720 detect resolution
+width = 1280
+height = 720
+zone_count = 20
+point_count = 100_000
+
+rng = np.random.default_rng(0)
+contours = {}
+
+for i in range(zone_count):
+    # irregular polygon around a random center
+    center = rng.integers([100, 100], [width - 100, height - 100])
+    angles = np.sort(rng.uniform(0, 2 * np.pi, 8))
+    radii = rng.uniform(40, 250, 8)
+    points = np.column_stack(
+        (
+            center[0] + radii * np.cos(angles),
+            center[1] + radii * np.sin(angles),
+        )
+    )
+    points = np.clip(points, 0, [width - 1, height - 1]).astype(int)
+    contours[f"zone_{i}"] = np.array(points)
+
+points = [
+    (int(x), int(y))
+    for x, y in zip(
+        rng.integers(0, width, point_count), rng.integers(0, height, point_count)
+    )
+]
+
+start = datetime.datetime.now().timestamp()
+raster = ZoneRaster((height, width), contours)
+build_time = datetime.datetime.now().timestamp() - start
+
+start = datetime.datetime.now().timestamp()
+contour_results = [
+    [cv2.pointPolygonTest(c, p, False) >= 0 for c in contours.values()] for p in points
+]
+contour_time = datetime.datetime.now().timestamp() - start
+
+start = datetime.datetime.now().timestamp()
+raster_results = []
+for p in points:
+    mask = raster.mask_at(p)
+    raster_results.append([bool(mask & raster.bits[name]) for name in contours])
+raster_time = datetime.datetime.now().timestamp() - start
+
+mismatches = sum(a != b for a, b in zip(contour_results, raster_results))
+
+print(f"Raster build: {build_time * 1000:.2f}ms")
+print(
+    f"pointPolygonTest: {contour_time:.3f}s ({contour_time / point_count * 1e6:.2f}us per object)"
+)
+print(
+    f"Zone raster: {raster_time:.3f}s ({raster_time / point_count * 1e6:.2f}us per object)"
+)
+print(f"Mismatched objects: {mismatches}/{point_count}")
@@ -46,6 +46,8 @@ from frigate.api.defs.response.generic_response import GenericResponse
 from frigate.api.defs.tags import Tags
 from frigate.comms.event_metadata_updater import EventMetadataTypeEnum
 from frigate.const import CLIPS_DIR
+from frigate.db.lookups import delete_event_zones, events_with_zones
+from frigate.db.rollups import refresh_rollup_event_counts
 from frigate.embeddings import EmbeddingsContext
 from frigate.models import Event, ReviewSegment, Timeline
 from frigate.track.object_processing import TrackedObject
@@ -225,8 +227,8 @@ async def events(request: Request, params: EventsQueryParams = Depends()):
             filtered_zones.remove("None")
             zone_clauses.append((Event.zones.length() == 0))
 
-        for zone in filtered_zones:
-            zone_clauses.append((Event.zones.cast("text") % f'*"{zone}"*'))
+        if filtered_zones:
+            zone_clauses.append((Event.id << events_with_zones(filtered_zones)))
 
         zone_clause = reduce(operator.or_, zone_clauses)
         clauses.append((zone_clause))
@@ -572,8 +574,8 @@ async def events_search(request: Request, params: EventsSearchQueryParams = Depe
             filtered_zones.remove("None")
             zone_clauses.append((Event.zones.length() == 0))
 
-        for zone in filtered_zones:
-            zone_clauses.append((Event.zones.cast("text") % f'*"{zone}"*'))
+        if filtered_zones:
+            zone_clauses.append((Event.id << events_with_zones(filtered_zones)))
 
         event_filters.append((reduce(operator.or_, zone_clauses)))
 
@@ -1356,6 +1358,10 @@ def delete_single_event(event_id: str, request: Request) -> dict:
 
     event.delete_instance()
     Timeline.delete().where(Timeline.source_id == event_id).execute()
+    delete_event_zones([event_id])
+
+    if event.has_clip:
+        refresh_rollup_event_counts([(event.camera, event.start_time)])
 
     # If semantic search is enabled, update the index
     if request.app.frigate_config.semantic_search.enabled:
@@ -16,6 +16,7 @@ from frigate.api.defs.request.export_recordings_body import ExportRecordingsBody
 from frigate.api.defs.request.export_rename_body import ExportRenameBody
 from frigate.api.defs.tags import Tags
 from frigate.const import EXPORT_DIR
+from frigate.db.queries import overlaps_time_range
 from frigate.models import Export, Previews, Recordings
 from frigate.record.export import (
     PlaybackFactorEnum,
@@ -29,10 +30,17 @@ logger = logging.getLogger(__name__)
 router = APIRouter(tags=[Tags.export])
 
 
+def add_export_progress(request: Request, export: dict) -> dict:
+    if export["in_progress"]:
+        export["progress"] = request.app.export_queue.get_progress(export["id"])
+
+    return export
+
+
 @router.get("/exports")
-def get_exports():
+def get_exports(request: Request):
     exports = Export.select().order_by(Export.date.desc()).dicts().iterator()
-    return JSONResponse(content=[e for e in exports])
+    return JSONResponse(content=[add_export_progress(request, e) for e in exports])
 
 
 @router.post("/export/{camera_name}/start/{start_time}/end/{end_time}")
@@ -59,14 +67,7 @@ def export_recording(
     if playback_source == "recordings":
         recordings_count = (
             Recordings.select()
-            .where(
-                Recordings.start_time.between(start_time, end_time)
-                | Recordings.end_time.between(start_time, end_time)
-                | (
-                    (start_time > Recordings.start_time)
-                    & (end_time < Recordings.end_time)
-                )
-            )
+            .where(overlaps_time_range(Recordings, start_time, end_time))
             .where(Recordings.camera == camera_name)
             .count()
         )
@@ -81,11 +82,7 @@ def export_recording(
     else:
         previews_count = (
             Previews.select()
-            .where(
-                Previews.start_time.between(start_time, end_time)
-                | Previews.end_time.between(start_time, end_time)
-                | ((start_time > Previews.start_time) & (end_time < Previews.end_time))
-            )
+            .where(overlaps_time_range(Previews, start_time, end_time))
             .where(Previews.camera == camera_name)
             .count()
         )
@@ -117,8 +114,17 @@ def export_recording(
             if playback_source in PlaybackSourceEnum.__members__.values()
             else PlaybackSourceEnum.recordings
         ),
+        request.app.preview_frames,
     )
-    exporter.start()
+
+    if not request.app.export_queue.submit(exporter):
+        return JSONResponse(
+            content=(
+                {"success": False, "message": "Too many exports are already queued."}
+            ),
+            status_code=503,
+        )
+
     return JSONResponse(
         content=(
             {
@@ -215,9 +221,13 @@ def export_delete(event_id: str):
 
 
 @router.get("/exports/{export_id}")
-def get_export(export_id: str):
+def get_export(request: Request, export_id: str):
     try:
-        return JSONResponse(content=model_to_dict(Export.get(Export.id == export_id)))
+        return JSONResponse(
+            content=add_export_progress(
+                request, model_to_dict(Export.get(Export.id == export_id))
+            )
+        )
     except DoesNotExist:
         return JSONResponse(
             content={"success": False, "message": "Export not found"},
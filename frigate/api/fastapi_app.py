@@ -25,12 +25,15 @@ from frigate.api import (
 )
 from frigate.api.auth import get_jwt_secret, limiter
 from frigate.api.permissions_startup import validate_camera_permissions_setup
+from frigate.camera.broadcaster import FrameBroadcaster
 from frigate.comms.event_metadata_updater import (
     EventMetadataPublisher,
 )
+from frigate.comms.preview_updater import PreviewFramesRequestor
 from frigate.config import FrigateConfig
 from frigate.embeddings import EmbeddingsContext
 from frigate.ptz.onvif import OnvifController
+from frigate.record.export import ExportQueue
 from frigate.stats.emitter import StatsEmitter
 from frigate.storage import StorageMaintainer
 
@@ -100,6 +103,10 @@ def create_fastapi_app(
     async def startup():
         logger.info("FastAPI started")
 
+    @app.on_event("shutdown")
+    async def shutdown():
+        app.preview_frames.stop()
+
     # Rate limiter (used for login endpoint)
     if frigate_config.auth.failed_login_rate_limit is None:
         limiter.enabled = False
@@ -127,6 +134,9 @@ def create_fastapi_app(
     # App Properties
     app.frigate_config = frigate_config
     app.detected_frames_processor = detected_frames_processor
+    app.frame_broadcaster = FrameBroadcaster(detected_frames_processor)
+    app.export_queue = ExportQueue(frigate_config)
+    app.preview_frames = PreviewFramesRequestor()
     app.storage_maintainer = storage_maintainer
     app.camera_error_image = None
     app.onvif = onvif
@@ -31,17 +31,31 @@ from frigate.api.defs.query.media_query_parameters import (
     MediaRecordingsSummaryQueryParams,
 )
 from frigate.api.defs.tags import Tags
+from frigate.camera.broadcaster import FrameBroadcaster
 from frigate.camera.state import CameraState
+from frigate.comms.preview_updater import get_preview_frame_files
 from frigate.config import FrigateConfig
 from frigate.const import (
     CACHE_DIR,
     CLIPS_DIR,
     INSTALL_DIR,
     MAX_SEGMENT_DURATION,
-    PREVIEW_FRAME_TYPE,
     RECORD_DIR,
 )
-from frigate.models import Event, Previews, Recordings, Regions, ReviewSegment
+from frigate.db.queries import overlaps_time_range
+from frigate.db.rollups import (
+    SECONDS_PER_HOUR,
+    recordings_rollup,
+    refresh_rollup_event_counts,
+)
+from frigate.models import (
+    Event,
+    Previews,
+    Recordings,
+    RecordingsRollup,
+    Regions,
+    ReviewSegment,
+)
 from frigate.track.object_processing import TrackedObjectProcessor
 from frigate.util.builtin import get_tz_modifiers
 from frigate.util.image import get_image_from_recording
@@ -79,7 +93,7 @@ async def mjpeg_feed(
     # return a multipart response
     return StreamingResponse(
         imagestream(
-            request.app.detected_frames_processor,
+            request.app.frame_broadcaster,
             camera_name,
             params.fps,
             params.height,
@@ -89,28 +103,40 @@ async def mjpeg_feed(
     )
 
 
-def imagestream(
-    detected_frames_processor: TrackedObjectProcessor,
+async def imagestream(
+    frame_broadcaster: FrameBroadcaster,
     camera_name: str,
     fps: int,
     height: int,
     draw_options: dict[str, Any],
 ):
+    quality_params = [int(cv2.IMWRITE_JPEG_QUALITY), 70]
+    placeholder = None
+
     while True:
         # max out at specified FPS
-        time.sleep(1 / fps)
-        frame = detected_frames_processor.get_current_frame(camera_name, draw_options)
-        if frame is None:
-            frame = np.zeros((height, int(height * 16 / 9), 3), np.uint8)
+        await asyncio.sleep(1 / fps)
+        # all viewers with the same options share one encoded frame
+        jpg = await asyncio.to_thread(
+            frame_broadcaster.get_frame,
+            camera_name,
+            "jpg",
+            height,
+            quality_params,
+            draw_options,
+        )
 
-        width = int(height * frame.shape[1] / frame.shape[0])
-        frame = cv2.resize(frame, dsize=(width, height), interpolation=cv2.INTER_LINEAR)
+        if jpg is None:
+            if placeholder is None:
+                _, placeholder = cv2.imencode(
+                    ".jpg",
+                    np.zeros((height, int(height * 16 / 9), 3), np.uint8),
+                    quality_params,
+                )
 
-        ret, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
-        yield (
-            b"--frame\r\n"
-            b"Content-Type: image/jpeg\r\n\r\n" + bytearray(jpg.tobytes()) + b"\r\n\r\n"
-        )
+            jpg = placeholder.tobytes()
+
+        yield b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + jpg + b"\r\n\r\n"
 
 
 @router.get("/{camera_name}/ptz/info")
@@ -157,15 +183,28 @@ def latest_frame(
         mime_type = "jpeg"
 
     if camera_name in request.app.frigate_config.cameras:
-        frame = frame_processor.get_current_frame(camera_name, draw_options)
         retry_interval = float(
             request.app.frigate_config.cameras.get(camera_name).ffmpeg.retry_interval
             or 10
         )
+        img = None
 
-        if frame is None or datetime.now().timestamp() > (
+        if datetime.now().timestamp() <= (
             frame_processor.get_current_frame_time(camera_name) + retry_interval
         ):
+            try:
+                # shared with every client requesting the same frame
+                img = request.app.frame_broadcaster.get_frame(
+                    camera_name,
+                    extension,
+                    params.height,
+                    quality_params,
+                    draw_options,
+                )
+            except ValueError as e:
+                return JSONResponse(content=str(e), status_code=400)
+
+        if img is None:
             if request.app.camera_error_image is None:
                 error_image = glob.glob(
                     os.path.join(INSTALL_DIR, "frigate/images/camera-error.jpg")
@@ -178,28 +217,31 @@ def latest_frame(
 
             frame = request.app.camera_error_image
 
-        height = int(params.height or str(frame.shape[0]))
-        width = int(height * frame.shape[1] / frame.shape[0])
+            if frame is None:
+                return JSONResponse(
+                    content={"success": False, "message": "Unable to get valid frame"},
+                    status_code=500,
+                )
 
-        if frame is None:
-            return JSONResponse(
-                content={"success": False, "message": "Unable to get valid frame"},
-                status_code=500,
-            )
+            height = int(params.height or str(frame.shape[0]))
+            width = int(height * frame.shape[1] / frame.shape[0])
 
-        if height < 1 or width < 1:
-            return JSONResponse(
-                content="Invalid height / width requested :: {} / {}".format(
-                    height, width
-                ),
-                status_code=400,
-            )
+            if height < 1 or width < 1:
+                return JSONResponse(
+                    content="Invalid height / width requested :: {} / {}".format(
+                        height, width
+                    ),
+                    status_code=400,
+                )
 
-        frame = cv2.resize(frame, dsize=(width, height), interpolation=cv2.INTER_AREA)
+            frame = cv2.resize(
+                frame, dsize=(width, height), interpolation=cv2.INTER_AREA
+            )
+            _, img = cv2.imencode(f".{extension}", frame, quality_params)
+            img = img.tobytes()
 
-        _, img = cv2.imencode(f".{extension}", frame, quality_params)
         return Response(
-            content=img.tobytes(),
+            content=img,
             media_type=f"image/{mime_type}",
             headers={
                 "Content-Type": f"image/{mime_type}",
@@ -419,6 +461,24 @@ def all_recordings_summary(params: MediaRecordingsSummaryQueryParams = Depends()
 
     cameras = params.cameras
 
+    if seconds_offset % SECONDS_PER_HOUR == 0:
+        # whole hour offsets keep each rollup hour within a single day,
+        # the offset is applied the same way as the query below
+        hours = (
+            recordings_rollup(None if cameras == "all" else cameras.split(","))
+            .select(RecordingsRollup.utc_hour)
+            .distinct()
+            .tuples()
+        )
+        days = {
+            time.strftime(
+                "%Y-%m-%d",
+                time.gmtime(utc_hour * SECONDS_PER_HOUR + seconds_offset * 2),
+            ): True
+            for (utc_hour,) in hours
+        }
+        return JSONResponse(content=days)
+
     query = (
         Recordings.select(
             fn.strftime(
@@ -458,54 +518,87 @@ def all_recordings_summary(params: MediaRecordingsSummaryQueryParams = Depends()
 def recordings_summary(camera_name: str, timezone: str = "utc"):
     """Returns hourly summary for recordings of given camera"""
     hour_modifier, minute_modifier, seconds_offset = get_tz_modifiers(timezone)
-    recording_groups = (
-        Recordings.select(
-            fn.strftime(
+
+    # (hour, duration, motion, objects, events) for each hour with recordings
+    recording_hours: list[tuple[str, float, int, int, int]] = []
+
+    if seconds_offset % SECONDS_PER_HOUR == 0:
+        # whole hour offsets line up with the hours of the rollup
+        for rollup in recordings_rollup([camera_name]):
+            hour = time.strftime(
                 "%Y-%m-%d %H",
-                fn.datetime(
-                    Recordings.start_time, "unixepoch", hour_modifier, minute_modifier
-                ),
-            ).alias("hour"),
-            fn.SUM(Recordings.duration).alias("duration"),
-            fn.SUM(Recordings.motion).alias("motion"),
-            fn.SUM(Recordings.objects).alias("objects"),
+                time.gmtime(rollup.utc_hour * SECONDS_PER_HOUR + seconds_offset),
+            )
+            recording_hours.append(
+                (
+                    hour,
+                    rollup.duration,
+                    rollup.motion,
+                    rollup.objects,
+                    rollup.event_count,
+                )
+            )
+    else:
+        recording_groups = (
+            Recordings.select(
+                fn.strftime(
+                    "%Y-%m-%d %H",
+                    fn.datetime(
+                        Recordings.start_time,
+                        "unixepoch",
+                        hour_modifier,
+                        minute_modifier,
+                    ),
+                ).alias("hour"),
+                fn.SUM(Recordings.duration).alias("duration"),
+                fn.SUM(Recordings.motion).alias("motion"),
+                fn.SUM(Recordings.objects).alias("objects"),
+            )
+            .where(Recordings.camera == camera_name)
+            .group_by((Recordings.start_time + seconds_offset).cast("int") / 3600)
+            .order_by(Recordings.start_time.desc())
+            .namedtuples()
         )
-        .where(Recordings.camera == camera_name)
-        .group_by((Recordings.start_time + seconds_offset).cast("int") / 3600)
-        .order_by(Recordings.start_time.desc())
-        .namedtuples()
-    )
 
-    event_groups = (
-        Event.select(
-            fn.strftime(
-                "%Y-%m-%d %H",
-                fn.datetime(
-                    Event.start_time, "unixepoch", hour_modifier, minute_modifier
-                ),
-            ).alias("hour"),
-            fn.COUNT(Event.id).alias("count"),
+        event_groups = (
+            Event.select(
+                fn.strftime(
+                    "%Y-%m-%d %H",
+                    fn.datetime(
+                        Event.start_time, "unixepoch", hour_modifier, minute_modifier
+                    ),
+                ).alias("hour"),
+                fn.COUNT(Event.id).alias("count"),
+            )
+            .where(Event.camera == camera_name, Event.has_clip)
+            .group_by((Event.start_time + seconds_offset).cast("int") / 3600)
+            .namedtuples()
         )
-        .where(Event.camera == camera_name, Event.has_clip)
-        .group_by((Event.start_time + seconds_offset).cast("int") / 3600)
-        .namedtuples()
-    )
 
-    event_map = {g.hour: g.count for g in event_groups}
+        event_map = {g.hour: g.count for g in event_groups}
+        recording_hours = [
+            (
+                group.hour,
+                group.duration,
+                group.motion,
+                group.objects,
+                event_map.get(group.hour, 0),
+            )
+            for group in recording_groups
+        ]
 
     days = {}
 
-    for recording_group in recording_groups:
-        parts = recording_group.hour.split()
+    for hour_key, duration, motion, objects, events_count in recording_hours:
+        parts = hour_key.split()
         hour = parts[1]
         day = parts[0]
-        events_count = event_map.get(recording_group.hour, 0)
         hour_data = {
             "hour": hour,
             "events": events_count,
-            "motion": recording_group.motion,
-            "objects": recording_group.objects,
-            "duration": round(recording_group.duration),
+            "motion": motion,
+            "objects": objects,
+            "duration": round(duration),
         }
         if day not in days:
             days[day] = {"events": events_count, "hours": [hour_data], "day": day}
@@ -582,11 +675,7 @@ def recording_clip(
             Recordings.start_time,
             Recordings.end_time,
         )
-        .where(
-            (Recordings.start_time.between(start_ts, end_ts))
-            | (Recordings.end_time.between(start_ts, end_ts))
-            | ((start_ts > Recordings.start_time) & (end_ts < Recordings.end_time))
-        )
+        .where(overlaps_time_range(Recordings, start_ts, end_ts))
         .where(Recordings.camera == camera_name)
         .order_by(Recordings.start_time.asc())
     )
@@ -656,11 +745,7 @@ def vod_ts(camera_name: str, start_ts: float, end_ts: float):
             Recordings.end_time,
             Recordings.start_time,
         )
-        .where(
-            Recordings.start_time.between(start_ts, end_ts)
-            | Recordings.end_time.between(start_ts, end_ts)
-            | ((start_ts > Recordings.start_time) & (end_ts < Recordings.end_time))
-        )
+        .where(overlaps_time_range(Recordings, start_ts, end_ts))
         .where(Recordings.camera == camera_name)
         .order_by(Recordings.start_time.asc())
         .iterator()
@@ -791,6 +876,7 @@ def vod_event(event_id: str):
             and vod_response[1] == 404
         ):
             Event.update(has_clip=False).where(Event.id == event_id).execute()
+            refresh_rollup_event_counts([(event.camera, event.start_time)])
         return vod_response
 
     duration = int((event.end_time - event.start_time) * 1000)
@@ -1215,11 +1301,7 @@ def preview_gif(
                 Previews.start_time,
                 Previews.end_time,
             )
-            .where(
-                Previews.start_time.between(start_ts, end_ts)
-                | Previews.end_time.between(start_ts, end_ts)
-                | ((start_ts > Previews.start_time) & (end_ts < Previews.end_time))
-            )
+            .where(overlaps_time_range(Previews, start_ts, end_ts))
             .where(Previews.camera == camera_name)
             .limit(1)
             .get()
@@ -1275,21 +1357,11 @@ def preview_gif(
     else:
         # need to generate from existing images
         preview_dir = os.path.join(CACHE_DIR, "preview_frames")
-        file_start = f"preview_{camera_name}"
-        start_file = f"{file_start}-{start_ts}.{PREVIEW_FRAME_TYPE}"
-        end_file = f"{file_start}-{end_ts}.{PREVIEW_FRAME_TYPE}"
         selected_previews = []
 
-        for file in sorted(os.listdir(preview_dir)):
-            if not file.startswith(file_start):
-                continue
-
-            if file < start_file:
-                continue
-
-            if file > end_file:
-                break
-
+        for file in get_preview_frame_files(
+            request.app.preview_frames, camera_name, start_ts, end_ts
+        ):
             selected_previews.append(f"file '{os.path.join(preview_dir, file)}'")
             selected_previews.append("duration 0.12")
 
@@ -1387,11 +1459,7 @@ def preview_mp4(
                     Previews.start_time,
                     Previews.end_time,
                 )
-                .where(
-                    Previews.start_time.between(start_ts, end_ts)
-                    | Previews.end_time.between(start_ts, end_ts)
-                    | ((start_ts > Previews.start_time) & (end_ts < Previews.end_time))
-                )
+                .where(overlaps_time_range(Previews, start_ts, end_ts))
                 .where(Previews.camera == camera_name)
                 .limit(1)
                 .get()
@@ -1447,21 +1515,11 @@ def preview_mp4(
     else:
         # need to generate from existing images
         preview_dir = os.path.join(CACHE_DIR, "preview_frames")
-        file_start = f"preview_{camera_name}"
-        start_file = f"{file_start}-{start_ts}.{PREVIEW_FRAME_TYPE}"
-        end_file = f"{file_start}-{end_ts}.{PREVIEW_FRAME_TYPE}"
         selected_previews = []
 
-        for file in sorted(os.listdir(preview_dir)):
-            if not file.startswith(file_start):
-                continue
-
-            if file < start_file:
-                continue
-
-            if file > end_file:
-                break
-
+        for file in get_preview_frame_files(
+            request.app.preview_frames, camera_name, start_ts, end_ts
+        ):
             selected_previews.append(f"file '{os.path.join(preview_dir, file)}'")
             selected_previews.append("duration 0.12")
 
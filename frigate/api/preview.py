@@ -1,15 +1,16 @@
 """Preview apis."""
 
 import logging
-import os
 from datetime import datetime, timedelta, timezone
 
 import pytz
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
 from frigate.api.defs.tags import Tags
-from frigate.const import BASE_DIR, CACHE_DIR, PREVIEW_FRAME_TYPE
+from frigate.comms.preview_updater import get_preview_frame_files
+from frigate.const import BASE_DIR
+from frigate.db.queries import overlaps_time_range
 from frigate.models import Previews
 
 logger = logging.getLogger(__name__)
@@ -34,11 +35,7 @@ def preview_ts(camera_name: str, start_ts: float, end_ts: float):
             Previews.start_time,
             Previews.end_time,
         )
-        .where(
-            Previews.start_time.between(start_ts, end_ts)
-            | Previews.end_time.between(start_ts, end_ts)
-            | ((start_ts > Previews.start_time) & (end_ts < Previews.end_time))
-        )
+        .where(overlaps_time_range(Previews, start_ts, end_ts))
         .where(camera_clause)
         .order_by(Previews.start_time.asc())
         .dicts()
@@ -87,25 +84,13 @@ def preview_hour(year_month: str, day: int, hour: int, camera_name: str, tz_name
 
 
 @router.get("/preview/{camera_name}/start/{start_ts}/end/{end_ts}/frames")
-def get_preview_frames_from_cache(camera_name: str, start_ts: float, end_ts: float):
+def get_preview_frames_from_cache(
+    request: Request, camera_name: str, start_ts: float, end_ts: float
+):
     """Get list of cached preview frames"""
-    preview_dir = os.path.join(CACHE_DIR, "preview_frames")
-    file_start = f"preview_{camera_name}"
-    start_file = f"{file_start}-{start_ts}.{PREVIEW_FRAME_TYPE}"
-    end_file = f"{file_start}-{end_ts}.{PREVIEW_FRAME_TYPE}"
-    selected_previews = []
-
-    for file in sorted(os.listdir(preview_dir)):
-        if not file.startswith(file_start):
-            continue
-
-        if file < start_file:
-            continue
-
-        if file > end_file:
-            break
-
-        selected_previews.append(file)
+    selected_previews = get_preview_frame_files(
+        request.app.preview_frames, camera_name, start_ts, end_ts
+    )
 
     return JSONResponse(
         content=selected_previews,
@@ -26,6 +26,13 @@ from frigate.api.defs.response.review_response import (
     ReviewSummaryResponse,
 )
 from frigate.api.defs.tags import Tags
+from frigate.db.lookups import (
+    delete_review_segment_lookups,
+    review_segments_with_labels,
+    review_segments_with_zones,
+)
+from frigate.db.queries import overlaps_time_range
+from frigate.db.rollups import remove_recordings_from_rollup
 from frigate.models import Recordings, ReviewSegment, UserReviewStatus
 from frigate.review.types import SeverityEnum
 from frigate.util.builtin import get_tz_modifiers
@@ -67,29 +74,18 @@ async def review(
         clauses.append((ReviewSegment.camera << camera_list))
 
     if labels != "all":
-        # use matching so segments with multiple labels
-        # still match on a search where any label matches
-        label_clauses = []
-        filtered_labels = labels.split(",")
-
-        for label in filtered_labels:
-            label_clauses.append(
-                (ReviewSegment.data["objects"].cast("text") % f'*"{label}"*')
-                | (ReviewSegment.data["audio"].cast("text") % f'*"{label}"*')
-            )
-        clauses.append(reduce(operator.or_, label_clauses))
+        # segments with multiple labels still match
+        # on a search where any label matches
+        clauses.append(
+            (ReviewSegment.id << review_segments_with_labels(labels.split(",")))
+        )
 
     if zones != "all":
-        # use matching so segments with multiple zones
-        # still match on a search where any zone matches
-        zone_clauses = []
-        filtered_zones = zones.split(",")
-
-        for zone in filtered_zones:
-            zone_clauses.append(
-                (ReviewSegment.data["zones"].cast("text") % f'*"{zone}"*')
-            )
-        clauses.append(reduce(operator.or_, zone_clauses))
+        # segments with multiple zones still match
+        # on a search where any zone matches
+        clauses.append(
+            (ReviewSegment.id << review_segments_with_zones(zones.split(",")))
+        )
 
     if severity:
         clauses.append((ReviewSegment.severity == severity))
@@ -183,28 +179,17 @@ async def review_summary(
         clauses.append((ReviewSegment.camera << camera_list))
 
     if labels != "all":
-        # use matching so segments with multiple labels
-        # still match on a search where any label matches
-        label_clauses = []
-        filtered_labels = labels.split(",")
-
-        for label in filtered_labels:
-            label_clauses.append(
-                (ReviewSegment.data["objects"].cast("text") % f'*"{label}"*')
-                | (ReviewSegment.data["audio"].cast("text") % f'*"{label}"*')
-            )
-        clauses.append(reduce(operator.or_, label_clauses))
+        # segments with multiple labels still match
+        # on a search where any label matches
+        clauses.append(
+            (ReviewSegment.id << review_segments_with_labels(labels.split(",")))
+        )
     if zones != "all":
-        # use matching so segments with multiple zones
-        # still match on a search where any zone matches
-        zone_clauses = []
-        filtered_zones = zones.split(",")
-
-        for zone in filtered_zones:
-            zone_clauses.append(
-                ReviewSegment.data["zones"].cast("text") % f'*"{zone}"*'
-            )
-        clauses.append(reduce(operator.or_, zone_clauses))
+        # segments with multiple zones still match
+        # on a search where any zone matches
+        clauses.append(
+            (ReviewSegment.id << review_segments_with_zones(zones.split(",")))
+        )
 
     last_24_query = (
         ReviewSegment.select(
@@ -278,16 +263,11 @@ async def review_summary(
         clauses.append((ReviewSegment.camera << camera_list))
 
     if labels != "all":
-        # use matching so segments with multiple labels
-        # still match on a search where any label matches
-        label_clauses = []
-        filtered_labels = labels.split(",")
-
-        for label in filtered_labels:
-            label_clauses.append(
-                ReviewSegment.data["objects"].cast("text") % f'*"{label}"*'
-            )
-        clauses.append(reduce(operator.or_, label_clauses))
+        # segments with multiple labels still match
+        # on a search where any label matches
+        clauses.append(
+            (ReviewSegment.id << review_segments_with_labels(labels.split(",")))
+        )
 
     day_in_seconds = 60 * 60 * 24
     last_month_query = (
@@ -437,14 +417,7 @@ def delete_reviews(body: ReviewModifyMultipleBody):
         camera_name = review["camera"]
         recordings = (
             Recordings.select(Recordings.id, Recordings.path)
-            .where(
-                Recordings.start_time.between(start_time, end_time)
-                | Recordings.end_time.between(start_time, end_time)
-                | (
-                    (start_time > Recordings.start_time)
-                    & (end_time < Recordings.end_time)
-                )
-            )
+            .where(overlaps_time_range(Recordings, start_time, end_time))
             .where(Recordings.camera == camera_name)
             .dicts()
             .iterator()
@@ -455,11 +428,13 @@ def delete_reviews(body: ReviewModifyMultipleBody):
             recording_ids.append(recording["id"])
 
     # delete recordings and review segments
+    remove_recordings_from_rollup(recording_ids)
     Recordings.delete().where(Recordings.id << recording_ids).execute()
     ReviewSegment.delete().where(ReviewSegment.id << list_of_ids).execute()
     UserReviewStatus.delete().where(
         UserReviewStatus.review_segment << list_of_ids
     ).execute()
+    delete_review_segment_lookups(list_of_ids)
 
     return JSONResponse(
         content=({"success": True, "message": "Deleted review items."}), status_code=200
@@ -18,11 +18,18 @@ import frigate.util as util
 from frigate.api.auth import hash_password
 from frigate.api.fastapi_app import create_fastapi_app
 from frigate.camera import CameraMetrics, PTZMetrics
+from frigate.camera_switch_monitor import (
+    Go2RtcStreamPoller,
+    start_go2rtc_stream_pollers,
+)
 from frigate.comms.base_communicator import Communicator
 from frigate.comms.config_updater import ConfigPublisher
 from frigate.comms.dispatcher import Dispatcher
 from frigate.comms.event_metadata_updater import EventMetadataPublisher
-from frigate.comms.inter_process import InterProcessCommunicator
+from frigate.comms.inter_process import (
+    InterProcessCommunicator,
+    InterProcessTelemetryCommunicator,
+)
 from frigate.comms.mqtt import MqttClient
 from frigate.comms.webpush import WebPushClient
 from frigate.comms.ws import WebSocketClient
@@ -40,6 +47,7 @@ from frigate.const import (
     THUMB_DIR,
 )
 from frigate.data_processing.types import DataProcessorMetrics
+from frigate.db.maintainer import DatabaseMaintainer
 from frigate.db.sqlitevecq import SqliteVecQueueDatabase
 from frigate.embeddings import EmbeddingsContext, manage_embeddings
 from frigate.events.audio import AudioProcessor
@@ -49,12 +57,16 @@ from frigate.log import _stop_logging
 from frigate.models import (
     CameraPermission,
     Event,
+    EventZone,
     Export,
     Previews,
     Recordings,
+    RecordingsRollup,
     RecordingsToDelete,
     Regions,
     ReviewSegment,
+    ReviewSegmentLabel,
+    ReviewSegmentZone,
     Timeline,
     User,
 )
@@ -72,6 +84,7 @@ from frigate.storage import StorageMaintainer
 from frigate.timeline import TimelineProcessor
 from frigate.track.object_processing import TrackedObjectProcessor
 from frigate.util.builtin import empty_and_close_queue
+from frigate.util.hwaccel import select_hwaccel
 from frigate.util.image import SharedMemoryFrameManager, UntrackedSharedMemory
 from frigate.util.object import get_camera_regions_grid
 from frigate.util.services import set_file_limit
@@ -149,27 +162,6 @@ class FrigateApp:
         self.timeline_queue: Queue = mp.Queue()
 
     def init_database(self) -> None:
-        def vacuum_db(db: SqliteExtDatabase) -> None:
-            logger.info("Running database vacuum")
-            db.execute_sql("VACUUM;")
-
-            try:
-                with open(f"{CONFIG_DIR}/.vacuum", "w") as f:
-                    f.write(str(datetime.datetime.now().timestamp()))
-            except PermissionError:
-                logger.error("Unable to write to /config to save DB state")
-
-        def cleanup_timeline_db(db: SqliteExtDatabase) -> None:
-            db.execute_sql(
-                "DELETE FROM timeline WHERE source_id NOT IN (SELECT id FROM event);"
-            )
-
-            try:
-                with open(f"{CONFIG_DIR}/.timeline", "w") as f:
-                    f.write(str(datetime.datetime.now().timestamp()))
-            except PermissionError:
-                logger.error("Unable to write to /config to save DB state")
-
         # Migrate DB schema
         migrate_db = SqliteExtDatabase(self.config.database.path)
 
@@ -186,29 +178,6 @@ class FrigateApp:
 
         router.run()
 
-        # this is a temporary check to clean up user DB from beta
-        # will be removed before final release
-        if not os.path.exists(f"{CONFIG_DIR}/.timeline"):
-            cleanup_timeline_db(migrate_db)
-
-        # check if vacuum needs to be run
-        if os.path.exists(f"{CONFIG_DIR}/.vacuum"):
-            with open(f"{CONFIG_DIR}/.vacuum") as f:
-                try:
-                    timestamp = round(float(f.readline()))
-                except Exception:
-                    timestamp = 0
-
-                if (
-                    timestamp
-                    < (
-                        datetime.datetime.now() - datetime.timedelta(weeks=2)
-                    ).timestamp()
-                ):
-                    vacuum_db(migrate_db)
-        else:
-            vacuum_db(migrate_db)
-
         migrate_db.close()
 
     def init_go2rtc(self) -> None:
@@ -217,11 +186,14 @@ class FrigateApp:
                 logger.info(f"go2rtc process pid: {proc.info['pid']}")
                 self.processes["go2rtc"] = proc.info["pid"]
 
+    def init_hwaccel(self) -> None:
+        select_hwaccel(self.config, self.camera_metrics)
+
     def init_recording_manager(self) -> None:
         recording_process = util.Process(
             target=manage_recordings,
             name="recording_manager",
-            args=(self.config,),
+            args=(self.config, self.camera_metrics),
         )
         recording_process.daemon = True
         self.recording_process = recording_process
@@ -274,7 +246,7 @@ class FrigateApp:
         self.db = SqliteVecQueueDatabase(
             self.config.database.path,
             pragmas={
-                "auto_vacuum": "FULL",  # Does not defragment database
+                "auto_vacuum": "INCREMENTAL",  # Free pages are reclaimed by the database maintainer
                 "cache_size": -512 * 1000,  # 512MB of cache,
                 "synchronous": "NORMAL",  # Safe when using WAL https://www.sqlite.org/pragma.html#pragma_synchronous
             },
@@ -285,12 +257,16 @@ class FrigateApp:
         )
         models = [
             Event,
+            EventZone,
             Export,
             Previews,
             Recordings,
+            RecordingsRollup,
             RecordingsToDelete,
             Regions,
             ReviewSegment,
+            ReviewSegmentLabel,
+            ReviewSegmentZone,
             Timeline,
             User,
             CameraPermission,
@@ -320,10 +296,11 @@ class FrigateApp:
             or self.config.face_recognition.enabled
         ):
             # Create a client for other processes to use
-            self.embeddings = EmbeddingsContext(self.db)
+            self.embeddings = EmbeddingsContext(self.db, self.config)
 
     def init_inter_process_communicator(self) -> None:
         self.inter_process_communicator = InterProcessCommunicator()
+        self.inter_process_telemetry = InterProcessTelemetryCommunicator()
         self.inter_config_updater = ConfigPublisher()
         self.event_metadata_updater = EventMetadataPublisher()
         self.inter_zmq_proxy = ZmqProxy()
@@ -348,6 +325,7 @@ class FrigateApp:
 
         comms.append(WebSocketClient(self.config))
         comms.append(self.inter_process_communicator)
+        comms.append(self.inter_process_telemetry)
 
         self.dispatcher = Dispatcher(
             self.config,
@@ -529,6 +507,28 @@ class FrigateApp:
         self.storage_maintainer = StorageMaintainer(self.config, self.stop_event)
         self.storage_maintainer.start()
 
+    def start_camera_switch_pollers(self) -> None:
+        self.go2rtc_stream_pollers: list[Go2RtcStreamPoller] = []
+
+        if not self.config.camera_switching.enabled:
+            return
+
+        self.go2rtc_stream_pollers = start_go2rtc_stream_pollers(
+            {
+                name: (
+                    camera.camera_switching.go2rtc_api_url,
+                    camera.camera_switching.check_interval,
+                )
+                for name, camera in self.config.cameras.items()
+                if camera.camera_switching.enabled
+            },
+            self.stop_event,
+        )
+
+    def start_database_maintainer(self) -> None:
+        self.database_maintainer = DatabaseMaintainer(self.config, self.stop_event)
+        self.database_maintainer.start()
+
     def start_stats_emitter(self) -> None:
         self.stats_emitter = StatsEmitter(
             self.config,
@@ -538,6 +538,7 @@ class FrigateApp:
                 self.embeddings_metrics,
                 self.detectors,
                 self.processes,
+                self.database_maintainer,
             ),
             self.stop_event,
         )
@@ -672,6 +673,7 @@ class FrigateApp:
 
         # Phase 2: Critical services for live streaming
         self.init_go2rtc()
+        self.init_hwaccel()
         self.init_onvif()
         self.init_auth()
         logger.info("✓ Core services ready - live streaming infrastructure prepared!")
@@ -684,6 +686,7 @@ class FrigateApp:
 
         # Phase 4: Camera and processing services
         self.start_camera_capture_processes()
+        self.start_camera_switch_pollers()
         logger.info("✓ Camera capture started!")
 
         # Phase 5: Detection and AI (most time-consuming)
@@ -702,6 +705,7 @@ class FrigateApp:
 
         # Phase 7: Maintenance and monitoring (lowest priority)
         self.start_storage_maintainer()
+        self.start_database_maintainer()
         self.start_stats_emitter()
         self.start_timeline_processor()
         self.start_event_processor()
@@ -813,6 +817,11 @@ class FrigateApp:
 
         self.event_cleanup.join()
         self.record_cleanup.join()
+        self.database_maintainer.join()
+
+        for poller in self.go2rtc_stream_pollers:
+            poller.join()
+
         self.stats_emitter.join()
         self.frigate_watchdog.join()
         self.db.stop()
@@ -19,6 +19,10 @@ class CameraMetrics:
     process: Optional[mp.Process]
     capture_process: Optional[mp.Process]
     ffmpeg_pid: Synchronized
+    switch_first_frame: Synchronized
+    cache_segment_time: Synchronized
+    cache_scan_time: Synchronized
+    hwaccel_fallback: Synchronized
 
     def __init__(self):
         self.camera_fps = mp.Value("d", 0)
@@ -35,6 +39,12 @@ class CameraMetrics:
         self.process = None
         self.capture_process = None
         self.ffmpeg_pid = mp.Value("i", 0)
+        self.switch_first_frame = mp.Value("d", 0)
+        # newest recording segment in the cache, published by the recording maintainer
+        self.cache_segment_time = mp.Value("d", 0)
+        self.cache_scan_time = mp.Value("d", 0)
+        # the auto detected hwaccel failed to decode the stream
+        self.hwaccel_fallback = mp.Value("i", 0)
 
 
 class PTZMetrics:
@@ -0,0 +1,91 @@
+"""Encodes the current frame of each camera once for all clients."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# encoded frames kept for the distinct (camera, format, height, quality, overlays) requests
+MAX_CACHED_FRAMES = 32
+
+
+class FrameBroadcaster:
+    """Renders and encodes the current frame of a camera once per distinct
+    request and shares the encoded bytes with every client asking for it
+    until a new frame arrives."""
+
+    def __init__(self, frame_processor, max_cached_frames: int = MAX_CACHED_FRAMES):
+        self.frame_processor = frame_processor
+        self.max_cached_frames = max_cached_frames
+        self.lock = threading.Lock()
+        # key -> (frame time, encoded frame)
+        self.cache: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+        # held while a key is rendered so concurrent clients wait for the result
+        self.render_locks: dict[tuple, threading.Lock] = {}
+
+    def get_frame(
+        self,
+        camera: str,
+        extension: str,
+        height: Optional[int],
+        quality_params: Optional[list[int]],
+        draw_options: dict[str, Any],
+    ) -> Optional[bytes]:
+        """Get the current frame of a camera encoded as the extension, None if
+        there is no frame yet. Raises ValueError for an invalid height."""
+        key = (
+            camera,
+            extension,
+            height,
+            tuple(quality_params or []),
+            tuple(sorted((k, bool(v)) for k, v in draw_options.items())),
+        )
+        frame_time = self.frame_processor.get_current_frame_time(camera)
+
+        with self.lock:
+            render_lock = self.render_locks.setdefault(key, threading.Lock())
+
+        with render_lock:
+            with self.lock:
+                cached = self.cache.get(key)
+
+                if cached is not None and cached[0] == frame_time:
+                    self.cache.move_to_end(key)
+                    return cached[1]
+
+            frame = self.frame_processor.get_current_frame(camera, draw_options)
+
+            if frame is None:
+                return None
+
+            if height is None:
+                height = frame.shape[0]
+
+            width = int(height * frame.shape[1] / frame.shape[0])
+
+            if height < 1 or width < 1:
+                raise ValueError(
+                    f"Invalid height / width requested :: {height} / {width}"
+                )
+
+            if height != frame.shape[0]:
+                frame = cv2.resize(
+                    frame, dsize=(width, height), interpolation=cv2.INTER_AREA
+                )
+
+            _, img = cv2.imencode(f".{extension}", frame, quality_params)
+            encoded = img.tobytes()
+
+            with self.lock:
+                self.cache[key] = (frame_time, encoded)
+                self.cache.move_to_end(key)
+
+                while len(self.cache) > self.max_cached_frames:
+                    evicted, _ = self.cache.popitem(last=False)
+                    self.render_locks.pop(evicted, None)
+
+            return encoded
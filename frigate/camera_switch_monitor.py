@@ -9,15 +9,20 @@ import logging
 import threading
 import time
 from dataclasses import dataclass
-from queue import Queue
+from multiprocessing.synchronize import Event as MpEvent
 from typing import Dict, Optional, Tuple
 
 import requests
 
 from frigate.camera_status_manager import camera_status_manager
+from frigate.comms.go2rtc_updater import Go2RtcStreamPublisher, Go2RtcStreamSubscriber
 
 logger = logging.getLogger(__name__)
 
+# Poll faster for a few checks after a stream looks unstable
+UNSTABLE_POLL_INTERVAL = 1.0
+UNSTABLE_POLL_COUNT = 5
+
 # Global flag to track if camera switching is enabled globally
 _camera_switching_globally_enabled = False
 
@@ -76,17 +81,6 @@ class CameraSwitchDetector:
         """Add a callback to be called when a camera switch is detected."""
         self.switch_callbacks.append(callback)
 
-    def get_stream_info(self) -> Optional[Dict]:
-        """Get stream information from go2rtc API."""
-        try:
-            response = requests.get(f"{self.go2rtc_api_url}/streams", timeout=5)
-            response.raise_for_status()
-            streams_data = response.json()
-            return streams_data.get(self.camera_name)
-        except Exception as e:
-            logger.warning(f"Failed to get stream info for {self.camera_name}: {e}")
-            return None
-
     def parse_stream_metrics(self, stream_data: Dict) -> StreamMetrics:
         """Parse stream data to extract relevant metrics."""
         metrics = StreamMetrics()
@@ -175,17 +169,23 @@ class CameraSwitchDetector:
         """Main monitoring loop to detect camera switches."""
         logger.info(f"Starting camera switch monitoring for {self.camera_name}")
 
+        # stream info is fetched once for all cameras by the Go2RtcStreamPoller
+        stream_subscriber = Go2RtcStreamSubscriber(self.camera_name)
+
         try:
             while not getattr(self, "_stop_monitoring", False):
+                topic, stream_data = stream_subscriber.check_for_update(timeout=1)
+
+                if not topic:
+                    continue
+
                 # Check if globally enabled before processing
                 if not is_camera_switching_globally_enabled():
                     logger.debug(
                         f"Camera switching globally disabled, skipping monitoring for {self.camera_name}"
                     )
-                    time.sleep(1)
                     continue
                 try:
-                    stream_data = self.get_stream_info()
                     self.current_metrics = self.parse_stream_metrics(stream_data)
 
                     # Detect switch
@@ -221,14 +221,9 @@ class CameraSwitchDetector:
                         f"Error in stream monitoring for {self.camera_name}: {e}"
                     )
 
-                # Check for stop signal periodically
-                for _ in range(int(self.monitoring_interval)):
-                    if getattr(self, "_stop_monitoring", False):
-                        break
-                    time.sleep(1)
-
         finally:
             # Cleanup on exit
+            stream_subscriber.stop()
             self._cleanup()
             logger.info(f"Camera switch monitoring stopped for {self.camera_name}")
 
@@ -272,297 +267,124 @@ class CameraSwitchDetector:
             logger.warning(f"Error during cleanup for {self.camera_name}: {e}")
 
 
-class StreamResetManager:
+class Go2RtcStreamPoller(threading.Thread):
     """
-    Manages stream resets when camera switches are detected.
+    Fetches stream info from a go2rtc instance and fans it out to all detectors.
 
-    This class handles the coordination between go2rtc stream resets
-    and Frigate camera process restarts.
+    The streams document is fetched and parsed once per interval for every
+    camera using the instance, then published per camera so detectors in the
+    camera processes don't each need to poll go2rtc.
     """
 
-    def __init__(self):
-        self.reset_queue = Queue()
-        self.go2rtc_api_url = "http://localhost:1984/api"
-        self.active_resets = set()
-        self.reset_cooldown = 30  # Minimum seconds between resets for same camera
-        self.last_reset_times: Dict[str, float] = {}
-        self._shutdown = False
-        self.camera_reset_callback = None
-
-    def reset_go2rtc_stream(self, camera_name: str) -> bool:
-        """Reset a specific go2rtc stream."""
-        try:
-            # First, try to restart the specific stream
-            restart_url = f"{self.go2rtc_api_url}/streams/{camera_name}/restart"
-            response = requests.post(restart_url, timeout=10)
-
-            if response.status_code == 200:
-                logger.info(f"Successfully restarted go2rtc stream for {camera_name}")
-                return True
-            else:
-                logger.warning(
-                    f"go2rtc stream restart returned status {response.status_code}"
-                )
-
-        except Exception as e:
-            logger.error(f"Failed to restart go2rtc stream for {camera_name}: {e}")
-
-        # Fallback: try to stop and start the stream
+    def __init__(
+        self,
+        go2rtc_api_url: str,
+        camera_intervals: Dict[str, float],
+        stop_event: MpEvent | threading.Event,
+    ):
+        super().__init__(name=f"go2rtc_stream_poller:{go2rtc_api_url}", daemon=True)
+        self.go2rtc_api_url = go2rtc_api_url
+        self.camera_intervals = camera_intervals
+        self.stop_event = stop_event
+        self.interval = min(camera_intervals.values())
+        self.last_signatures: Dict[str, tuple] = {}
+        self.last_errors: Dict[str, int] = {}
+        self.last_polled: Dict[str, float] = {}
+        # remaining fast polls of each camera whose stream looked unstable
+        self.unstable_polls: Dict[str, int] = {}
+
+    def get_streams(self, session: requests.Session) -> Optional[Dict]:
+        """Get stream information for all streams from the go2rtc API."""
         try:
-            # Stop stream
-            stop_url = f"{self.go2rtc_api_url}/streams/{camera_name}/stop"
-            requests.post(stop_url, timeout=5)
-
-            # Wait a moment
-            time.sleep(2)
-
-            # Start stream
-            start_url = f"{self.go2rtc_api_url}/streams/{camera_name}/start"
-            response = requests.post(start_url, timeout=10)
-
-            if response.status_code == 200:
-                logger.info(
-                    f"Successfully restarted go2rtc stream for {camera_name} via stop/start"
-                )
-                return True
-
+            response = session.get(f"{self.go2rtc_api_url}/streams", timeout=5)
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
-            logger.error(f"Failed to stop/start go2rtc stream for {camera_name}: {e}")
-
-        return False
-
-    def request_camera_reset(self, camera_name: str, reason: str = ""):
-        """Request a camera reset due to detected switch."""
-        # Check if globally enabled
-        if not is_camera_switching_globally_enabled():
-            logger.debug(
-                f"Camera switching globally disabled, skipping reset for {camera_name}"
-            )
-            return
-
-        current_time = time.time()
-
-        # Check cooldown
-        if camera_name in self.last_reset_times:
-            time_since_last = current_time - self.last_reset_times[camera_name]
-            if time_since_last < self.reset_cooldown:
-                logger.info(
-                    f"Skipping reset for {camera_name} - still in cooldown ({time_since_last:.1f}s)"
-                )
-                return
-
-        # Prevent concurrent resets
-        if camera_name in self.active_resets:
-            logger.info(f"Reset already in progress for {camera_name}")
-            return
-
-        logger.info(f"Queueing camera reset for {camera_name}: {reason}")
-        self.reset_queue.put((camera_name, reason, current_time))
-
-    def execute_camera_reset(self, camera_name: str, reason: str):
-        """Execute the actual camera reset process."""
-        try:
-            self.active_resets.add(camera_name)
-            logger.info(f"Executing camera reset for {camera_name}: {reason}")
-
-            # Step 1: Reset go2rtc stream
-            self.reset_go2rtc_stream(camera_name)
+            logger.warning(f"Failed to get stream info from {self.go2rtc_api_url}: {e}")
+            return None
 
-            # Step 2: Signal Frigate to restart camera processes via callback
-            if hasattr(self, "camera_reset_callback") and self.camera_reset_callback:
-                try:
-                    self.camera_reset_callback(camera_name, reason)
-                except Exception as e:
-                    logger.error(
-                        f"Error in camera reset callback for {camera_name}: {e}"
-                    )
+    def _is_unstable(self, camera_name: str, stream_data: Optional[Dict]) -> bool:
+        """Check if a stream changed or reported new errors since the last poll."""
+        if not stream_data:
+            return False
 
-            logger.info(f"Camera reset completed for {camera_name}")
-            self.last_reset_times[camera_name] = time.time()
+        signature = tuple(
+            (track.get("codec"), track.get("width"), track.get("height"))
+            for producer in stream_data.get("producers", [])
+            for track in producer.get("tracks", [])
+        )
+        # errors of stale consumers stay in the stream info, only new ones count
+        errors = len([c for c in stream_data.get("consumers", []) if c.get("error")])
+        previous = self.last_signatures.get(camera_name)
+        previous_errors = self.last_errors.get(camera_name, 0)
+        self.last_signatures[camera_name] = signature
+        self.last_errors[camera_name] = errors
+
+        return errors > previous_errors or (
+            previous is not None and previous != signature
+        )
 
-        except Exception as e:
-            logger.error(f"Error executing camera reset for {camera_name}: {e}")
-        finally:
-            self.active_resets.discard(camera_name)
-
-    def set_camera_reset_callback(self, callback):
-        """Set callback function to trigger camera resets in Frigate."""
-        self.camera_reset_callback = callback
-
-    def process_reset_queue(self):
-        """Process queued reset requests."""
-        while not self._shutdown:
-            try:
-                camera_name, reason, request_time = self.reset_queue.get(timeout=1)
-                if not self._shutdown:  # Double-check shutdown state
-                    self.execute_camera_reset(camera_name, reason)
-            except Exception:
+    def poll(
+        self,
+        session: requests.Session,
+        publisher: Go2RtcStreamPublisher,
+        now: float,
+    ) -> float:
+        """Publish the stream info of the cameras that are due, returns the seconds until the next poll."""
+        streams = self.get_streams(session)
+
+        for camera_name, interval in self.camera_intervals.items():
+            stream_data = streams.get(camera_name) if streams else None
+
+            if self._is_unstable(camera_name, stream_data):
+                self.unstable_polls[camera_name] = UNSTABLE_POLL_COUNT
+            elif self.unstable_polls.get(camera_name, 0) > 0:
+                self.unstable_polls[camera_name] -= 1
+            # cameras with a longer check interval are only updated when due
+            elif now - self.last_polled.get(camera_name, 0) < interval - 0.5:
                 continue
 
-        # Cleanup any remaining resets
-        logger.info("Reset queue processor shutting down, cleaning up...")
-        self._cleanup_reset_signals()
-
-    def shutdown(self):
-        """Shutdown the reset manager gracefully."""
-        self._shutdown = True
-        logger.info("StreamResetManager shutdown requested")
-
-    def _cleanup_reset_signals(self):
-        """Clean up any remaining reset signal files."""
-        # No longer using file-based signaling, but keep method for compatibility
-        pass
-
-
-class CameraSwitchMonitor:
-    """
-    Main coordinator class for camera switch detection and stream management.
-
-    This class sets up monitoring for multiple cameras and coordinates
-    the detection and reset processes.
-    """
-
-    def __init__(self, camera_configs: Dict[str, Dict]):
-        self.camera_configs = camera_configs
-        self.detectors: Dict[str, CameraSwitchDetector] = {}
-        self.reset_manager = StreamResetManager()
-        self.monitoring_threads: Dict[str, threading.Thread] = {}
-        self.running = False
-
-    def setup_camera_monitoring(self, camera_name: str, config: Dict):
-        """Set up monitoring for a specific camera."""
-        # Only monitor cameras that use go2rtc and have switching enabled
-        if not config.get("camera_switching", {}).get("enabled", False):
-            return
-
-        logger.info(f"Setting up camera switch monitoring for {camera_name}")
-
-        detector = CameraSwitchDetector(camera_name)
-
-        # Configure thresholds from camera config
-        switching_config = config.get("camera_switching", {})
-        if "thresholds" in switching_config:
-            detector.switch_threshold.update(switching_config["thresholds"])
+            self.last_polled[camera_name] = now
+            publisher.publish(stream_data, camera_name)
 
-        # Set monitoring interval
-        detector.monitoring_interval = switching_config.get("check_interval", 5.0)
+        if any(self.unstable_polls.values()):
+            return UNSTABLE_POLL_INTERVAL
 
-        # Add reset callback
-        detector.add_switch_callback(self.reset_manager.request_camera_reset)
+        return self.interval
 
-        self.detectors[camera_name] = detector
-
-    def start_monitoring(self):
-        """Start monitoring all configured cameras."""
-        if self.running:
-            return
-
-        self.running = True
-        logger.info("Starting camera switch monitoring system")
-
-        # Start reset queue processor
-        reset_thread = threading.Thread(
-            target=self.reset_manager.process_reset_queue,
-            daemon=True,
-            name="reset_queue_processor",
+    def run(self) -> None:
+        logger.info(
+            f"Polling go2rtc streams at {self.go2rtc_api_url} for {len(self.camera_intervals)} cameras"
         )
-        reset_thread.start()
-
-        # Start monitoring threads for each camera
-        for camera_name, detector in self.detectors.items():
-            thread = threading.Thread(
-                target=detector.monitor_stream,
-                daemon=True,
-                name=f"monitor_{camera_name}",
-            )
-            thread.start()
-            self.monitoring_threads[camera_name] = thread
-
-        logger.info(f"Started monitoring {len(self.detectors)} cameras for switching")
-
-    def stop_monitoring(self):
-        """Stop all monitoring activities and cleanup resources."""
-        self.running = False
-        logger.info("Stopping camera switch monitoring system")
-
-        # Stop all detector threads
-        for camera_name, detector in self.detectors.items():
-            try:
-                detector.stop_monitoring()
-                logger.debug(f"Stopped monitoring for {camera_name}")
-            except Exception as e:
-                logger.warning(f"Error stopping detector for {camera_name}: {e}")
-
-        # Wait for threads to finish (with timeout)
-        for camera_name, thread in self.monitoring_threads.items():
-            try:
-                thread.join(timeout=5)
-                if thread.is_alive():
-                    logger.warning(f"Thread for {camera_name} did not stop gracefully")
-                else:
-                    logger.debug(f"Thread for {camera_name} stopped successfully")
-            except Exception as e:
-                logger.warning(f"Error joining thread for {camera_name}: {e}")
-
-        # Shutdown reset manager
-        try:
-            self.reset_manager.shutdown()
-        except Exception as e:
-            logger.warning(f"Error shutting down reset manager: {e}")
+        publisher = Go2RtcStreamPublisher()
 
-        # Clean up all temporary files
-        self._cleanup_all_files()
-
-        logger.info("Camera switch monitoring system stopped and cleaned up")
-
-    def _cleanup_all_files(self):
-        """Clean up all temporary files created by the monitoring system."""
-        try:
-            # Clean up status manager state
-            camera_status_manager.cleanup()
-            logger.debug("Cleaned up camera status manager state")
-
-        except Exception as e:
-            logger.warning(f"Error during cleanup: {e}")
-
-    def __del__(self):
-        """Destructor to ensure cleanup on object deletion."""
-        if self.running:
-            self.stop_monitoring()
-
-    def get_status(self) -> Dict:
-        """Get status of all monitored cameras."""
-        status = {
-            "running": self.running,
-            "monitored_cameras": len(self.detectors),
-            "cameras": {},
-        }
+        with requests.Session() as session:
+            while not self.stop_event.is_set():
+                if not is_camera_switching_globally_enabled():
+                    self.stop_event.wait(1)
+                    continue
 
-        for camera_name, detector in self.detectors.items():
-            status["cameras"][camera_name] = {
-                "current_metrics": detector.current_metrics.__dict__,
-                "format_changes": detector.current_metrics.format_changes,
-                "last_reset": self.reset_manager.last_reset_times.get(camera_name, 0),
-                "thread_alive": self.monitoring_threads.get(
-                    camera_name, threading.Thread()
-                ).is_alive(),
-            }
+                self.stop_event.wait(self.poll(session, publisher, time.time()))
 
-        return status
+        publisher.stop()
+        logger.info(f"Stopped polling go2rtc streams at {self.go2rtc_api_url}")
 
 
-def create_camera_switch_monitor(config: Dict) -> CameraSwitchMonitor:
-    """Factory function to create and configure camera switch monitor."""
-    camera_configs = {}
+def start_go2rtc_stream_pollers(
+    camera_configs: Dict[str, Tuple[str, float]],
+    stop_event: MpEvent | threading.Event,
+) -> list[Go2RtcStreamPoller]:
+    """Start one poller per go2rtc instance for cameras mapped to (api url, check interval)."""
+    instances: Dict[str, Dict[str, float]] = {}
 
-    # Extract camera configurations
-    for camera_name, camera_config in config.get("cameras", {}).items():
-        camera_configs[camera_name] = camera_config
+    for camera_name, (api_url, interval) in camera_configs.items():
+        instances.setdefault(api_url, {})[camera_name] = interval
 
-    monitor = CameraSwitchMonitor(camera_configs)
+    pollers = []
 
-    # Set up monitoring for each camera
-    for camera_name, camera_config in camera_configs.items():
-        monitor.setup_camera_monitoring(camera_name, camera_config)
+    for api_url, camera_intervals in instances.items():
+        poller = Go2RtcStreamPoller(api_url, camera_intervals, stop_event)
+        poller.start()
+        pollers.append(poller)
 
-    return monitor
+    return pollers
@@ -0,0 +1,259 @@
+"""Binary encoding for messages on the detection bus."""
+
+import json
+import math
+import struct
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+
+FORMAT_JSON = 0
+FORMAT_VIDEO = 1
+
+# format, frame time, object count, motion box count, region count
+VIDEO_HEADER = struct.Struct("<BdHHH")
+TEXT_LENGTH = struct.Struct("<H")
+COLUMN_LENGTH = struct.Struct("<I")
+BOX_DTYPE = np.dtype("<i4")
+
+# fixed size fields of each tracked object, stored as one packed record
+OBJECT_DTYPE = np.dtype(
+    [
+        ("frame_time", "<f8"),
+        ("start_time", "<f8"),
+        ("end_time", "<f8"),
+        ("score", "<f8"),
+        ("top_score", "<f8"),
+        ("area", "<i8"),
+        ("ratio", "<f8"),
+        ("box", "<i4", (4,)),
+        ("region", "<i4", (4,)),
+        ("motionless_count", "<i4"),
+        ("position_changes", "<i4"),
+        ("current_estimated_speed", "<f8"),
+        ("average_estimated_speed", "<f8"),
+        ("velocity_angle", "<f8"),
+        ("false_positive", "?"),
+        ("active", "?"),
+        ("stationary", "?"),
+        ("has_clip", "?"),
+        ("has_snapshot", "?"),
+        ("pending_loitering", "?"),
+    ]
+)
+RECORD_FIELDS: tuple[str, ...] = OBJECT_DTYPE.names
+NULLABLE_RECORD_FIELDS = ("end_time",)
+
+# variable size fields of each tracked object, each stored as its own json column
+COLUMN_FIELDS = (
+    "id",
+    "label",
+    "sub_label",
+    "max_severity",
+    "recognized_license_plate",
+    "current_zones",
+    "entered_zones",
+    "attributes",
+    "current_attributes",
+    "snapshot",
+    "path_data",
+)
+
+# the camera of each object is the camera of the message
+OBJECT_FIELDS = frozenset(RECORD_FIELDS + COLUMN_FIELDS + ("camera",))
+
+# columns that rarely change, reused from the previous message when unchanged
+CACHED_COLUMNS: dict[str, Callable[[Any, Any], bool]] = {
+    # a new snapshot dict is created whenever a better snapshot is found
+    "snapshot": lambda previous, current: previous is current,
+    # path data is only appended to, and copies share the same points
+    "path_data": lambda previous, current: (
+        len(previous) == len(current) and (not current or previous[-1] is current[-1])
+    ),
+}
+
+
+def decode_detection(data: bytes, object_fields: Optional[Iterable[str]] = None) -> Any:
+    """Decode a detection payload.
+
+    object_fields limits the tracked object fields that are decoded for video
+    detections, all fields are decoded when it is None."""
+    if data[0] == FORMAT_VIDEO:
+        return _decode_video(data, object_fields)
+
+    return json.loads(data[1:])
+
+
+class DetectionEncoder:
+    """Encodes detection payloads using the schema for their type."""
+
+    def __init__(self) -> None:
+        # object id -> (value, encoded value) for the fields in CACHED_COLUMNS
+        self.column_cache: dict[str, dict[str, tuple[Any, str]]] = {
+            field: {} for field in CACHED_COLUMNS
+        }
+
+    def encode(self, detection_type: str, payload: Any) -> bytes:
+        if detection_type == "video":
+            encoded = self._encode_video(payload)
+
+            if encoded is not None:
+                return encoded
+
+        return bytes([FORMAT_JSON]) + json.dumps(payload).encode()
+
+    def _encode_column(self, field: str, tracked_objects: list[dict]) -> bytes:
+        if field not in CACHED_COLUMNS:
+            return json.dumps([o[field] for o in tracked_objects]).encode()
+
+        cache = self.column_cache[field]
+        is_unchanged = CACHED_COLUMNS[field]
+        updated_cache = {}
+        encoded = []
+
+        for o in tracked_objects:
+            value = o[field]
+            cached = cache.get(o["id"])
+
+            if cached is None or not is_unchanged(cached[0], value):
+                cached = (value, json.dumps(value))
+
+            updated_cache[o["id"]] = cached
+            encoded.append(cached[1])
+
+        # only keep the objects that are still tracked
+        self.column_cache[field] = updated_cache
+        return f"[{','.join(encoded)}]".encode()
+
+    def _encode_video(self, payload: tuple) -> Optional[bytes]:
+        """Encode a video detection, None if it does not fit the schema."""
+        camera, frame_name, frame_time, tracked_objects, motion_boxes, regions = payload
+
+        if any(o.keys() != OBJECT_FIELDS for o in tracked_objects):
+            return None
+
+        records = np.empty(len(tracked_objects), OBJECT_DTYPE)
+
+        for field in RECORD_FIELDS:
+            values = [o[field] for o in tracked_objects]
+
+            if field in NULLABLE_RECORD_FIELDS:
+                values = [math.nan if v is None else v for v in values]
+
+            column = np.array(values)
+
+            # packing would silently truncate non integer values
+            if (
+                column.size > 0
+                and OBJECT_DTYPE[field].base.kind == "i"
+                and column.dtype.kind not in "iub"
+            ):
+                return None
+
+            records[field] = column
+
+        motion = np.array(motion_boxes).reshape(-1, 4)
+        region_boxes = np.array(regions).reshape(-1, 4)
+
+        if (motion.size > 0 and motion.dtype.kind not in "iu") or (
+            region_boxes.size > 0 and region_boxes.dtype.kind not in "iu"
+        ):
+            return None
+
+        motion = motion.astype(BOX_DTYPE)
+        region_boxes = region_boxes.astype(BOX_DTYPE)
+
+        parts = [
+            VIDEO_HEADER.pack(
+                FORMAT_VIDEO, frame_time, len(records), len(motion), len(region_boxes)
+            )
+        ]
+
+        for text in (camera, frame_name):
+            encoded = text.encode()
+            parts.append(TEXT_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+
+        parts.append(records.tobytes())
+        parts.append(motion.tobytes())
+        parts.append(region_boxes.tobytes())
+
+        for field in COLUMN_FIELDS:
+            column = self._encode_column(field, tracked_objects)
+            parts.append(COLUMN_LENGTH.pack(len(column)))
+            parts.append(column)
+
+        return b"".join(parts)
+
+
+def _decode_video(data: bytes, object_fields: Optional[Iterable[str]]) -> list:
+    _, frame_time, object_count, motion_count, region_count = VIDEO_HEADER.unpack_from(
+        data
+    )
+    offset = VIDEO_HEADER.size
+
+    texts = []
+
+    for _ in range(2):
+        (length,) = TEXT_LENGTH.unpack_from(data, offset)
+        offset += TEXT_LENGTH.size
+        texts.append(data[offset : offset + length].decode())
+        offset += length
+
+    camera, frame_name = texts
+
+    records = np.frombuffer(data, OBJECT_DTYPE, object_count, offset)
+    offset += records.nbytes
+    motion_boxes = np.frombuffer(data, BOX_DTYPE, motion_count * 4, offset)
+    offset += motion_boxes.nbytes
+    regions = np.frombuffer(data, BOX_DTYPE, region_count * 4, offset)
+    offset += regions.nbytes
+
+    fields = (
+        OBJECT_FIELDS
+        if object_fields is None
+        else OBJECT_FIELDS.intersection(object_fields)
+    )
+    values: dict[str, list] = {}
+
+    for field in COLUMN_FIELDS:
+        (length,) = COLUMN_LENGTH.unpack_from(data, offset)
+        offset += COLUMN_LENGTH.size
+
+        # only parse the columns that were asked for
+        if field in fields:
+            values[field] = json.loads(data[offset : offset + length])
+
+        offset += length
+
+    for field in RECORD_FIELDS:
+        if field not in fields:
+            continue
+
+        column = records[field].tolist()
+
+        if field in NULLABLE_RECORD_FIELDS:
+            column = [None if math.isnan(v) else v for v in column]
+
+        values[field] = column
+
+    if "camera" in fields:
+        values["camera"] = [camera] * object_count
+
+    names = list(values.keys())
+    tracked_objects = [
+        dict(zip(names, object_values)) for object_values in zip(*values.values())
+    ]
+
+    # no fields were asked for, still report how many objects there are
+    if not names:
+        tracked_objects = [{} for _ in range(object_count)]
+
+    return [
+        camera,
+        frame_name,
+        frame_time,
+        tracked_objects,
+        motion_boxes.reshape(-1, 4).tolist(),
+        regions.reshape(-1, 4).tolist(),
+    ]
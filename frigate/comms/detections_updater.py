@@ -1,8 +1,11 @@
 """Facilitates communication between processes."""
 
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
+import zmq
+
+from .detections_codec import DetectionEncoder, decode_detection
 from .zmq_proxy import Publisher, Subscriber
 
 
@@ -22,6 +25,17 @@ class DetectionPublisher(Publisher):
     def __init__(self, topic: DetectionTypeEnum) -> None:
         topic = topic.value
         super().__init__(topic)
+        self.encoder = DetectionEncoder()
+
+    def publish(self, payload: Any, sub_topic: str = "") -> None:
+        """Publish the topic and the encoded payload as separate frames."""
+        topic = f"{self.topic}{sub_topic}"
+        self.socket.send_multipart(
+            [
+                topic.encode(),
+                self.encoder.encode(topic[len(self.topic_base) :], payload),
+            ]
+        )
 
 
 class DetectionSubscriber(Subscriber):
@@ -29,14 +43,32 @@ class DetectionSubscriber(Subscriber):
 
     topic_base = "detection/"
 
-    def __init__(self, topic: DetectionTypeEnum) -> None:
+    def __init__(
+        self,
+        topic: DetectionTypeEnum,
+        object_fields: Optional[Iterable[str]] = None,
+    ) -> None:
         topic = topic.value
         super().__init__(topic)
+        self.object_fields = (
+            frozenset(object_fields) if object_fields is not None else None
+        )
 
     def check_for_update(
         self, timeout: float = None
     ) -> Optional[tuple[DetectionTypeEnum, Any]]:
-        return super().check_for_update(timeout)
+        try:
+            has_update, _, _ = zmq.select([self.socket], [], [], timeout)
+
+            if has_update:
+                topic, data = self.socket.recv_multipart(flags=zmq.NOBLOCK)
+                return self._return_object(
+                    topic.decode(), decode_detection(data, self.object_fields)
+                )
+        except zmq.ZMQError:
+            pass
+
+        return self._return_object("", None)
 
     def _return_object(self, topic: str, payload: Any) -> Any:
         if payload is None:
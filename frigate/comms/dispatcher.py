@@ -23,6 +23,8 @@ from frigate.const import (
     UPDATE_MODEL_STATE,
     UPSERT_REVIEW_SEGMENT,
 )
+from frigate.db.lookups import update_review_segment_lookups
+from frigate.db.rollups import add_recordings_to_rollup
 from frigate.models import Event, Previews, Recordings, ReviewSegment
 from frigate.ptz.onvif import OnvifCommandEnum, OnvifController
 from frigate.types import ModelStatusTypesEnum, TrackedObjectUpdateTypesEnum
@@ -51,6 +53,8 @@ class Dispatcher:
         self.camera_activity = CameraActivityManager(config, self.publish)
         self.model_state = {}
         self.embeddings_reindex = {}
+        # last labels and zones written for each ongoing review segment
+        self.review_segment_lookups: dict[str, tuple[Any, ...]] = {}
 
         self._camera_settings_handlers: dict[str, Callable] = {
             "audio": self._on_audio_command,
@@ -100,6 +104,7 @@ class Dispatcher:
 
         def handle_insert_many_recordings():
             Recordings.insert_many(payload).execute()
+            add_recordings_to_rollup(payload)
 
         def handle_request_region_grid():
             camera = payload
@@ -119,6 +124,23 @@ class Dispatcher:
                 update=payload,
             ).execute()
 
+            # only rewrite the lookups when the labels or zones changed
+            segment_id = payload[ReviewSegment.id.name]
+            data = payload[ReviewSegment.data.name]
+            lookups = (
+                sorted(data.get("objects", [])),
+                sorted(data.get("audio", [])),
+                sorted(data.get("zones", [])),
+            )
+
+            if self.review_segment_lookups.get(segment_id) != lookups:
+                update_review_segment_lookups(segment_id, data)
+
+            if payload.get(ReviewSegment.end_time.name) is None:
+                self.review_segment_lookups[segment_id] = lookups
+            else:
+                self.review_segment_lookups.pop(segment_id, None)
+
         def handle_clear_ongoing_review_segments():
             ReviewSegment.update(end_time=datetime.datetime.now().timestamp()).where(
                 ReviewSegment.end_time.is_null(True)
@@ -0,0 +1,34 @@
+"""Facilitates communication between processes."""
+
+import logging
+from typing import Any, Optional
+
+from .zmq_proxy import Publisher, Subscriber
+
+logger = logging.getLogger(__name__)
+
+
+class Go2RtcStreamPublisher(Publisher):
+    """Publishes go2rtc stream info for each camera."""
+
+    topic_base = "go2rtc/streams/"
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def publish(self, payload: Optional[dict[str, Any]], camera: str) -> None:
+        super().publish(payload, camera)
+
+
+class Go2RtcStreamSubscriber(Subscriber):
+    """Receives go2rtc stream info for a single camera."""
+
+    topic_base = "go2rtc/streams/"
+
+    def __init__(self, camera: str) -> None:
+        # the trailing space separates topic and payload,
+        # so cam1 does not also receive updates for cam10
+        super().__init__(f"{camera} ")
+
+    def _return_object(self, topic: str, payload: Any) -> Any:
+        return (topic, payload)
@@ -10,6 +10,10 @@ import zmq
 from frigate.comms.base_communicator import Communicator
 
 SOCKET_REP_REQ = "ipc:///tmp/cache/comms"
+SOCKET_PUSH_PULL = "ipc:///tmp/cache/telemetry"
+
+# max number of telemetry messages buffered before values are coalesced by the sender
+TELEMETRY_HWM = 100
 
 
 class InterProcessCommunicator(Communicator):
@@ -74,3 +78,78 @@ class InterProcessRequestor:
     def stop(self) -> None:
         self.socket.close()
         self.context.destroy()
+
+
+class InterProcessTelemetryCommunicator(Communicator):
+    """Receives fire and forget telemetry, only the latest value of each topic is dispatched."""
+
+    def __init__(self) -> None:
+        self.context = zmq.Context()
+        self.socket = self.context.socket(zmq.PULL)
+        self.socket.bind(SOCKET_PUSH_PULL)
+        self.stop_event: MpEvent = mp.Event()
+
+    def publish(self, topic: str, payload: str, retain: bool) -> None:
+        """There is no communication back to the processes."""
+        pass
+
+    def subscribe(self, receiver: Callable) -> None:
+        self._dispatcher = receiver
+        self.reader_thread = threading.Thread(target=self.read)
+        self.reader_thread.start()
+
+    def read(self) -> None:
+        while not self.stop_event.is_set():
+            has_message, _, _ = zmq.select([self.socket], [], [], 1)
+
+            if not has_message:
+                continue
+
+            latest: dict[str, Any] = {}
+
+            while True:  # load all messages that are queued
+                try:
+                    (topic, value) = self.socket.recv_json(flags=zmq.NOBLOCK)
+                    latest[topic] = value
+                except zmq.ZMQError:
+                    break
+
+            for topic, value in latest.items():
+                self._dispatcher(topic, value)
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        self.reader_thread.join()
+        self.socket.close()
+        self.context.destroy()
+
+
+class InterProcessTelemetryPublisher:
+    """Sends high frequency values to the dispatcher without waiting for a reply.
+
+    A value that could not be sent is only retried with the next send, so
+    topics that change rarely belong on the InterProcessRequestor."""
+
+    def __init__(self) -> None:
+        self.context = zmq.Context()
+        self.socket = self.context.socket(zmq.PUSH)
+        self.socket.setsockopt(zmq.SNDHWM, TELEMETRY_HWM)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.connect(SOCKET_PUSH_PULL)
+        self.pending: dict[str, Any] = {}
+
+    def send_data(self, topic: str, data: Any) -> None:
+        """Sends data, keeping only the latest value per topic while the dispatcher is busy."""
+        self.pending[topic] = data
+
+        for pending_topic, pending_data in list(self.pending.items()):
+            try:
+                self.socket.send_json((pending_topic, pending_data), flags=zmq.NOBLOCK)
+            except zmq.ZMQError:
+                return
+
+            del self.pending[pending_topic]
+
+    def stop(self) -> None:
+        self.socket.close()
+        self.context.destroy()
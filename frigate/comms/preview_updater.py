@@ -0,0 +1,129 @@
+"""Facilitates looking up cached preview frames between processes."""
+
+import os
+import threading
+from typing import Any, Callable, Optional
+
+import zmq
+
+from frigate.const import CACHE_DIR, PREVIEW_FRAME_TYPE
+
+SOCKET_REP_REQ = "ipc:///tmp/cache/preview_frames"
+# ms to wait for the output process before falling back to listing the cache
+REQUEST_TIMEOUT = 500
+
+
+class PreviewFramesResponder:
+    def __init__(self) -> None:
+        self.context = zmq.Context()
+        self.socket = self.context.socket(zmq.REP)
+        self.socket.bind(SOCKET_REP_REQ)
+
+    def check_for_request(self, process: Callable, timeout: float = 0.01) -> None:
+        """Answer the queued requests, waiting up to timeout seconds for the first."""
+        while True:  # load all messages that are queued
+            has_message, _, _ = zmq.select([self.socket], [], [], timeout)
+
+            if not has_message:
+                break
+
+            timeout = 0
+
+            try:
+                (topic, value) = self.socket.recv_json(flags=zmq.NOBLOCK)
+                self.socket.send_json(process(topic, value))
+            except zmq.ZMQError:
+                break
+
+    def stop(self) -> None:
+        self.socket.close()
+        self.context.destroy()
+
+
+class PreviewFramesRequestor:
+    """Get the times of cached preview frames from the output process."""
+
+    def __init__(self) -> None:
+        # connected on the first request, most api instances never look up frames
+        self.context: Optional[zmq.Context] = None
+        self.socket: Optional[zmq.Socket] = None
+        # requests from api threads are sent one at a time on the same socket
+        self.lock = threading.Lock()
+
+    def _connect(self) -> zmq.Socket:
+        socket = self.context.socket(zmq.REQ)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(SOCKET_REP_REQ)
+        return socket
+
+    def send_data(self, topic: str, data: Any) -> Any:
+        """Sends data and then waits for reply, None if there is no reply."""
+        with self.lock:
+            if self.context is None:
+                self.context = zmq.Context()
+                self.socket = self._connect()
+
+            try:
+                self.socket.send_json((topic, data), flags=zmq.NOBLOCK)
+
+                if self.socket.poll(REQUEST_TIMEOUT):
+                    return self.socket.recv_json()
+            except zmq.ZMQError:
+                pass
+
+            # a request socket without a reply can't send again
+            self.socket.close()
+            self.socket = self._connect()
+            return None
+
+    def get_frame_times(
+        self, camera: str, start_ts: float, end_ts: float
+    ) -> Optional[list[float]]:
+        return self.send_data(
+            "frames", {"camera": camera, "start": start_ts, "end": end_ts}
+        )
+
+    def stop(self) -> None:
+        with self.lock:
+            if self.context is None:
+                return
+
+            self.socket.close()
+            self.context.destroy()
+            self.context = None
+            self.socket = None
+
+
+def get_preview_frame_files(
+    requestor: Optional[PreviewFramesRequestor],
+    camera: str,
+    start_ts: float,
+    end_ts: float,
+) -> list[str]:
+    """Get the names of the cached preview frames of a camera in a time range."""
+    file_start = f"preview_{camera}"
+    frame_times = (
+        requestor.get_frame_times(camera, start_ts, end_ts)
+        if requestor is not None
+        else None
+    )
+
+    if frame_times is not None:
+        return [f"{file_start}-{t}.{PREVIEW_FRAME_TYPE}" for t in frame_times]
+
+    # the output process is not running, list the cache instead
+    selected_previews = []
+
+    for file in os.listdir(os.path.join(CACHE_DIR, "preview_frames")):
+        if not file.startswith(f"{file_start}-"):
+            continue
+
+        try:
+            frame_time = float(file[len(file_start) + 1 : -len(PREVIEW_FRAME_TYPE) - 1])
+        except ValueError:
+            continue
+
+        if start_ts <= frame_time <= end_ts:
+            selected_previews.append((frame_time, file))
+
+    return [file for _, file in sorted(selected_previews)]
@@ -38,4 +38,8 @@ class AudioConfig(FrigateBaseModel):
     enabled_in_config: Optional[bool] = Field(
         None, title="Keep track of original state of audio detection."
     )
-    num_threads: int = Field(default=2, title="Number of detection threads", ge=1)
+    num_threads: int = Field(
+        default=2,
+        title="Number of detection threads, the shared audio detector uses the highest value of all cameras",
+        ge=1,
+    )
@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Union
 
-from pydantic import Field, field_validator
+from pydantic import Field, PrivateAttr, field_validator
 
 from frigate.const import DEFAULT_FFMPEG_VERSION, INCLUDED_FFMPEG_VERSIONS
 
@@ -109,6 +109,9 @@ class CameraInput(FrigateBaseModel):
 class CameraFfmpegConfig(FfmpegConfig):
     inputs: list[CameraInput] = Field(title="Camera inputs.")
 
+    # hwaccel args were auto detected, the decode preset is verified at startup
+    _auto_hwaccel: bool = PrivateAttr(default=False)
+
     @field_validator("inputs")
     @classmethod
     def validate_roles(cls, v):
@@ -83,3 +83,12 @@ class GenAIConfig(FrigateBaseModel):
     provider: GenAIProviderEnum = Field(
         default=GenAIProviderEnum.openai, title="GenAI provider."
     )
+    max_concurrent_requests: int = Field(
+        default=2, ge=1, title="Number of requests sent to the provider at once."
+    )
+    requests_per_minute: Optional[int] = Field(
+        default=None, ge=1, title="Maximum requests per minute sent to the provider."
+    )
+    max_retries: int = Field(
+        default=2, ge=0, title="Number of times a failed request is retried."
+    )
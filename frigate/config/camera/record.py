@@ -66,6 +66,12 @@ class RecordExportConfig(FrigateBaseModel):
     timelapse_args: str = Field(
         default=DEFAULT_TIME_LAPSE_FFMPEG_ARGS, title="Timelapse Args"
     )
+    max_concurrent: int = Field(
+        default=1, ge=1, title="Number of exports that run at the same time."
+    )
+    io_priority: int = Field(
+        default=7, ge=0, le=7, title="Best effort I/O priority of exports."
+    )
 
 
 class RecordConfig(FrigateBaseModel):
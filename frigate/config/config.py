@@ -333,6 +333,19 @@ def verify_lpr_and_face(
         )
 
 
+def verify_export_concurrency(
+    frigate_config: FrigateConfig, camera_config: CameraConfig
+) -> ValueError | None:
+    """Verify that the export concurrency is not set at the camera level, exports of all cameras share one queue."""
+    if (
+        camera_config.record.export.max_concurrent
+        != frigate_config.record.export.max_concurrent
+    ):
+        raise ValueError(
+            f"Camera {camera_config.name} sets record -> export -> max_concurrent, which can only be set at the global level of the config."
+        )
+
+
 class FrigateConfig(FrigateBaseModel):
     version: Optional[str] = Field(default=None, title="Current config version.")
 
@@ -467,7 +480,9 @@ class FrigateConfig(FrigateBaseModel):
                 self.objects.filters[attribute].min_score = 0.7
 
         # auto detect hwaccel args
-        if self.ffmpeg.hwaccel_args == "auto":
+        auto_hwaccel = self.ffmpeg.hwaccel_args == "auto"
+
+        if auto_hwaccel:
             self.ffmpeg.hwaccel_args = auto_detect_hwaccel()
 
         # Global config to propagate down to camera level
@@ -550,6 +565,10 @@ class FrigateConfig(FrigateBaseModel):
             if camera_config.ffmpeg.hwaccel_args == "auto":
                 camera_config.ffmpeg.hwaccel_args = self.ffmpeg.hwaccel_args
 
+            camera_config.ffmpeg._auto_hwaccel = (
+                auto_hwaccel and camera.ffmpeg.hwaccel_args == "auto"
+            )
+
             for input in camera_config.ffmpeg.inputs:
                 need_detect_dimensions = "detect" in input.roles and (
                     camera_config.detect.height is None
@@ -698,6 +717,7 @@ class FrigateConfig(FrigateBaseModel):
             verify_motion_and_detect(camera_config)
             verify_objects_track(camera_config, labelmap_objects)
             verify_lpr_and_face(self, camera_config)
+            verify_export_concurrency(self, camera_config)
 
         self.objects.parse_all_objects(self.cameras)
         self.model.create_colormap(sorted(self.objects.all_objects))
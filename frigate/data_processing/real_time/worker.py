@@ -0,0 +1,149 @@
+"""Run real time processors on their own threads."""
+
+import datetime
+import logging
+import threading
+from collections import OrderedDict
+from multiprocessing.synchronize import Event as MpEvent
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+from frigate.config import FrigateConfig
+from frigate.util.builtin import InferenceSpeed
+
+from ..types import RealTimeProcessorMetrics
+from .api import RealTimeProcessorApi
+
+logger = logging.getLogger(__name__)
+
+# max number of objects with a pending update for a single processor
+MAX_PENDING_UPDATES = 20
+
+
+class PendingUpdate(NamedTuple):
+    camera: str
+    # copied when submitted, the shared memory slot is reused for newer frames
+    frame: np.ndarray | None
+    data: Any
+    dedicated_lpr: bool
+    expire: bool
+    received: float
+
+
+class RealTimeProcessorWorker(threading.Thread):
+    """Process updates for a single real time processor.
+
+    Only the newest update for each object is kept, so a slow processor
+    skips stale frames instead of falling further behind.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: FrigateConfig,
+        processor: RealTimeProcessorApi,
+        metrics: RealTimeProcessorMetrics | None,
+        stop_event: MpEvent,
+        processor_lock: Optional[threading.Lock] = None,
+    ) -> None:
+        super().__init__(name=f"realtime_processor:{name}", daemon=True)
+        self.config = config
+        self.processor = processor
+        self.metrics = metrics or RealTimeProcessorMetrics()
+        self.stop_event = stop_event
+        self.lag = InferenceSpeed(self.metrics.lag)
+        self.pending: OrderedDict[str, PendingUpdate] = OrderedDict()
+        self.pending_condition = threading.Condition()
+        # processors are not thread safe, requests must wait for the current frame,
+        # the lock is shared when the maintainer uses the processor's state too
+        self.processor_lock = processor_lock or threading.Lock()
+
+    def submit(
+        self,
+        key: str,
+        camera: str,
+        frame: np.ndarray,
+        data: Any,
+        dedicated_lpr: bool = False,
+    ) -> None:
+        """Queue a frame for the processor, replacing any older update for the same key.
+
+        The frame must not be changed after it is submitted."""
+        self._enqueue(
+            key,
+            PendingUpdate(
+                camera,
+                frame,
+                data,
+                dedicated_lpr,
+                False,
+                datetime.datetime.now().timestamp(),
+            ),
+        )
+
+    def expire(self, object_id: str, camera: str) -> None:
+        """Queue expiration of an object, pending updates for it are discarded."""
+        self._enqueue(
+            object_id,
+            PendingUpdate(
+                camera, None, None, False, True, datetime.datetime.now().timestamp()
+            ),
+        )
+
+    def handle_request(self, topic: str, request_data: dict[str, Any]) -> Any:
+        with self.processor_lock:
+            return self.processor.handle_request(topic, request_data)
+
+    def _enqueue(self, key: str, update: PendingUpdate) -> None:
+        with self.pending_condition:
+            existing = self.pending.pop(key, None)
+
+            if existing is not None and not existing.expire:
+                self.metrics.dropped.value += 1
+            elif not update.expire and len(self.pending) >= MAX_PENDING_UPDATES:
+                # drop the oldest frame update, expirations are always kept
+                for pending_key, pending in self.pending.items():
+                    if not pending.expire:
+                        del self.pending[pending_key]
+                        self.metrics.dropped.value += 1
+                        break
+
+            self.pending[key] = update
+            self.metrics.queued.value = len(self.pending)
+            self.pending_condition.notify()
+
+    def run(self) -> None:
+        while not self.stop_event.is_set():
+            with self.pending_condition:
+                if not self.pending:
+                    self.pending_condition.wait(timeout=1)
+                    continue
+
+                key, update = self.pending.popitem(last=False)
+                self.metrics.queued.value = len(self.pending)
+
+            try:
+                self._process(key, update)
+            except Exception as e:
+                logger.error(
+                    f"{self.name} failed to process update for {key}: {e}",
+                    exc_info=True,
+                )
+
+        logger.debug(f"Exiting {self.name}...")
+
+    def _process(self, key: str, update: PendingUpdate) -> None:
+        if update.expire:
+            with self.processor_lock:
+                self.processor.expire_object(key, update.camera)
+
+            return
+
+        self.lag.update(datetime.datetime.now().timestamp() - update.received)
+
+        with self.processor_lock:
+            if update.dedicated_lpr:
+                self.processor.process_frame(update.camera, update.frame, True)
+            else:
+                self.processor.process_frame(update.data, update.frame)
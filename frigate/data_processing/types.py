@@ -5,6 +5,30 @@ from enum import Enum
 from multiprocessing.sharedctypes import Synchronized
 
 
+class RealTimeProcessorMetrics:
+    lag: Synchronized
+    dropped: Synchronized
+    queued: Synchronized
+
+    def __init__(self):
+        self.lag = mp.Value("d", 0.0)
+        self.dropped = mp.Value("i", 0)
+        self.queued = mp.Value("i", 0)
+
+
+class GenAIMetrics:
+    latency: Synchronized
+    queued: Synchronized
+    dropped: Synchronized
+    failed: Synchronized
+
+    def __init__(self):
+        self.latency = mp.Value("d", 0.0)
+        self.queued = mp.Value("i", 0)
+        self.dropped = mp.Value("i", 0)
+        self.failed = mp.Value("i", 0)
+
+
 class DataProcessorMetrics:
     image_embeddings_speed: Synchronized
     image_embeddings_eps: Synchronized
@@ -16,6 +40,8 @@ class DataProcessorMetrics:
     alpr_pps: Synchronized
     yolov9_lpr_speed: Synchronized
     yolov9_lpr_pps: Synchronized
+    realtime_processors: dict[str, RealTimeProcessorMetrics]
+    genai: GenAIMetrics
 
     def __init__(self):
         self.image_embeddings_speed = mp.Value("d", 0.0)
@@ -28,6 +54,12 @@ class DataProcessorMetrics:
         self.alpr_pps = mp.Value("d", 0.0)
         self.yolov9_lpr_speed = mp.Value("d", 0.0)
         self.yolov9_lpr_pps = mp.Value("d", 0.0)
+        self.realtime_processors = {
+            "face_recognition": RealTimeProcessorMetrics(),
+            "lpr": RealTimeProcessorMetrics(),
+            "bird_classification": RealTimeProcessorMetrics(),
+        }
+        self.genai = GenAIMetrics()
 
 
 class DataProcessorModelRunner:
@@ -0,0 +1,76 @@
+"""Keep the label and zone lookup tables in sync with the rows they index."""
+
+from typing import Any, Iterable
+
+from peewee import Field, Model, ModelSelect
+
+from frigate.models import EventZone, ReviewSegmentLabel, ReviewSegmentZone
+
+
+def _replace_values(
+    model: type[Model], key_field: Field, value_field: Field, key: str, values: set
+) -> None:
+    """Replace the values stored for a key, leaving unchanged rows in place."""
+    model.delete().where(
+        (key_field == key) & (value_field.not_in(list(values)))
+    ).execute()
+
+    if values:
+        model.insert_many(
+            [{key_field.name: key, value_field.name: value} for value in values]
+        ).on_conflict_ignore().execute()
+
+
+def update_review_segment_lookups(segment_id: str, data: dict[str, Any]) -> None:
+    """Update the labels and zones of a review segment from its data."""
+    _replace_values(
+        ReviewSegmentLabel,
+        ReviewSegmentLabel.review_segment,
+        ReviewSegmentLabel.label,
+        segment_id,
+        set(data.get("objects", [])) | set(data.get("audio", [])),
+    )
+    _replace_values(
+        ReviewSegmentZone,
+        ReviewSegmentZone.review_segment,
+        ReviewSegmentZone.zone,
+        segment_id,
+        set(data.get("zones", [])),
+    )
+
+
+def update_event_zones(event_id: str, zones: Iterable[str]) -> None:
+    """Update the zones of an event."""
+    _replace_values(EventZone, EventZone.event, EventZone.zone, event_id, set(zones))
+
+
+def delete_review_segment_lookups(segment_ids: list[str]) -> None:
+    ReviewSegmentLabel.delete().where(
+        ReviewSegmentLabel.review_segment << segment_ids
+    ).execute()
+    ReviewSegmentZone.delete().where(
+        ReviewSegmentZone.review_segment << segment_ids
+    ).execute()
+
+
+def delete_event_zones(event_ids: list[str]) -> None:
+    EventZone.delete().where(EventZone.event << event_ids).execute()
+
+
+def review_segments_with_labels(labels: list[str]) -> ModelSelect:
+    """Ids of review segments with any of the labels."""
+    return ReviewSegmentLabel.select(ReviewSegmentLabel.review_segment).where(
+        ReviewSegmentLabel.label << labels
+    )
+
+
+def review_segments_with_zones(zones: list[str]) -> ModelSelect:
+    """Ids of review segments in any of the zones."""
+    return ReviewSegmentZone.select(ReviewSegmentZone.review_segment).where(
+        ReviewSegmentZone.zone << zones
+    )
+
+
+def events_with_zones(zones: list[str]) -> ModelSelect:
+    """Ids of events in any of the zones."""
+    return EventZone.select(EventZone.event).where(EventZone.zone << zones)
@@ -0,0 +1,165 @@
+"""Run database maintenance in the background."""
+
+import datetime
+import logging
+import os
+import threading
+from multiprocessing.synchronize import Event as MpEvent
+from typing import Any
+
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.config import FrigateConfig
+from frigate.const import CONFIG_DIR
+
+logger = logging.getLogger(__name__)
+
+
+# seconds between maintenance ticks
+MAINTENANCE_INTERVAL = 60
+# max number of free pages returned to the filesystem per tick
+INCREMENTAL_VACUUM_PAGES = 2000
+# rowid window that is checked for orphaned timeline entries per statement
+TIMELINE_CHUNK_SIZE = 10000
+# number of timeline chunks that are processed per tick
+TIMELINE_CHUNKS_PER_TICK = 10
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+class DatabaseMaintainer(threading.Thread):
+    """Reclaim free pages and remove orphaned rows without blocking startup."""
+
+    def __init__(self, config: FrigateConfig, stop_event: MpEvent) -> None:
+        super().__init__(name="database_maintainer")
+        self.config = config
+        self.stop_event = stop_event
+        self.db: SqliteExtDatabase | None = None
+        self.timeline_cleanup_needed = not os.path.exists(f"{CONFIG_DIR}/.timeline")
+        self.timeline_position: int | None = None
+        self.timeline_max_rowid = 0
+        self.timeline_min_rowid = 0
+        self.stats: dict[str, Any] = {
+            "auto_vacuum": None,
+            "free_pages": 0,
+            "reclaimed_pages": 0,
+            "last_vacuum": None,
+            "timeline_cleanup": {
+                "status": "pending" if self.timeline_cleanup_needed else "complete",
+                "progress": 0.0 if self.timeline_cleanup_needed else 100.0,
+                "deleted": 0,
+            },
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get a copy of the current maintenance progress."""
+        stats = self.stats.copy()
+        stats["timeline_cleanup"] = self.stats["timeline_cleanup"].copy()
+        return stats
+
+    def connect(self) -> SqliteExtDatabase:
+        """Open a dedicated connection so maintenance never waits on the write queue."""
+        db = SqliteExtDatabase(
+            self.config.database.path,
+            pragmas={
+                "auto_vacuum": "INCREMENTAL",
+                "journal_mode": "wal",
+                "synchronous": "NORMAL",
+            },
+            timeout=max(
+                60, 10 * len([c for c in self.config.cameras.values() if c.enabled])
+            ),
+        )
+        db.connect()
+        return db
+
+    def cleanup_timeline(self, db: SqliteExtDatabase) -> None:
+        """Delete timeline entries without an event in bounded rowid windows."""
+        progress = self.stats["timeline_cleanup"]
+
+        if self.timeline_position is None:
+            min_rowid, max_rowid = db.execute_sql(
+                "SELECT COALESCE(MIN(rowid), 0), COALESCE(MAX(rowid), 0) FROM timeline;"
+            ).fetchone()
+            self.timeline_min_rowid = min_rowid
+            self.timeline_max_rowid = max_rowid
+            self.timeline_position = min_rowid - 1
+            progress["status"] = "running"
+            logger.info("Removing timeline entries for deleted events")
+
+        for _ in range(TIMELINE_CHUNKS_PER_TICK):
+            if self.stop_event.is_set():
+                return
+
+            if self.timeline_position >= self.timeline_max_rowid:
+                break
+
+            chunk_end = self.timeline_position + TIMELINE_CHUNK_SIZE
+            cursor = db.execute_sql(
+                "DELETE FROM timeline WHERE rowid > ? AND rowid <= ? "
+                "AND NOT EXISTS (SELECT 1 FROM event WHERE event.id = timeline.source_id);",
+                (self.timeline_position, chunk_end),
+            )
+            progress["deleted"] += max(cursor.rowcount, 0)
+            self.timeline_position = chunk_end
+
+        total = self.timeline_max_rowid - self.timeline_min_rowid + 1
+
+        if self.timeline_position >= self.timeline_max_rowid:
+            progress["status"] = "complete"
+            progress["progress"] = 100.0
+            self.timeline_cleanup_needed = False
+            logger.info(
+                f"Timeline cleanup complete, removed {progress['deleted']} entries"
+            )
+
+            try:
+                with open(f"{CONFIG_DIR}/.timeline", "w") as f:
+                    f.write(str(datetime.datetime.now().timestamp()))
+            except PermissionError:
+                logger.error("Unable to write to /config to save DB state")
+        else:
+            progress["progress"] = round(
+                (self.timeline_position - self.timeline_min_rowid + 1) / total * 100,
+                1,
+            )
+
+    def incremental_vacuum(self, db: SqliteExtDatabase) -> None:
+        """Return a bounded number of free pages to the filesystem."""
+        auto_vacuum = db.execute_sql("PRAGMA auto_vacuum;").fetchone()[0]
+        self.stats["auto_vacuum"] = auto_vacuum
+
+        if auto_vacuum != AUTO_VACUUM_INCREMENTAL:
+            # databases created without auto vacuum can only be converted by a
+            # full VACUUM which would block all writers, so it is not run here
+            return
+
+        free_pages = db.execute_sql("PRAGMA freelist_count;").fetchone()[0]
+
+        if free_pages > 0:
+            # the pragma frees one page per step, executescript steps it to completion
+            db.connection().executescript(
+                f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES});"
+            )
+            remaining = db.execute_sql("PRAGMA freelist_count;").fetchone()[0]
+            self.stats["reclaimed_pages"] += free_pages - remaining
+            self.stats["last_vacuum"] = datetime.datetime.now().timestamp()
+            logger.debug(f"Reclaimed {free_pages - remaining} free database pages")
+            free_pages = remaining
+
+        self.stats["free_pages"] = free_pages
+
+    def run(self) -> None:
+        self.db = self.connect()
+
+        while not self.stop_event.wait(MAINTENANCE_INTERVAL):
+            try:
+                if self.timeline_cleanup_needed:
+                    self.cleanup_timeline(self.db)
+
+                self.incremental_vacuum(self.db)
+            except Exception as e:
+                logger.error(f"Error running database maintenance: {e}")
+
+        self.db.close()
+        logger.info("Exiting database maintainer...")
@@ -0,0 +1,46 @@
+"""Shared query predicates."""
+
+import json
+from typing import Any
+
+from peewee import SQL, Expression, Field, Model
+
+from frigate.const import MAX_PLAYLIST_SECONDS
+from frigate.models import Previews, Recordings
+
+# longest row of the tables with segments of a bounded duration, recorded
+# segments are at most minutes long, backfilled ones are capped at this
+# length by the backfill and previews cover at most an hour
+MAX_ROW_DURATION: dict[type[Model], float] = {
+    Previews: MAX_PLAYLIST_SECONDS,
+    Recordings: MAX_PLAYLIST_SECONDS,
+}
+
+
+def overlaps_time_range(
+    model: type[Model], start_time: Any, end_time: Any
+) -> Expression:
+    """Rows of model that overlap start_time to end_time.
+
+    Matches the same rows as checking if either end is between start_time and
+    end_time or the row covers the whole range. Two plain range comparisons can
+    use the (camera, start_time) and (camera, end_time) indexes, the or'ed
+    between checks can not. For tables with a bounded row duration start_time
+    is bounded on both sides so the index search stays near the range instead
+    of reaching back to the oldest row."""
+    overlaps = (model.start_time <= end_time) & (model.end_time >= start_time)
+    max_duration = MAX_ROW_DURATION.get(model)
+
+    if max_duration is not None:
+        overlaps &= model.start_time >= start_time - max_duration
+
+    return overlaps
+
+
+def in_values(field: Field, values: list[Any]) -> Expression:
+    """Rows where field is one of values.
+
+    The values are bound as one json array instead of a parameter each, peewee
+    builds the sql for a long list of parameters one value at a time which
+    takes seconds for the hundred thousands of ids deleted by the cleanup."""
+    return field.in_(SQL("(SELECT value FROM json_each(?))", [json.dumps(values)]))
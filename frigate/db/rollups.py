@@ -0,0 +1,120 @@
+"""Keep the hourly recordings rollup in sync with the recordings and events."""
+
+from typing import Any, Iterable
+
+from peewee import ModelSelect, fn
+
+from frigate.db.queries import in_values
+from frigate.models import Event, Recordings, RecordingsRollup
+
+SECONDS_PER_HOUR = 3600
+
+
+def _utc_hour(field) -> Any:
+    return field.cast("int") / SECONDS_PER_HOUR
+
+
+def add_recordings_to_rollup(recordings: Iterable[dict[str, Any]]) -> None:
+    """Add newly inserted recordings, keyed by field name, to the rollup."""
+    hours: dict[tuple[str, int], dict[str, Any]] = {}
+
+    for recording in recordings:
+        key = (
+            recording[Recordings.camera.name],
+            int(recording[Recordings.start_time.name]) // SECONDS_PER_HOUR,
+        )
+        hour = hours.setdefault(
+            key, {"segments": 0, "duration": 0, "motion": 0, "objects": 0}
+        )
+        hour["segments"] += 1
+        hour["duration"] += recording[Recordings.duration.name]
+        hour["motion"] += recording.get(Recordings.motion.name) or 0
+        hour["objects"] += recording.get(Recordings.objects.name) or 0
+
+    for (camera, utc_hour), hour in hours.items():
+        RecordingsRollup.insert(camera=camera, utc_hour=utc_hour, **hour).on_conflict(
+            conflict_target=[RecordingsRollup.camera, RecordingsRollup.utc_hour],
+            update={
+                RecordingsRollup.segments: RecordingsRollup.segments + hour["segments"],
+                RecordingsRollup.duration: RecordingsRollup.duration + hour["duration"],
+                RecordingsRollup.motion: RecordingsRollup.motion + hour["motion"],
+                RecordingsRollup.objects: RecordingsRollup.objects + hour["objects"],
+            },
+        ).execute()
+
+
+def remove_recordings_from_rollup(recording_ids: list[str] | ModelSelect) -> None:
+    """Remove recordings from the rollup, must be called before they are deleted."""
+    hours = (
+        Recordings.select(
+            Recordings.camera,
+            _utc_hour(Recordings.start_time).alias("utc_hour"),
+            fn.COUNT(Recordings.id).alias("segments"),
+            fn.SUM(Recordings.duration).alias("duration"),
+            fn.COALESCE(fn.SUM(Recordings.motion), 0).alias("motion"),
+            fn.COALESCE(fn.SUM(Recordings.objects), 0).alias("objects"),
+        )
+        .where(
+            Recordings.id << recording_ids
+            if isinstance(recording_ids, ModelSelect)
+            else in_values(Recordings.id, recording_ids)
+        )
+        .group_by(Recordings.camera, _utc_hour(Recordings.start_time))
+        .namedtuples()
+    )
+
+    for hour in list(hours):
+        RecordingsRollup.update(
+            segments=RecordingsRollup.segments - hour.segments,
+            duration=RecordingsRollup.duration - hour.duration,
+            motion=RecordingsRollup.motion - hour.motion,
+            objects=RecordingsRollup.objects - hour.objects,
+        ).where(
+            RecordingsRollup.camera == hour.camera,
+            RecordingsRollup.utc_hour == hour.utc_hour,
+        ).execute()
+
+    RecordingsRollup.delete().where(
+        RecordingsRollup.segments <= 0, RecordingsRollup.event_count <= 0
+    ).execute()
+
+
+def refresh_rollup_event_counts(events: Iterable[tuple[str, float]]) -> None:
+    """Recount the events with clips in the hours of the (camera, start_time) pairs."""
+    for camera, utc_hour in {
+        (camera, int(start_time) // SECONDS_PER_HOUR) for camera, start_time in events
+    }:
+        count = (
+            Event.select()
+            .where(
+                Event.camera == camera,
+                Event.start_time >= utc_hour * SECONDS_PER_HOUR,
+                Event.start_time < (utc_hour + 1) * SECONDS_PER_HOUR,
+                Event.has_clip,
+            )
+            .count()
+        )
+
+        if count == 0:
+            RecordingsRollup.update(event_count=0).where(
+                RecordingsRollup.camera == camera,
+                RecordingsRollup.utc_hour == utc_hour,
+            ).execute()
+            continue
+
+        RecordingsRollup.insert(
+            camera=camera, utc_hour=utc_hour, event_count=count
+        ).on_conflict(
+            conflict_target=[RecordingsRollup.camera, RecordingsRollup.utc_hour],
+            update={RecordingsRollup.event_count: count},
+        ).execute()
+
+
+def recordings_rollup(cameras: list[str] | None = None) -> ModelSelect:
+    """Hours with recordings, newest first, for all cameras when cameras is None."""
+    query = RecordingsRollup.select().where(RecordingsRollup.segments > 0)
+
+    if cameras is not None:
+        query = query.where(RecordingsRollup.camera << cameras)
+
+    return query.order_by(RecordingsRollup.utc_hour.desc())
@@ -36,6 +36,9 @@ class SqliteVecQueueDatabase(SqliteQueueDatabase):
         self.execute_sql("""
             DROP TABLE vec_thumbnails;
         """)
+        self.execute_sql("""
+            DROP TABLE IF EXISTS reindex_checkpoint;
+        """)
 
     def create_embeddings_tables(self) -> None:
         """Create vec0 virtual table for embeddings"""
@@ -51,3 +54,11 @@ class SqliteVecQueueDatabase(SqliteQueueDatabase):
                 description_embedding FLOAT[768] distance_metric=cosine
             );
         """)
+        # position of an interrupted reindex, written with the embeddings it covers
+        # selects don't go through the write queue, wait until the tables exist
+        self.execute_sql("""
+            CREATE TABLE IF NOT EXISTS reindex_checkpoint (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                data TEXT NOT NULL
+            );
+        """).fetchall()
@@ -25,10 +25,31 @@ from frigate.util.builtin import serialize
 from frigate.util.services import listen
 
 from .maintainer import EmbeddingMaintainer
-from .util import ZScoreNormalization
+from .util import TextEmbeddingCache, ZScoreNormalization
 
 logger = logging.getLogger(__name__)
 
+# max number of search text embeddings kept in memory and on disk
+SEARCH_EMBEDDING_CACHE_SIZE = 256
+
+# filters and ordering are appended by EmbeddingsContext._search
+THUMBNAIL_SEARCH_QUERY = """
+    SELECT
+        id,
+        distance
+    FROM vec_thumbnails
+    WHERE thumbnail_embedding MATCH ?
+        AND k = 100
+"""
+DESCRIPTION_SEARCH_QUERY = """
+    SELECT
+        id,
+        distance
+    FROM vec_descriptions
+    WHERE description_embedding MATCH ?
+        AND k = 100
+"""
+
 
 def manage_embeddings(config: FrigateConfig, metrics: DataProcessorMetrics) -> None:
     stop_event = mp.Event()
@@ -47,7 +68,7 @@ def manage_embeddings(config: FrigateConfig, metrics: DataProcessorMetrics) -> N
     db = SqliteVecQueueDatabase(
         config.database.path,
         pragmas={
-            "auto_vacuum": "FULL",  # Does not defragment database
+            "auto_vacuum": "INCREMENTAL",  # Free pages are reclaimed by the database maintainer
             "cache_size": -512 * 1000,  # 512MB of cache
             "synchronous": "NORMAL",  # Safe when using WAL https://www.sqlite.org/pragma.html#pragma_synchronous
         },
@@ -67,10 +88,14 @@ def manage_embeddings(config: FrigateConfig, metrics: DataProcessorMetrics) -> N
 
 
 class EmbeddingsContext:
-    def __init__(self, db: SqliteVecQueueDatabase):
+    def __init__(self, db: SqliteVecQueueDatabase, config: FrigateConfig):
         self.db = db
         self.thumb_stats = ZScoreNormalization()
         self.desc_stats = ZScoreNormalization()
+        self.search_embeddings = TextEmbeddingCache(SEARCH_EMBEDDING_CACHE_SIZE)
+        self.search_model = (
+            f"{config.semantic_search.model.value}-{config.semantic_search.model_size}"
+        )
         self.requestor = EmbeddingsRequestor()
 
         # load stats from disk
@@ -90,16 +115,62 @@ class EmbeddingsContext:
             except OSError as e:
                 logger.error(f"Failed to clear corrupted stats file: {e}")
 
+        # load cached search embeddings from disk
+        try:
+            with open(os.path.join(CONFIG_DIR, ".search_embeddings.json"), "r") as f:
+                self.search_embeddings.from_dict(json.loads(f.read()))
+        except FileNotFoundError:
+            pass
+        except (JSONDecodeError, ValueError):
+            logger.warning("Failed to decode cached search embeddings, ignoring")
+
     def stop(self):
-        """Write the stats to disk as JSON on exit."""
+        """Write the stats and cached search embeddings to disk as JSON on exit."""
         contents = {
             "thumb_stats": self.thumb_stats.to_dict(),
             "desc_stats": self.desc_stats.to_dict(),
         }
         with open(os.path.join(CONFIG_DIR, ".search_stats.json"), "w") as f:
             json.dump(contents, f)
+        with open(os.path.join(CONFIG_DIR, ".search_embeddings.json"), "w") as f:
+            json.dump(self.search_embeddings.to_dict(), f)
         self.requestor.stop()
 
+    def _get_search_embedding(self, query_text: str) -> bytes | None:
+        """Get the embedding for search text, only running the model for new text."""
+        query_embedding = self.search_embeddings.get(self.search_model, query_text)
+
+        if query_embedding is not None:
+            return query_embedding
+
+        data = self.requestor.send_data(
+            EmbeddingsRequestEnum.generate_search.value, query_text
+        )
+
+        if not data:
+            return None
+
+        query_embedding = serialize(data)
+        self.search_embeddings.put(self.search_model, query_text, query_embedding)
+        return query_embedding
+
+    def _search(
+        self, sql_query: str, query_embedding: bytes, event_ids: list[str] | None
+    ) -> list[tuple[str, float]]:
+        # Add the IN clause if event_ids is provided and not empty
+        # this is the only filter supported by sqlite-vec as of 0.1.3
+        # but it seems to be broken in this version
+        if event_ids:
+            sql_query += " AND id IN ({})".format(",".join("?" * len(event_ids)))
+
+        # order by distance DESC is not implemented in this version of sqlite-vec
+        # when it's implemented, we can use cosine similarity
+        sql_query += " ORDER BY distance"
+
+        parameters = [query_embedding] + event_ids if event_ids else [query_embedding]
+
+        return self.db.execute_sql(sql_query, parameters).fetchall()
+
     def search_thumbnail(
         self, query: Union[Event, str], event_ids: list[str] = None
     ) -> list[tuple[str, float]]:
@@ -127,77 +198,22 @@ class EmbeddingsContext:
 
                 query_embedding = serialize(data)
         else:
-            data = self.requestor.send_data(
-                EmbeddingsRequestEnum.generate_search.value, query
-            )
+            query_embedding = self._get_search_embedding(query)
 
-            if not data:
+            if query_embedding is None:
                 return []
 
-            query_embedding = serialize(data)
-
-        sql_query = """
-            SELECT
-                id,
-                distance
-            FROM vec_thumbnails
-            WHERE thumbnail_embedding MATCH ?
-                AND k = 100
-        """
-
-        # Add the IN clause if event_ids is provided and not empty
-        # this is the only filter supported by sqlite-vec as of 0.1.3
-        # but it seems to be broken in this version
-        if event_ids:
-            sql_query += " AND id IN ({})".format(",".join("?" * len(event_ids)))
-
-        # order by distance DESC is not implemented in this version of sqlite-vec
-        # when it's implemented, we can use cosine similarity
-        sql_query += " ORDER BY distance"
-
-        parameters = [query_embedding] + event_ids if event_ids else [query_embedding]
-
-        results = self.db.execute_sql(sql_query, parameters).fetchall()
-
-        return results
+        return self._search(THUMBNAIL_SEARCH_QUERY, query_embedding, event_ids)
 
     def search_description(
         self, query_text: str, event_ids: list[str] = None
     ) -> list[tuple[str, float]]:
-        data = self.requestor.send_data(
-            EmbeddingsRequestEnum.generate_search.value, query_text
-        )
+        query_embedding = self._get_search_embedding(query_text)
 
-        if not data:
+        if query_embedding is None:
             return []
 
-        query_embedding = serialize(data)
-
-        # Prepare the base SQL query
-        sql_query = """
-            SELECT
-                id,
-                distance
-            FROM vec_descriptions
-            WHERE description_embedding MATCH ?
-                AND k = 100
-        """
-
-        # Add the IN clause if event_ids is provided and not empty
-        # this is the only filter supported by sqlite-vec as of 0.1.3
-        # but it seems to be broken in this version
-        if event_ids:
-            sql_query += " AND id IN ({})".format(",".join("?" * len(event_ids)))
-
-        # order by distance DESC is not implemented in this version of sqlite-vec
-        # when it's implemented, we can use cosine similarity
-        sql_query += " ORDER BY distance"
-
-        parameters = [query_embedding] + event_ids if event_ids else [query_embedding]
-
-        results = self.db.execute_sql(sql_query, parameters).fetchall()
-
-        return results
+        return self._search(DESCRIPTION_SEARCH_QUERY, query_embedding, event_ids)
 
     def register_face(self, face_name: str, image_data: bytes) -> dict[str, Any]:
         return self.requestor.send_data(
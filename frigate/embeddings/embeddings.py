@@ -2,10 +2,13 @@
 
 import datetime
 import io
+import json
 import logging
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 from numpy import ndarray
 from PIL import Image
@@ -31,6 +34,9 @@ from .onnx.jina_v2_embedding import JinaV2Embedding
 
 logger = logging.getLogger(__name__)
 
+REINDEX_PAGE_SIZE = 256
+REINDEX_PREFETCH_WORKERS = 4
+
 
 def get_metadata(event: Event) -> dict:
     """Extract valid event metadata."""
@@ -63,6 +69,29 @@ def get_metadata(event: Event) -> dict:
     )
 
 
+class AdaptiveBatchSize:
+    """Grow the batch size while throughput improves and shrink it when it drops."""
+
+    def __init__(self, initial: int, maximum: int) -> None:
+        self.size = initial
+        self.maximum = maximum
+        self.best_throughput = 0.0
+
+    def update(self, count: int, duration: float) -> None:
+        # partial batches don't represent the throughput of the current size
+        if count < self.size or duration <= 0:
+            return
+
+        throughput = count / duration
+
+        if throughput > self.best_throughput * 1.05:
+            self.best_throughput = throughput
+            self.size = min(self.size * 2, self.maximum)
+        elif throughput < self.best_throughput * 0.8:
+            self.best_throughput = throughput
+            self.size = max(self.size // 2, 1)
+
+
 class Embeddings:
     """SQLite-vec embeddings database."""
 
@@ -293,96 +322,237 @@ class Embeddings:
 
         return embeddings
 
+    def _load_reindex_checkpoint(self) -> dict[str, Any] | None:
+        """Load the checkpoint of an interrupted reindex for the current model."""
+        row = self.db.execute_sql(
+            "SELECT data FROM reindex_checkpoint WHERE id = 0"
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            checkpoint = json.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Ignoring invalid reindex checkpoint: {e}")
+            return None
+
+        if checkpoint.get("model") != self.config.semantic_search.model.value or (
+            checkpoint.get("model_size") != self.config.semantic_search.model_size
+        ):
+            return None
+
+        return checkpoint
+
+    def _write_reindex_page(
+        self,
+        thumbnail_embeddings: list[tuple[str, ndarray]],
+        description_embeddings: list[tuple[str, ndarray]],
+        last_event: Event,
+        totals: dict[str, Any],
+    ) -> None:
+        """Write the embeddings of a page and the checkpoint after it in one
+        transaction, so a resumed reindex never skips embeddings that were lost."""
+        # the queue database runs all writes in order on its writer thread,
+        # waiting for each statement keeps the page in this transaction
+        self.db.execute_sql("BEGIN IMMEDIATE").fetchall()
+
+        try:
+            self._upsert_embeddings(
+                "vec_thumbnails", "thumbnail_embedding", thumbnail_embeddings
+            )
+            self._upsert_embeddings(
+                "vec_descriptions", "description_embedding", description_embeddings
+            )
+            self.db.execute_sql(
+                "INSERT OR REPLACE INTO reindex_checkpoint(id, data) VALUES(0, ?)",
+                (
+                    json.dumps(
+                        {
+                            "model": self.config.semantic_search.model.value,
+                            "model_size": self.config.semantic_search.model_size,
+                            "start_time": last_event.start_time,
+                            "id": last_event.id,
+                            "totals": totals,
+                        }
+                    ),
+                ),
+            ).fetchall()
+        finally:
+            # writes of other threads may be part of the transaction, so it is
+            # committed even when the page failed, without its checkpoint the
+            # page is embedded again on resume
+            self.db.execute_sql("COMMIT").fetchall()
+
+    def _get_reindex_page(
+        self, after_start_time: float | None, after_id: str | None
+    ) -> list[Event]:
+        """Get the next page of events, newest first, using keyset pagination."""
+        query = Event.select()
+
+        if after_start_time is not None:
+            query = query.where(
+                (Event.start_time < after_start_time)
+                | ((Event.start_time == after_start_time) & (Event.id < after_id))
+            )
+
+        return list(
+            query.order_by(Event.start_time.desc(), Event.id.desc()).limit(
+                REINDEX_PAGE_SIZE
+            )
+        )
+
+    @staticmethod
+    def _load_reindex_thumbnail(event: Event) -> Image.Image | None:
+        """Read and decode an event thumbnail, returns None if it is missing or corrupt."""
+        thumbnail = get_event_thumbnail_bytes(event)
+
+        if not thumbnail:
+            return None
+
+        try:
+            return Image.open(io.BytesIO(thumbnail)).convert("RGB")
+        except Exception as e:
+            logger.warning(
+                f"Embeddings reindexing: Skipping corrupt thumbnail for event {event.id}: {e}"
+            )
+            return None
+
+    def _upsert_embeddings(
+        self, table: str, column: str, embeddings: list[tuple[str, ndarray]]
+    ) -> None:
+        """Write a page of embeddings with a single statement."""
+        if not embeddings:
+            return
+
+        items = []
+
+        for event_id, embedding in embeddings:
+            items.append(event_id)
+            items.append(serialize(embedding))
+
+        self.db.execute_sql(
+            """
+            INSERT OR REPLACE INTO {}(id, {})
+            VALUES {}
+            """.format(table, column, ", ".join(["(?, ?)"] * len(embeddings))),
+            items,
+        ).fetchall()
+
     def reindex(self) -> None:
         logger.info("Indexing tracked object embeddings...")
 
-        self.db.drop_embeddings_tables()
-        logger.debug("Dropped embeddings tables.")
-        self.db.create_embeddings_tables()
-        logger.debug("Created embeddings tables.")
+        checkpoint = self._load_reindex_checkpoint()
 
-        # Delete the saved stats file
-        if os.path.exists(os.path.join(CONFIG_DIR, ".search_stats.json")):
-            os.remove(os.path.join(CONFIG_DIR, ".search_stats.json"))
+        if checkpoint:
+            logger.info(
+                f"Resuming embeddings reindex after {checkpoint['totals']['processed_objects']} tracked objects."
+            )
+            last_start_time = checkpoint["start_time"]
+            last_id = checkpoint["id"]
+            totals = checkpoint["totals"]
+        else:
+            self.db.drop_embeddings_tables()
+            logger.debug("Dropped embeddings tables.")
+            self.db.create_embeddings_tables()
+            logger.debug("Created embeddings tables.")
+
+            # Delete the saved stats file
+            if os.path.exists(os.path.join(CONFIG_DIR, ".search_stats.json")):
+                os.remove(os.path.join(CONFIG_DIR, ".search_stats.json"))
+
+            last_start_time = None
+            last_id = None
+            totals = {
+                "thumbnails": 0,
+                "descriptions": 0,
+                "processed_objects": 0,
+            }
 
         st = time.time()
+        resumed_objects = totals["processed_objects"]
 
         # Get total count of events to process
         total_events = Event.select().count()
-
-        batch_size = (
-            4
-            if self.config.semantic_search.model == SemanticSearchModelEnum.jinav2
-            else 32
-        )
-        current_page = 1
-
-        totals = {
-            "thumbnails": 0,
-            "descriptions": 0,
-            "processed_objects": total_events - 1 if total_events < batch_size else 0,
-            "total_objects": total_events,
-            "time_remaining": 0 if total_events < batch_size else -1,
-            "status": "indexing",
-        }
+        totals["total_objects"] = total_events
+        totals["time_remaining"] = -1
+        totals["status"] = "indexing"
 
         self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
 
-        events = (
-            Event.select()
-            .order_by(Event.start_time.desc())
-            .paginate(current_page, batch_size)
-        )
+        if self.config.semantic_search.model == SemanticSearchModelEnum.jinav2:
+            batch_size = AdaptiveBatchSize(4, 16)
+        else:
+            batch_size = AdaptiveBatchSize(32, 128)
+
+        with ThreadPoolExecutor(
+            max_workers=REINDEX_PREFETCH_WORKERS, thread_name_prefix="reindex"
+        ) as executor:
+            events = self._get_reindex_page(last_start_time, last_id)
+            thumbnails = [
+                executor.submit(self._load_reindex_thumbnail, e) for e in events
+            ]
 
-        while events:
-            event: Event
-            batch_thumbs = {}
-            batch_descs = {}
-            for event in events:
-                totals["processed_objects"] += 1
-
-                if description := event.data.get("description", "").strip():
-                    batch_descs[event.id] = description
-                    totals["descriptions"] += 1
-
-                if thumbnail := get_event_thumbnail_bytes(event):
-                    batch_thumbs[event.id] = thumbnail
-                    totals["thumbnails"] += 1
-
-            # run batch embedding
-            if batch_thumbs:
-                self.batch_embed_thumbnail(batch_thumbs)
-
-            if batch_descs:
-                self.batch_embed_description(batch_descs)
-
-            # report progress every batch so we don't spam the logs
-            progress = (totals["processed_objects"] / total_events) * 100
-            logger.debug(
-                "Processed %d/%d events (%.2f%% complete) | Thumbnails: %d, Descriptions: %d",
-                totals["processed_objects"],
-                total_events,
-                progress,
-                totals["thumbnails"],
-                totals["descriptions"],
-            )
+            while events:
+                # decode the next page while the model runs on this one
+                next_events = self._get_reindex_page(
+                    events[-1].start_time, events[-1].id
+                )
+                next_thumbnails = [
+                    executor.submit(self._load_reindex_thumbnail, e)
+                    for e in next_events
+                ]
+
+                thumbnail_embeddings = self._reindex_thumbnails(
+                    [(e.id, t.result()) for e, t in zip(events, thumbnails)],
+                    batch_size,
+                )
 
-            # Calculate time remaining
-            elapsed_time = time.time() - st
-            avg_time_per_event = elapsed_time / totals["processed_objects"]
-            remaining_events = total_events - totals["processed_objects"]
-            time_remaining = avg_time_per_event * remaining_events
-            totals["time_remaining"] = int(time_remaining)
-
-            self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
-
-            # Move to the next page
-            current_page += 1
-            events = (
-                Event.select()
-                .order_by(Event.start_time.desc())
-                .paginate(current_page, batch_size)
-            )
+                description_embeddings: list[tuple[str, ndarray]] = []
+
+                for event in events:
+                    if description := event.data.get("description", "").strip():
+                        # embed one by one to avoid token limit
+                        start = datetime.datetime.now().timestamp()
+                        description_embeddings.append(
+                            (event.id, self.text_embedding([description])[0])
+                        )
+                        self.text_inference_speed.update(
+                            datetime.datetime.now().timestamp() - start
+                        )
+                        self.text_eps.update()
+
+                totals["processed_objects"] += len(events)
+                totals["thumbnails"] += len(thumbnail_embeddings)
+                totals["descriptions"] += len(description_embeddings)
+                self._write_reindex_page(
+                    thumbnail_embeddings, description_embeddings, events[-1], totals
+                )
+
+                # report progress every page so we don't spam the logs
+                progress = (totals["processed_objects"] / total_events) * 100
+                logger.debug(
+                    "Processed %d/%d events (%.2f%% complete) | Thumbnails: %d, Descriptions: %d | Batch size: %d",
+                    totals["processed_objects"],
+                    total_events,
+                    progress,
+                    totals["thumbnails"],
+                    totals["descriptions"],
+                    batch_size.size,
+                )
+
+                # Calculate time remaining
+                elapsed_time = time.time() - st
+                avg_time_per_event = elapsed_time / (
+                    totals["processed_objects"] - resumed_objects
+                )
+                remaining_events = max(total_events - totals["processed_objects"], 0)
+                totals["time_remaining"] = int(avg_time_per_event * remaining_events)
+
+                self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
+
+                events = next_events
+                thumbnails = next_thumbnails
 
         logger.info(
             "Embedded %d thumbnails and %d descriptions in %s seconds",
@@ -390,10 +560,42 @@ class Embeddings:
             totals["descriptions"],
             round(time.time() - st, 1),
         )
+        totals["time_remaining"] = 0
         totals["status"] = "completed"
 
+        self.db.execute_sql("DELETE FROM reindex_checkpoint").fetchall()
+
         self.requestor.send_data(UPDATE_EMBEDDINGS_REINDEX_PROGRESS, totals)
 
+    def _reindex_thumbnails(
+        self,
+        thumbnails: list[tuple[str, Image.Image | None]],
+        batch_size: AdaptiveBatchSize,
+    ) -> list[tuple[str, ndarray]]:
+        """Embed decoded thumbnails using the adaptive batch size."""
+        valid = [
+            (event_id, image) for event_id, image in thumbnails if image is not None
+        ]
+        embeddings: list[tuple[str, ndarray]] = []
+        i = 0
+
+        while i < len(valid):
+            batch = valid[i : i + batch_size.size]
+            start = datetime.datetime.now().timestamp()
+            batch_embeddings = self.vision_embedding([image for _, image in batch])
+            duration = datetime.datetime.now().timestamp() - start
+
+            batch_size.update(len(batch), duration)
+            self.image_inference_speed.update(duration / len(batch))
+
+            for (event_id, _), embedding in zip(batch, batch_embeddings):
+                embeddings.append((event_id, embedding))
+                self.image_eps.update()
+
+            i += len(batch)
+
+        return embeddings
+
     def start_reindex(self) -> bool:
         """Start reindexing in a separate thread if not already running."""
         with self.reindex_lock:
@@ -46,9 +46,11 @@ from frigate.data_processing.real_time.face import FaceRealTimeProcessor
 from frigate.data_processing.real_time.license_plate import (
     LicensePlateRealTimeProcessor,
 )
+from frigate.data_processing.real_time.worker import RealTimeProcessorWorker
 from frigate.data_processing.types import DataProcessorMetrics, PostProcessDataEnum
 from frigate.events.types import EventTypeEnum, RegenerateDescriptionEnum
 from frigate.genai import get_genai_client
+from frigate.genai.scheduler import GenAIScheduler
 from frigate.models import Event
 from frigate.types import TrackedObjectUpdateTypesEnum
 from frigate.util.builtin import serialize
@@ -100,47 +102,67 @@ class EmbeddingMaintainer(threading.Thread):
         self.recordings_subscriber = RecordingsDataSubscriber(
             RecordingsDataTypeEnum.recordings_available_through
         )
-        self.detection_subscriber = DetectionSubscriber(DetectionTypeEnum.video)
+        # only the camera, frame and motion boxes are used for dedicated lpr
+        self.detection_subscriber = DetectionSubscriber(
+            DetectionTypeEnum.video, object_fields=()
+        )
         self.embeddings_responder = EmbeddingsResponder()
         self.frame_manager = SharedMemoryFrameManager()
 
         self.detected_license_plates: dict[str, dict[str, Any]] = {}
+        # held by the lpr worker while processing, guards the plates and model runner
+        # shared with the post processor
+        self.license_plates_lock = threading.Lock()
+        # zmq sockets are not thread safe, each worker gets its own
+        self.worker_comms: list[InterProcessRequestor | EventMetadataPublisher] = []
 
         # model runners to share between realtime and post processors
         if self.config.lpr.enabled:
             lpr_model_runner = LicensePlateModelRunner(
-                self.requestor,
+                self._create_worker_comms(InterProcessRequestor),
                 device=self.config.lpr.device,
                 model_size=self.config.lpr.model_size,
             )
 
-        # realtime processors
-        self.realtime_processors: list[RealTimeProcessorApi] = []
+        # realtime processors, each runs on its own worker
+        self.realtime_processors: list[RealTimeProcessorWorker] = []
 
         if self.config.face_recognition.enabled:
-            self.realtime_processors.append(
+            self._add_realtime_processor(
+                "face_recognition",
                 FaceRealTimeProcessor(
-                    self.config, self.requestor, self.event_metadata_publisher, metrics
-                )
+                    self.config,
+                    self._create_worker_comms(InterProcessRequestor),
+                    self._create_worker_comms(EventMetadataPublisher),
+                    metrics,
+                ),
+                stop_event,
             )
 
         if self.config.classification.bird.enabled:
-            self.realtime_processors.append(
+            self._add_realtime_processor(
+                "bird_classification",
                 BirdRealTimeProcessor(
-                    self.config, self.event_metadata_publisher, metrics
-                )
+                    self.config,
+                    self._create_worker_comms(EventMetadataPublisher),
+                    metrics,
+                ),
+                stop_event,
             )
 
         if self.config.lpr.enabled:
-            self.realtime_processors.append(
+            self._add_realtime_processor(
+                "lpr",
                 LicensePlateRealTimeProcessor(
                     self.config,
-                    self.requestor,
-                    self.event_metadata_publisher,
+                    self._create_worker_comms(InterProcessRequestor),
+                    self._create_worker_comms(EventMetadataPublisher),
                     metrics,
                     lpr_model_runner,
                     self.detected_license_plates,
-                )
+                ),
+                stop_event,
+                self.license_plates_lock,
             )
 
         # post processors
@@ -162,12 +184,52 @@ class EmbeddingMaintainer(threading.Thread):
         self.tracked_events: dict[str, list[Any]] = {}
         self.early_request_sent: dict[str, bool] = {}
         self.genai_client = get_genai_client(config)
+        self.genai_scheduler = (
+            GenAIScheduler(
+                config,
+                self.genai_client,
+                self._handle_genai_description,
+                metrics.genai if metrics else None,
+                stop_event,
+            )
+            if self.genai_client is not None
+            else None
+        )
 
         # recordings data
         self.recordings_available_through: dict[str, float] = {}
 
+    def _create_worker_comms(self, comms_type: type) -> Any:
+        comms = comms_type()
+        self.worker_comms.append(comms)
+        return comms
+
+    def _add_realtime_processor(
+        self,
+        name: str,
+        processor: RealTimeProcessorApi,
+        stop_event: MpEvent,
+        processor_lock: Optional[threading.Lock] = None,
+    ) -> None:
+        self.realtime_processors.append(
+            RealTimeProcessorWorker(
+                name,
+                self.config,
+                processor,
+                self.metrics.realtime_processors[name] if self.metrics else None,
+                stop_event,
+                processor_lock,
+            )
+        )
+
     def run(self) -> None:
         """Maintain a SQLite-vec database for semantic search."""
+        for worker in self.realtime_processors:
+            worker.start()
+
+        if self.genai_scheduler is not None:
+            self.genai_scheduler.start()
+
         while not self.stop_event.is_set():
             self._process_requests()
             self._process_updates()
@@ -184,6 +246,12 @@ class EmbeddingMaintainer(threading.Thread):
         self.event_metadata_publisher.stop()
         self.event_metadata_subscriber.stop()
         self.embeddings_responder.stop()
+        for worker in self.realtime_processors:
+            worker.join()
+
+        for comms in self.worker_comms:
+            comms.stop()
+
         self.requestor.stop()
         logger.info("Exiting embeddings maintenance...")
 
@@ -250,13 +318,7 @@ class EmbeddingMaintainer(threading.Thread):
         if not camera_config.genai.enabled and len(self.realtime_processors) == 0:
             return
 
-        # Create our own thumbnail based on the bounding box and the frame time
-        try:
-            yuv_frame = self.frame_manager.get(
-                frame_name, camera_config.frame_shape_yuv
-            )
-        except FileNotFoundError:
-            pass
+        yuv_frame = self.frame_manager.get(frame_name, camera_config.frame_shape_yuv)
 
         if yuv_frame is None:
             logger.debug(
@@ -264,12 +326,24 @@ class EmbeddingMaintainer(threading.Thread):
             )
             return
 
-        for processor in self.realtime_processors:
-            processor.process_frame(data, yuv_frame)
+        if self.realtime_processors:
+            # the shared memory slot is reused for newer frames before a lagging
+            # worker gets to it, the workers share one copy
+            frame = yuv_frame.copy()
+
+            # newer updates replace queued ones
+            for worker in self.realtime_processors:
+                worker.submit(data["id"], camera, frame, data)
 
-        # no need to save our own thumbnails if genai is not enabled
-        # or if the object has become stationary
-        if self.genai_client is not None and not data["stationary"]:
+        # no need to create thumbnails if genai is not enabled
+        if self.genai_client is None:
+            self.frame_manager.close(frame_name)
+            return
+
+        # Create our own thumbnail based on the bounding box and the frame time
+
+        # no need to save our own thumbnails if the object has become stationary
+        if not data["stationary"]:
             if data["id"] not in self.tracked_events:
                 self.tracked_events[data["id"]] = []
 
@@ -306,18 +380,14 @@ class EmbeddingMaintainer(threading.Thread):
                         logger.debug(f"{camera} sending early request to GenAI")
 
                         self.early_request_sent[data["id"]] = True
-                        threading.Thread(
-                            target=self._genai_embed_description,
-                            name=f"_genai_embed_description_{event.id}",
-                            daemon=True,
-                            args=(
-                                event,
-                                [
-                                    data["thumbnail"]
-                                    for data in self.tracked_events[data["id"]]
-                                ],
-                            ),
-                        ).start()
+                        self.genai_scheduler.submit(
+                            event,
+                            [
+                                data["thumbnail"]
+                                for data in self.tracked_events[data["id"]]
+                            ],
+                            final=False,
+                        )
 
         self.frame_manager.close(frame_name)
 
@@ -336,30 +406,33 @@ class EmbeddingMaintainer(threading.Thread):
             for processor in self.post_processors:
                 if isinstance(processor, LicensePlatePostProcessor):
                     recordings_available = self.recordings_available_through.get(camera)
-                    if (
-                        recordings_available is not None
-                        and event_id in self.detected_license_plates
-                        and self.config.cameras[camera].type != "lpr"
-                    ):
-                        processor.process_data(
-                            {
-                                "event_id": event_id,
-                                "camera": camera,
-                                "recordings_available": self.recordings_available_through[
-                                    camera
-                                ],
-                                "obj_data": self.detected_license_plates[event_id][
-                                    "obj_data"
-                                ],
-                            },
-                            PostProcessDataEnum.recording,
-                        )
+
+                    # the lpr worker updates the plates
+                    with self.license_plates_lock:
+                        if (
+                            recordings_available is not None
+                            and event_id in self.detected_license_plates
+                            and self.config.cameras[camera].type != "lpr"
+                        ):
+                            processor.process_data(
+                                {
+                                    "event_id": event_id,
+                                    "camera": camera,
+                                    "recordings_available": self.recordings_available_through[
+                                        camera
+                                    ],
+                                    "obj_data": self.detected_license_plates[event_id][
+                                        "obj_data"
+                                    ],
+                                },
+                                PostProcessDataEnum.recording,
+                            )
                 else:
                     processor.process_data(event_id, PostProcessDataEnum.event_id)
 
             # expire in realtime processors
-            for processor in self.realtime_processors:
-                processor.expire_object(event_id, camera)
+            for worker in self.realtime_processors:
+                worker.expire(event_id, camera)
 
             if updated_db:
                 try:
@@ -403,19 +476,27 @@ class EmbeddingMaintainer(threading.Thread):
 
         to_remove = []
 
-        for id, data in self.detected_license_plates.items():
-            last_seen = data.get("last_seen", 0)
-            if not last_seen:
-                continue
+        # the lpr worker updates the plates
+        with self.license_plates_lock:
+            for id, data in self.detected_license_plates.items():
+                last_seen = data.get("last_seen", 0)
+                if not last_seen:
+                    continue
+
+                if (
+                    now - last_seen
+                    > self.config.cameras[data["camera"]].lpr.expire_time
+                ):
+                    to_remove.append(id)
+
+            for id in to_remove:
+                self.detected_license_plates.pop(id)
 
-            if now - last_seen > self.config.cameras[data["camera"]].lpr.expire_time:
-                to_remove.append(id)
         for id in to_remove:
             self.event_metadata_publisher.publish(
                 EventMetadataTypeEnum.manual_event_end,
                 (id, now),
             )
-            self.detected_license_plates.pop(id)
 
     def _process_recordings_updates(self) -> None:
         """Process recordings updates."""
@@ -470,25 +551,20 @@ class EmbeddingMaintainer(threading.Thread):
             # we're not a dedicated lpr camera or we are one but we're using frigate+
             return
 
-        try:
-            yuv_frame = self.frame_manager.get(
-                frame_name, camera_config.frame_shape_yuv
-            )
-        except FileNotFoundError:
-            pass
+        yuv_frame = self.frame_manager.get(frame_name, camera_config.frame_shape_yuv)
 
         if yuv_frame is None:
-            logger.debug(
-                "Unable to process dedicated LPR update because frame is unavailable."
-            )
+            logger.debug("Unable to process dedicated LPR update due to no frame.")
             return
 
-        for processor in self.realtime_processors:
-            if isinstance(processor, LicensePlateRealTimeProcessor):
-                processor.process_frame(camera, yuv_frame, True)
-
+        # the shared memory slot is reused for newer frames
+        frame = yuv_frame.copy()
         self.frame_manager.close(frame_name)
 
+        for worker in self.realtime_processors:
+            if isinstance(worker.processor, LicensePlateRealTimeProcessor):
+                worker.submit(camera, camera, frame, None, dedicated_lpr=True)
+
     def _create_thumbnail(self, yuv_frame, box, height=500) -> Optional[bytes]:
         """Return jpg thumbnail of a region of the frame."""
         frame = cv2.cvtColor(yuv_frame, cv2.COLOR_YUV2BGR_I420)
@@ -555,31 +631,19 @@ class EmbeddingMaintainer(threading.Thread):
                     ) as j:
                         j.write(jpg_bytes)
 
-        # Generate the description. Call happens in a thread since it is network bound.
-        threading.Thread(
-            target=self._genai_embed_description,
-            name=f"_genai_embed_description_{event.id}",
-            daemon=True,
-            args=(
-                event,
-                embed_image,
-            ),
-        ).start()
-
-    def _genai_embed_description(self, event: Event, thumbnails: list[bytes]) -> None:
-        """Embed the description for an event."""
-        camera_config = self.config.cameras[event.camera]
-
-        description = self.genai_client.generate_description(
-            camera_config, thumbnails, event
-        )
-
-        if not description:
-            logger.debug("Failed to generate description for %s", event.id)
-            return
+        # Generate the description on the scheduler since it is network bound.
+        self.genai_scheduler.submit(event, embed_image, final=True)
 
+    def _handle_genai_description(
+        self,
+        requestor: InterProcessRequestor,
+        event: Event,
+        thumbnails: list[bytes],
+        description: str,
+    ) -> None:
+        """Embed the description for an event, runs on a scheduler worker."""
         # fire and forget description update
-        self.requestor.send_data(
+        requestor.send_data(
             UPDATE_EVENT_DESCRIPTION,
             {
                 "type": TrackedObjectUpdateTypesEnum.description,
@@ -675,4 +739,4 @@ class EmbeddingMaintainer(threading.Thread):
             )
         )
 
-        self._genai_embed_description(event, embed_image)
+        self.genai_scheduler.submit(event, embed_image, final=True)
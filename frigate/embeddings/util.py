@@ -1,6 +1,9 @@
-"""Z-score normalization for search distance."""
+"""Z-score normalization for search distance and text embedding cache."""
 
+import base64
 import math
+import threading
+from collections import OrderedDict
 
 
 class ZScoreNormalization:
@@ -52,3 +55,51 @@ class ZScoreNormalization:
         self.mean = data["mean"]
         self.m2 = data["m2"]
         return self
+
+
+class TextEmbeddingCache:
+    """LRU cache of serialized search text embeddings keyed by model and text."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: OrderedDict[str, bytes] = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(model: str, text: str) -> str:
+        return f"{model}:{' '.join(text.split())}"
+
+    def get(self, model: str, text: str) -> bytes | None:
+        key = self._key(model, text)
+
+        with self.lock:
+            embedding = self.entries.get(key)
+
+            if embedding is not None:
+                self.entries.move_to_end(key)
+
+            return embedding
+
+    def put(self, model: str, text: str, embedding: bytes) -> None:
+        key = self._key(model, text)
+
+        with self.lock:
+            self.entries[key] = embedding
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                key: base64.b64encode(embedding).decode("ascii")
+                for key, embedding in self.entries.items()
+            }
+
+    def from_dict(self, data: dict):
+        with self.lock:
+            for key, embedding in list(data.items())[-self.max_size :]:
+                self.entries[key] = base64.b64decode(embedding)
+
+        return self
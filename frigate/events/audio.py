@@ -2,6 +2,7 @@
 
 import datetime
 import logging
+import queue
 import random
 import string
 import threading
@@ -18,7 +19,10 @@ from frigate.comms.event_metadata_updater import (
     EventMetadataPublisher,
     EventMetadataTypeEnum,
 )
-from frigate.comms.inter_process import InterProcessRequestor
+from frigate.comms.inter_process import (
+    InterProcessRequestor,
+    InterProcessTelemetryPublisher,
+)
 from frigate.config import CameraConfig, CameraInput, FfmpegConfig
 from frigate.const import (
     AUDIO_DURATION,
@@ -33,6 +37,9 @@ from frigate.object_detection.base import load_labels
 from frigate.util.builtin import get_ffmpeg_arg_list
 from frigate.video import start_or_restart_ffmpeg, stop_ffmpeg
 
+# max number of queued chunks that are classified in one pass of the engine
+AUDIO_BATCH_SIZE = 8
+
 try:
     from tflite_runtime.interpreter import Interpreter
 except ModuleNotFoundError:
@@ -88,10 +95,20 @@ class AudioProcessor(util.Process):
         if len(self.cameras) == 0:
             return
 
+        # a single interpreter is shared so cpu usage scales with
+        # the amount of audio heard instead of the number of cameras
+        inference_engine = AudioInferenceEngine(
+            self.stop_event,
+            max(camera.audio.num_threads for camera in self.cameras),
+            len(self.cameras),
+        )
+        inference_engine.start()
+
         for camera in self.cameras:
             audio_thread = AudioEventMaintainer(
                 camera,
                 self.camera_metrics,
+                inference_engine,
                 self.stop_event,
             )
             audio_threads.append(audio_thread)
@@ -108,6 +125,8 @@ class AudioProcessor(util.Process):
                 self.logger.info(f"Waiting for thread {thread.name:s} to exit")
                 thread.join(10)
 
+        inference_engine.join(10)
+
         for thread in audio_threads:
             if thread.is_alive():
                 self.logger.warning(f"Thread {thread.name} is still alive")
@@ -115,11 +134,65 @@ class AudioProcessor(util.Process):
         self.logger.info("Exiting audio processor")
 
 
+class AudioInferenceEngine(threading.Thread):
+    """Classify audio chunks submitted by all cameras on a single interpreter."""
+
+    def __init__(
+        self, stop_event: threading.Event, num_threads: int, num_cameras: int
+    ) -> None:
+        super().__init__(name="audio_inference_engine")
+        self.stop_event = stop_event
+        self.detector = AudioTfl(stop_event, num_threads)
+        self.input_queue: queue.Queue = queue.Queue(maxsize=num_cameras * 2)
+        self.result_queues: dict[str, queue.SimpleQueue] = {}
+        self.logger = logging.getLogger("audio.inference")
+
+    def register(self, camera: str) -> queue.SimpleQueue:
+        """Get the queue that detections for a camera are returned on."""
+        self.result_queues[camera] = queue.SimpleQueue()
+        return self.result_queues[camera]
+
+    def submit(
+        self, camera: str, frame_time: float, dBFS: float, waveform: np.ndarray
+    ) -> bool:
+        """Queue a waveform for detection without blocking the audio reader."""
+        try:
+            self.input_queue.put_nowait((camera, frame_time, dBFS, waveform))
+            return True
+        except queue.Full:
+            return False
+
+    def run(self) -> None:
+        while not self.stop_event.is_set():
+            try:
+                batch = [self.input_queue.get(timeout=1)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < AUDIO_BATCH_SIZE:
+                try:
+                    batch.append(self.input_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for camera, frame_time, dBFS, waveform in batch:
+                try:
+                    detections = self.detector.detect(waveform)
+                except Exception as e:
+                    self.logger.error(f"Error running audio detection: {e}")
+                    continue
+
+                self.result_queues[camera].put((frame_time, dBFS, detections))
+
+        self.logger.info("Exiting audio inference engine")
+
+
 class AudioEventMaintainer(threading.Thread):
     def __init__(
         self,
         camera: CameraConfig,
         camera_metrics: dict[str, CameraMetrics],
+        inference_engine: AudioInferenceEngine,
         stop_event: threading.Event,
     ) -> None:
         super().__init__(name=f"{camera.name}_audio_event_processor")
@@ -128,7 +201,8 @@ class AudioEventMaintainer(threading.Thread):
         self.camera_metrics = camera_metrics
         self.detections: dict[dict[str, Any]] = {}
         self.stop_event = stop_event
-        self.detector = AudioTfl(stop_event, self.config.audio.num_threads)
+        self.inference_engine = inference_engine
+        self.detection_results = inference_engine.register(camera.name)
         self.shape = (int(round(AUDIO_DURATION * AUDIO_SAMPLE_RATE)),)
         self.chunk_size = int(round(AUDIO_DURATION * AUDIO_SAMPLE_RATE * 2))
         self.logger = logging.getLogger(f"audio.{self.config.name}")
@@ -138,6 +212,7 @@ class AudioEventMaintainer(threading.Thread):
 
         # create communication for audio detections
         self.requestor = InterProcessRequestor()
+        self.telemetry_publisher = InterProcessTelemetryPublisher()
         self.config_subscriber = ConfigSubscriber(f"config/audio/{camera.name}")
         self.enabled_subscriber = ConfigSubscriber(
             f"config/enabled/{camera.name}", True
@@ -161,7 +236,28 @@ class AudioEventMaintainer(threading.Thread):
         if rms >= self.config.audio.min_volume:
             # create waveform relative to max range and look for detections
             waveform = (audio / AUDIO_MAX_BIT_RANGE).astype(np.float32)
-            model_detections = self.detector.detect(waveform)
+
+            if not self.inference_engine.submit(
+                self.config.name,
+                datetime.datetime.now().timestamp(),
+                dBFS,
+                waveform,
+            ):
+                self.logger.debug(
+                    f"Audio detection for {self.config.name} is falling behind, skipping chunk"
+                )
+
+        self.handle_detection_results()
+        self.expire_detections()
+
+    def handle_detection_results(self) -> None:
+        """Handle detections that the inference engine has finished."""
+        while True:
+            try:
+                frame_time, dBFS, model_detections = self.detection_results.get_nowait()
+            except queue.Empty:
+                return
+
             audio_detections = []
 
             for label, score, _ in model_detections:
@@ -182,14 +278,12 @@ class AudioEventMaintainer(threading.Thread):
             self.detection_publisher.publish(
                 (
                     self.config.name,
-                    datetime.datetime.now().timestamp(),
+                    frame_time,
                     dBFS,
                     audio_detections,
                 )
             )
 
-        self.expire_detections()
-
     def calculate_audio_levels(self, audio_as_float: np.float32) -> Tuple[float, float]:
         # Calculate RMS (Root-Mean-Square) which represents the average signal amplitude
         # Note: np.float32 isn't serializable, we must use np.float64 to publish the message
@@ -201,8 +295,10 @@ class AudioEventMaintainer(threading.Thread):
         else:
             dBFS = 0
 
-        self.requestor.send_data(f"{self.config.name}/audio/dBFS", float(dBFS))
-        self.requestor.send_data(f"{self.config.name}/audio/rms", float(rms))
+        self.telemetry_publisher.send_data(
+            f"{self.config.name}/audio/dBFS", float(dBFS)
+        )
+        self.telemetry_publisher.send_data(f"{self.config.name}/audio/rms", float(rms))
 
         return float(rms), float(dBFS)
 
@@ -358,6 +454,7 @@ class AudioEventMaintainer(threading.Thread):
             stop_ffmpeg(self.audio_listener, self.logger)
         self.logpipe.close()
         self.requestor.stop()
+        self.telemetry_publisher.stop()
         self.config_subscriber.stop()
         self.enabled_subscriber.stop()
         self.detection_publisher.stop()
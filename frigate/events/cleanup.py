@@ -2,14 +2,15 @@
 
 import datetime
 import logging
-import os
 import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing.synchronize import Event as MpEvent
-from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Optional
 
 from frigate.config import FrigateConfig
-from frigate.const import CLIPS_DIR
+from frigate.db.lookups import delete_event_zones
+from frigate.db.rollups import refresh_rollup_event_counts
 from frigate.db.sqlitevecq import SqliteVecQueueDatabase
 from frigate.models import Event, Timeline
 from frigate.util.path import delete_event_snapshot, delete_event_thumbnail
@@ -18,6 +19,10 @@ logger = logging.getLogger(__name__)
 
 
 CHUNK_SIZE = 50
+# events selected, cleaned up and updated at a time
+EXPIRE_CHUNK_SIZE = 500
+# threads deleting the media of expired events
+MAX_DELETE_WORKERS = 8
 
 
 class EventCleanup(threading.Thread):
@@ -31,6 +36,11 @@ class EventCleanup(threading.Thread):
         self.camera_keys = list(self.config.cameras.keys())
         self.removed_camera_labels: list[str] = None
         self.camera_labels: dict[str, dict[str, Any]] = {}
+        self.delete_executor = ThreadPoolExecutor(
+            max_workers=MAX_DELETE_WORKERS, thread_name_prefix="event_cleanup"
+        )
+        # counts of the current run, logged when it finishes
+        self.run_metrics: defaultdict[str, int] = defaultdict(int)
 
     def get_removed_camera_labels(self) -> list[Event]:
         """Get a list of distinct labels for removed cameras."""
@@ -63,299 +73,225 @@ class EventCleanup(threading.Thread):
 
         return self.camera_labels[camera]["labels"]
 
-    def expire_snapshots(self) -> list[str]:
-        ## Expire events from unlisted cameras based on the global config
-        retain_config = self.config.snapshots.retain
-        update_params = {"has_snapshot": False}
-
-        distinct_labels = self.get_removed_camera_labels()
-
-        ## Expire events from cameras no longer in the config
-        # loop over object types in db
-        for event in distinct_labels:
-            # get expiration time for this label
-            expire_days = retain_config.objects.get(event.label, retain_config.default)
-
-            expire_after = (
-                datetime.datetime.now() - datetime.timedelta(days=expire_days)
-            ).timestamp()
-            # grab all events after specific time
-            expired_events: list[Event] = (
+    def expire_events(
+        self,
+        conditions: list,
+        update_params: dict[str, bool],
+        delete_media: Optional[Callable[[Any], bool]] = None,
+    ) -> list[Any]:
+        """Delete the media of the events matching the conditions and update
+        their flags, one chunk of events at a time."""
+        expired_events = []
+        last_start_time = 0
+        last_id = ""
+
+        while True:
+            # keyset pagination on the camera / start_time index so each chunk
+            # continues where the last one stopped instead of sorting every match
+            chunk = list(
                 Event.select(
                     Event.id,
                     Event.camera,
-                    Event.thumbnail,
+                    Event.start_time,
+                    Event.has_clip,
                 )
                 .where(
-                    Event.camera.not_in(self.camera_keys),
-                    Event.start_time < expire_after,
-                    Event.label == event.label,
-                    Event.retain_indefinitely == False,
+                    *conditions,
+                    Event.start_time >= last_start_time,
+                    ~((Event.start_time == last_start_time) & (Event.id <= last_id)),
                 )
+                .order_by(Event.start_time, Event.id)
+                .limit(EXPIRE_CHUNK_SIZE)
                 .namedtuples()
-                .iterator()
             )
-            logger.debug(f"{len(list(expired_events))} events can be expired")
 
-            # delete the media from disk
-            for expired in expired_events:
-                deleted = delete_event_snapshot(expired)
+            if not chunk:
+                break
 
-                if not deleted:
-                    logger.warning(
-                        f"Unable to delete event images for {expired.camera}: {expired.id}"
-                    )
+            last_start_time = chunk[-1].start_time
+            last_id = chunk[-1].id
 
-            # update the clips attribute for the db entry
-            query = Event.select(Event.id).where(
-                Event.camera.not_in(self.camera_keys),
-                Event.start_time < expire_after,
-                Event.label == event.label,
-                Event.retain_indefinitely == False,
-            )
+            if delete_media is not None:
+                for event, deleted in zip(
+                    chunk, self.delete_executor.map(delete_media, chunk)
+                ):
+                    if not deleted:
+                        self.run_metrics["failed_deletes"] += 1
+                        logger.warning(
+                            f"Unable to delete event images for {event.camera}: {event.id}"
+                        )
 
-            events_to_update = []
+            logger.debug(f"Updating {update_params} for {len(chunk)} events")
+            Event.update(update_params).where(
+                Event.id << [e.id for e in chunk]
+            ).execute()
+            expired_events.extend(chunk)
 
-            for event in query.iterator():
-                events_to_update.append(event.id)
-                if len(events_to_update) >= CHUNK_SIZE:
-                    logger.debug(
-                        f"Updating {update_params} for {len(events_to_update)} events"
-                    )
-                    Event.update(update_params).where(
-                        Event.id << events_to_update
-                    ).execute()
-                    events_to_update = []
-
-            # Update any remaining events
-            if events_to_update:
-                logger.debug(
-                    f"Updating clips/snapshots attribute for {len(events_to_update)} events"
-                )
-                Event.update(update_params).where(
-                    Event.id << events_to_update
-                ).execute()
+        return expired_events
+
+    def expire_snapshots(self) -> list[str]:
+        expired_events = []
 
-        events_to_update = []
+        ## Expire events from cameras no longer in the config based on the global config
+        retain_config = self.config.snapshots.retain
+
+        for event in self.get_removed_camera_labels():
+            # get expiration time for this label
+            expire_days = retain_config.objects.get(event.label, retain_config.default)
+            expire_after = (
+                datetime.datetime.now() - datetime.timedelta(days=expire_days)
+            ).timestamp()
+            expired_events.extend(
+                self.expire_events(
+                    [
+                        Event.camera.not_in(self.camera_keys),
+                        Event.start_time < expire_after,
+                        Event.label == event.label,
+                        Event.retain_indefinitely == False,
+                        Event.has_snapshot == True,
+                    ],
+                    {"has_snapshot": False},
+                    delete_event_snapshot,
+                )
+            )
 
         ## Expire events from cameras based on the camera config
         for name, camera in self.config.cameras.items():
             retain_config = camera.snapshots.retain
 
-            # get distinct objects in database for this camera
-            distinct_labels = self.get_camera_labels(name)
-
-            # loop over object types in db
-            for event in distinct_labels:
+            # loop over the distinct object types in the database for this camera
+            for event in self.get_camera_labels(name):
                 # get expiration time for this label
                 expire_days = retain_config.objects.get(
                     event.label, retain_config.default
                 )
-
                 expire_after = (
                     datetime.datetime.now() - datetime.timedelta(days=expire_days)
                 ).timestamp()
-                # grab all events after specific time
-                expired_events = (
-                    Event.select(
-                        Event.id,
-                        Event.camera,
-                        Event.thumbnail,
+                expired_events.extend(
+                    self.expire_events(
+                        [
+                            Event.camera == name,
+                            Event.start_time < expire_after,
+                            Event.label == event.label,
+                            Event.retain_indefinitely == False,
+                            Event.has_snapshot == True,
+                        ],
+                        {"has_snapshot": False},
+                        delete_event_snapshot,
                     )
-                    .where(
-                        Event.camera == name,
-                        Event.start_time < expire_after,
-                        Event.label == event.label,
-                        Event.retain_indefinitely == False,
-                    )
-                    .namedtuples()
-                    .iterator()
                 )
 
-                # delete the grabbed clips from disk
-                # only snapshots are stored in /clips
-                # so no need to delete mp4 files
-                for event in expired_events:
-                    events_to_update.append(event.id)
-                    deleted = delete_event_snapshot(event)
-
-                    if not deleted:
-                        logger.warning(
-                            f"Unable to delete event images for {event.camera}: {event.id}"
-                        )
-
-        # update the clips attribute for the db entry
-        for i in range(0, len(events_to_update), CHUNK_SIZE):
-            batch = events_to_update[i : i + CHUNK_SIZE]
-            logger.debug(f"Updating {update_params} for {len(batch)} events")
-            Event.update(update_params).where(Event.id << batch).execute()
-
-        return events_to_update
+        self.run_metrics["expired_snapshots"] += len(expired_events)
+        return [e.id for e in expired_events]
 
     def expire_clips(self) -> list[str]:
-        ## Expire events from unlisted cameras based on the global config
+        # mp4 clips are no longer stored in /clips, only the flag is updated
+        ## Expire events from cameras no longer in the config based on the global config
         expire_days = max(
             self.config.record.alerts.retain.days,
             self.config.record.detections.retain.days,
         )
-        file_extension = None  # mp4 clips are no longer stored in /clips
-        update_params = {"has_clip": False}
-
-        # get expiration time for this label
-
         expire_after = (
             datetime.datetime.now() - datetime.timedelta(days=expire_days)
         ).timestamp()
-        # grab all events after specific time
-        expired_events: list[Event] = (
-            Event.select(
-                Event.id,
-                Event.camera,
-            )
-            .where(
+        expired_events = self.expire_events(
+            [
                 Event.camera.not_in(self.camera_keys),
                 Event.start_time < expire_after,
                 Event.retain_indefinitely == False,
-            )
-            .namedtuples()
-            .iterator()
-        )
-        logger.debug(f"{len(list(expired_events))} events can be expired")
-        # delete the media from disk
-        for expired in expired_events:
-            media_name = f"{expired.camera}-{expired.id}"
-            media_path = Path(f"{os.path.join(CLIPS_DIR, media_name)}.{file_extension}")
-
-            try:
-                media_path.unlink(missing_ok=True)
-                if file_extension == "jpg":
-                    media_path = Path(
-                        f"{os.path.join(CLIPS_DIR, media_name)}-clean.png"
-                    )
-                    media_path.unlink(missing_ok=True)
-            except OSError as e:
-                logger.warning(f"Unable to delete event images: {e}")
-
-        # update the clips attribute for the db entry
-        query = Event.select(Event.id).where(
-            Event.camera.not_in(self.camera_keys),
-            Event.start_time < expire_after,
-            Event.retain_indefinitely == False,
+                Event.has_clip == True,
+            ],
+            {"has_clip": False},
         )
 
-        events_to_update = []
-
-        for event in query.iterator():
-            events_to_update.append(event.id)
-
-            if len(events_to_update) >= CHUNK_SIZE:
-                logger.debug(
-                    f"Updating {update_params} for {len(events_to_update)} events"
-                )
-                Event.update(update_params).where(
-                    Event.id << events_to_update
-                ).execute()
-                events_to_update = []
-
-        # Update any remaining events
-        if events_to_update:
-            logger.debug(
-                f"Updating clips/snapshots attribute for {len(events_to_update)} events"
-            )
-            Event.update(update_params).where(Event.id << events_to_update).execute()
-
-        events_to_update = []
         now = datetime.datetime.now()
 
         ## Expire events from cameras based on the camera config
         for name, camera in self.config.cameras.items():
-            expire_days = max(
-                camera.record.alerts.retain.days,
-                camera.record.detections.retain.days,
-            )
             alert_expire_date = (
                 now - datetime.timedelta(days=camera.record.alerts.retain.days)
             ).timestamp()
             detection_expire_date = (
                 now - datetime.timedelta(days=camera.record.detections.retain.days)
             ).timestamp()
-            # grab all events after specific time
-            expired_events = (
-                Event.select(
-                    Event.id,
-                    Event.camera,
-                )
-                .where(
-                    Event.camera == name,
-                    Event.retain_indefinitely == False,
-                    (
+            expired_events.extend(
+                self.expire_events(
+                    [
+                        Event.camera == name,
+                        Event.retain_indefinitely == False,
+                        Event.has_clip == True,
                         (
-                            (Event.data["max_severity"] != "detection")
-                            | (Event.data["max_severity"].is_null())
+                            (
+                                (Event.data["max_severity"] != "detection")
+                                | (Event.data["max_severity"].is_null())
+                            )
+                            & (Event.end_time < alert_expire_date)
                         )
-                        & (Event.end_time < alert_expire_date)
-                    )
-                    | (
-                        (Event.data["max_severity"] == "detection")
-                        & (Event.end_time < detection_expire_date)
-                    ),
+                        | (
+                            (Event.data["max_severity"] == "detection")
+                            & (Event.end_time < detection_expire_date)
+                        ),
+                    ],
+                    {"has_clip": False},
                 )
+            )
+
+        refresh_rollup_event_counts((e.camera, e.start_time) for e in expired_events)
+        self.run_metrics["expired_clips"] += len(expired_events)
+        return [e.id for e in expired_events]
+
+    def delete_expired_events(self) -> None:
+        """Drop events from the db where has_clip and has_snapshot are false."""
+        while True:
+            events = list(
+                Event.select(Event.id, Event.camera, Event.thumbnail)
+                .where(Event.has_clip == False, Event.has_snapshot == False)
+                .limit(EXPIRE_CHUNK_SIZE)
                 .namedtuples()
-                .iterator()
             )
 
-            # delete the grabbed clips from disk
-            # only snapshots are stored in /clips
-            # so no need to delete mp4 files
-            for event in expired_events:
-                events_to_update.append(event.id)
+            if not events:
+                break
+
+            # thumbnails stored in the db don't need a file to be deleted
+            list(self.delete_executor.map(delete_event_thumbnail, events))
+            ids_to_delete = [e.id for e in events]
+
+            for i in range(0, len(ids_to_delete), CHUNK_SIZE):
+                chunk = ids_to_delete[i : i + CHUNK_SIZE]
+                logger.debug(f"Deleting {len(chunk)} events from the database")
+                Event.delete().where(Event.id << chunk).execute()
+                delete_event_zones(chunk)
 
-        # update the clips attribute for the db entry
-        for i in range(0, len(events_to_update), CHUNK_SIZE):
-            batch = events_to_update[i : i + CHUNK_SIZE]
-            logger.debug(f"Updating {update_params} for {len(batch)} events")
-            Event.update(update_params).where(Event.id << batch).execute()
+                if self.config.semantic_search.enabled:
+                    self.db.delete_embeddings_description(event_ids=chunk)
+                    self.db.delete_embeddings_thumbnail(event_ids=chunk)
+                    logger.debug(f"Deleted {len(chunk)} embeddings")
 
-        return events_to_update
+            self.run_metrics["deleted_events"] += len(events)
 
     def run(self) -> None:
         # only expire events every 5 minutes
         while not self.stop_event.wait(300):
+            start = datetime.datetime.now().timestamp()
+            self.run_metrics = defaultdict(int)
             events_with_expired_clips = self.expire_clips()
 
             # delete timeline entries for events that have expired recordings
             # delete up to 100,000 at a time
             max_deletes = 100000
-            deleted_events_list = list(events_with_expired_clips)
-            for i in range(0, len(deleted_events_list), max_deletes):
+            for i in range(0, len(events_with_expired_clips), max_deletes):
                 Timeline.delete().where(
-                    Timeline.source_id << deleted_events_list[i : i + max_deletes]
+                    Timeline.source_id << events_with_expired_clips[i : i + max_deletes]
                 ).execute()
 
             self.expire_snapshots()
+            self.delete_expired_events()
 
-            # drop events from db where has_clip and has_snapshot are false
-            events = (
-                Event.select()
-                .where(Event.has_clip == False, Event.has_snapshot == False)
-                .iterator()
+            logger.debug(
+                f"Event cleanup took {datetime.datetime.now().timestamp() - start:.2f}s: {dict(self.run_metrics)}"
             )
-            events_to_delete: list[Event] = [e for e in events]
-
-            for e in events_to_delete:
-                delete_event_thumbnail(e)
-
-            logger.debug(f"Found {len(events_to_delete)} events that can be expired")
-            if len(events_to_delete) > 0:
-                ids_to_delete = [e.id for e in events_to_delete]
-                for i in range(0, len(ids_to_delete), CHUNK_SIZE):
-                    chunk = ids_to_delete[i : i + CHUNK_SIZE]
-                    logger.debug(f"Deleting {len(chunk)} events from the database")
-                    Event.delete().where(Event.id << chunk).execute()
-
-                    if self.config.semantic_search.enabled:
-                        self.db.delete_embeddings_description(event_ids=chunk)
-                        self.db.delete_embeddings_thumbnail(event_ids=chunk)
-                        logger.debug(f"Deleted {len(ids_to_delete)} embeddings")
 
+        self.delete_executor.shutdown()
         logger.info("Exiting event cleanup...")
@@ -6,6 +6,8 @@ from typing import Dict
 
 from frigate.comms.events_updater import EventEndPublisher, EventUpdateSubscriber
 from frigate.config import FrigateConfig
+from frigate.db.lookups import update_event_zones
+from frigate.db.rollups import refresh_rollup_event_counts
 from frigate.events.types import EventStateEnum, EventTypeEnum
 from frigate.models import Event
 from frigate.util.builtin import to_relative_box
@@ -63,6 +65,10 @@ class EventProcessor(threading.Thread):
         self.config = config
         self.timeline_queue = timeline_queue
         self.events_in_process: Dict[str, Event] = {}
+        # zones last written to the lookup table for each event in process
+        self.saved_event_zones: Dict[str, list[str]] = {}
+        # events in process already counted in the recordings rollup
+        self.counted_events: set[str] = set()
         self.stop_event = stop_event
 
         self.event_receiver = EventUpdateSubscriber()
@@ -246,6 +252,15 @@ class EventProcessor(threading.Thread):
                 .execute()
             )
 
+            # only write the zones when they changed since the last save
+            if self.saved_event_zones.get(event_data["id"]) != event[Event.zones]:
+                update_event_zones(event_data["id"], event[Event.zones])
+                self.saved_event_zones[event_data["id"]] = event[Event.zones]
+
+            if event[Event.has_clip] and event_data["id"] not in self.counted_events:
+                refresh_rollup_event_counts([(camera, start_time)])
+                self.counted_events.add(event_data["id"])
+
         # check if the stored event_data should be updated
         if updated_db or should_update_state(
             self.events_in_process[event_data["id"]], event_data
@@ -255,6 +270,8 @@ class EventProcessor(threading.Thread):
 
         if event_type == EventStateEnum.end:
             del self.events_in_process[event_data["id"]]
+            self.saved_event_zones.pop(event_data["id"], None)
+            self.counted_events.discard(event_data["id"])
             self.event_end_publisher.publish((event_data["id"], camera, updated_db))
 
     def handle_external_detection(
@@ -286,6 +303,11 @@ class EventProcessor(threading.Thread):
                     "score"
                 ]
             Event.insert(event).execute()
+
+            if event_data["has_clip"]:
+                refresh_rollup_event_counts(
+                    [(event_data["camera"], event_data["start_time"])]
+                )
         elif event_type == EventStateEnum.end:
             event = {
                 Event.id: event_data["id"],
@@ -0,0 +1,278 @@
+"""Schedule generative AI requests on a bounded pool of workers."""
+
+import datetime
+import logging
+import threading
+from collections import defaultdict
+from multiprocessing.synchronize import Event as MpEvent
+from typing import Callable, NamedTuple, Optional
+
+from frigate.comms.inter_process import InterProcessRequestor
+from frigate.config import CameraConfig, FrigateConfig
+from frigate.data_processing.types import GenAIMetrics
+from frigate.genai import GenAIClient
+from frigate.models import Event
+from frigate.util.builtin import InferenceSpeed
+
+logger = logging.getLogger(__name__)
+
+# max number of events with a pending request, the least important is dropped
+MAX_PENDING_REQUESTS = 100
+# seconds to wait before the first retry, doubled for every further retry
+RETRY_BACKOFF = 5
+
+PRIORITY_ALERT = 0
+PRIORITY_DETECTION = 1
+
+
+class GenAIRequest(NamedTuple):
+    event: Event
+    thumbnails: list[bytes]
+    final: bool
+    priority: int
+    sequence: int
+    received: float
+    attempt: int = 0
+    not_before: float = 0
+
+
+class TokenBucket:
+    """Limit requests to a rate while allowing short bursts."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = datetime.datetime.now().timestamp()
+        self.lock = threading.Lock()
+
+    def take(self) -> float:
+        """Take a token, returns the seconds to wait when none is available."""
+        with self.lock:
+            now = datetime.datetime.now().timestamp()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+
+            return (1 - self.tokens) / self.rate
+
+
+def get_event_priority(camera_config: CameraConfig, event: Event) -> int:
+    """Requests for objects that create alerts are sent first."""
+    alerts = camera_config.review.alerts
+
+    if (
+        alerts.enabled
+        and event.label in alerts.labels
+        and (
+            not alerts.required_zones
+            or set(event.zones or []) & set(alerts.required_zones)
+        )
+    ):
+        return PRIORITY_ALERT
+
+    return PRIORITY_DETECTION
+
+
+class GenAIScheduler:
+    """Send description requests to the GenAI provider.
+
+    Only the newest request for each event is kept, an early request is
+    superseded by the final one, and requests for alerts are sent before
+    requests for detections. Each worker has its own requestor that is
+    passed to the description handler, zmq sockets can't be shared
+    between threads.
+    """
+
+    def __init__(
+        self,
+        config: FrigateConfig,
+        client: GenAIClient,
+        handle_description: Callable[
+            [InterProcessRequestor, Event, list[bytes], str], None
+        ],
+        metrics: Optional[GenAIMetrics],
+        stop_event: MpEvent,
+    ) -> None:
+        self.config = config
+        self.client = client
+        self.handle_description = handle_description
+        self.metrics = metrics or GenAIMetrics()
+        self.stop_event = stop_event
+        self.latency = InferenceSpeed(self.metrics.latency)
+        self.rate_limit = (
+            TokenBucket(
+                config.genai.requests_per_minute / 60,
+                config.genai.max_concurrent_requests,
+            )
+            if config.genai.requests_per_minute
+            else None
+        )
+        self.pending: dict[str, GenAIRequest] = {}
+        self.pending_condition = threading.Condition()
+        self.sequence = 0
+        # newest request applied and requests being sent for each event
+        self.applied: dict[str, int] = {}
+        self.sending: defaultdict[str, int] = defaultdict(int)
+        self.workers = [
+            threading.Thread(name=f"genai:{i}", target=self.run, daemon=True)
+            for i in range(config.genai.max_concurrent_requests)
+        ]
+
+    def start(self) -> None:
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, event: Event, thumbnails: list[bytes], final: bool) -> None:
+        """Queue a description request, replacing a pending one for the event."""
+        with self.pending_condition:
+            existing = self.pending.get(event.id)
+
+            # an early request never replaces the final one
+            if existing is not None and existing.final and not final:
+                return
+
+            self.sequence += 1
+            self._enqueue(
+                GenAIRequest(
+                    event,
+                    thumbnails,
+                    final,
+                    get_event_priority(self.config.cameras[event.camera], event),
+                    self.sequence,
+                    existing.received
+                    if existing is not None
+                    else datetime.datetime.now().timestamp(),
+                )
+            )
+
+    def _enqueue(self, request: GenAIRequest) -> None:
+        if self.pending.pop(request.event.id, None) is not None:
+            self.metrics.dropped.value += 1
+        elif len(self.pending) >= MAX_PENDING_REQUESTS:
+            # drop the oldest of the least important requests
+            dropped = max(
+                self.pending.values(), key=lambda r: (r.priority, -r.received)
+            )
+            del self.pending[dropped.event.id]
+            self.metrics.dropped.value += 1
+
+        self.pending[request.event.id] = request
+        self.metrics.queued.value = len(self.pending)
+        self.pending_condition.notify()
+
+    def _next_request(self) -> Optional[GenAIRequest]:
+        """Get the most important request that is ready to be sent."""
+        now = datetime.datetime.now().timestamp()
+        ready = [r for r in self.pending.values() if r.not_before <= now]
+
+        if not ready:
+            return None
+
+        request = min(ready, key=lambda r: (r.priority, r.received))
+        del self.pending[request.event.id]
+        self.metrics.queued.value = len(self.pending)
+        self.sending[request.event.id] += 1
+        return request
+
+    def run(self) -> None:
+        requestor = InterProcessRequestor()
+
+        while not self.stop_event.is_set():
+            with self.pending_condition:
+                request = self._next_request()
+
+                if request is None:
+                    self.pending_condition.wait(timeout=1)
+                    continue
+
+            if not self._wait_for_rate_limit():
+                break
+
+            try:
+                self._send(request, requestor)
+            except Exception as e:
+                logger.error(
+                    f"Failed to generate description for {request.event.id}: {e}",
+                    exc_info=True,
+                )
+            finally:
+                self._finish(request.event.id)
+
+        requestor.stop()
+        logger.debug(f"Exiting {threading.current_thread().name}...")
+
+    def _wait_for_rate_limit(self) -> bool:
+        """Wait until a request can be sent, False when stopping."""
+        if self.rate_limit is None:
+            return True
+
+        wait = self.rate_limit.take()
+
+        while wait > 0:
+            if self.stop_event.wait(wait):
+                return False
+
+            wait = self.rate_limit.take()
+
+        return True
+
+    def _send(self, request: GenAIRequest, requestor: InterProcessRequestor) -> None:
+        event = request.event
+
+        try:
+            description = self.client.generate_description(
+                self.config.cameras[event.camera], request.thumbnails, event
+            )
+        except Exception as e:
+            logger.debug(f"GenAI request for {event.id} raised: {e}")
+            description = None
+
+        if not description:
+            self._retry(request)
+            return
+
+        self.latency.update(datetime.datetime.now().timestamp() - request.received)
+
+        with self.pending_condition:
+            # a newer request for the event already updated the description
+            if self.applied.get(event.id, 0) > request.sequence:
+                return
+
+            self.applied[event.id] = request.sequence
+
+        self.handle_description(requestor, event, request.thumbnails, description)
+
+    def _retry(self, request: GenAIRequest) -> None:
+        if request.attempt >= self.config.genai.max_retries:
+            logger.debug(f"Failed to generate description for {request.event.id}")
+            self.metrics.failed.value += 1
+            return
+
+        with self.pending_condition:
+            # a newer request replaces the retry
+            if request.event.id in self.pending:
+                return
+
+            self._enqueue(
+                request._replace(
+                    attempt=request.attempt + 1,
+                    not_before=datetime.datetime.now().timestamp()
+                    + RETRY_BACKOFF * 2**request.attempt,
+                )
+            )
+
+    def _finish(self, event_id: str) -> None:
+        with self.pending_condition:
+            self.sending[event_id] -= 1
+
+            if self.sending[event_id] <= 0:
+                del self.sending[event_id]
+
+                if event_id not in self.pending:
+                    self.applied.pop(event_id, None)
@@ -4,6 +4,7 @@ from peewee import (
     AutoField,
     BooleanField,
     CharField,
+    CompositeKey,
     DateTimeField,
     FloatField,
     ForeignKeyField,
@@ -52,6 +53,16 @@ class Event(Model):  # type: ignore[misc]
     data = JSONField()  # ex: tracked object box, region, etc.
 
 
+class EventZone(Model):  # type: ignore[misc]
+    event = ForeignKeyField(Event, backref="zone_rows", index=False)
+    zone = CharField(max_length=100)
+
+    class Meta:
+        table_name = "event_zone"
+        primary_key = CompositeKey("event", "zone")
+        indexes = ((("zone", "event"), False),)
+
+
 class Timeline(Model):  # type: ignore[misc]
     timestamp = DateTimeField()
     camera = CharField(index=True, max_length=20)
@@ -81,6 +92,20 @@ class Recordings(Model):  # type: ignore[misc]
     regions = IntegerField(null=True)
 
 
+class RecordingsRollup(Model):  # type: ignore[misc]
+    camera = CharField(max_length=20)
+    utc_hour = IntegerField()  # start_time // 3600 of the recordings
+    segments = IntegerField(default=0)
+    duration = FloatField(default=0)
+    motion = IntegerField(default=0)
+    objects = IntegerField(default=0)
+    event_count = IntegerField(default=0)  # events with clips
+
+    class Meta:
+        table_name = "recordings_rollup"
+        primary_key = CompositeKey("camera", "utc_hour")
+
+
 class Export(Model):  # type: ignore[misc]
     id = CharField(null=False, primary_key=True, max_length=30)
     camera = CharField(index=True, max_length=20)
@@ -101,6 +126,26 @@ class ReviewSegment(Model):  # type: ignore[misc]
     data = JSONField()  # additional data about detection like list of labels, zone, areas of significant motion
 
 
+class ReviewSegmentLabel(Model):  # type: ignore[misc]
+    review_segment = ForeignKeyField(ReviewSegment, backref="label_rows", index=False)
+    label = CharField(max_length=100)
+
+    class Meta:
+        table_name = "review_segment_label"
+        primary_key = CompositeKey("review_segment", "label")
+        indexes = ((("label", "review_segment"), False),)
+
+
+class ReviewSegmentZone(Model):  # type: ignore[misc]
+    review_segment = ForeignKeyField(ReviewSegment, backref="zone_rows", index=False)
+    zone = CharField(max_length=100)
+
+    class Meta:
+        table_name = "review_segment_zone"
+        primary_key = CompositeKey("review_segment", "zone")
+        indexes = ((("zone", "review_segment"), False),)
+
+
 class UserReviewStatus(Model):  # type: ignore[misc]
     user_id = CharField(max_length=30)
     review_segment = ForeignKeyField(ReviewSegment, backref="user_reviews")
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 import cv2
 import numpy as np
@@ -12,6 +13,39 @@ from frigate.util.image import grab_cv2_contours
 
 logger = logging.getLogger(__name__)
 
+# size of the blocks compared against their running average, in motion frame pixels
+STATIC_BLOCK_SIZE = 8
+# a frame is static when no block differs from its average by more than this
+# fraction of the threshold, so motion needs to cover about 1/8 of a block
+STATIC_BLOCK_FRACTION = 0.125
+
+
+def contrast_limits(frame: np.ndarray, low: float, high: float) -> tuple[int, int]:
+    """Get the low and high percentiles of a uint8 frame from its histogram.
+
+    Matches np.percentile(...).astype(np.uint8) without sorting the frame."""
+    cumulative = np.cumsum(cv2.calcHist([frame], [0], None, [256], [0, 256]).ravel())
+    count = int(cumulative[-1])
+    limits = []
+
+    for percentile in (low, high):
+        index = percentile / 100 * (count - 1)
+        lower = int(np.floor(index))
+        fraction = index - lower
+        # value of the nth smallest pixel is the first bin holding more than n pixels
+        below, above = np.searchsorted(
+            cumulative, [lower, min(lower + 1, count - 1)], side="right"
+        )
+        # same interpolation as np.percentile
+        if fraction >= 0.5:
+            value = above - (above - below) * (1 - fraction)
+        else:
+            value = below + (above - below) * fraction
+
+        limits.append(int(value))
+
+    return limits[0], limits[1]
+
 
 class ImprovedMotionDetector(MotionDetector):
     def __init__(
@@ -24,6 +58,7 @@ class ImprovedMotionDetector(MotionDetector):
         blur_radius=1,
         interpolation=cv2.INTER_NEAREST,
         contrast_frame_history=50,
+        skip_static_frames=True,
     ):
         self.name = name
         self.config = config
@@ -33,7 +68,6 @@ class ImprovedMotionDetector(MotionDetector):
             config.frame_height,
             config.frame_height * frame_shape[1] // frame_shape[0],
         )
-        self.avg_frame = np.zeros(self.motion_frame_size, np.float32)
         self.motion_frame_count = 0
         self.frame_counter = 0
         resized_mask = cv2.resize(
@@ -41,7 +75,47 @@ class ImprovedMotionDetector(MotionDetector):
             dsize=(self.motion_frame_size[1], self.motion_frame_size[0]),
             interpolation=cv2.INTER_AREA,
         )
-        self.mask = np.where(resized_mask == [0])
+
+        # only process the bounding area of the unmasked pixels, padded by twice
+        # the blur radius so blurring gives the same result as the full frame
+        unmasked = cv2.findNonZero(resized_mask)
+
+        if unmasked is None:
+            self.roi_offset = (0, 0)
+            roi_mask = resized_mask
+        else:
+            x, y, w, h = cv2.boundingRect(unmasked)
+            padding = 2 * blur_radius
+            x_start, y_start = max(0, x - padding), max(0, y - padding)
+            x_end = min(self.motion_frame_size[1], x + w + padding)
+            y_end = min(self.motion_frame_size[0], y + h + padding)
+            self.roi_offset = (x_start, y_start)
+            roi_mask = resized_mask[y_start:y_end, x_start:x_end]
+
+        self.roi_size = roi_mask.shape
+        self.avg_frame = np.zeros(self.roi_size, np.float32)
+        self.mask = np.where(roi_mask == [0])
+
+        # frames whose blocks match the running average of the blocks skip detection,
+        # the average is updated alongside the average frame and at least one frame
+        # per second is still fully processed
+        self.skip_static_frames = skip_static_frames
+        self.max_skipped_frames = max(1, int(fps))
+        self.skipped_frames = 0
+        self.static_block_size = (
+            max(1, self.roi_size[1] // STATIC_BLOCK_SIZE),
+            max(1, self.roi_size[0] // STATIC_BLOCK_SIZE),
+        )
+        # blocks that are completely masked are ignored
+        self.static_block_mask = (
+            cv2.resize(
+                (roi_mask > 0).astype(np.uint8),
+                self.static_block_size,
+                interpolation=cv2.INTER_AREA,
+            )
+            > 0
+        ).astype(np.uint8)
+        self.avg_blocks = None
         self.save_images = False
         self.calibrating = True
         self.blur_radius = blur_radius
@@ -86,11 +160,30 @@ class ImprovedMotionDetector(MotionDetector):
         gray = frame[0 : self.frame_shape[0], 0 : self.frame_shape[1]]
 
         # resize frame
-        resized_frame = cv2.resize(
+        full_frame = cv2.resize(
             gray,
             dsize=(self.motion_frame_size[1], self.motion_frame_size[0]),
             interpolation=self.interpolation,
         )
+        x_start, y_start = self.roi_offset
+        resized_frame = full_frame[
+            y_start : y_start + self.roi_size[0], x_start : x_start + self.roi_size[1]
+        ]
+
+        blocks = None
+
+        if self.skip_static_frames:
+            blocks = cv2.resize(
+                resized_frame, self.static_block_size, interpolation=cv2.INTER_AREA
+            ).astype(np.float32)
+
+            if self.avg_blocks is None:
+                self.avg_blocks = blocks.copy()
+            elif self.is_static(blocks):
+                self.skipped_frames += 1
+                return motion_boxes
+
+            self.skipped_frames = 0
 
         if self.save_images:
             resized_saved = resized_frame.copy()
@@ -98,8 +191,8 @@ class ImprovedMotionDetector(MotionDetector):
         # Improve contrast
         if self.config.improve_contrast:
             # TODO tracking moving average of min/max to avoid sudden contrast changes
-            min_value = np.percentile(resized_frame, 4).astype(np.uint8)
-            max_value = np.percentile(resized_frame, 96).astype(np.uint8)
+            # limits come from the whole frame, including the masked areas
+            min_value, max_value = contrast_limits(full_frame, 4, 96)
             # skip contrast calcs if the image is a single color
             if min_value < max_value:
                 # keep track of the last 50 contrast values
@@ -157,6 +250,8 @@ class ImprovedMotionDetector(MotionDetector):
             total_contour_area += contour_area
             if contour_area > self.config.contour_area:
                 x, y, w, h = cv2.boundingRect(c)
+                x += x_start
+                y += y_start
                 motion_boxes.append(
                     (
                         int(x * self.resize_factor),
@@ -186,6 +281,9 @@ class ImprovedMotionDetector(MotionDetector):
             self.last_stop_time = self.ptz_metrics.stop_time.value
 
             self.avg_frame = resized_frame.astype(np.float32)
+
+            if blocks is not None:
+                self.avg_blocks = blocks.copy()
             motion_boxes = []
             pct_motion = 0
 
@@ -228,22 +326,46 @@ class ImprovedMotionDetector(MotionDetector):
             self.motion_frame_count += 1
             if self.motion_frame_count >= 10:
                 # only average in the current frame if the difference persists for a bit
-                cv2.accumulateWeighted(
-                    resized_frame,
-                    self.avg_frame,
-                    0.2 if self.calibrating else self.config.frame_alpha,
-                )
+                self.accumulate(resized_frame, blocks)
         else:
             # when no motion, just keep averaging the frames together
-            cv2.accumulateWeighted(
-                resized_frame,
-                self.avg_frame,
-                0.2 if self.calibrating else self.config.frame_alpha,
-            )
+            self.accumulate(resized_frame, blocks)
             self.motion_frame_count = 0
 
         return motion_boxes
 
+    def accumulate(self, frame: np.ndarray, blocks: Optional[np.ndarray]) -> None:
+        """Average the frame, and its blocks, into the running averages."""
+        alpha = 0.2 if self.calibrating else self.config.frame_alpha
+        cv2.accumulateWeighted(frame, self.avg_frame, alpha)
+
+        if blocks is not None:
+            cv2.accumulateWeighted(blocks, self.avg_blocks, alpha)
+
+    def is_static(self, blocks: np.ndarray) -> bool:
+        """If the frame is close enough to the running average to skip detection."""
+        if (
+            self.calibrating
+            or self.motion_frame_count > 0
+            or self.save_images
+            or self.skipped_frames >= self.max_skipped_frames
+            or self.ptz_metrics.autotracker_enabled.value
+        ):
+            return False
+
+        threshold = self.config.threshold
+
+        # contrast improvement stretches the differences before the threshold
+        if self.config.improve_contrast:
+            avg_min, avg_max = np.mean(self.contrast_values, axis=0)
+
+            if avg_min < avg_max:
+                threshold *= (avg_max - avg_min) / 255
+
+        block_delta = cv2.absdiff(blocks, self.avg_blocks)
+        _, max_delta, _, _ = cv2.minMaxLoc(block_delta, self.static_block_mask)
+        return max_delta < threshold * STATIC_BLOCK_FRACTION
+
     def stop(self) -> None:
         """stop the motion detector."""
         self.config_subscriber.stop()
@@ -10,7 +10,7 @@ import queue
 import subprocess as sp
 import threading
 import traceback
-from typing import Any, Optional
+from typing import Any
 
 import cv2
 import numpy as np
@@ -20,8 +20,8 @@ from frigate.config import BirdseyeModeEnum, FfmpegConfig, FrigateConfig
 from frigate.const import BASE_DIR, BIRDSEYE_PIPE, INSTALL_DIR
 from frigate.util.image import (
     SharedMemoryFrameManager,
-    copy_yuv_to_position,
     get_yuv_crop,
+    get_yuv_position_copies,
 )
 
 logger = logging.getLogger(__name__)
@@ -332,9 +332,9 @@ class BirdsEyeFrameManager:
             )
             self.cameras[camera] = {
                 "dimensions": [settings.detect.width, settings.detect.height],
+                "frame_shape": settings.frame_shape_yuv,
                 "last_active_frame": 0.0,
-                "current_frame": 0.0,
-                "layout_frame": 0.0,
+                "current_frame_time": 0.0,
                 "channel_dims": {
                     "y": y,
                     "u1": u1,
@@ -345,6 +345,10 @@ class BirdsEyeFrameManager:
             }
 
         self.camera_layout = []
+        # channel copies of each camera in the layout, frames are downscaled
+        # straight into the canvas when they arrive
+        self.tiles: dict[str, list[tuple]] = {}
+        self.tiles_changed = False
         self.active_cameras = set()
         self.last_output_time = 0.0
 
@@ -352,24 +356,32 @@ class BirdsEyeFrameManager:
         logger.debug("Clearing the birdseye frame")
         self.frame[:] = self.blank_frame
 
-    def copy_to_position(self, position, camera=None, frame: np.ndarray = None):
-        if camera is None:
-            frame = None
-            channel_dims = None
-        else:
-            if frame is None:
-                logger.debug(f"Unable to copy frame {camera} to birdseye.")
-                return
+    def set_tiles(self) -> None:
+        """Cache the channel copies of each camera for the current layout."""
+        self.tiles = {
+            camera: get_yuv_position_copies(
+                self.frame.shape,
+                [position[1], position[0]],
+                [position[3], position[2]],
+                self.cameras[camera]["frame_shape"],
+                self.cameras[camera]["channel_dims"],
+            )
+            for row in self.camera_layout
+            for camera, position in row
+        }
 
-            channel_dims = self.cameras[camera]["channel_dims"]
+    def copy_to_tile(self, camera: str, frame: np.ndarray) -> None:
+        tile = self.tiles.get(camera)
 
-        copy_yuv_to_position(
-            self.frame,
-            [position[1], position[0]],
-            [position[3], position[2]],
-            frame,
-            channel_dims,
-        )
+        if tile is None:
+            return
+
+        for destination, source, dsize in tile:
+            self.frame[destination] = cv2.resize(
+                frame[source], dsize=dsize, interpolation=cv2.INTER_LINEAR
+            )
+
+        self.tiles_changed = True
 
     def camera_active(self, mode, object_box_count, motion_box_count):
         if mode == BirdseyeModeEnum.continuous:
@@ -381,10 +393,10 @@ class BirdsEyeFrameManager:
         if mode == BirdseyeModeEnum.objects and object_box_count > 0:
             return True
 
-    def update_frame(self, frame: Optional[np.ndarray] = None) -> bool:
+    def update_frame(self) -> bool:
         """
-        Update birdseye, optionally with a new frame.
-        When no frame is passed, check the layout and update for any disabled cameras.
+        Update the birdseye layout for the active cameras.
+        Returns True when the layout changed.
         """
 
         # determine how many cameras are tracking objects within the last inactivity_threshold seconds
@@ -432,6 +444,7 @@ class BirdsEyeFrameManager:
                 return False
             # if the layout needs to be cleared
             self.camera_layout = []
+            self.tiles = {}
             self.active_cameras = set()
             self.clear_frame()
             frame_changed = True
@@ -523,17 +536,9 @@ class BirdsEyeFrameManager:
                         self.canvas.set_coefficient(len(active_cameras), coefficient)
 
                     self.camera_layout = layout_candidate
-                frame_changed = True
 
-            # Draw the layout
-            for row in self.camera_layout:
-                for position in row:
-                    src_frame = self.cameras[position[0]]["current_frame"]
-                    if src_frame is None or src_frame.size == 0:
-                        logger.debug(f"Skipping invalid frame for {position[0]}")
-                        continue
-                    self.copy_to_position(position[1], position[0], src_frame)
-            if frame is not None:  # Frame presence indicates a potential change
+                # tiles are filled as the next frame of each camera arrives
+                self.set_tiles()
                 frame_changed = True
 
         return frame_changed
@@ -704,7 +709,6 @@ class BirdsEyeFrameManager:
                 return False
 
         # update the last active frame for the camera
-        self.cameras[camera]["current_frame"] = frame.copy()
         self.cameras[camera]["current_frame_time"] = frame_time
         if self.camera_active(camera_config.birdseye.mode, object_count, motion_count):
             self.cameras[camera]["last_active_frame"] = frame_time
@@ -712,20 +716,33 @@ class BirdsEyeFrameManager:
         now = datetime.datetime.now().timestamp()
 
         # limit output to 10 fps
-        if not force_update and (now - self.last_output_time) < 1 / 10:
-            return False
+        output = force_update or (now - self.last_output_time) >= 1 / 10
+        updated_layout = False
 
-        try:
-            updated_frame = self.update_frame(frame)
-        except Exception:
-            updated_frame = False
-            self.active_cameras = []
-            self.camera_layout = []
-            print(traceback.format_exc())
+        if output:
+            try:
+                updated_layout = self.update_frame()
+            except Exception:
+                self.active_cameras = []
+                self.camera_layout = []
+                self.tiles = {}
+                print(traceback.format_exc())
 
-        # if the frame was updated or the fps is too low, send frame
-        if force_update or updated_frame or (now - self.last_output_time) > 1:
+        # frames of cameras outside of the layout are not kept
+        self.copy_to_tile(camera, frame)
+
+        if not output:
+            return False
+
+        # if a tile or the layout was updated or the fps is too low, send frame
+        if (
+            force_update
+            or updated_layout
+            or self.tiles_changed
+            or (now - self.last_output_time) > 1
+        ):
             self.last_output_time = now
+            self.tiles_changed = False
             return True
         return False
 
@@ -24,7 +24,7 @@ from frigate.config import FrigateConfig
 from frigate.const import CACHE_DIR, CLIPS_DIR
 from frigate.output.birdseye import Birdseye
 from frigate.output.camera import JsmpegCamera
-from frigate.output.preview import PreviewRecorder
+from frigate.output.preview import PreviewFrameIndex, PreviewRecorder
 from frigate.util.image import SharedMemoryFrameManager, get_blank_yuv_frame
 
 logger = logging.getLogger(__name__)
@@ -98,7 +98,17 @@ def output_frames(
     websocket_server.initialize_websockets_manager()
     websocket_thread = threading.Thread(target=websocket_server.serve_forever)
 
-    detection_subscriber = DetectionSubscriber(DetectionTypeEnum.video)
+    detection_subscriber = DetectionSubscriber(
+        DetectionTypeEnum.video,
+        object_fields=(
+            "label",
+            "frame_time",
+            "false_positive",
+            "motionless_count",
+            "position_changes",
+            "stationary",
+        ),
+    )
     config_enabled_subscriber = ConfigSubscriber("config/enabled/")
 
     jsmpeg_cameras: dict[str, JsmpegCamera] = {}
@@ -110,12 +120,19 @@ def output_frames(
 
     move_preview_frames("cache")
 
+    # the api looks up cached preview frames here instead of listing the cache
+    preview_frame_index = PreviewFrameIndex()
+    preview_index_thread = threading.Thread(
+        name="preview_index", target=preview_frame_index.serve, args=(stop_event,)
+    )
+    preview_index_thread.start()
+
     for camera, cam_config in config.cameras.items():
         if not cam_config.enabled_in_config:
             continue
 
         jsmpeg_cameras[camera] = JsmpegCamera(cam_config, stop_event, websocket_server)
-        preview_recorders[camera] = PreviewRecorder(cam_config)
+        preview_recorders[camera] = PreviewRecorder(cam_config, preview_frame_index)
         preview_write_times[camera] = 0
 
     if config.birdseye.enabled:
@@ -241,6 +258,7 @@ def output_frames(
         birdseye.stop()
 
     config_enabled_subscriber.stop()
+    preview_index_thread.join()
     websocket_server.manager.close_all()
     websocket_server.manager.stop()
     websocket_server.manager.join()
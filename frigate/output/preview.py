@@ -1,12 +1,15 @@
 """Handle outputting low res / fps preview segments from decoded frames."""
 
+import bisect
 import datetime
 import logging
 import os
+import queue
 import shutil
 import subprocess as sp
 import threading
-import time
+from collections import defaultdict
+from multiprocessing.synchronize import Event as MpEvent
 from pathlib import Path
 from typing import Any
 
@@ -15,16 +18,17 @@ import numpy as np
 
 from frigate.comms.config_updater import ConfigSubscriber
 from frigate.comms.inter_process import InterProcessRequestor
+from frigate.comms.preview_updater import PreviewFramesResponder
 from frigate.config import CameraConfig, RecordQualityEnum
 from frigate.const import CACHE_DIR, CLIPS_DIR, INSERT_PREVIEW, PREVIEW_FRAME_TYPE
 from frigate.ffmpeg_presets import (
-    FPS_VFR_PARAM,
     EncodeTypeEnum,
     parse_preset_hardware_acceleration_encode,
 )
 from frigate.models import Previews
 from frigate.track.object_processing import TrackedObject
 from frigate.util.image import copy_yuv_to_position, get_blank_yuv_frame, get_yuv_crop
+from frigate.util.services import lower_priority
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +38,9 @@ PREVIEW_SEGMENT_DURATION = 3600  # one hour
 # important to have lower keyframe to maintain scrubbing performance
 PREVIEW_KEYFRAME_INTERVAL = 40
 PREVIEW_HEIGHT = 180
+# frames are streamed to the encoder at a constant rate matching the max preview output rate
+PREVIEW_STREAM_FPS = 2
+PREVIEW_WRITE_QUEUE_SIZE = 10
 PREVIEW_QUALITY_WEBP = {
     RecordQualityEnum.very_low: 70,
     RecordQualityEnum.low: 80,
@@ -58,99 +65,286 @@ def get_cache_image_name(camera: str, frame_time: float) -> str:
     )
 
 
-class FFMpegConverter(threading.Thread):
-    """Convert a list of still frames into a vfr mp4."""
+class PreviewFrameIndex:
+    """Sorted times of the preview frames in the cache for each camera, so
+    lookups don't need to list the cache shared by all cameras."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.frame_times: defaultdict[str, list[float]] = defaultdict(list)
+
+    def add(self, camera: str, frame_time: float) -> None:
+        with self.lock:
+            frame_times = self.frame_times[camera]
+
+            if not frame_times or frame_time > frame_times[-1]:
+                frame_times.append(frame_time)
+            elif frame_times[bisect.bisect_left(frame_times, frame_time)] != frame_time:
+                bisect.insort(frame_times, frame_time)
+
+    def remove(self, camera: str, removed_times: list[float]) -> None:
+        removed = set(removed_times)
+
+        with self.lock:
+            self.frame_times[camera] = [
+                t for t in self.frame_times[camera] if t not in removed
+            ]
+
+    def get_frame_times(
+        self, camera: str, start_ts: float, end_ts: float
+    ) -> list[float]:
+        with self.lock:
+            frame_times = self.frame_times.get(camera, [])
+            return frame_times[
+                bisect.bisect_left(frame_times, start_ts) : bisect.bisect_right(
+                    frame_times, end_ts
+                )
+            ]
+
+    def handle_request(self, topic: str, data: dict[str, Any]) -> Any:
+        if topic == "frames":
+            return self.get_frame_times(data["camera"], data["start"], data["end"])
+
+        return None
+
+    def serve(self, stop_event: MpEvent) -> None:
+        """Answer frame lookups from other processes until stopped."""
+        responder = PreviewFramesResponder()
+
+        while not stop_event.is_set():
+            responder.check_for_request(self.handle_request, timeout=1)
+
+        responder.stop()
+
+
+class PreviewEncoder(threading.Thread):
+    """Stream downscaled frames into a long lived ffmpeg process per preview segment."""
 
     def __init__(
         self,
         config: CameraConfig,
-        frame_times: list[float],
         requestor: InterProcessRequestor,
+        out_width: int,
+        out_height: int,
+        cached_frame_times: list[float],
+        frame_index: PreviewFrameIndex,
     ):
-        super().__init__(name=f"{config.name}_preview_converter")
+        super().__init__(name=f"{config.name}_preview_encoder", daemon=True)
         self.config = config
-        self.frame_times = frame_times
         self.requestor = requestor
+        self.out_width = out_width
+        self.out_height = out_height
+        self.cached_frame_times = cached_frame_times
+        self.frame_index = frame_index
+        self.frame_queue: queue.Queue = queue.Queue(maxsize=PREVIEW_WRITE_QUEUE_SIZE)
+        self.process: sp.Popen | None = None
+        self.path = ""
+        self.frame_times: list[float] = []
+        self.last_frame: np.ndarray | None = None
+        self.last_frame_time = 0.0
+        self.last_frame_index = -1
+
+    def write_frame(self, frame_time: float, frame: np.ndarray | None) -> bool:
+        """Queue a downscaled I420 frame, None repeats the last written frame.
+        Returns False if the frame was dropped because the encoder is behind."""
+        try:
+            self.frame_queue.put_nowait((frame_time, frame))
+        except queue.Full:
+            logger.debug(
+                f"Preview encoder for {self.config.name} is falling behind, dropping frame"
+            )
+            return False
+
+        return True
+
+    def end_segment(self) -> None:
+        """Finish the current segment once all queued frames are written."""
+        self.frame_queue.put((None, None))
+
+    def stop(self) -> None:
+        self.frame_queue.put(None)
+        self.join()
+
+    def _start_segment(self, frame_time: float) -> None:
         self.path = os.path.join(
-            CLIPS_DIR,
-            f"previews/{self.config.name}/{self.frame_times[0]}-{self.frame_times[-1]}.mp4",
+            CLIPS_DIR, f"previews/{self.config.name}/{frame_time}-partial.mp4"
         )
 
-        # write a PREVIEW at fps and 1 key frame per clip
-        self.ffmpeg_cmd = parse_preset_hardware_acceleration_encode(
-            config.ffmpeg.ffmpeg_path,
+        # raw frames are written at a constant rate and gaps are filled
+        # by repeating the last frame, so 1 key frame per interval is kept
+        ffmpeg_cmd = parse_preset_hardware_acceleration_encode(
+            self.config.ffmpeg.ffmpeg_path,
             "default",
-            input="-f concat -y -protocol_whitelist pipe,file -safe 0 -threads 1 -i /dev/stdin",
-            output=f"-threads 1 -g {PREVIEW_KEYFRAME_INTERVAL} -bf 0 -b:v {PREVIEW_QUALITY_BIT_RATES[self.config.record.preview.quality]} {FPS_VFR_PARAM} -movflags +faststart -pix_fmt yuv420p {self.path}",
+            input=f"-loglevel error -f rawvideo -pix_fmt yuv420p -video_size {self.out_width}x{self.out_height} -framerate {PREVIEW_STREAM_FPS} -threads 1 -i pipe:",
+            output=f"-threads 1 -g {PREVIEW_KEYFRAME_INTERVAL} -bf 0 -b:v {PREVIEW_QUALITY_BIT_RATES[self.config.record.preview.quality]} -movflags +faststart -pix_fmt yuv420p -y {self.path}",
             type=EncodeTypeEnum.preview,
         )
 
-    def run(self) -> None:
-        # generate input list
-        item_count = len(self.frame_times)
-        playlist = []
-
-        for t_idx in range(0, item_count):
-            if t_idx == item_count - 1:
-                # last frame does not get a duration
-                playlist.append(
-                    f"file '{get_cache_image_name(self.config.name, self.frame_times[t_idx])}'"
+        self.process = sp.Popen(
+            ffmpeg_cmd.split(" "),
+            stdin=sp.PIPE,
+            stdout=sp.DEVNULL,
+            stderr=sp.PIPE,
+            start_new_session=True,
+            preexec_fn=lower_priority,
+        )
+        self.frame_times = []
+        self.last_frame_index = -1
+
+    def _write_frame(self, frame_time: float, frame: np.ndarray | None) -> None:
+        if frame is None:
+            if self.last_frame is None:
+                return
+
+            frame = self.last_frame
+
+            try:
+                shutil.copy(
+                    get_cache_image_name(self.config.name, self.last_frame_time),
+                    get_cache_image_name(self.config.name, frame_time),
                 )
-                continue
+                self.frame_index.add(self.config.name, frame_time)
+            except FileNotFoundError:
+                pass
+        else:
+            # cached stills are still used to scrub the in progress segment
+            if cv2.imwrite(
+                get_cache_image_name(self.config.name, frame_time),
+                cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420),
+                [
+                    int(cv2.IMWRITE_WEBP_QUALITY),
+                    PREVIEW_QUALITY_WEBP[self.config.record.preview.quality],
+                ],
+            ):
+                self.frame_index.add(self.config.name, frame_time)
+
+        self._encode_frame(frame_time, frame)
+
+    def _encode_frame(self, frame_time: float, frame: np.ndarray) -> None:
+        if self.process is None:
+            self._start_segment(frame_time)
+
+        if self.frame_times:
+            frame_index = round((frame_time - self.frame_times[0]) * PREVIEW_STREAM_FPS)
+        else:
+            frame_index = 0
 
-            playlist.append(
-                f"file '{get_cache_image_name(self.config.name, self.frame_times[t_idx])}'"
-            )
-            playlist.append(
-                f"duration {self.frame_times[t_idx + 1] - self.frame_times[t_idx]}"
-            )
+        self.frame_times.append(frame_time)
+
+        if frame_index <= self.last_frame_index:
+            return
 
         try:
-            p = sp.run(
-                self.ffmpeg_cmd.split(" "),
-                input="\n".join(playlist),
-                encoding="ascii",
-                capture_output=True,
-            )
-        except BlockingIOError:
-            logger.warning(
-                f"Failed to create preview for {self.config.name}, retrying..."
-            )
-            time.sleep(2)
-            p = sp.run(
-                self.ffmpeg_cmd.split(" "),
-                input="\n".join(playlist),
-                encoding="ascii",
-                capture_output=True,
-            )
+            # repeat the previous frame until this frame's timestamp is reached
+            for _ in range(self.last_frame_index + 1, frame_index):
+                self.process.stdin.write(self.last_frame.tobytes())
+
+            self.process.stdin.write(frame.tobytes())
+        except BrokenPipeError:
+            logger.error(f"Preview encoder for {self.config.name} exited unexpectedly")
+            self._abort_segment()
+            return
+
+        self.last_frame = frame
+        self.last_frame_time = frame_time
+        self.last_frame_index = frame_index
+
+    def _finish_segment(self) -> None:
+        if self.process is None:
+            return
+
+        try:
+            _, stderr = self.process.communicate(timeout=60)
+        except (sp.TimeoutExpired, ValueError):
+            self._abort_segment()
+            return
 
         start = self.frame_times[0]
         end = self.frame_times[-1]
 
-        if p.returncode == 0:
+        if self.process.returncode == 0:
+            path = os.path.join(
+                CLIPS_DIR, f"previews/{self.config.name}/{start}-{end}.mp4"
+            )
+            os.rename(self.path, path)
             logger.debug("successfully saved preview")
             self.requestor.send_data(
                 INSERT_PREVIEW,
                 {
                     Previews.id.name: f"{self.config.name}_{end}",
                     Previews.camera.name: self.config.name,
-                    Previews.path.name: self.path,
+                    Previews.path.name: path,
                     Previews.start_time.name: start,
                     Previews.end_time.name: end,
                     Previews.duration.name: end - start,
                 },
             )
         else:
-            logger.error(f"Error saving preview for {self.config.name} :: {p.stderr}")
+            logger.error(
+                f"Error saving preview for {self.config.name} :: {stderr.decode(errors='ignore')}"
+            )
+            Path(self.path).unlink(missing_ok=True)
 
         # unlink files from cache
         # don't delete last frame as it will be used as first frame in next segment
         for t in self.frame_times[0:-1]:
             Path(get_cache_image_name(self.config.name, t)).unlink(missing_ok=True)
 
+        self.frame_index.remove(self.config.name, self.frame_times[0:-1])
+
+        self.process = None
+        self.frame_times = []
+
+    def _abort_segment(self) -> None:
+        """Discard the partial segment, cached stills are kept to rebuild it after restart."""
+        if self.process is None:
+            return
+
+        self.process.terminate()
+
+        try:
+            self.process.communicate(timeout=30)
+        except sp.TimeoutExpired:
+            self.process.kill()
+            self.process.communicate()
+
+        Path(self.path).unlink(missing_ok=True)
+        self.process = None
+        self.frame_times = []
+
+    def run(self) -> None:
+        # rebuild the segment from stills cached before a restart
+        for frame_time in self.cached_frame_times:
+            bgr_frame = cv2.imread(get_cache_image_name(self.config.name, frame_time))
+
+            if bgr_frame is None or bgr_frame.shape[:2] != (
+                self.out_height,
+                self.out_width,
+            ):
+                continue
+
+            self._encode_frame(
+                frame_time, cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2YUV_I420)
+            )
+
+        while True:
+            item = self.frame_queue.get()
+
+            if item is None:
+                break
+
+            frame_time, frame = item
+
+            if frame_time is None:
+                self._finish_segment()
+            else:
+                self._write_frame(frame_time, frame)
+
+        self._abort_segment()
+
 
 class PreviewRecorder:
-    def __init__(self, config: CameraConfig) -> None:
+    def __init__(self, config: CameraConfig, frame_index: PreviewFrameIndex) -> None:
         self.config = config
         self.start_time = 0
         self.last_output_time = 0
@@ -242,6 +436,24 @@ class PreviewRecorder:
 
             self.last_output_time = ts
             self.output_frames.append(ts)
+            frame_index.add(config.name, ts)
+
+        # segments that were being encoded when frigate stopped are rebuilt from the cache
+        preview_dir = os.path.join(CLIPS_DIR, f"previews/{config.name}")
+
+        for file in os.listdir(preview_dir):
+            if file.endswith("-partial.mp4"):
+                os.unlink(os.path.join(preview_dir, file))
+
+        self.encoder = PreviewEncoder(
+            self.config,
+            self.requestor,
+            self.out_width,
+            self.out_height,
+            list(self.output_frames),
+            frame_index,
+        )
+        self.encoder.start()
 
     def reset_frame_cache(self, frame_time: float) -> None:
         self.segment_end = (
@@ -291,7 +503,8 @@ class PreviewRecorder:
         return False
 
     def write_frame_to_cache(self, frame_time: float, frame: np.ndarray) -> None:
-        # resize yuv frame
+        """Queue the frame for the encoder and keep its time unless it was dropped."""
+        # resize yuv frame, encoding and writing happens on the encoder thread
         small_frame = np.zeros((self.out_height * 3 // 2, self.out_width), np.uint8)
         copy_yuv_to_position(
             small_frame,
@@ -301,18 +514,9 @@ class PreviewRecorder:
             self.channel_dims,
             cv2.INTER_AREA,
         )
-        small_frame = cv2.cvtColor(
-            small_frame,
-            cv2.COLOR_YUV2BGR_I420,
-        )
-        cv2.imwrite(
-            get_cache_image_name(self.config.name, frame_time),
-            small_frame,
-            [
-                int(cv2.IMWRITE_WEBP_QUALITY),
-                PREVIEW_QUALITY_WEBP[self.config.record.preview.quality],
-            ],
-        )
+
+        if self.encoder.write_frame(frame_time, small_frame):
+            self.output_frames.append(frame_time)
 
     def write_data(
         self,
@@ -332,7 +536,6 @@ class PreviewRecorder:
         # always write the first frame
         if self.start_time == 0:
             self.start_time = frame_time
-            self.output_frames.append(frame_time)
             self.write_frame_to_cache(frame_time, frame)
             return
 
@@ -341,15 +544,10 @@ class PreviewRecorder:
             if len(self.output_frames) > 0:
                 # save last frame to ensure consistent duration
                 if self.config.record:
-                    self.output_frames.append(frame_time)
                     self.write_frame_to_cache(frame_time, frame)
 
                 # write the preview if any frames exist for this hour
-                FFMpegConverter(
-                    self.config,
-                    self.output_frames,
-                    self.requestor,
-                ).start()
+                self.encoder.end_segment()
             else:
                 logger.debug(
                     f"Not saving preview for {self.config.name} because there are no saved frames."
@@ -359,22 +557,18 @@ class PreviewRecorder:
 
             # include first frame to ensure consistent duration
             if self.config.record.enabled:
-                self.output_frames.append(frame_time)
                 self.write_frame_to_cache(frame_time, frame)
 
             return
         elif self.should_write_frame(current_tracked_objects, motion_boxes, frame_time):
-            self.output_frames.append(frame_time)
             self.write_frame_to_cache(frame_time, frame)
             return
 
     def flag_offline(self, frame_time: float) -> None:
         if not self.offline:
-            self.write_frame_to_cache(
+            self.encoder.write_frame(
                 frame_time,
-                get_blank_yuv_frame(
-                    self.config.detect.width, self.config.detect.height
-                ),
+                get_blank_yuv_frame(self.out_width, self.out_height),
             )
             self.offline = True
 
@@ -386,23 +580,16 @@ class PreviewRecorder:
                 self.reset_frame_cache(frame_time)
                 return
 
-            old_frame_path = get_cache_image_name(
-                self.config.name, self.output_frames[-1]
-            )
-            new_frame_path = get_cache_image_name(self.config.name, frame_time)
-            shutil.copy(old_frame_path, new_frame_path)
-
             # save last frame to ensure consistent duration
-            self.output_frames.append(frame_time)
-            FFMpegConverter(
-                self.config,
-                self.output_frames,
-                self.requestor,
-            ).start()
+            if self.encoder.write_frame(frame_time, None):
+                self.output_frames.append(frame_time)
+
+            self.encoder.end_segment()
 
             self.reset_frame_cache(frame_time)
 
     def stop(self) -> None:
+        self.encoder.stop()
         self.config_subscriber.stop()
         self.requestor.stop()
 
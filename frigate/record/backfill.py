@@ -12,7 +12,11 @@ from typing import List, Optional, Tuple
 from peewee import DoesNotExist
 
 from frigate.config import FrigateConfig
-from frigate.const import RECORD_DIR
+from frigate.const import MAX_PLAYLIST_SECONDS, RECORD_DIR
+from frigate.db.rollups import (
+    add_recordings_to_rollup,
+    remove_recordings_from_rollup,
+)
 from frigate.models import Recordings
 from frigate.util.services import get_video_properties
 
@@ -446,6 +450,24 @@ class RecordingBackfillService:
                 end_time = start_time + datetime.timedelta(seconds=duration)
                 file_size_mb = self._get_file_size_mb(file_path)
 
+                # time range queries only look this far back for overlapping segments
+                if duration > MAX_PLAYLIST_SECONDS:
+                    logger.warning(
+                        f"Skipping {file_path}, recordings can be at most {MAX_PLAYLIST_SECONDS} seconds long"
+                    )
+                    files_errors += 1
+                    results.append(
+                        {
+                            "file_path": file_path,
+                            "start_time": start_time.timestamp(),
+                            "end_time": end_time.timestamp(),
+                            "duration": duration,
+                            "file_size_mb": file_size_mb,
+                            "status": "error",
+                        }
+                    )
+                    continue
+
                 # Check if recording already exists in database
                 existing_recording = None
                 try:
@@ -500,6 +522,7 @@ class RecordingBackfillService:
 
                 if existing_recording and force:
                     # Update existing record
+                    remove_recordings_from_rollup([existing_recording.id])
                     Recordings.update(recording_data).where(
                         Recordings.id == existing_recording.id
                     ).execute()
@@ -509,6 +532,10 @@ class RecordingBackfillService:
                     Recordings.insert(recording_data).execute()
                     status = "added"
 
+                add_recordings_to_rollup(
+                    [{field.name: value for field, value in recording_data.items()}]
+                )
+
                 files_added += 1
                 results.append(
                     {
@@ -5,19 +5,42 @@ import itertools
 import logging
 import os
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from multiprocessing.synchronize import Event as MpEvent
 from pathlib import Path
+from typing import Optional
 
+import numpy as np
 from playhouse.sqlite_ext import SqliteExtDatabase
 
-from frigate.config import CameraConfig, FrigateConfig, RetainModeEnum
+from frigate.config import CameraConfig, FrigateConfig
 from frigate.const import CACHE_DIR, CLIPS_DIR, MAX_WAL_SIZE, RECORD_DIR
+from frigate.db.lookups import delete_review_segment_lookups
+from frigate.db.queries import in_values
+from frigate.db.rollups import remove_recordings_from_rollup
 from frigate.models import Previews, Recordings, ReviewSegment, UserReviewStatus
+from frigate.record.retention import (
+    RecordingSegments,
+    get_previews_to_keep,
+    get_recordings_to_keep,
+    get_review_intervals,
+    to_array,
+)
 from frigate.record.util import remove_empty_directories, sync_recordings
 from frigate.util.builtin import clear_and_unlink, get_tomorrow_at_time
 
 logger = logging.getLogger(__name__)
 
+# threads unlinking expired recordings and previews
+MAX_DELETE_WORKERS = 8
+# files unlinked by each task on the delete pool
+DELETE_BATCH_SIZE = 1000
+
+
+def delete_files(paths: list[str]) -> None:
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+
 
 class RecordingCleanup(threading.Thread):
     """Cleanup existing recordings based on retention config."""
@@ -26,6 +49,10 @@ class RecordingCleanup(threading.Thread):
         super().__init__(name="recording_cleanup")
         self.config = config
         self.stop_event = stop_event
+        self.delete_executor = ThreadPoolExecutor(
+            max_workers=MAX_DELETE_WORKERS, thread_name_prefix="recording_cleanup"
+        )
+        self.pending_deletes: list[Future] = []
 
     def clean_tmp_previews(self) -> None:
         """delete any previews in the cache that are more than 1 hour old."""
@@ -98,171 +125,114 @@ class RecordingCleanup(threading.Thread):
                 UserReviewStatus.review_segment
                 << deleted_reviews_list[i : i + max_deletes]
             ).execute()
+            delete_review_segment_lookups(deleted_reviews_list[i : i + max_deletes])
+
+    def delete_files(self, paths: list[str]) -> None:
+        """Unlink the files on the delete pool, in batches."""
+        for i in range(0, len(paths), DELETE_BATCH_SIZE):
+            self.pending_deletes.append(
+                self.delete_executor.submit(
+                    delete_files, paths[i : i + DELETE_BATCH_SIZE]
+                )
+            )
+
+    def wait_for_deletes(self) -> None:
+        """Wait for the files of all cameras to be unlinked."""
+        for future in self.pending_deletes:
+            try:
+                future.result()
+            except OSError as e:
+                logger.warning(f"Failed to delete expired recording files: {e}")
+
+        self.pending_deletes = []
 
     def expire_existing_camera_recordings(
-        self, expire_date: float, config: CameraConfig, reviews: ReviewSegment
+        self,
+        expire_date: float,
+        config: CameraConfig,
+        reviews: list[tuple[float, Optional[float], str]],
     ) -> None:
         """Delete recordings for existing camera based on retention config."""
-        # Get the timestamp for cutoff of retained days
-
-        # Get recordings to check for expiration
-        recordings: Recordings = (
+        recordings = list(
             Recordings.select(
                 Recordings.id,
+                Recordings.path,
                 Recordings.start_time,
                 Recordings.end_time,
-                Recordings.path,
-                Recordings.objects,
                 Recordings.motion,
+                Recordings.objects,
                 Recordings.dBFS,
             )
             .where(
                 Recordings.camera == config.name,
+                # implied by the end time, lets the (camera, start_time) index
+                # be used for both the filter and the order
+                Recordings.start_time < expire_date,
                 Recordings.end_time < expire_date,
             )
             .order_by(Recordings.start_time)
-            .namedtuples()
-            .iterator()
+            .tuples()
         )
 
-        # loop over recordings and see if they overlap with any non-expired reviews
-        # TODO: expire segments based on segment stats according to config
-        review_start = 0
-        deleted_recordings = set()
-        kept_recordings: list[tuple[float, float]] = []
-        recording: Recordings
-        for recording in recordings:
-            keep = False
-            mode = None
-
-            # Special handling for backfill recordings (motion=-1, objects=-1, dBFS=-1)
-            # These should be kept regardless of review segments since they're manually added
-            if (
-                recording.motion == -1
-                and recording.objects == -1
-                and recording.dBFS == -1
-            ):
-                keep = True
-                mode = (
-                    config.record.detections.retain.mode
-                )  # Use detection retention mode for backfill
-                logger.debug(
-                    f"Keeping backfill recording: {recording.id} ({recording.path})"
-                )
-            else:
-                # Now look for a reason to keep this recording segment
-                for idx in range(review_start, len(reviews)):
-                    review: ReviewSegment = reviews[idx]
-                    severity = review.severity
-                    pre_capture = config.record.get_review_pre_capture(severity)
-                    post_capture = config.record.get_review_post_capture(severity)
-
-                    # if the review starts in the future, stop checking reviews
-                    # and let this recording segment expire
-                    if review.start_time - pre_capture > recording.end_time:
-                        keep = False
-                        break
-
-                    # if the review is in progress or ends after the recording starts, keep it
-                    # and stop looking at reviews
-                    if (
-                        review.end_time is None
-                        or review.end_time + post_capture >= recording.start_time
-                    ):
-                        keep = True
-                        mode = (
-                            config.record.alerts.retain.mode
-                            if review.severity == "alert"
-                            else config.record.detections.retain.mode
-                        )
-                        break
-
-                    # if the review ends before this recording segment starts, skip
-                    # this review and check the next review for an overlap.
-                    # since the review and recordings are sorted, we can skip review
-                    # that end before the previous recording segment started on future segments
-                    if review.end_time + post_capture < recording.start_time:
-                        review_start = idx
-
-            # Delete recordings outside of the retention window or based on the retention mode
-            # Note: -1 values indicate backfilled recordings that weren't processed by algorithms
-            if (
-                not keep
-                or (mode == RetainModeEnum.motion and recording.motion == 0)
-                or (mode == RetainModeEnum.active_objects and recording.objects == 0)
-            ):
-                Path(recording.path).unlink(missing_ok=True)
-                deleted_recordings.add(recording.id)
-            else:
-                kept_recordings.append((recording.start_time, recording.end_time))
+        if recordings:
+            ids, paths, *stats = zip(*recordings)
+            segments = RecordingSegments(*map(to_array, stats))
+        else:
+            ids, paths = (), ()
+            segments = RecordingSegments(*(to_array([]) for _ in range(5)))
+
+        # keep segments overlapping a review and matching its retain mode
+        kept = get_recordings_to_keep(
+            config.record, segments, get_review_intervals(reviews)
+        )
+        deleted = np.flatnonzero(~kept)
 
         # expire recordings
-        logger.debug(f"Expiring {len(deleted_recordings)} recordings")
+        logger.debug(f"Expiring {len(deleted)} recordings")
+        self.delete_files([paths[i] for i in deleted])
         # delete up to 100,000 at a time
         max_deletes = 100000
-        deleted_recordings_list = list(deleted_recordings)
+        deleted_recordings_list = [ids[i] for i in deleted]
         for i in range(0, len(deleted_recordings_list), max_deletes):
+            remove_recordings_from_rollup(deleted_recordings_list[i : i + max_deletes])
             Recordings.delete().where(
-                Recordings.id << deleted_recordings_list[i : i + max_deletes]
+                in_values(Recordings.id, deleted_recordings_list[i : i + max_deletes])
             ).execute()
 
-        previews: Previews = (
+        previews = list(
             Previews.select(
                 Previews.id,
+                Previews.path,
                 Previews.start_time,
                 Previews.end_time,
-                Previews.path,
             )
             .where(
                 Previews.camera == config.name,
                 Previews.end_time < expire_date,
             )
-            .order_by(Previews.start_time)
-            .namedtuples()
-            .iterator()
+            .tuples()
         )
 
-        # expire previews
-        recording_start = 0
-        deleted_previews = set()
-        for preview in previews:
-            keep = False
-            # look for a reason to keep this preview
-            for idx in range(recording_start, len(kept_recordings)):
-                start_time, end_time = kept_recordings[idx]
-
-                # if the recording starts in the future, stop checking recordings
-                # and let this preview expire
-                if start_time > preview.end_time:
-                    keep = False
-                    break
-
-                # if the recording ends after the preview starts, keep it
-                # and stop looking at recordings
-                if end_time >= preview.start_time:
-                    keep = True
-                    break
-
-                # if the recording ends before this preview starts, skip
-                # this recording and check the next recording for an overlap.
-                # since the kept recordings and previews are sorted, we can skip recordings
-                # that end before the current preview started
-                if end_time < preview.start_time:
-                    recording_start = idx
-
-            # Delete previews without any relevant recordings
-            if not keep:
-                Path(preview.path).unlink(missing_ok=True)
-                deleted_previews.add(preview.id)
+        if not previews:
+            return
+
+        # delete previews without any kept recordings
+        preview_ids, preview_paths, preview_starts, preview_ends = zip(*previews)
+        deleted = np.flatnonzero(
+            ~get_previews_to_keep(
+                to_array(preview_starts), to_array(preview_ends), segments, kept
+            )
+        )
 
         # expire previews
-        logger.debug(f"Expiring {len(deleted_previews)} previews")
+        logger.debug(f"Expiring {len(deleted)} previews")
+        self.delete_files([preview_paths[i] for i in deleted])
         # delete up to 100,000 at a time
         max_deletes = 100000
-        deleted_previews_list = list(deleted_previews)
+        deleted_previews_list = [preview_ids[i] for i in deleted]
         for i in range(0, len(deleted_previews_list), max_deletes):
             Previews.delete().where(
-                Previews.id << deleted_previews_list[i : i + max_deletes]
+                in_values(Previews.id, deleted_previews_list[i : i + max_deletes])
             ).execute()
 
     def expire_recordings(self) -> None:
@@ -288,18 +258,20 @@ class RecordingCleanup(threading.Thread):
             .iterator()
         )
 
-        deleted_recordings = set()
+        deleted_recordings_list = []
+        deleted_paths = []
         for recording in no_camera_recordings:
-            Path(recording.path).unlink(missing_ok=True)
-            deleted_recordings.add(recording.id)
+            deleted_recordings_list.append(recording.id)
+            deleted_paths.append(recording.path)
 
-        logger.debug(f"Expiring {len(deleted_recordings)} recordings")
+        logger.debug(f"Expiring {len(deleted_recordings_list)} recordings")
+        self.delete_files(deleted_paths)
         # delete up to 100,000 at a time
         max_deletes = 100000
-        deleted_recordings_list = list(deleted_recordings)
         for i in range(0, len(deleted_recordings_list), max_deletes):
+            remove_recordings_from_rollup(deleted_recordings_list[i : i + max_deletes])
             Recordings.delete().where(
-                Recordings.id << deleted_recordings_list[i : i + max_deletes]
+                in_values(Recordings.id, deleted_recordings_list[i : i + max_deletes])
             ).execute()
         logger.debug("End deleted cameras.")
 
@@ -314,7 +286,7 @@ class RecordingCleanup(threading.Thread):
             expire_date = (now - datetime.timedelta(days=expire_days)).timestamp()
 
             # Get all the reviews to check against
-            reviews: ReviewSegment = (
+            reviews = list(
                 ReviewSegment.select(
                     ReviewSegment.start_time,
                     ReviewSegment.end_time,
@@ -326,13 +298,14 @@ class RecordingCleanup(threading.Thread):
                     # before the expire date are included
                     ReviewSegment.start_time < expire_date,
                 )
-                .order_by(ReviewSegment.start_time)
-                .namedtuples()
+                .tuples()
             )
 
             self.expire_existing_camera_recordings(expire_date, config, reviews)
             logger.debug(f"End camera: {camera}.")
 
+        # files of all cameras are unlinked in parallel while the next camera is checked
+        self.wait_for_deletes()
         logger.debug("End all cameras.")
         logger.debug("End expire recordings.")
 
@@ -345,6 +318,7 @@ class RecordingCleanup(threading.Thread):
         # Expire tmp clips every minute, recordings and clean directories every hour.
         for counter in itertools.cycle(range(self.config.record.expire_interval)):
             if self.stop_event.wait(60):
+                self.delete_executor.shutdown()
                 logger.info("Exiting recording cleanup...")
                 break
 
@@ -3,10 +3,13 @@
 import datetime
 import logging
 import os
+import queue
 import random
+import re
 import shutil
 import string
 import subprocess as sp
+import tempfile
 import threading
 from enum import Enum
 from pathlib import Path
@@ -14,29 +17,42 @@ from typing import Optional
 
 from peewee import DoesNotExist
 
+from frigate.comms.preview_updater import (
+    PreviewFramesRequestor,
+    get_preview_frame_files,
+)
 from frigate.config import FfmpegConfig, FrigateConfig
 from frigate.const import (
     CACHE_DIR,
     CLIPS_DIR,
     EXPORT_DIR,
-    MAX_PLAYLIST_SECONDS,
-    PREVIEW_FRAME_TYPE,
 )
+from frigate.db.queries import overlaps_time_range
 from frigate.ffmpeg_presets import (
     EncodeTypeEnum,
     parse_preset_hardware_acceleration_encode,
 )
 from frigate.models import Export, Previews, Recordings
 from frigate.util.builtin import is_current_hour
+from frigate.util.services import lower_priority
 
 logger = logging.getLogger(__name__)
 
 
 TIMELAPSE_DATA_INPUT_ARGS = "-an -skip_frame nokey"
 
+# exports waiting for a free worker, further exports are rejected
+MAX_QUEUED_EXPORTS = 20
+
+
+def get_timelapse_factor(timelapse_args: str) -> float:
+    """Get how much the timelapse args speed up the recordings."""
+    match = re.search(r"setpts=([\d.]+)\*PTS", timelapse_args)
 
-def lower_priority():
-    os.nice(10)
+    try:
+        return float(match.group(1)) if match else 1.0
+    except ValueError:
+        return 1.0
 
 
 class PlaybackFactorEnum(str, Enum):
@@ -49,7 +65,7 @@ class PlaybackSourceEnum(str, Enum):
     preview = "preview"
 
 
-class RecordingExporter(threading.Thread):
+class RecordingExporter:
     """Exports a specific set of recordings for a camera to storage as a single file."""
 
     def __init__(
@@ -63,8 +79,8 @@ class RecordingExporter(threading.Thread):
         end_time: int,
         playback_factor: PlaybackFactorEnum,
         playback_source: PlaybackSourceEnum,
+        preview_frames: Optional[PreviewFramesRequestor] = None,
     ) -> None:
-        super().__init__()
         self.config = config
         self.export_id = id
         self.camera = camera
@@ -74,6 +90,22 @@ class RecordingExporter(threading.Thread):
         self.end_time = end_time
         self.playback_factor = playback_factor
         self.playback_source = playback_source
+        self.preview_frames = preview_frames
+        self.export_name = (
+            self.user_provided_name
+            or f"{self.camera.replace('_', ' ')} {self.get_datetime_from_timestamp(self.start_time)} {self.get_datetime_from_timestamp(self.end_time)}"
+        )
+        filename_start_datetime = datetime.datetime.fromtimestamp(
+            self.start_time
+        ).strftime("%Y%m%d_%H%M%S")
+        filename_end_datetime = datetime.datetime.fromtimestamp(self.end_time).strftime(
+            "%Y%m%d_%H%M%S"
+        )
+        cleaned_export_id = self.export_id.split("_")[-1]
+        self.video_path = f"{EXPORT_DIR}/{self.camera}_{filename_start_datetime}-{filename_end_datetime}_{cleaned_export_id}.mp4"
+        # seconds of source video in the export and the share of it written so far
+        self.duration = end_time - start_time
+        self.progress = 0.0
 
         # ensure export thumb dir
         Path(os.path.join(CLIPS_DIR, "export")).mkdir(exist_ok=True)
@@ -108,12 +140,7 @@ class RecordingExporter(threading.Thread):
                         Previews.end_time,
                     )
                     .where(
-                        Previews.start_time.between(self.start_time, self.end_time)
-                        | Previews.end_time.between(self.start_time, self.end_time)
-                        | (
-                            (self.start_time > Previews.start_time)
-                            & (self.end_time < Previews.end_time)
-                        )
+                        overlaps_time_range(Previews, self.start_time, self.end_time)
                     )
                     .where(Previews.camera == self.camera)
                     .limit(1)
@@ -153,69 +180,56 @@ class RecordingExporter(threading.Thread):
         else:
             # need to generate from existing images
             preview_dir = os.path.join(CACHE_DIR, "preview_frames")
-            file_start = f"preview_{self.camera}"
-            start_file = f"{file_start}-{self.start_time}.{PREVIEW_FRAME_TYPE}"
-            end_file = f"{file_start}-{self.end_time}.{PREVIEW_FRAME_TYPE}"
-            selected_preview = None
-
-            for file in sorted(os.listdir(preview_dir)):
-                if not file.startswith(file_start):
-                    continue
-
-                if file < start_file:
-                    continue
-
-                if file > end_file:
-                    break
-
-                selected_preview = os.path.join(preview_dir, file)
-                break
+            selected_previews = get_preview_frame_files(
+                self.preview_frames, self.camera, self.start_time, self.end_time
+            )
 
-            if not selected_preview:
+            if not selected_previews:
                 return ""
 
-            shutil.copyfile(selected_preview, thumb_path)
+            shutil.copyfile(os.path.join(preview_dir, selected_previews[0]), thumb_path)
 
         return thumb_path
 
     def get_record_export_command(self, video_path: str) -> list[str]:
-        if (self.end_time - self.start_time) <= MAX_PLAYLIST_SECONDS:
-            playlist_lines = f"http://127.0.0.1:5000/vod/{self.camera}/start/{self.start_time}/end/{self.end_time}/index.m3u8"
-            ffmpeg_input = (
-                f"-y -protocol_whitelist pipe,file,http,tcp -i {playlist_lines}"
-            )
-        else:
-            playlist_lines = []
+        playlist_lines = []
 
-            # get full set of recordings
-            export_recordings = (
-                Recordings.select(
-                    Recordings.start_time,
-                    Recordings.end_time,
-                )
-                .where(
-                    Recordings.start_time.between(self.start_time, self.end_time)
-                    | Recordings.end_time.between(self.start_time, self.end_time)
-                    | (
-                        (self.start_time > Recordings.start_time)
-                        & (self.end_time < Recordings.end_time)
-                    )
-                )
-                .where(Recordings.camera == self.camera)
-                .order_by(Recordings.start_time.asc())
+        # the segments are read from disk directly, trimmed to the export range
+        export_recordings = (
+            Recordings.select(
+                Recordings.path,
+                Recordings.start_time,
+                Recordings.end_time,
             )
+            .where(overlaps_time_range(Recordings, self.start_time, self.end_time))
+            .where(Recordings.camera == self.camera)
+            .order_by(Recordings.start_time.asc())
+            .namedtuples()
+            .iterator()
+        )
+
+        self.duration = 0
+        recording: Recordings
+        for recording in export_recordings:
+            playlist_lines.append(f"file '{recording.path}'")
 
-            # Use pagination to process records in chunks
-            page_size = 1000
-            num_pages = (export_recordings.count() + page_size - 1) // page_size
+            if recording.start_time < self.start_time:
+                playlist_lines.append(
+                    f"inpoint {self.start_time - recording.start_time:.3f}"
+                )
 
-            for page in range(1, num_pages + 1):
-                playlist = export_recordings.paginate(page, page_size)
+            if recording.end_time > self.end_time:
                 playlist_lines.append(
-                    f"file 'http://127.0.0.1:5000/vod/{self.camera}/start/{float(playlist[0].start_time)}/end/{float(playlist[-1].end_time)}/index.m3u8'"
+                    f"outpoint {self.end_time - recording.start_time:.3f}"
                 )
 
-            ffmpeg_input = "-y -protocol_whitelist pipe,file,http,tcp -f concat -safe 0 -i /dev/stdin"
+            self.duration += min(recording.end_time, self.end_time) - max(
+                recording.start_time, self.start_time
+            )
+
+        ffmpeg_input = (
+            "-y -protocol_whitelist pipe,file -f concat -safe 0 -i /dev/stdin"
+        )
 
         if self.playback_factor == PlaybackFactorEnum.realtime:
             ffmpeg_cmd = (
@@ -247,20 +261,10 @@ class RecordingExporter(threading.Thread):
         if is_current_hour(self.start_time):
             # get list of current preview frames
             preview_dir = os.path.join(CACHE_DIR, "preview_frames")
-            file_start = f"preview_{self.camera}"
-            start_file = f"{file_start}-{self.start_time}.{PREVIEW_FRAME_TYPE}"
-            end_file = f"{file_start}-{self.end_time}.{PREVIEW_FRAME_TYPE}"
-
-            for file in sorted(os.listdir(preview_dir)):
-                if not file.startswith(file_start):
-                    continue
-
-                if file < start_file:
-                    continue
-
-                if file > end_file:
-                    break
 
+            for file in get_preview_frame_files(
+                self.preview_frames, self.camera, self.start_time, self.end_time
+            ):
                 playlist_lines.append(f"file '{os.path.join(preview_dir, file)}'")
                 playlist_lines.append("duration 0.12")
 
@@ -276,14 +280,7 @@ class RecordingExporter(threading.Thread):
                 Previews.start_time,
                 Previews.end_time,
             )
-            .where(
-                Previews.start_time.between(self.start_time, self.end_time)
-                | Previews.end_time.between(self.start_time, self.end_time)
-                | (
-                    (self.start_time > Previews.start_time)
-                    & (self.end_time < Previews.end_time)
-                )
-            )
+            .where(overlaps_time_range(Previews, self.start_time, self.end_time))
             .where(Previews.camera == self.camera)
             .order_by(Previews.start_time.asc())
             .namedtuples()
@@ -329,62 +326,91 @@ class RecordingExporter(threading.Thread):
 
         return ffmpeg_cmd, playlist_lines
 
-    def run(self) -> None:
-        logger.debug(
-            f"Beginning export for {self.camera} from {self.start_time} to {self.end_time}"
-        )
-        export_name = (
-            self.user_provided_name
-            or f"{self.camera.replace('_', ' ')} {self.get_datetime_from_timestamp(self.start_time)} {self.get_datetime_from_timestamp(self.end_time)}"
-        )
-        filename_start_datetime = datetime.datetime.fromtimestamp(
-            self.start_time
-        ).strftime("%Y%m%d_%H%M%S")
-        filename_end_datetime = datetime.datetime.fromtimestamp(self.end_time).strftime(
-            "%Y%m%d_%H%M%S"
-        )
-        cleaned_export_id = self.export_id.split("_")[-1]
-        video_path = f"{EXPORT_DIR}/{self.camera}_{filename_start_datetime}-{filename_end_datetime}_{cleaned_export_id}.mp4"
-        thumb_path = self.save_thumbnail(self.export_id)
-
+    def insert(self) -> None:
+        """Add the export as in progress so it is listed while queued."""
         Export.insert(
             {
                 Export.id: self.export_id,
                 Export.camera: self.camera,
-                Export.name: export_name,
+                Export.name: self.export_name,
                 Export.date: self.start_time,
-                Export.video_path: video_path,
-                Export.thumb_path: thumb_path,
+                Export.video_path: self.video_path,
+                Export.thumb_path: os.path.join(
+                    CLIPS_DIR, f"export/{self.export_id}.webp"
+                ),
                 Export.in_progress: True,
             }
         ).execute()
 
-        try:
-            if self.playback_source == PlaybackSourceEnum.recordings:
-                ffmpeg_cmd, playlist_lines = self.get_record_export_command(video_path)
-            else:
-                ffmpeg_cmd, playlist_lines = self.get_preview_export_command(video_path)
-        except DoesNotExist:
-            return
+    def discard(self) -> None:
+        """Remove the export and its files after it failed."""
+        Path(self.video_path).unlink(missing_ok=True)
+        Path(os.path.join(CLIPS_DIR, f"export/{self.export_id}.webp")).unlink(
+            missing_ok=True
+        )
+        Export.delete().where(Export.id == self.export_id).execute()
 
-        p = sp.run(
-            ffmpeg_cmd,
-            input="\n".join(playlist_lines),
-            encoding="ascii",
-            preexec_fn=lower_priority,
-            capture_output=True,
+    def get_output_duration(self) -> float:
+        if self.playback_factor == PlaybackFactorEnum.timelapse_25x:
+            return self.duration * get_timelapse_factor(
+                self.config.cameras[self.camera].record.export.timelapse_args
+            )
+
+        return self.duration
+
+    def run(self) -> None:
+        logger.debug(
+            f"Beginning export for {self.camera} from {self.start_time} to {self.end_time}"
         )
+        video_path = self.video_path
+        thumb_path = self.save_thumbnail(self.export_id)
+        Export.update({Export.thumb_path: thumb_path}).where(
+            Export.id == self.export_id
+        ).execute()
+
+        if self.playback_source == PlaybackSourceEnum.recordings:
+            ffmpeg_cmd, playlist_lines = self.get_record_export_command(video_path)
+        else:
+            ffmpeg_cmd, playlist_lines = self.get_preview_export_command(video_path)
+
+        # report progress on stdout, stderr is only read when the export fails
+        ffmpeg_cmd[1:1] = ["-progress", "pipe:1", "-nostats"]
+        output_duration = self.get_output_duration()
+
+        with tempfile.TemporaryFile() as stderr:
+            p = sp.Popen(
+                ffmpeg_cmd,
+                stdin=sp.PIPE,
+                stdout=sp.PIPE,
+                stderr=stderr,
+                encoding="ascii",
+                preexec_fn=lambda: lower_priority(
+                    self.config.cameras[self.camera].record.export.io_priority
+                ),
+            )
+            # the concat demuxer reads the whole list before writing any output
+            p.stdin.write("\n".join(playlist_lines))
+            p.stdin.close()
+
+            for line in p.stdout:
+                key, _, value = line.strip().partition("=")
+
+                if key == "out_time_us" and value.isdigit() and output_duration > 0:
+                    self.progress = min(1.0, int(value) / 1000000 / output_duration)
+
+            p.wait()
+            stderr.seek(0)
+            error = stderr.read().decode(errors="replace")
 
         if p.returncode != 0:
             logger.error(
                 f"Failed to export {self.playback_source.value} for command {' '.join(ffmpeg_cmd)}"
             )
-            logger.error(p.stderr)
-            Path(video_path).unlink(missing_ok=True)
-            Export.delete().where(Export.id == self.export_id).execute()
-            Path(thumb_path).unlink(missing_ok=True)
+            logger.error(error)
+            self.discard()
             return
         else:
+            self.progress = 1.0
             Export.update({Export.in_progress: False}).where(
                 Export.id == self.export_id
             ).execute()
@@ -392,6 +418,60 @@ class RecordingExporter(threading.Thread):
         logger.debug(f"Finished exporting {video_path}")
 
 
+class ExportQueue:
+    """Runs queued exports in the background, a limited number at a time."""
+
+    def __init__(self, config: FrigateConfig) -> None:
+        self.config = config
+        self.jobs: queue.Queue[RecordingExporter] = queue.Queue(MAX_QUEUED_EXPORTS)
+        self.lock = threading.Lock()
+        # queued and running exports by id
+        self.exports: dict[str, RecordingExporter] = {}
+        self.workers: list[threading.Thread] = []
+
+    def submit(self, exporter: RecordingExporter) -> bool:
+        """Queue an export, False when too many exports are already waiting.
+        All cameras share the queue so max_concurrent is only read globally."""
+        with self.lock:
+            if self.jobs.full():
+                return False
+
+            if not self.workers:
+                for i in range(self.config.record.export.max_concurrent):
+                    worker = threading.Thread(
+                        name=f"exporter:{i}", target=self.run_exports, daemon=True
+                    )
+                    worker.start()
+                    self.workers.append(worker)
+
+            exporter.insert()
+            self.exports[exporter.export_id] = exporter
+            self.jobs.put_nowait(exporter)
+
+        return True
+
+    def get_progress(self, export_id: str) -> Optional[float]:
+        """Get the share of a queued or running export that has been written."""
+        with self.lock:
+            exporter = self.exports.get(export_id)
+
+        return exporter.progress if exporter else None
+
+    def run_exports(self) -> None:
+        while True:
+            exporter = self.jobs.get()
+
+            try:
+                exporter.run()
+            except Exception:
+                logger.exception(f"Failed to export {exporter.export_id}")
+                # don't leave the export listed as in progress forever
+                exporter.discard()
+            finally:
+                with self.lock:
+                    self.exports.pop(exporter.export_id, None)
+
+
 def migrate_exports(ffmpeg: FfmpegConfig, camera_names: list[str]):
     Path(os.path.join(CLIPS_DIR, "export")).mkdir(exist_ok=True)
 
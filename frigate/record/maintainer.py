@@ -16,6 +16,7 @@ from typing import Any, Optional, Tuple
 import numpy as np
 import psutil
 
+from frigate.camera import CameraMetrics
 from frigate.comms.config_updater import ConfigSubscriber
 from frigate.comms.detections_updater import DetectionSubscriber, DetectionTypeEnum
 from frigate.comms.inter_process import InterProcessRequestor
@@ -26,7 +27,6 @@ from frigate.comms.recordings_updater import (
 from frigate.config import FrigateConfig, RetainModeEnum
 from frigate.const import (
     CACHE_DIR,
-    CACHE_SEGMENT_FORMAT,
     FAST_QUEUE_TIMEOUT,
     INSERT_MANY_RECORDINGS,
     MAX_SEGMENT_DURATION,
@@ -34,6 +34,7 @@ from frigate.const import (
     RECORD_DIR,
 )
 from frigate.models import Recordings, ReviewSegment
+from frigate.record.segment_index import publish_cache_segments, scan_cache_segments
 from frigate.review.types import SeverityEnum
 from frigate.util.services import get_video_properties
 
@@ -65,14 +66,23 @@ class SegmentInfo:
 
 
 class RecordingMaintainer(threading.Thread):
-    def __init__(self, config: FrigateConfig, stop_event: MpEvent):
+    def __init__(
+        self,
+        config: FrigateConfig,
+        camera_metrics: dict[str, CameraMetrics],
+        stop_event: MpEvent,
+    ):
         super().__init__(name="recording_maintainer")
         self.config = config
+        self.camera_metrics = camera_metrics
 
         # create communication for retained recordings
         self.requestor = InterProcessRequestor()
         self.config_subscriber = ConfigSubscriber("config/record/")
-        self.detection_subscriber = DetectionSubscriber(DetectionTypeEnum.all)
+        self.detection_subscriber = DetectionSubscriber(
+            DetectionTypeEnum.all,
+            object_fields=("false_positive", "motionless_count"),
+        )
         self.recordings_publisher = RecordingsDataPublisher(
             RecordingsDataTypeEnum.recordings_available_through
         )
@@ -83,13 +93,9 @@ class RecordingMaintainer(threading.Thread):
         self.end_time_cache: dict[str, Tuple[datetime.datetime, float]] = {}
 
     async def move_files(self) -> None:
-        cache_files = [
-            d
-            for d in os.listdir(CACHE_DIR)
-            if os.path.isfile(os.path.join(CACHE_DIR, d))
-            and d.endswith(".mp4")
-            and not d.startswith("preview_")
-        ]
+        # the one scan of the cache, shared with the camera watchdogs
+        cached_segments = scan_cache_segments()
+        publish_cache_segments(cached_segments, self.camera_metrics)
 
         files_in_use = []
         for process in psutil.process_iter():
@@ -104,37 +110,21 @@ class RecordingMaintainer(threading.Thread):
             except psutil.Error:
                 continue
 
-        # group recordings by camera
+        # group recordings by camera, skipping files currently in use
         grouped_recordings: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
-        for cache in cache_files:
-            # Skip files currently in use
-            if cache in files_in_use:
-                continue
-
-            cache_path = os.path.join(CACHE_DIR, cache)
-            basename = os.path.splitext(cache)[0]
-            camera, date = basename.rsplit("@", maxsplit=1)
+        for camera, segments in cached_segments.items():
+            recordings = [
+                s
+                for s in segments
+                if os.path.basename(s["cache_path"]) not in files_in_use
+            ]
 
-            # important that start_time is utc because recordings are stored and compared in utc
-            start_time = datetime.datetime.strptime(
-                date, CACHE_SEGMENT_FORMAT
-            ).astimezone(datetime.timezone.utc)
-
-            grouped_recordings[camera].append(
-                {
-                    "cache_path": cache_path,
-                    "start_time": start_time,
-                }
-            )
+            if recordings:
+                grouped_recordings[camera] = recordings
 
         # delete all cached files past the most recent MAX_SEGMENTS_IN_CACHE
         keep_count = MAX_SEGMENTS_IN_CACHE
         for camera in grouped_recordings.keys():
-            # sort based on start time
-            grouped_recordings[camera] = sorted(
-                grouped_recordings[camera], key=lambda s: s["start_time"]
-            )
-
             camera_info = self.object_recordings_info[camera]
             most_recently_processed_frame_time = (
                 camera_info[-1][0] if len(camera_info) > 0 else 0
@@ -10,6 +10,7 @@ from typing import Optional
 from playhouse.sqliteq import SqliteQueueDatabase
 from setproctitle import setproctitle
 
+from frigate.camera import CameraMetrics
 from frigate.config import FrigateConfig
 from frigate.models import Recordings, ReviewSegment
 from frigate.record.maintainer import RecordingMaintainer
@@ -18,7 +19,9 @@ from frigate.util.services import listen
 logger = logging.getLogger(__name__)
 
 
-def manage_recordings(config: FrigateConfig) -> None:
+def manage_recordings(
+    config: FrigateConfig, camera_metrics: dict[str, CameraMetrics]
+) -> None:
     stop_event = mp.Event()
 
     def receiveSignal(signalNumber: int, frame: Optional[FrameType]) -> None:
@@ -34,7 +37,7 @@ def manage_recordings(config: FrigateConfig) -> None:
     db = SqliteQueueDatabase(
         config.database.path,
         pragmas={
-            "auto_vacuum": "FULL",  # Does not defragment database
+            "auto_vacuum": "INCREMENTAL",  # Free pages are reclaimed by the database maintainer
             "cache_size": -512 * 1000,  # 512MB of cache
             "synchronous": "NORMAL",  # Safe when using WAL https://www.sqlite.org/pragma.html#pragma_synchronous
         },
@@ -45,6 +48,7 @@ def manage_recordings(config: FrigateConfig) -> None:
 
     maintainer = RecordingMaintainer(
         config,
+        camera_metrics,
         stop_event,
     )
     maintainer.start()
@@ -0,0 +1,149 @@
+"""Decide which expired recordings and previews to keep.
+
+The decisions are made for all the segments of a camera at once by
+merging the review intervals and searching them with numpy, instead of
+walking the recordings and reviews one at a time.
+"""
+
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+from frigate.config import RecordConfig, RetainModeEnum
+from frigate.review.types import SeverityEnum
+
+
+class RecordingSegments(NamedTuple):
+    start_time: np.ndarray
+    end_time: np.ndarray
+    motion: np.ndarray
+    objects: np.ndarray
+    dBFS: np.ndarray
+
+
+class ReviewIntervals(NamedTuple):
+    start_time: np.ndarray
+    # reviews in progress end at inf
+    end_time: np.ndarray
+    severity: np.ndarray
+
+
+def to_array(values: list[Optional[Any]]) -> np.ndarray:
+    """Convert db values to floats, None becomes nan."""
+    return np.array(values, dtype=np.float64).reshape(-1)
+
+
+def get_review_intervals(
+    reviews: list[tuple[float, Optional[float], str]],
+) -> ReviewIntervals:
+    """Convert (start_time, end_time, severity) rows to arrays."""
+    if not reviews:
+        return ReviewIntervals(to_array([]), to_array([]), np.array([], dtype=str))
+
+    start_times, end_times, severities = zip(*reviews)
+    return ReviewIntervals(
+        to_array(start_times),
+        np.nan_to_num(to_array(end_times), nan=np.inf),
+        np.array(severities, dtype=str),
+    )
+
+
+def merge_intervals(
+    starts: np.ndarray, ends: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge intervals into disjoint intervals sorted by start."""
+    if len(starts) == 0:
+        return starts, ends
+
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    # furthest end of the intervals so far
+    ends = np.maximum.accumulate(ends[order])
+    # an interval starting after every previous one ended starts a new group
+    first = np.empty(len(starts), dtype=bool)
+    first[0] = True
+    first[1:] = starts[1:] > ends[:-1]
+    last = np.append(np.flatnonzero(first)[1:] - 1, len(starts) - 1)
+    return starts[first], ends[last]
+
+
+def overlaps_any(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    interval_starts: np.ndarray,
+    interval_ends: np.ndarray,
+) -> np.ndarray:
+    """Mask of the [start, end] ranges that overlap any of the intervals."""
+    merged_starts, merged_ends = merge_intervals(interval_starts, interval_ends)
+
+    if len(merged_starts) == 0:
+        return np.zeros(len(starts), dtype=bool)
+
+    # the last merged interval starting before the range ends reaches
+    # further than any before it, so only it needs to be checked
+    idx = np.searchsorted(merged_starts, ends, side="right") - 1
+    return (idx >= 0) & (merged_ends[np.maximum(idx, 0)] >= starts)
+
+
+def get_segments_matching_mode(
+    segments: RecordingSegments, mode: RetainModeEnum
+) -> np.ndarray:
+    """Mask of the segments with the stats the retain mode keeps."""
+    if mode == RetainModeEnum.motion:
+        return segments.motion != 0
+
+    if mode == RetainModeEnum.active_objects:
+        return segments.objects != 0
+
+    return np.ones(len(segments.start_time), dtype=bool)
+
+
+def get_recordings_to_keep(
+    record_config: RecordConfig,
+    segments: RecordingSegments,
+    reviews: ReviewIntervals,
+) -> np.ndarray:
+    """Mask of the expired segments kept for a review based on its retain mode."""
+    # backfilled recordings weren't processed by the detectors and are always kept
+    keep = (segments.motion == -1) & (segments.objects == -1) & (segments.dBFS == -1)
+
+    for severity, severity_mask in (
+        (SeverityEnum.alert, reviews.severity == SeverityEnum.alert.value),
+        (SeverityEnum.detection, reviews.severity != SeverityEnum.alert.value),
+    ):
+        if not severity_mask.any():
+            continue
+
+        review_config = (
+            record_config.alerts
+            if severity == SeverityEnum.alert
+            else record_config.detections
+        )
+        in_review = overlaps_any(
+            segments.start_time,
+            segments.end_time,
+            reviews.start_time[severity_mask]
+            - record_config.get_review_pre_capture(severity),
+            reviews.end_time[severity_mask]
+            + record_config.get_review_post_capture(severity),
+        )
+        keep |= in_review & get_segments_matching_mode(
+            segments, review_config.retain.mode
+        )
+
+    return keep
+
+
+def get_previews_to_keep(
+    preview_starts: np.ndarray,
+    preview_ends: np.ndarray,
+    segments: RecordingSegments,
+    kept: np.ndarray,
+) -> np.ndarray:
+    """Mask of the previews overlapping a kept recording."""
+    return overlaps_any(
+        preview_starts,
+        preview_ends,
+        segments.start_time[kept],
+        segments.end_time[kept],
+    )
@@ -0,0 +1,80 @@
+"""Index of the recording segments in the cache."""
+
+import datetime
+import os
+import time
+from collections import defaultdict
+from multiprocessing.sharedctypes import Synchronized
+from typing import Any
+
+from frigate.camera import CameraMetrics
+from frigate.const import CACHE_DIR, CACHE_SEGMENT_FORMAT
+
+# the published segment times are only used while the cache is scanned regularly
+MAX_SCAN_AGE = 30
+
+
+def scan_cache_segments() -> dict[str, list[dict[str, Any]]]:
+    """Get the recording segments in the cache by camera, sorted by start time."""
+    grouped_segments: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+
+    with os.scandir(CACHE_DIR) as entries:
+        for entry in entries:
+            if (
+                not entry.name.endswith(".mp4")
+                or entry.name.startswith("preview_")
+                or not entry.is_file()
+            ):
+                continue
+
+            basename = os.path.splitext(entry.name)[0]
+            camera, date = basename.rsplit("@", maxsplit=1)
+
+            # important that start_time is utc because recordings are stored and compared in utc
+            start_time = datetime.datetime.strptime(
+                date, CACHE_SEGMENT_FORMAT
+            ).astimezone(datetime.timezone.utc)
+
+            grouped_segments[camera].append(
+                {"cache_path": entry.path, "start_time": start_time}
+            )
+
+    for segments in grouped_segments.values():
+        segments.sort(key=lambda s: s["start_time"])
+
+    return grouped_segments
+
+
+def publish_cache_segments(
+    grouped_segments: dict[str, list[dict[str, Any]]],
+    camera_metrics: dict[str, CameraMetrics],
+) -> None:
+    """Share the newest cached segment of each camera with the camera processes."""
+    now = time.time()
+
+    for camera, metrics in camera_metrics.items():
+        segments = grouped_segments.get(camera)
+
+        if segments:
+            metrics.cache_segment_time.value = segments[-1]["start_time"].timestamp()
+
+        metrics.cache_scan_time.value = now
+
+
+def get_newest_segment_time(
+    camera: str, cache_segment_time: Synchronized, cache_scan_time: Synchronized
+) -> datetime.datetime | None:
+    """Get the start of the newest cached segment for a camera.
+
+    Uses the times published by the recording maintainer and only scans the
+    cache itself when the maintainer has not scanned it recently."""
+    if time.time() - cache_scan_time.value < MAX_SCAN_AGE:
+        if cache_segment_time.value == 0:
+            return None
+
+        return datetime.datetime.fromtimestamp(
+            cache_segment_time.value, datetime.timezone.utc
+        )
+
+    segments = scan_cache_segments().get(camera)
+    return segments[-1]["start_time"] if segments else None
@@ -3,14 +3,23 @@
 import datetime
 import logging
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
 
 from peewee import DatabaseError, chunked
 
 from frigate.const import RECORD_DIR
-from frigate.models import Recordings, RecordingsToDelete
+from frigate.db.queries import in_values
+from frigate.db.rollups import remove_recordings_from_rollup
+from frigate.models import Recordings
 
 logger = logging.getLogger(__name__)
 
+# threads scanning the hour directories of the recordings
+MAX_SCAN_WORKERS = 8
+
 
 def remove_empty_directories(directory: str) -> None:
     # list all directories recursively and sort them by path,
@@ -28,120 +37,191 @@ def remove_empty_directories(directory: str) -> None:
             os.rmdir(path)
 
 
-def sync_recordings(limited: bool) -> None:
-    """Check the db for stale recordings entries that don't exist in the filesystem."""
+def _scan_files(directory: str, since: Optional[str]) -> list[str]:
+    """Get the files in directory and its subdirectories, only the files in
+    directories after since when it is set."""
+    files = []
+    directories = [directory]
 
-    def delete_db_entries_without_file(check_timestamp: float) -> bool:
-        """Delete db entries where file was deleted outside of frigate."""
+    while directories:
+        current = directories.pop()
+        include_files = since is None or current > since
 
-        if limited:
-            recordings = Recordings.select(Recordings.id, Recordings.path).where(
-                Recordings.start_time >= check_timestamp
-            )
-        else:
-            # get all recordings in the db
-            recordings = Recordings.select(Recordings.id, Recordings.path)
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # the subdirectories of since are after it
+                        if not entry.is_symlink() and (
+                            since is None
+                            or entry.path >= since
+                            or since.startswith(f"{entry.path}/")
+                        ):
+                            directories.append(entry.path)
+                    elif include_files:
+                        files.append(entry.path)
+        except FileNotFoundError:
+            # removed while scanning
+            continue
 
-        # Use pagination to process records in chunks
-        page_size = 1000
-        num_pages = (recordings.count() + page_size - 1) // page_size
-        recordings_to_delete = set()
+    return files
 
-        for page in range(num_pages):
-            for recording in recordings.paginate(page, page_size):
-                if not os.path.exists(recording.path):
-                    recordings_to_delete.add(recording.id)
 
-        if len(recordings_to_delete) == 0:
-            return True
+def get_recording_files(since: Optional[str] = None) -> list[str]:
+    """Get the sorted recording files on disk, scanning the hour directories
+    in parallel, only the files in directories after since when it is set."""
+    files = []
+    hour_directories = []
 
-        logger.info(
-            f"Deleting {len(recordings_to_delete)} recording DB entries with missing files"
-        )
+    # recordings are stored in RECORD_DIR/<date>/<hour>/<camera>
+    for directory in [RECORD_DIR] + sorted(
+        entry.path
+        for entry in os.scandir(RECORD_DIR)
+        if entry.is_dir() and not entry.is_symlink()
+    ):
+        for entry in os.scandir(directory):
+            if entry.is_dir():
+                if directory != RECORD_DIR and not entry.is_symlink():
+                    hour_directories.append(entry.path)
+            elif since is None or directory > since:
+                files.append(entry.path)
 
-        # convert back to list of dictionaries for insertion
-        recordings_to_delete = [
-            {"id": recording_id} for recording_id in recordings_to_delete
-        ]
+    if since is not None:
+        hour_directories = [d for d in hour_directories if d >= since]
 
-        if float(len(recordings_to_delete)) / max(1, recordings.count()) > 0.5:
-            logger.warning(
-                f"Deleting {(float(len(recordings_to_delete)) / recordings.count()):2f}% of recordings DB entries, could be due to configuration error. Aborting..."
-            )
-            return False
+    with ThreadPoolExecutor(
+        max_workers=MAX_SCAN_WORKERS, thread_name_prefix="recording_sync"
+    ) as executor:
+        for hour_files in executor.map(
+            lambda directory: _scan_files(directory, since), hour_directories
+        ):
+            files.extend(hour_files)
 
-        # create a temporary table for deletion
-        RecordingsToDelete.create_table(temporary=True)
+    files.sort()
+    return files
 
-        # insert ids to the temporary table
-        max_inserts = 1000
-        for batch in chunked(recordings_to_delete, max_inserts):
-            RecordingsToDelete.insert_many(batch).execute()
 
-        try:
-            # delete records in the main table that exist in the temporary table
-            query = Recordings.delete().where(
-                Recordings.id.in_(RecordingsToDelete.select(RecordingsToDelete.id))
-            )
-            query.execute()
-        except DatabaseError as e:
-            logger.error(f"Database error during recordings db cleanup: {e}")
+def sync_recordings(limited: bool) -> None:
+    """Delete db entries for recordings without a file and recording files
+    without a db entry.
 
-        return True
+    The files on disk are scanned once and merged with the db paths, both
+    sorted by path, so each side is read a single time."""
+    logger.debug("Start sync recordings.")
+    start = datetime.datetime.now().timestamp()
 
-    def delete_files_without_db_entry(files_on_disk: list[str]):
-        """Delete files where file is not inside frigate db."""
-        files_to_delete = []
+    # start checking on the hour 36 hours ago
+    check_point = datetime.datetime.now().replace(
+        minute=0, second=0, microsecond=0
+    ).astimezone(datetime.timezone.utc) - datetime.timedelta(hours=36)
 
-        for file in files_on_disk:
-            if not Recordings.select().where(Recordings.path == file).exists():
-                files_to_delete.append(file)
+    # scan the disk before reading the db so the entries of new files are read
+    files_on_disk = get_recording_files(
+        f"{RECORD_DIR}/{check_point.strftime('%Y-%m-%d/%H')}" if limited else None
+    )
+    files_memory = sys.getsizeof(files_on_disk) + sum(
+        sys.getsizeof(file) for file in files_on_disk
+    )
 
-        if len(files_to_delete) == 0:
-            return True
+    recordings = Recordings.select(Recordings.id, Recordings.path)
 
-        logger.info(
-            f"Deleting {len(files_to_delete)} recordings files with missing DB entries"
-        )
+    if limited:
+        recordings = recordings.where(Recordings.start_time >= check_point.timestamp())
 
-        if float(len(files_to_delete)) / max(1, len(files_on_disk)) > 0.5:
-            logger.debug(
-                f"Deleting {(float(len(files_to_delete)) / len(files_on_disk)):2f}% of recordings DB entries, could be due to configuration error. Aborting..."
-            )
-            return False
+    # merge the paths of the db and the disk, both sorted by path
+    db_count = 0
+    recordings_without_file = []
+    files_without_recording = []
+    file_idx = 0
 
-        for file in files_to_delete:
-            os.unlink(file)
+    for recording_id, path in recordings.order_by(Recordings.path).tuples().iterator():
+        db_count += 1
 
-        return True
+        while file_idx < len(files_on_disk) and files_on_disk[file_idx] < path:
+            files_without_recording.append(files_on_disk[file_idx])
+            file_idx += 1
 
-    logger.debug("Start sync recordings.")
+        if file_idx < len(files_on_disk) and files_on_disk[file_idx] == path:
+            file_idx += 1
+        else:
+            recordings_without_file.append(recording_id)
 
-    # start checking on the hour 36 hours ago
-    check_point = datetime.datetime.now().replace(
-        minute=0, second=0, microsecond=0
-    ).astimezone(datetime.timezone.utc) - datetime.timedelta(hours=36)
-    db_success = delete_db_entries_without_file(check_point.timestamp())
+    files_without_recording.extend(files_on_disk[file_idx:])
 
     # only try to cleanup files if db cleanup was successful
-    if db_success:
-        if limited:
-            # get recording files from last 36 hours
-            hour_check = f"{RECORD_DIR}/{check_point.strftime('%Y-%m-%d/%H')}"
-            files_on_disk = {
-                os.path.join(root, file)
-                for root, _, files in os.walk(RECORD_DIR)
-                for file in files
-                if root > hour_check
-            }
-        else:
-            # get all recordings files on disk and put them in a set
-            files_on_disk = {
-                os.path.join(root, file)
-                for root, _, files in os.walk(RECORD_DIR)
-                for file in files
-            }
-
-        delete_files_without_db_entry(files_on_disk)
+    if delete_db_entries_without_file(recordings_without_file, db_count):
+        delete_files_without_db_entry(files_without_recording, len(files_on_disk))
 
+    logger.info(
+        f"Synced {db_count} recording DB entries with {len(files_on_disk)} files in "
+        f"{datetime.datetime.now().timestamp() - start:.1f}s using "
+        f"{files_memory / (1024 * 1024):.1f}MB for the file paths"
+    )
     logger.debug("End sync recordings.")
+
+
+def delete_db_entries_without_file(recording_ids: list[str], db_count: int) -> bool:
+    """Delete db entries where file was deleted outside of frigate."""
+    # files of entries inserted after the disk was scanned exist now
+    recording_ids = [
+        recording.id
+        for batch in chunked(recording_ids, 100000)
+        for recording in Recordings.select(Recordings.id, Recordings.path)
+        .where(in_values(Recordings.id, batch))
+        .namedtuples()
+        if not os.path.exists(recording.path)
+    ]
+
+    if len(recording_ids) == 0:
+        return True
+
+    logger.info(
+        f"Deleting {len(recording_ids)} recording DB entries with missing files"
+    )
+
+    if float(len(recording_ids)) / max(1, db_count) > 0.5:
+        logger.warning(
+            f"Deleting {(float(len(recording_ids)) / db_count):2f}% of recordings DB entries, could be due to configuration error. Aborting..."
+        )
+        return False
+
+    # delete up to 100,000 at a time
+    try:
+        for batch in chunked(recording_ids, 100000):
+            remove_recordings_from_rollup(batch)
+            Recordings.delete().where(in_values(Recordings.id, batch)).execute()
+    except DatabaseError as e:
+        logger.error(f"Database error during recordings db cleanup: {e}")
+
+    return True
+
+
+def delete_files_without_db_entry(files: list[str], files_count: int) -> bool:
+    """Delete files where file is not inside frigate db."""
+    # entries of files written while the db was read exist now
+    files_with_recording = {
+        path
+        for batch in chunked(files, 100000)
+        for (path,) in Recordings.select(Recordings.path)
+        .where(in_values(Recordings.path, batch))
+        .tuples()
+    }
+    files_to_delete = [file for file in files if file not in files_with_recording]
+
+    if len(files_to_delete) == 0:
+        return True
+
+    logger.info(
+        f"Deleting {len(files_to_delete)} recordings files with missing DB entries"
+    )
+
+    if float(len(files_to_delete)) / max(1, files_count) > 0.5:
+        logger.debug(
+            f"Deleting {(float(len(files_to_delete)) / files_count):2f}% of recordings DB entries, could be due to configuration error. Aborting..."
+        )
+        return False
+
+    for file in files_to_delete:
+        Path(file).unlink(missing_ok=True)
+
+    return True
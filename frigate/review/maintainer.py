@@ -153,7 +153,21 @@ class ReviewSegmentMaintainer(threading.Thread):
         self.record_config_subscriber = ConfigSubscriber("config/record/")
         self.review_config_subscriber = ConfigSubscriber("config/review/")
         self.enabled_config_subscriber = ConfigSubscriber("config/enabled/")
-        self.detection_subscriber = DetectionSubscriber(DetectionTypeEnum.all)
+        self.detection_subscriber = DetectionSubscriber(
+            DetectionTypeEnum.all,
+            object_fields=(
+                "id",
+                "label",
+                "sub_label",
+                "box",
+                "frame_time",
+                "current_zones",
+                "false_positive",
+                "motionless_count",
+                "position_changes",
+                "pending_loitering",
+            ),
+        )
 
         # manual events
         self.indefinite_events: dict[str, dict[str, Any]] = {}
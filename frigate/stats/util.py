@@ -15,6 +15,7 @@ from frigate.camera import CameraMetrics
 from frigate.config import FrigateConfig
 from frigate.const import CACHE_DIR, CLIPS_DIR, RECORD_DIR
 from frigate.data_processing.types import DataProcessorMetrics
+from frigate.db.maintainer import DatabaseMaintainer
 from frigate.object_detection.base import ObjectDetectProcess
 from frigate.types import StatsTrackingTypes
 from frigate.util.services import (
@@ -57,6 +58,7 @@ def stats_init(
     embeddings_metrics: DataProcessorMetrics | None,
     detectors: dict[str, ObjectDetectProcess],
     processes: dict[str, int],
+    database_maintainer: DatabaseMaintainer | None = None,
 ) -> StatsTrackingTypes:
     stats_tracking: StatsTrackingTypes = {
         "camera_metrics": camera_metrics,
@@ -66,6 +68,7 @@ def stats_init(
         "latest_frigate_version": get_latest_version(config),
         "last_updated": int(time.time()),
         "processes": processes,
+        "database_maintainer": database_maintainer,
     }
     return stats_tracking
 
@@ -291,6 +294,12 @@ def stats_snapshot(
             "audio_dBFS": round(camera_stats.audio_dBFS.value, 4),
         }
 
+        if config.cameras[name].camera_switching.enabled:
+            # time from the last detected switch until the new stream had a frame
+            stats["cameras"][name]["switch_first_frame"] = round(
+                camera_stats.switch_first_frame.value * 1000, 2
+            )
+
     stats["detectors"] = {}
     for name, detector in stats_tracking["detectors"].items():
         pid = detector.detect_process.pid if detector.detect_process else None
@@ -354,8 +363,49 @@ def stats_snapshot(
                     embeddings_metrics.yolov9_lpr_pps.value, 2
                 )
 
+        # kept separate from embeddings which only contains graphed speeds and rates
+        stats["realtime_processors"] = {}
+        enabled_processors = {
+            "face_recognition": config.face_recognition.enabled,
+            "lpr": config.lpr.enabled,
+            "bird_classification": config.classification.bird.enabled,
+        }
+
+        for name, processor_metrics in embeddings_metrics.realtime_processors.items():
+            if not enabled_processors.get(name):
+                continue
+
+            stats["realtime_processors"][name] = {
+                "lag": round(processor_metrics.lag.value * 1000, 2),
+                "dropped": processor_metrics.dropped.value,
+                "queued": processor_metrics.queued.value,
+            }
+
+        if any(c.enabled and c.genai.enabled for c in config.cameras.values()):
+            genai_metrics = embeddings_metrics.genai
+            stats["genai"] = {
+                "latency": round(genai_metrics.latency.value * 1000, 2),
+                "queued": genai_metrics.queued.value,
+                "dropped": genai_metrics.dropped.value,
+                "failed": genai_metrics.failed.value,
+            }
+
     get_processing_stats(config, stats, hwaccel_errors)
 
+    for name, camera_stats in stats["cameras"].items():
+        ffmpeg_usage = stats.get("cpu_usages", {}).get(str(camera_stats["ffmpeg_pid"]))
+        camera_fps = camera_stats["camera_fps"]
+
+        # cpu time in ms the detect ffmpeg process spends on each frame
+        camera_stats["decode_cost"] = (
+            round(float(ffmpeg_usage["cpu"]) * 10 / camera_fps, 2)
+            if ffmpeg_usage and camera_fps > 0
+            else 0
+        )
+        camera_stats["hwaccel_fallback"] = bool(
+            camera_metrics[name].hwaccel_fallback.value
+        )
+
     stats["service"] = {
         "uptime": (int(time.time()) - stats_tracking["started"]),
         "version": VERSION,
@@ -365,6 +415,11 @@ def stats_snapshot(
         "last_updated": int(time.time()),
     }
 
+    database_maintainer = stats_tracking.get("database_maintainer")
+
+    if database_maintainer:
+        stats["service"]["database"] = database_maintainer.get_stats()
+
     for path in [RECORD_DIR, CLIPS_DIR, CACHE_DIR, "/dev/shm"]:
         try:
             storage_stats = shutil.disk_usage(path)
@@ -9,6 +9,7 @@ from peewee import fn
 
 from frigate.config import FrigateConfig
 from frigate.const import RECORD_DIR
+from frigate.db.rollups import remove_recordings_from_rollup
 from frigate.models import Event, Recordings
 from frigate.util.builtin import clear_and_unlink
 
@@ -210,6 +211,7 @@ class StorageMaintainer(threading.Thread):
         max_deletes = 100000
         deleted_recordings_list = list(deleted_recordings)
         for i in range(0, len(deleted_recordings_list), max_deletes):
+            remove_recordings_from_rollup(deleted_recordings_list[i : i + max_deletes])
             Recordings.delete().where(
                 Recordings.id << deleted_recordings_list[i : i + max_deletes]
             ).execute()
@@ -2,6 +2,7 @@ import datetime
 import logging
 import os
 import unittest
+from unittest.mock import patch
 
 from peewee_migrate import Router
 from playhouse.sqlite_ext import SqliteExtDatabase
@@ -11,7 +12,7 @@ from pydantic import Json
 from frigate.api.fastapi_app import create_fastapi_app
 from frigate.config import FrigateConfig
 from frigate.const import BASE_DIR, CACHE_DIR
-from frigate.models import Event, Recordings, ReviewSegment
+from frigate.models import Event, Recordings, RecordingsRollup, ReviewSegment
 from frigate.review.types import SeverityEnum
 from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
 
@@ -25,7 +26,13 @@ class BaseTestHttp(unittest.TestCase):
         router.run()
         migrate_db.close()
         self.db = SqliteQueueDatabase(TEST_DB)
-        self.db.bind(models)
+        # the delete endpoints keep the recordings rollup in sync
+        self.db.bind(models + [RecordingsRollup])
+        # the api must not connect to the output process
+        self.preview_frames_patcher = patch(
+            "frigate.api.fastapi_app.PreviewFramesRequestor"
+        )
+        self.preview_frames_patcher.start()
 
         self.minimal_config = {
             "mqtt": {"host": "mqtt"},
@@ -100,6 +107,8 @@ class BaseTestHttp(unittest.TestCase):
         }
 
     def tearDown(self):
+        self.preview_frames_patcher.stop()
+
         if not self.db.is_closed():
             self.db.close()
 
@@ -0,0 +1,124 @@
+import multiprocessing as mp
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from frigate.events import audio
+from frigate.events.audio import AudioEventMaintainer, AudioInferenceEngine
+
+
+class TestAudioInferenceEngine(unittest.TestCase):
+    def setUp(self):
+        self.patcher = patch.object(audio, "AudioTfl")
+        self.detector = self.patcher.start().return_value
+        self.detector.detect.side_effect = lambda waveform: [
+            ("speech", float(waveform[0]), None)
+        ]
+        self.stop_event = threading.Event()
+        self.engine = AudioInferenceEngine(self.stop_event, 2, 2)
+        self.front = self.engine.register("front")
+        self.back = self.engine.register("back")
+
+    def tearDown(self):
+        self.stop_event.set()
+
+        if self.engine.is_alive():
+            self.engine.join(5)
+
+        self.patcher.stop()
+
+    def waveform(self, value: float) -> np.ndarray:
+        return np.full(10, value, np.float32)
+
+    def test_results_are_returned_to_camera(self):
+        self.engine.start()
+        assert self.engine.submit("front", 1, -30, self.waveform(0.25))
+        assert self.engine.submit("back", 2, -40, self.waveform(0.5))
+
+        assert self.front.get(timeout=5) == (1, -30, [("speech", 0.25, None)])
+        assert self.back.get(timeout=5) == (2, -40, [("speech", 0.5, None)])
+        assert self.front.empty()
+
+    def test_submit_fails_when_queue_is_full(self):
+        for i in range(4):
+            assert self.engine.submit("front", i, -30, self.waveform(0))
+
+        assert not self.engine.submit("back", 5, -30, self.waveform(0))
+        self.detector.detect.assert_not_called()
+
+    def test_detection_error_does_not_stop_engine(self):
+        detect = self.detector.detect.side_effect
+
+        def fail_first(waveform):
+            if self.detector.detect.call_count == 1:
+                raise RuntimeError("bad input")
+
+            return detect(waveform)
+
+        self.detector.detect.side_effect = fail_first
+        self.engine.start()
+        self.engine.submit("front", 1, -30, self.waveform(0.25))
+        self.engine.submit("front", 2, -30, self.waveform(0.5))
+
+        # the failed chunk has no result
+        assert self.front.get(timeout=5) == (2, -30, [("speech", 0.5, None)])
+        assert self.engine.is_alive()
+
+
+class TestAudioEventMaintainer(unittest.TestCase):
+    def setUp(self):
+        self.patchers = [
+            patch.object(audio, name)
+            for name in [
+                "ConfigSubscriber",
+                "DetectionPublisher",
+                "EventMetadataPublisher",
+                "InterProcessRequestor",
+                "InterProcessTelemetryPublisher",
+                "LogPipe",
+                "get_ffmpeg_command",
+            ]
+        ]
+
+        for patcher in self.patchers:
+            patcher.start()
+
+        camera = SimpleNamespace(
+            name="front",
+            enabled=True,
+            ffmpeg=None,
+            audio=SimpleNamespace(
+                enabled=True, min_volume=500, listen=["speech"], filters=None
+            ),
+        )
+        self.engine = Mock()
+        self.engine.register.return_value = audio.queue.SimpleQueue()
+        self.maintainer = AudioEventMaintainer(
+            camera,
+            {
+                "front": SimpleNamespace(
+                    audio_rms=mp.Value("d", 0), audio_dBFS=mp.Value("d", 0)
+                )
+            },
+            self.engine,
+            threading.Event(),
+        )
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_quiet_audio_is_not_submitted(self):
+        self.maintainer.detect_audio(np.full(100, 100, np.int16))
+        self.engine.submit.assert_not_called()
+
+        self.maintainer.detect_audio(np.full(100, 1000, np.int16))
+        self.engine.submit.assert_called_once()
+        assert self.engine.submit.call_args.args[0] == "front"
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -12,7 +12,7 @@ from playhouse.sqlite_ext import SqliteExtDatabase
 from playhouse.sqliteq import SqliteQueueDatabase
 
 from frigate.config import FrigateConfig
-from frigate.models import Recordings
+from frigate.models import Recordings, RecordingsRollup
 from frigate.record.backfill import RecordingBackfillService
 
 
@@ -31,7 +31,7 @@ class TestRecordingBackfillService(unittest.TestCase):
         router.run()
         migrate_db.close()
         self.db = SqliteQueueDatabase(self.temp_db_path)
-        models = [Recordings]
+        models = [Recordings, RecordingsRollup]
         self.db.bind(models)
 
         self.config = Mock(spec=FrigateConfig)
@@ -204,6 +204,27 @@ class TestRecordingBackfillService(unittest.TestCase):
             self.assertEqual(recording.dBFS, -1)
             self.assertEqual(recording.regions, -1)
 
+    def test_backfill_recordings_skips_long_files(self):
+        """Test that recordings longer than time range queries look back are skipped."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            camera_dir = (
+                Path(temp_dir) / "recordings" / "2022-01-01" / "12" / "test_camera"
+            )
+            camera_dir.mkdir(parents=True)
+            test_file = camera_dir / "30.00.mp4"
+            test_file.write_bytes(b"fake video data" * 100)
+
+            with patch.object(
+                self.service, "_get_video_duration", return_value=3 * 3600.0
+            ):
+                result = self.service.backfill_recordings(
+                    "test_camera", directory_path=temp_dir
+                )
+
+            self.assertEqual(result["files_added"], 0)
+            self.assertEqual(result["files_errors"], 1)
+            self.assertEqual(Recordings.select().count(), 0)
+
     def test_get_file_size_mb(self):
         """Test getting file size in MB."""
         with tempfile.NamedTemporaryFile() as temp_file:
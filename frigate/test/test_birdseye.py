@@ -1,8 +1,13 @@
 """Test camera user and password cleanup."""
 
+import multiprocessing as mp
 import unittest
+from unittest.mock import patch
 
-from frigate.output.birdseye import get_canvas_shape
+import numpy as np
+
+from frigate.config import FrigateConfig
+from frigate.output.birdseye import BirdsEyeFrameManager, get_canvas_shape
 
 
 class TestBirdseye(unittest.TestCase):
@@ -45,3 +50,61 @@ class TestBirdseye(unittest.TestCase):
         canvas_width, canvas_height = get_canvas_shape(width, height)
         assert canvas_width == width  # width will be the same
         assert canvas_height != height
+
+
+class TestBirdseyeFrameManager(unittest.TestCase):
+    def setUp(self):
+        config = FrigateConfig(
+            mqtt={"host": "mqtt"},
+            birdseye={"enabled": True, "mode": "continuous"},
+            cameras={
+                name: {
+                    "ffmpeg": {
+                        "inputs": [{"path": f"rtsp://{name}/live", "roles": ["detect"]}]
+                    },
+                    "detect": {"width": 1280, "height": 720, "fps": 5},
+                }
+                for name in ["front", "back"]
+            },
+        )
+        self.manager = BirdsEyeFrameManager(config, mp.Event())
+        self.now = 1000.0
+        self.datetime = patch("frigate.output.birdseye.datetime.datetime")
+        self.datetime.start().now.return_value.timestamp.side_effect = lambda: self.now
+
+    def tearDown(self):
+        self.datetime.stop()
+
+    def update(self, camera: str, value: int) -> bool:
+        self.now += 0.2
+        return self.manager.update(
+            camera, 1, 1, self.now, np.full((1080, 1280), value, np.uint8)
+        )
+
+    def tile(self, camera: str) -> np.ndarray:
+        for row in self.manager.camera_layout:
+            for name, (x, y, width, height) in row:
+                if name == camera:
+                    return self.manager.frame[y : y + height, x : x + width]
+
+    def test_frames_are_copied_into_their_tile(self):
+        assert self.update("front", 200)
+        assert (self.tile("front") == 200).any()
+
+        # back joins the layout, front is blank until its next frame
+        assert self.update("back", 100)
+        assert (self.tile("back") == 100).any()
+        assert not (self.tile("front") == 200).any()
+        tiles = self.manager.tiles
+
+        assert self.update("front", 200)
+        assert (self.tile("front") == 200).any()
+        assert not (self.tile("back") == 200).any()
+
+        # the tile geometry is kept until the layout changes
+        assert self.manager.tiles is tiles
+
+        # nothing to send when no tile changed
+        self.now += 0.2
+        assert not self.manager.update_frame()
+        assert not self.manager.tiles_changed
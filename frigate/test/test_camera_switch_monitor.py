@@ -0,0 +1,109 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+import requests
+
+from frigate.camera_switch_monitor import (
+    UNSTABLE_POLL_COUNT,
+    UNSTABLE_POLL_INTERVAL,
+    Go2RtcStreamPoller,
+    start_go2rtc_stream_pollers,
+)
+
+
+def stream(width: int = 1920, errors: int = 0) -> dict:
+    return {
+        "producers": [{"tracks": [{"codec": "H264", "width": width, "height": 1080}]}],
+        "consumers": [{"error": "connection reset"}] * errors,
+    }
+
+
+class TestGo2RtcStreamPoller(unittest.TestCase):
+    def setUp(self):
+        self.streams = {"front": stream(), "back": stream()}
+        self.session = MagicMock(spec=requests.Session)
+        self.session.get.side_effect = lambda url, timeout: Mock(
+            json=Mock(return_value=self.streams)
+        )
+        self.publisher = Mock()
+        self.poller = Go2RtcStreamPoller(
+            "http://go2rtc:1984/api", {"front": 5, "back": 30}, threading.Event()
+        )
+
+    def poll(self, now: float) -> tuple[float, list[str]]:
+        self.publisher.reset_mock()
+        wait = self.poller.poll(self.session, self.publisher, now)
+        return wait, [c.args[1] for c in self.publisher.publish.call_args_list]
+
+    def test_pollers_are_grouped_by_api_url(self):
+        with patch.object(Go2RtcStreamPoller, "start"):
+            pollers = start_go2rtc_stream_pollers(
+                {
+                    "front": ("http://a:1984/api", 5),
+                    "back": ("http://a:1984/api", 30),
+                    "garage": ("http://b:1984/api", 10),
+                },
+                threading.Event(),
+            )
+
+        assert {p.go2rtc_api_url: p.camera_intervals for p in pollers} == {
+            "http://a:1984/api": {"front": 5, "back": 30},
+            "http://b:1984/api": {"garage": 10},
+        }
+        assert [p.interval for p in pollers] == [5, 10]
+
+    def test_cameras_are_published_at_their_interval(self):
+        published = [self.poll(1000 + t)[1] for t in range(0, 35, 5)]
+
+        self.session.get.assert_called_with(
+            "http://go2rtc:1984/api/streams", timeout=5
+        )
+        assert self.session.get.call_count == 7
+        assert published == [
+            ["front", "back"],
+            ["front"],
+            ["front"],
+            ["front"],
+            ["front"],
+            ["front"],
+            ["front", "back"],
+        ]
+
+    def test_poll_interval_decays_after_unstable_stream(self):
+        assert self.poll(1000) == (5, ["front", "back"])
+
+        # only the changed camera is published on every fast poll
+        self.streams["back"] = stream(width=1280)
+        assert self.poll(1005) == (UNSTABLE_POLL_INTERVAL, ["front", "back"])
+
+        for now in range(1006, 1005 + UNSTABLE_POLL_COUNT):
+            assert self.poll(now) == (UNSTABLE_POLL_INTERVAL, ["back"])
+
+        assert self.poll(1005 + UNSTABLE_POLL_COUNT) == (5, ["front", "back"])
+        assert self.poll(1010 + UNSTABLE_POLL_COUNT) == (5, ["front"])
+
+    def test_persistent_errors_do_not_keep_fast_polling(self):
+        self.streams["front"] = stream(errors=1)
+
+        assert self.poll(1000) == (UNSTABLE_POLL_INTERVAL, ["front", "back"])
+
+        for now in range(1001, 1000 + UNSTABLE_POLL_COUNT):
+            assert self.poll(now) == (UNSTABLE_POLL_INTERVAL, ["front"])
+
+        # the error of the stale consumer is still reported but isn't new
+        assert self.poll(1000 + UNSTABLE_POLL_COUNT) == (5, ["front"])
+        assert self.poll(1005 + UNSTABLE_POLL_COUNT) == (5, ["front"])
+
+        self.streams["front"] = stream(errors=2)
+        assert self.poll(1006 + UNSTABLE_POLL_COUNT)[0] == UNSTABLE_POLL_INTERVAL
+
+    def test_failed_request_publishes_empty_stream_info(self):
+        self.session.get.side_effect = requests.ConnectionError()
+
+        assert self.poll(1000) == (5, ["front", "back"])
+        assert all(c.args[0] is None for c in self.publisher.publish.call_args_list)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,161 @@
+import multiprocessing as mp
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import ANY, Mock, patch
+
+from frigate import video
+from frigate.video import CameraWatchdog
+
+
+class StubProcess:
+    """A detect ffmpeg whose stdout is a pipe the test writes frames to."""
+
+    def __init__(self, has_frame: bool) -> None:
+        read_fd, self.write_fd = os.pipe()
+        self.stdout = os.fdopen(read_fd, "rb")
+        self.pid = 1234
+
+        if has_frame:
+            os.write(self.write_fd, b"\0")
+
+    def poll(self):
+        return None
+
+    def close(self) -> None:
+        self.stdout.close()
+        os.close(self.write_fd)
+
+
+class TestCameraWatchdogSwitch(unittest.TestCase):
+    def setUp(self):
+        self.processes: list[StubProcess] = []
+        self.standby_has_frame = True
+        self.patchers = [
+            patch.object(video, "ConfigSubscriber"),
+            patch.object(video, "InterProcessRequestor"),
+            patch.object(video, "LogPipe"),
+            patch.object(video, "camera_reset_manager"),
+            patch.object(video, "stop_ffmpeg"),
+            patch.object(video, "CameraCapture"),
+            patch.object(video, "STANDBY_FIRST_FRAME_TIMEOUT", 0.1),
+            patch.object(
+                video, "start_or_restart_ffmpeg", side_effect=self.start_ffmpeg
+            ),
+        ]
+
+        for patcher in self.patchers:
+            patcher.start()
+
+        config = SimpleNamespace(
+            name="front",
+            enabled=True,
+            frame_shape_yuv=(540, 640),
+            ffmpeg=SimpleNamespace(retry_interval=10),
+            ffmpeg_cmds=[
+                {"roles": ["detect"], "cmd": ["ffmpeg", "detect"]},
+                {"roles": ["record"], "cmd": ["ffmpeg", "record"]},
+            ],
+            camera_switching=SimpleNamespace(enabled=False),
+        )
+        self.switch_first_frame = mp.Value("d", 0)
+        self.watchdog = CameraWatchdog(
+            "front",
+            config,
+            2,
+            Mock(),
+            mp.Value("d", 0),
+            mp.Value("d", 0),
+            mp.Value("i", 0),
+            self.switch_first_frame,
+            None,
+            None,
+            threading.Event(),
+        )
+        self.old_process = Mock()
+        self.old_capture_thread = Mock(is_alive=Mock(return_value=False))
+        self.watchdog.ffmpeg_detect_process = self.old_process
+        self.watchdog.capture_thread = self.old_capture_thread
+        self.record_process = Mock()
+        self.watchdog.ffmpeg_other_processes = [
+            {
+                "cmd": ["ffmpeg", "record"],
+                "roles": ["record"],
+                "logpipe": Mock(),
+                "process": self.record_process,
+            }
+        ]
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+        for process in self.processes:
+            process.close()
+
+    def start_ffmpeg(self, cmd, logger, logpipe, frame_size=None, ffmpeg_process=None):
+        if "detect" not in cmd:
+            return Mock()
+
+        self.processes.append(StubProcess(self.standby_has_frame))
+        return self.processes[-1]
+
+    def test_standby_is_swapped_in(self):
+        self.watchdog._handle_camera_switch("front", "resolution changed")
+
+        standby = self.processes[0]
+        video.stop_ffmpeg.assert_any_call(self.old_process, self.watchdog.logger)
+        self.old_capture_thread.join.assert_called_once()
+        assert self.watchdog.ffmpeg_detect_process is standby
+        assert video.CameraCapture.call_args.args[3] is standby
+        self.watchdog.capture_thread.start.assert_called_once()
+        assert 0 < self.switch_first_frame.value < 1
+
+        # the other processes are restarted as well
+        video.start_or_restart_ffmpeg.assert_called_with(
+            ["ffmpeg", "record"],
+            self.watchdog.logger,
+            ANY,
+            ffmpeg_process=self.record_process,
+        )
+
+    def test_detect_is_restarted_when_standby_times_out(self):
+        self.standby_has_frame = False
+        self.switch_first_frame.value = 99
+
+        with patch.object(self.watchdog, "reset_capture_thread") as reset:
+            self.watchdog._handle_camera_switch("front", "resolution changed")
+
+        video.stop_ffmpeg.assert_called_once_with(
+            self.processes[0], self.watchdog.logger
+        )
+        reset.assert_called_once()
+        video.CameraCapture.assert_not_called()
+        # the metric is for this switch, not the previous one
+        assert 0.1 <= self.switch_first_frame.value < 1
+
+    def test_detect_is_restarted_when_capture_thread_does_not_exit(self):
+        self.old_capture_thread.is_alive.return_value = True
+
+        with patch.object(self.watchdog, "reset_capture_thread") as reset:
+            self.watchdog._handle_camera_switch("front", "resolution changed")
+
+        video.stop_ffmpeg.assert_any_call(self.processes[0], self.watchdog.logger)
+        reset.assert_called_once()
+        video.CameraCapture.assert_not_called()
+
+    def test_switch_is_skipped_while_another_is_handled(self):
+        self.switch_first_frame.value = 99
+
+        with self.watchdog.switch_lock:
+            self.watchdog._handle_camera_switch("front", "resolution changed")
+
+        video.start_or_restart_ffmpeg.assert_not_called()
+        video.stop_ffmpeg.assert_not_called()
+        assert self.watchdog.ffmpeg_detect_process is self.old_process
+        assert self.switch_first_frame.value == 99
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
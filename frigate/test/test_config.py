@@ -571,6 +571,33 @@ class TestConfig(unittest.TestCase):
         }
         self.assertRaises(ValidationError, lambda: FrigateConfig(**config))
 
+    def test_camera_export_concurrency_throws_error(self):
+        config = {
+            "mqtt": {"host": "mqtt"},
+            "record": {"export": {"max_concurrent": 2}},
+            "cameras": {
+                "back": {
+                    "ffmpeg": {
+                        "inputs": [
+                            {"path": "rtsp://10.0.0.1:554/video", "roles": ["detect"]}
+                        ]
+                    },
+                    "detect": {
+                        "height": 1080,
+                        "width": 1920,
+                        "fps": 5,
+                    },
+                    "record": {"export": {"io_priority": 4}},
+                }
+            },
+        }
+        frigate_config = FrigateConfig(**config)
+        assert frigate_config.cameras["back"].record.export.max_concurrent == 2
+        assert frigate_config.cameras["back"].record.export.io_priority == 4
+
+        config["cameras"]["back"]["record"]["export"]["max_concurrent"] = 1
+        self.assertRaises(ValidationError, lambda: FrigateConfig(**config))
+
     def test_zone_matching_camera_name_throws_error(self):
         config = {
             "mqtt": {"host": "mqtt"},
@@ -0,0 +1,135 @@
+import logging
+import os
+import unittest
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.db.lookups import (
+    delete_review_segment_lookups,
+    events_with_zones,
+    review_segments_with_labels,
+    review_segments_with_zones,
+    update_event_zones,
+    update_review_segment_lookups,
+)
+from frigate.models import (
+    Event,
+    EventZone,
+    ReviewSegment,
+    ReviewSegmentLabel,
+    ReviewSegmentZone,
+)
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class TestDbLookups(unittest.TestCase):
+    def setUp(self):
+        self.db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        self.router = Router(self.db)
+        self.db.bind(
+            [Event, EventZone, ReviewSegment, ReviewSegmentLabel, ReviewSegmentZone]
+        )
+
+    def tearDown(self):
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def insert_review_segment(self, id: str, data: dict) -> None:
+        ReviewSegment.insert(
+            id=id,
+            camera="front_door",
+            start_time=0,
+            end_time=10,
+            severity="alert",
+            thumb_path=id,
+            data=data,
+        ).execute()
+
+    def insert_event(self, id: str, zones: list[str]) -> None:
+        Event.insert(
+            id=id,
+            label="person",
+            camera="front_door",
+            start_time=0,
+            end_time=10,
+            top_score=0,
+            score=0,
+            false_positive=False,
+            zones=zones,
+            thumbnail="",
+            region=[],
+            box=[],
+            area=0,
+            data={},
+        ).execute()
+
+    def test_migration_backfills_lookups(self):
+        self.router.run("032_create_camera_permissions_table")
+        self.insert_review_segment(
+            "review1",
+            {"objects": ["person", "car"], "audio": ["speech"], "zones": ["porch"]},
+        )
+        self.insert_review_segment("review2", {"objects": ["dog"], "zones": []})
+        self.insert_event("event1", ["porch", "yard"])
+        self.router.run()
+
+        assert {r.label for r in ReviewSegmentLabel.select()} == {
+            "person",
+            "car",
+            "speech",
+            "dog",
+        }
+        assert [r.review_segment_id for r in review_segments_with_zones(["porch"])] == [
+            "review1"
+        ]
+        assert sorted(z.zone for z in EventZone.select()) == ["porch", "yard"]
+
+    def test_lookups_follow_updates(self):
+        self.router.run()
+        self.insert_review_segment("review1", {})
+        self.insert_review_segment("review2", {})
+
+        update_review_segment_lookups(
+            "review1", {"objects": ["bird"], "audio": [], "zones": ["feeder"]}
+        )
+        update_review_segment_lookups(
+            "review1", {"objects": ["bird-verified"], "audio": [], "zones": ["feeder"]}
+        )
+        update_review_segment_lookups(
+            "review2", {"objects": ["bird"], "audio": [], "zones": []}
+        )
+
+        assert [
+            s.id
+            for s in ReviewSegment.select().where(
+                ReviewSegment.id << review_segments_with_labels(["bird"])
+            )
+        ] == ["review2"]
+        assert [
+            s.id
+            for s in ReviewSegment.select().where(
+                ReviewSegment.id << review_segments_with_zones(["feeder"])
+            )
+        ] == ["review1"]
+
+        delete_review_segment_lookups(["review1"])
+        assert ReviewSegmentZone.select().count() == 0
+
+        self.insert_event("event1", [])
+        update_event_zones("event1", ["porch"])
+        update_event_zones("event1", ["porch", "yard"])
+        assert [
+            e.id for e in Event.select().where(Event.id << events_with_zones(["yard"]))
+        ] == ["event1"]
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,103 @@
+"""Tests for background database maintenance."""
+
+import datetime
+import logging
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.config import FrigateConfig
+from frigate.db import maintainer
+from frigate.db.maintainer import DatabaseMaintainer
+
+
+class TestDatabaseMaintainer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "frigate.db")
+
+        migrate_db = SqliteExtDatabase(
+            self.db_path, pragmas={"auto_vacuum": "INCREMENTAL"}
+        )
+        del logging.getLogger("peewee_migrate").handlers[:]
+        router = Router(migrate_db)
+        router.run()
+        migrate_db.close()
+
+        self.config = Mock(spec=FrigateConfig)
+        self.config.database = Mock()
+        self.config.database.path = self.db_path
+        self.config.cameras = {}
+
+        self.config_dir_patch = patch.object(maintainer, "CONFIG_DIR", self.temp_dir)
+        self.config_dir_patch.start()
+
+    def tearDown(self):
+        self.config_dir_patch.stop()
+
+        for file in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, file))
+
+        os.rmdir(self.temp_dir)
+
+    def _insert_timeline(self, db: SqliteExtDatabase, source_ids: list[str]) -> None:
+        now = datetime.datetime.now().timestamp()
+        db.execute_sql(
+            "INSERT INTO event (id, label, camera, start_time, end_time, false_positive, zones, thumbnail, has_clip, has_snapshot, retain_indefinitely, data) "
+            "VALUES ('kept', 'person', 'front', ?, ?, 0, '[]', '', 1, 1, 0, '{}');",
+            (now, now),
+        )
+
+        with db.atomic():
+            for source_id in source_ids:
+                db.execute_sql(
+                    "INSERT INTO timeline (timestamp, camera, source, source_id, class_type, data) "
+                    "VALUES (?, 'front', 'tracked_object', ?, 'visible', '{}');",
+                    (now, source_id),
+                )
+
+    def test_timeline_cleanup_runs_in_chunks(self):
+        db_maintainer = DatabaseMaintainer(self.config, Mock(is_set=lambda: False))
+        db = db_maintainer.connect()
+        self._insert_timeline(db, ["kept"] * 5 + ["orphan"] * 25)
+
+        with (
+            patch.object(maintainer, "TIMELINE_CHUNK_SIZE", 10),
+            patch.object(maintainer, "TIMELINE_CHUNKS_PER_TICK", 1),
+        ):
+            db_maintainer.cleanup_timeline(db)
+            assert db_maintainer.stats["timeline_cleanup"]["status"] == "running"
+            assert 0 < db_maintainer.stats["timeline_cleanup"]["progress"] < 100
+
+            while db_maintainer.timeline_cleanup_needed:
+                db_maintainer.cleanup_timeline(db)
+
+        remaining = db.execute_sql("SELECT source_id FROM timeline;").fetchall()
+        assert remaining == [("kept",)] * 5
+        assert db_maintainer.stats["timeline_cleanup"]["deleted"] == 25
+        assert db_maintainer.stats["timeline_cleanup"]["status"] == "complete"
+        assert os.path.exists(os.path.join(self.temp_dir, ".timeline"))
+        db.close()
+
+    def test_incremental_vacuum_reclaims_bounded_pages(self):
+        db_maintainer = DatabaseMaintainer(self.config, Mock(is_set=lambda: False))
+        db = db_maintainer.connect()
+        self._insert_timeline(db, ["orphan"] * 2000)
+        db.execute_sql("DELETE FROM timeline;")
+        free_pages = db.execute_sql("PRAGMA freelist_count;").fetchone()[0]
+        assert free_pages > 10
+
+        with patch.object(maintainer, "INCREMENTAL_VACUUM_PAGES", 5):
+            db_maintainer.incremental_vacuum(db)
+
+        assert db_maintainer.stats["reclaimed_pages"] == 5
+        assert db_maintainer.stats["free_pages"] == free_pages - 5
+        db.close()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
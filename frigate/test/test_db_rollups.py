@@ -0,0 +1,113 @@
+import logging
+import os
+import unittest
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.db.rollups import (
+    add_recordings_to_rollup,
+    recordings_rollup,
+    refresh_rollup_event_counts,
+    remove_recordings_from_rollup,
+)
+from frigate.models import Event, Recordings, RecordingsRollup
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class TestDbRollups(unittest.TestCase):
+    def setUp(self):
+        self.db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        self.router = Router(self.db)
+        self.db.bind([Event, Recordings, RecordingsRollup])
+
+    def tearDown(self):
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def recording(self, id: str, start_time: float, motion: int = 1) -> dict:
+        return {
+            Recordings.id.name: id,
+            Recordings.camera.name: "front_door",
+            Recordings.path.name: f"/media/{id}.mp4",
+            Recordings.start_time.name: start_time,
+            Recordings.end_time.name: start_time + 10,
+            Recordings.duration.name: 10,
+            Recordings.motion.name: motion,
+            Recordings.objects.name: 1,
+            Recordings.segment_size.name: 1,
+        }
+
+    def insert_event(self, id: str, start_time: float, has_clip: bool) -> None:
+        Event.insert(
+            id=id,
+            label="person",
+            camera="front_door",
+            start_time=start_time,
+            end_time=start_time + 10,
+            top_score=0,
+            false_positive=False,
+            zones=[],
+            thumbnail="",
+            has_clip=has_clip,
+            data={},
+        ).execute()
+
+    def rollup(self) -> list[tuple]:
+        return [
+            (r.utc_hour, r.segments, r.duration, r.motion, r.event_count)
+            for r in recordings_rollup(["front_door"])
+        ]
+
+    def test_migration_backfills_rollup(self):
+        self.router.run("034_add_camera_time_indexes")
+        Recordings.insert_many(
+            [
+                self.recording("rec1", 3600),
+                self.recording("rec2", 3610, motion=None),
+                self.recording("rec3", 7200),
+            ]
+        ).execute()
+        self.insert_event("event1", 3605, True)
+        self.insert_event("event2", 3700, False)
+        self.router.run()
+
+        assert self.rollup() == [(2, 1, 10, 1, 0), (1, 2, 20, 1, 1)]
+
+    def test_rollup_follows_updates(self):
+        self.router.run()
+        recordings = [
+            self.recording("rec1", 3600),
+            self.recording("rec2", 3610),
+            self.recording("rec3", 7200),
+        ]
+        Recordings.insert_many(recordings).execute()
+        add_recordings_to_rollup(recordings)
+        assert self.rollup() == [(2, 1, 10, 1, 0), (1, 2, 20, 2, 0)]
+
+        self.insert_event("event1", 7205, True)
+        refresh_rollup_event_counts([("front_door", 7205)])
+        assert self.rollup() == [(2, 1, 10, 1, 1), (1, 2, 20, 2, 0)]
+
+        remove_recordings_from_rollup(["rec1", "rec3"])
+        Recordings.delete().where(Recordings.id << ["rec1", "rec3"]).execute()
+        assert self.rollup() == [(1, 1, 10, 1, 0)]
+
+        # the event count is kept for when recordings in its hour are added
+        assert RecordingsRollup.get(RecordingsRollup.utc_hour == 2).event_count == 1
+
+        Event.update(has_clip=False).where(Event.id == "event1").execute()
+        refresh_rollup_event_counts([("front_door", 7205)])
+        remove_recordings_from_rollup(["rec2"])
+        assert RecordingsRollup.select().count() == 0
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
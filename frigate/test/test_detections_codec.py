@@ -0,0 +1,122 @@
+import json
+import unittest
+
+from frigate.comms.detections_codec import (
+    FORMAT_JSON,
+    FORMAT_VIDEO,
+    DetectionEncoder,
+    decode_detection,
+)
+
+
+def tracked_object(id: str, end_time=None) -> dict:
+    return {
+        "id": id,
+        "camera": "front",
+        "frame_time": 1700000000.123456,
+        "snapshot": {
+            "frame_time": 1700000000.1,
+            "box": (10, 20, 110, 220),
+            "area": 20000,
+            "region": (0, 0, 320, 320),
+            "score": 0.84375,
+            "attributes": [],
+            "current_estimated_speed": 0,
+            "velocity_angle": 0,
+            "path_data": [],
+            "recognized_license_plate_score": 0,
+        },
+        "label": "person",
+        "sub_label": ["bob", 0.92],
+        "top_score": 0.8125,
+        "false_positive": False,
+        "start_time": 1699999990.5,
+        "end_time": end_time,
+        "score": 0.796875,
+        "box": (12, 24, 118, 230),
+        "area": 21836,
+        "ratio": 0.5145631067961165,
+        "region": (0, 0, 320, 320),
+        "active": True,
+        "stationary": False,
+        "motionless_count": 0,
+        "position_changes": 3,
+        "current_zones": ["porch"],
+        "entered_zones": ["driveway", "porch"],
+        "has_clip": True,
+        "has_snapshot": True,
+        "attributes": {"face": 0.75},
+        "current_attributes": [{"label": "face", "box": (30, 30, 60, 60)}],
+        "pending_loitering": False,
+        "max_severity": "alert",
+        "current_estimated_speed": 4.5,
+        "average_estimated_speed": 3.25,
+        "velocity_angle": 12.5,
+        "path_data": [((0.1, 0.2), 1699999995.0)],
+        "recognized_license_plate": None,
+    }
+
+
+class TestDetectionsCodec(unittest.TestCase):
+    def setUp(self):
+        self.encoder = DetectionEncoder()
+        self.payload = (
+            "front",
+            "front1700000000.123456",
+            1700000000.123456,
+            [tracked_object("1"), tracked_object("2", end_time=1700000001.5)],
+            [(0, 0, 10, 10), (20, 20, 40, 40)],
+            [(0, 0, 320, 320)],
+        )
+
+    def test_video_round_trip_matches_json(self):
+        encoded = self.encoder.encode("video", self.payload)
+
+        assert encoded[0] == FORMAT_VIDEO
+        assert decode_detection(encoded) == json.loads(json.dumps(self.payload))
+
+    def test_only_requested_fields_are_decoded(self):
+        decoded = decode_detection(
+            self.encoder.encode("video", self.payload), ("id", "box", "end_time")
+        )
+
+        assert decoded[3] == [
+            {"id": "1", "box": [12, 24, 118, 230], "end_time": None},
+            {"id": "2", "box": [12, 24, 118, 230], "end_time": 1700000001.5},
+        ]
+        assert decoded[4] == [[0, 0, 10, 10], [20, 20, 40, 40]]
+
+        decoded = decode_detection(self.encoder.encode("video", self.payload), ())
+        assert decoded[3] == [{}, {}]
+
+    def test_unchanged_columns_are_reused(self):
+        self.encoder.encode("video", self.payload)
+        snapshot_cache = self.encoder.column_cache["snapshot"]
+
+        obj = self.payload[3][0]
+        obj["path_data"] = obj["path_data"] + [((0.3, 0.4), 1700000000.1)]
+        obj["snapshot"] = {**obj["snapshot"], "score": 0.9}
+        self.payload[3].pop()
+        decoded = decode_detection(self.encoder.encode("video", self.payload))
+
+        assert decoded == json.loads(json.dumps(self.payload))
+        assert list(self.encoder.column_cache["snapshot"].keys()) == ["1"]
+        assert self.encoder.column_cache["snapshot"] is not snapshot_cache
+
+    def test_payload_outside_schema_falls_back_to_json(self):
+        self.payload[3][0]["box"] = (12.5, 24, 118, 230)
+        encoded = self.encoder.encode("video", self.payload)
+
+        assert encoded[0] == FORMAT_JSON
+        assert decode_detection(encoded) == json.loads(json.dumps(self.payload))
+
+    def test_other_detections_use_json(self):
+        payload = ("front", 1700000000.0, -30.5, [("speech", 0.8)])
+        encoded = self.encoder.encode("audio", payload)
+
+        assert encoded[0] == FORMAT_JSON
+        assert decode_detection(encoded) == json.loads(json.dumps(payload))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
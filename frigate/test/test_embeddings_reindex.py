@@ -0,0 +1,172 @@
+import io
+import logging
+import os
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from peewee_migrate import Router
+from PIL import Image
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.config.classification import SemanticSearchModelEnum
+from frigate.data_processing.types import DataProcessorMetrics
+from frigate.db.sqlitevecq import SqliteVecQueueDatabase
+from frigate.embeddings import embeddings
+from frigate.embeddings.embeddings import Embeddings
+from frigate.models import Event
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class PlainVecQueueDatabase(SqliteVecQueueDatabase):
+    """Creates plain tables in place of the vec0 tables, the extension isn't loaded in tests."""
+
+    def execute_sql(self, sql, params=None, **kwargs):
+        sql = (
+            sql.replace("VIRTUAL TABLE", "TABLE")
+            .replace("USING vec0", "")
+            .replace("FLOAT[768] distance_metric=cosine", "BLOB")
+        )
+        return super().execute_sql(sql, params, **kwargs)
+
+
+class TestEmbeddingsReindex(unittest.TestCase):
+    def setUp(self):
+        migrate_db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        Router(migrate_db).run()
+        migrate_db.close()
+        self.db = PlainVecQueueDatabase(TEST_DB)
+        self.db.bind([Event])
+
+        thumbnail = io.BytesIO()
+        Image.new("RGB", (8, 8)).save(thumbnail, format="JPEG")
+
+        for i in range(5):
+            Event.insert(
+                id=f"event{i}",
+                label="person",
+                camera="front",
+                start_time=1000 + i,
+                end_time=1010 + i,
+                top_score=0.8,
+                false_positive=False,
+                zones=[],
+                thumbnail="",
+                has_clip=True,
+                has_snapshot=True,
+                data={"description": f"person {i}"} if i % 2 else {},
+            ).execute()
+
+        self.vision_embedding = MagicMock(
+            side_effect=lambda images: [np.zeros(768, np.float32) for _ in images]
+        )
+        self.patchers = [
+            patch.object(embeddings, "REINDEX_PAGE_SIZE", 2),
+            patch.object(embeddings, "InterProcessRequestor"),
+            patch.object(
+                embeddings,
+                "JinaV1TextEmbedding",
+                return_value=lambda texts: [np.ones(768, np.float32) for _ in texts],
+            ),
+            patch.object(
+                embeddings, "JinaV1ImageEmbedding", return_value=self.vision_embedding
+            ),
+            patch.object(
+                embeddings,
+                "get_event_thumbnail_bytes",
+                return_value=thumbnail.getvalue(),
+            ),
+        ]
+
+        for patcher in self.patchers:
+            patcher.start()
+
+        config = SimpleNamespace(
+            semantic_search=SimpleNamespace(
+                model=SemanticSearchModelEnum.jinav1, model_size="small"
+            )
+        )
+        self.embeddings = Embeddings(config, self.db, DataProcessorMetrics())
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        self.db.stop()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def count(self, table: str) -> int:
+        return self.db.execute_sql(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_reindex_resumes_from_checkpoint(self):
+        # the model fails on the second page
+        self.vision_embedding.side_effect = [
+            [np.zeros(768, np.float32)] * 2,
+            RuntimeError("model crashed"),
+        ]
+
+        with self.assertRaises(RuntimeError):
+            self.embeddings.reindex()
+
+        checkpoint = self.embeddings._load_reindex_checkpoint()
+        assert checkpoint["id"] == "event3"
+        assert checkpoint["totals"]["processed_objects"] == 2
+        assert self.count("vec_thumbnails") == 2
+        assert self.count("vec_descriptions") == 1
+
+        self.vision_embedding.reset_mock(side_effect=True)
+        self.vision_embedding.side_effect = lambda images: [
+            np.zeros(768, np.float32) for _ in images
+        ]
+        self.embeddings.reindex()
+
+        # only the events after the checkpoint are embedded again
+        assert sum(len(c.args[0]) for c in self.vision_embedding.call_args_list) == 3
+        assert self.count("vec_thumbnails") == 5
+        assert self.count("vec_descriptions") == 2
+        assert self.embeddings._load_reindex_checkpoint() is None
+
+        totals = self.embeddings.requestor.send_data.call_args.args[1]
+        assert totals["status"] == "completed"
+        assert totals["processed_objects"] == 5
+        assert totals["thumbnails"] == 5
+
+    def test_failed_page_does_not_move_checkpoint(self):
+        upsert = self.embeddings._upsert_embeddings
+        calls = 0
+
+        def fail_second_page(table, column, page_embeddings):
+            nonlocal calls
+            calls += 1
+
+            # thumbnails of the second page are written, descriptions fail
+            if calls == 4:
+                raise RuntimeError("disk full")
+
+            upsert(table, column, page_embeddings)
+
+        with (
+            patch.object(
+                self.embeddings, "_upsert_embeddings", side_effect=fail_second_page
+            ),
+            self.assertRaises(RuntimeError),
+        ):
+            self.embeddings.reindex()
+
+        # the page is embedded again on resume
+        assert self.embeddings._load_reindex_checkpoint()["id"] == "event3"
+        assert self.count("vec_thumbnails") == 4
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
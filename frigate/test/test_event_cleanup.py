@@ -0,0 +1,118 @@
+import datetime
+import logging
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.events import cleanup
+from frigate.events.cleanup import EventCleanup
+from frigate.models import Event, EventZone, RecordingsRollup, Timeline
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+def retain(days: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        snapshots=SimpleNamespace(retain=SimpleNamespace(default=days, objects={})),
+        record=SimpleNamespace(
+            alerts=SimpleNamespace(retain=SimpleNamespace(days=days)),
+            detections=SimpleNamespace(retain=SimpleNamespace(days=days)),
+        ),
+    )
+
+
+class TestEventCleanup(unittest.TestCase):
+    def setUp(self):
+        self.db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        Router(self.db).run()
+        self.db.bind([Event, EventZone, RecordingsRollup, Timeline])
+        self.clips_dir = tempfile.TemporaryDirectory()
+        self.patchers = [
+            patch("frigate.util.path.CLIPS_DIR", self.clips_dir.name),
+            patch.object(cleanup, "EXPIRE_CHUNK_SIZE", 2),
+        ]
+
+        for patcher in self.patchers:
+            patcher.start()
+
+        config = retain(1)
+        config.cameras = {"front": retain(1)}
+        config.semantic_search = SimpleNamespace(enabled=False)
+        self.cleanup = EventCleanup(config, Mock(), Mock())
+
+        now = datetime.datetime.now().timestamp()
+
+        for id, age, retain_indefinitely in [
+            ("old1", 10, False),
+            ("old2", 10, False),
+            ("old3", 10, False),
+            ("kept", 10, True),
+            ("new", 0, False),
+        ]:
+            start_time = now - age * 86400
+            Event.insert(
+                id=id,
+                label="person",
+                camera="front",
+                start_time=start_time,
+                end_time=start_time + 10,
+                top_score=0,
+                false_positive=False,
+                zones=[],
+                thumbnail="",
+                has_clip=True,
+                has_snapshot=True,
+                retain_indefinitely=retain_indefinitely,
+                data={"type": "object", "max_severity": "alert"},
+            ).execute()
+            open(os.path.join(self.clips_dir.name, f"front-{id}.jpg"), "w").close()
+
+    def tearDown(self):
+        self.cleanup.delete_executor.shutdown()
+
+        for patcher in self.patchers:
+            patcher.stop()
+
+        self.clips_dir.cleanup()
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def test_expire_snapshots_once(self):
+        assert sorted(self.cleanup.expire_snapshots()) == ["old1", "old2", "old3"]
+        assert sorted(os.listdir(self.clips_dir.name)) == [
+            "front-kept.jpg",
+            "front-new.jpg",
+        ]
+        with_snapshot = Event.select(Event.id).where(Event.has_snapshot == True)
+        assert [e.id for e in with_snapshot] == ["kept", "new"]
+
+        # expired events are not selected again
+        assert self.cleanup.expire_snapshots() == []
+
+    def test_expire_clips_and_delete_events(self):
+        assert sorted(self.cleanup.expire_clips()) == ["old1", "old2", "old3"]
+        assert self.cleanup.expire_clips() == []
+
+        self.cleanup.expire_snapshots()
+        self.cleanup.delete_expired_events()
+
+        assert sorted(e.id for e in Event.select()) == ["kept", "new"]
+        assert self.cleanup.run_metrics["deleted_events"] == 3
+        assert self.cleanup.run_metrics["expired_snapshots"] == 3
+        assert self.cleanup.run_metrics["expired_clips"] == 3
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
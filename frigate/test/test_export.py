@@ -0,0 +1,170 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.config import FrigateConfig
+from frigate.models import Export, Recordings
+from frigate.record.export import (
+    ExportQueue,
+    PlaybackFactorEnum,
+    PlaybackSourceEnum,
+    RecordingExporter,
+    get_timelapse_factor,
+)
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class TestRecordExport(unittest.TestCase):
+    def setUp(self):
+        self.config = FrigateConfig(
+            **{
+                "mqtt": {"host": "mqtt"},
+                "record": {"export": {"max_concurrent": 1}},
+                "cameras": {
+                    "front_door": {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"height": 1080, "width": 1920, "fps": 5},
+                    }
+                },
+            }
+        )
+        self.db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        self.db.bind([Export, Recordings])
+        self.db.create_tables([Export, Recordings])
+        self.clips_dir = tempfile.TemporaryDirectory()
+        self.patcher = patch("frigate.record.export.CLIPS_DIR", self.clips_dir.name)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.clips_dir.cleanup()
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def exporter(self, id: str, start_time: int, end_time: int) -> RecordingExporter:
+        return RecordingExporter(
+            self.config,
+            id,
+            "front_door",
+            None,
+            None,
+            start_time,
+            end_time,
+            PlaybackFactorEnum.realtime,
+            PlaybackSourceEnum.recordings,
+        )
+
+    def test_playlist_is_read_from_disk_and_trimmed(self):
+        for i in range(4):
+            Recordings.insert(
+                id=f"rec{i}",
+                camera="front_door",
+                path=f"/media/frigate/recordings/{i}.mp4",
+                start_time=1000 + i * 10,
+                end_time=1010 + i * 10,
+                duration=10,
+                motion=0,
+                objects=0,
+                segment_size=1,
+            ).execute()
+
+        exporter = self.exporter("front_door_abcdef", 1005, 1025)
+        ffmpeg_cmd, playlist_lines = exporter.get_record_export_command("/tmp/a.mp4")
+
+        assert playlist_lines == [
+            "file '/media/frigate/recordings/0.mp4'",
+            "inpoint 5.000",
+            "file '/media/frigate/recordings/1.mp4'",
+            "file '/media/frigate/recordings/2.mp4'",
+            "outpoint 5.000",
+        ]
+        assert exporter.duration == 20
+        assert not any("http" in arg for arg in ffmpeg_cmd)
+        assert ffmpeg_cmd[ffmpeg_cmd.index("-c") + 1] == "copy"
+
+    def test_timelapse_factor(self):
+        assert get_timelapse_factor("-vf setpts=0.04*PTS -r 30") == 0.04
+        assert get_timelapse_factor("-r 30") == 1.0
+
+    def test_queue_limits_running_and_waiting_exports(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def run():
+            started.set()
+            release.wait(5)
+
+        exporters = []
+
+        for i in range(4):
+            exporter = MagicMock(export_id=f"front_door_{i}", progress=0.0)
+            exporter.run.side_effect = run
+            exporters.append(exporter)
+
+        with patch("frigate.record.export.MAX_QUEUED_EXPORTS", 2):
+            export_queue = ExportQueue(self.config)
+
+        assert export_queue.submit(exporters[0])
+        assert started.wait(5)
+        assert export_queue.submit(exporters[1])
+        assert export_queue.submit(exporters[2])
+        assert not export_queue.submit(exporters[3])
+        assert len(export_queue.workers) == 1
+        assert export_queue.get_progress("front_door_1") == 0.0
+        assert export_queue.get_progress("front_door_3") is None
+
+        release.set()
+
+        for _ in range(50):
+            if not export_queue.exports:
+                break
+
+            time.sleep(0.1)
+
+        assert export_queue.get_progress("front_door_1") is None
+
+        for exporter in exporters[:3]:
+            exporter.insert.assert_called_once()
+            exporter.run.assert_called_once()
+
+        exporters[3].insert.assert_not_called()
+
+    def test_failed_export_is_removed(self):
+        exporter = self.exporter("front_door_abcdef", 1000, 1010)
+        export_queue = ExportQueue(self.config)
+
+        with patch.object(exporter, "run", side_effect=RuntimeError):
+            assert export_queue.submit(exporter)
+
+            for _ in range(50):
+                if not export_queue.exports:
+                    break
+
+                time.sleep(0.1)
+
+        assert not Export.select().where(Export.id == "front_door_abcdef").exists()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+import threading
+import time
+import unittest
+
+import cv2
+import numpy as np
+
+from frigate.camera.broadcaster import FrameBroadcaster
+
+
+class FakeFrameProcessor:
+    def __init__(self):
+        self.frame_time = 1.0
+        self.renders = 0
+
+    def get_current_frame_time(self, camera):
+        return self.frame_time
+
+    def get_current_frame(self, camera, draw_options={}):
+        self.renders += 1
+        # rendering is slow enough for concurrent clients to overlap
+        time.sleep(0.05)
+        return np.full((720, 1280, 3), 100, np.uint8)
+
+
+class TestFrameBroadcaster(unittest.TestCase):
+    def setUp(self):
+        self.processor = FakeFrameProcessor()
+        self.broadcaster = FrameBroadcaster(self.processor, max_cached_frames=2)
+        self.quality = [int(cv2.IMWRITE_JPEG_QUALITY), 70]
+
+    def get_frame(self, height=360, draw_options={"bounding_boxes": 1}):
+        return self.broadcaster.get_frame(
+            "front", "jpg", height, self.quality, draw_options
+        )
+
+    def test_clients_share_one_render(self):
+        results = []
+        clients = [
+            threading.Thread(target=lambda: results.append(self.get_frame()))
+            for _ in range(20)
+        ]
+
+        for client in clients:
+            client.start()
+
+        for client in clients:
+            client.join()
+
+        assert self.processor.renders == 1
+        assert len(set(results)) == 1
+        assert cv2.imdecode(np.frombuffer(results[0], np.uint8), 1).shape == (
+            360,
+            640,
+            3,
+        )
+
+    def test_new_frame_and_options_are_rendered(self):
+        self.get_frame()
+        self.get_frame(draw_options={"bounding_boxes": True})
+        assert self.processor.renders == 1
+
+        self.get_frame(draw_options={"bounding_boxes": 1, "zones": 1})
+        self.get_frame(height=180)
+        assert self.processor.renders == 3
+
+        self.processor.frame_time = 2.0
+        self.get_frame(height=180)
+        assert self.processor.renders == 4
+
+        # only the two most recent keys are kept
+        self.get_frame()
+        assert self.processor.renders == 5
+
+    def test_invalid_height(self):
+        with self.assertRaises(ValueError):
+            self.get_frame(height=0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,237 @@
+import json
+import threading
+import time
+import unittest
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Optional
+from unittest.mock import Mock, patch
+
+import requests
+
+from frigate.const import UPDATE_EVENT_DESCRIPTION
+from frigate.data_processing.types import GenAIMetrics
+from frigate.genai import GenAIClient
+from frigate.genai import scheduler as genai_scheduler
+from frigate.genai.scheduler import GenAIScheduler, TokenBucket
+from frigate.models import Event
+
+
+class StubProvider(BaseHTTPRequestHandler):
+    """Fails the first request for each event and tracks concurrent requests."""
+
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+    attempts: dict[str, int] = {}
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        with self.lock:
+            StubProvider.active += 1
+            StubProvider.max_active = max(StubProvider.max_active, self.active)
+            attempt = self.attempts.get(body["prompt"], 0)
+            self.attempts[body["prompt"]] = attempt + 1
+
+        time.sleep(0.05)
+
+        with self.lock:
+            StubProvider.active -= 1
+
+        if attempt == 0:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        response = json.dumps({"response": f"a {body['prompt']}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubClient(GenAIClient):
+    def _send(self, prompt: str, images: list[bytes]) -> Optional[str]:
+        response = requests.post(
+            self.genai_config.base_url, json={"prompt": prompt}, timeout=5
+        )
+
+        if response.status_code != 200:
+            return None
+
+        return response.json()["response"]
+
+
+class TestGenAIScheduler(unittest.TestCase):
+    def setUp(self):
+        camera = SimpleNamespace(
+            genai=SimpleNamespace(prompt="{id}", object_prompts={}),
+            review=SimpleNamespace(
+                alerts=SimpleNamespace(
+                    enabled=True, labels=["person"], required_zones=[]
+                )
+            ),
+        )
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubProvider)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.config = SimpleNamespace(
+            genai=SimpleNamespace(
+                base_url=f"http://127.0.0.1:{self.server.server_port}",
+                max_concurrent_requests=2,
+                requests_per_minute=None,
+                max_retries=1,
+            ),
+            cameras={"front": camera},
+        )
+        self.metrics = GenAIMetrics()
+        self.stop_event = threading.Event()
+        self.descriptions: dict[str, str] = {}
+        self.requestors: list[Mock] = []
+        self.requestor_patcher = patch.object(
+            genai_scheduler,
+            "InterProcessRequestor",
+            side_effect=self.create_requestor,
+        )
+        self.requestor_patcher.start()
+        self.scheduler = GenAIScheduler(
+            self.config,
+            StubClient(self.config.genai),
+            self.handle_description,
+            self.metrics,
+            self.stop_event,
+        )
+
+    def tearDown(self):
+        self.stop_event.set()
+        self.requestor_patcher.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def create_requestor(self) -> Mock:
+        self.requestors.append(Mock())
+        return self.requestors[-1]
+
+    def handle_description(self, requestor, event: Event, _, description: str):
+        self.descriptions[event.id] = description
+
+    def event(self, id: str, label: str = "car") -> Event:
+        return Event(id=id, camera="front", label=label, zones=[])
+
+    def test_final_request_supersedes_early_request(self):
+        self.scheduler.submit(self.event("e1"), [b"early"], final=False)
+        self.scheduler.submit(self.event("e1"), [b"final"], final=True)
+        self.scheduler.submit(self.event("e1"), [b"late"], final=False)
+
+        assert list(self.scheduler.pending.keys()) == ["e1"]
+        assert self.scheduler.pending["e1"].thumbnails == [b"final"]
+        assert self.metrics.dropped.value == 1
+        assert self.metrics.queued.value == 1
+
+    def test_alerts_are_sent_before_detections(self):
+        self.scheduler.submit(self.event("car"), [b""], final=True)
+        self.scheduler.submit(self.event("person", "person"), [b""], final=True)
+
+        assert self.scheduler._next_request().event.id == "person"
+        assert self.scheduler._next_request().event.id == "car"
+        assert self.scheduler._next_request() is None
+
+    def test_full_queue_drops_oldest_detection(self):
+        with patch.object(genai_scheduler, "MAX_PENDING_REQUESTS", 2):
+            self.scheduler.submit(self.event("car1"), [b""], final=True)
+            self.scheduler.submit(self.event("person", "person"), [b""], final=True)
+            self.scheduler.submit(self.event("car2"), [b""], final=True)
+
+        assert sorted(self.scheduler.pending.keys()) == ["car2", "person"]
+
+    def test_stale_description_is_not_applied(self):
+        self.scheduler.client = Mock(generate_description=Mock(return_value="early"))
+        self.scheduler.submit(self.event("e1"), [b""], final=False)
+        early = self.scheduler._next_request()
+        self.scheduler.submit(self.event("e1"), [b""], final=True)
+        final = self.scheduler._next_request()
+
+        self.scheduler.client.generate_description.return_value = "final"
+        self.scheduler._send(final, Mock())
+        self.scheduler.client.generate_description.return_value = "early"
+        self.scheduler._send(early, Mock())
+
+        assert self.descriptions == {"e1": "final"}
+
+    def test_requests_are_retried_against_provider(self):
+        StubProvider.attempts = {}
+        StubProvider.max_active = 0
+
+        with patch.object(genai_scheduler, "RETRY_BACKOFF", 0):
+            self.scheduler.start()
+
+            for i in range(6):
+                self.scheduler.submit(self.event(f"e{i}"), [b""], final=True)
+
+            for _ in range(100):
+                if len(self.descriptions) == 6:
+                    break
+
+                time.sleep(0.05)
+
+        assert self.descriptions == {f"e{i}": f"a e{i}" for i in range(6)}
+        assert StubProvider.max_active <= 2
+        assert self.metrics.failed.value == 0
+        assert self.metrics.queued.value == 0
+
+    def test_descriptions_use_the_worker_requestor(self):
+        # the maintainer pulls in the detector runtimes
+        from frigate.embeddings.maintainer import EmbeddingMaintainer
+
+        maintainer = SimpleNamespace(
+            requestor=Mock(),
+            config=SimpleNamespace(semantic_search=SimpleNamespace(enabled=False)),
+        )
+        self.scheduler.handle_description = partial(
+            EmbeddingMaintainer._handle_genai_description, maintainer
+        )
+        self.scheduler.client = Mock(generate_description=Mock(return_value="a car"))
+        self.scheduler.start()
+
+        for i in range(6):
+            self.scheduler.submit(self.event(f"e{i}"), [b""], final=True)
+
+        for _ in range(100):
+            if self.metrics.queued.value == 0 and not self.scheduler.sending:
+                break
+
+            time.sleep(0.05)
+
+        self.stop_event.set()
+
+        for worker in self.scheduler.workers:
+            worker.join(timeout=5)
+
+        maintainer.requestor.send_data.assert_not_called()
+        worker_requestors = [r for r in self.requestors if r.send_data.called]
+        assert sum(r.send_data.call_count for r in worker_requestors) == 6
+        assert all(
+            c.args[0] == UPDATE_EVENT_DESCRIPTION
+            for r in worker_requestors
+            for c in r.send_data.call_args_list
+        )
+
+        # one requestor for each worker, closed when it exits
+        assert len(self.requestors) == 2
+        assert all(r.stop.call_count == 1 for r in self.requestors)
+
+    def test_token_bucket_limits_rate(self):
+        bucket = TokenBucket(rate=1, burst=2)
+
+        assert bucket.take() == 0
+        assert bucket.take() == 0
+        assert 0.9 < bucket.take() <= 1
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
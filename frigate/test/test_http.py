@@ -2,7 +2,7 @@ import datetime
 import logging
 import os
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from fastapi.testclient import TestClient
 from peewee_migrate import Router
@@ -14,7 +14,7 @@ from frigate.api.fastapi_app import create_fastapi_app
 from frigate.comms.event_metadata_updater import EventMetadataPublisher
 from frigate.config import FrigateConfig
 from frigate.const import BASE_DIR, CACHE_DIR
-from frigate.models import Event, Recordings, Timeline
+from frigate.models import Event, Recordings, RecordingsRollup, Timeline
 from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
 
 
@@ -27,8 +27,13 @@ class TestHttp(unittest.TestCase):
         router.run()
         migrate_db.close()
         self.db = SqliteQueueDatabase(TEST_DB)
-        models = [Event, Recordings, Timeline]
+        models = [Event, Recordings, RecordingsRollup, Timeline]
         self.db.bind(models)
+        # the api must not connect to the output process
+        self.preview_frames_patcher = patch(
+            "frigate.api.fastapi_app.PreviewFramesRequestor"
+        )
+        self.preview_frames_patcher.start()
 
         self.minimal_config = {
             "mqtt": {"host": "mqtt"},
@@ -103,6 +108,8 @@ class TestHttp(unittest.TestCase):
         }
 
     def tearDown(self):
+        self.preview_frames_patcher.stop()
+
         if not self.db.is_closed():
             self.db.close()
 
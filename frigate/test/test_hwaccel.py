@@ -0,0 +1,183 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from frigate.camera import CameraMetrics
+from frigate.config import FrigateConfig
+from frigate.util.hwaccel import (
+    get_hwaccel_candidates,
+    get_trial_decode_cmd,
+    select_hwaccel,
+)
+
+VAINFO_INTEL = """vainfo: Driver version: Intel iHD driver for Intel(R) Gen Graphics - 24.1.0
+vainfo: Supported profile and entrypoints
+      VAProfileH264Main               : VAEntrypointVLD
+      VAProfileH264Main               : VAEntrypointEncSliceLP
+      VAProfileHEVCMain               : VAEntrypointEncSlice
+      VAProfileJPEGBaseline           : VAEntrypointVLD
+"""
+
+
+class TestHwaccelSelection(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "mqtt": {"host": "mqtt"},
+            "cameras": {
+                "front": {
+                    "ffmpeg": {
+                        "inputs": [
+                            {
+                                "path": "rtsp://10.0.0.1:554/video",
+                                "roles": ["detect", "record"],
+                            }
+                        ]
+                    },
+                    "detect": {"height": 1080, "width": 1920, "fps": 5},
+                    "record": {"enabled": True},
+                },
+                "back": {
+                    "ffmpeg": {
+                        "inputs": [
+                            {"path": "rtsp://10.0.0.2:554/video", "roles": ["detect"]}
+                        ]
+                    },
+                    "detect": {"height": 1080, "width": 1920, "fps": 5},
+                },
+            },
+        }
+
+    def frigate_config(self, detected: str) -> FrigateConfig:
+        with patch("frigate.config.config.auto_detect_hwaccel", return_value=detected):
+            return FrigateConfig(**self.config)
+
+    def select(
+        self,
+        config: FrigateConfig,
+        codecs: dict,
+        decodes,
+        vainfo=None,
+        probe_timeout: float = 30,
+    ) -> dict:
+        """Select with stubbed probes, decodes(path, cmd) is the trial result."""
+        metrics = {name: CameraMetrics() for name in config.cameras}
+        vainfo = vainfo or MagicMock(returncode=0, stdout=VAINFO_INTEL.encode())
+
+        def run(cmd, **kwargs):
+            return MagicMock(
+                returncode=0 if decodes(cmd[cmd.index("-i") + 1], cmd) else 1
+            )
+
+        with (
+            patch(
+                "frigate.util.hwaccel.ffprobe_video_codec",
+                side_effect=lambda ffmpeg, path: codecs.get(path),
+            ),
+            patch("frigate.util.hwaccel.vainfo_hwaccel", side_effect=[vainfo]),
+            patch("frigate.util.hwaccel.sp.run", side_effect=run),
+            patch("frigate.util.hwaccel.PROBE_TIMEOUT", probe_timeout),
+        ):
+            select_hwaccel(config, metrics)
+
+        return metrics
+
+    def test_candidates_follow_stream_codec(self):
+        assert get_hwaccel_candidates("preset-nvidia", "hevc", "") == [
+            "preset-nvidia-h265"
+        ]
+        assert get_hwaccel_candidates("preset-vaapi", "h264", VAINFO_INTEL) == [
+            "preset-vaapi",
+            "preset-intel-qsv-h264",
+        ]
+        # vainfo lists no hevc decode profile
+        assert get_hwaccel_candidates("preset-vaapi", "hevc", VAINFO_INTEL) == [
+            "preset-intel-qsv-h265"
+        ]
+        # without vainfo output the trial decode decides
+        assert get_hwaccel_candidates("preset-vaapi", "h264", "") == ["preset-vaapi"]
+        assert get_hwaccel_candidates("", "h264", VAINFO_INTEL) == []
+
+    def test_trial_decode_cmd_only_decodes_detect(self):
+        config = self.frigate_config("preset-nvidia")
+        cmd = " ".join(
+            get_trial_decode_cmd(config.cameras["front"], "preset-nvidia-h264")
+        )
+
+        assert "-hwaccel cuda" in cmd
+        assert "scale_cuda=w=1920:h=1080" in cmd
+        assert "segment" not in cmd
+        assert cmd.endswith("-frames:v 10 -y /dev/null")
+
+    def test_verified_preset_is_used(self):
+        config = self.frigate_config("preset-vaapi")
+        metrics = self.select(
+            config,
+            {"rtsp://10.0.0.1:554/video": "h264", "rtsp://10.0.0.2:554/video": "hevc"},
+            lambda path, cmd: "-hwaccel vaapi" not in " ".join(cmd),
+        )
+
+        # front fails vaapi and uses qsv, back only has qsv for hevc
+        assert config.cameras["front"].ffmpeg.hwaccel_args == "preset-intel-qsv-h264"
+        assert config.cameras["back"].ffmpeg.hwaccel_args == "preset-intel-qsv-h265"
+        assert "h264_qsv" in " ".join(config.cameras["front"].ffmpeg_cmds[0]["cmd"])
+        assert not metrics["front"].hwaccel_fallback.value
+
+    def test_failed_hwaccel_falls_back_to_cpu(self):
+        config = self.frigate_config("preset-nvidia")
+        metrics = self.select(
+            config,
+            {"rtsp://10.0.0.1:554/video": "h264"},
+            lambda path, cmd: (
+                path == "rtsp://10.0.0.1:554/video" and "cuda" not in " ".join(cmd)
+            ),
+        )
+
+        assert config.cameras["front"].ffmpeg.hwaccel_args == ""
+        assert "cuda" not in " ".join(config.cameras["front"].ffmpeg_cmds[0]["cmd"])
+        assert metrics["front"].hwaccel_fallback.value
+
+        # the unreachable stream keeps the detected preset
+        assert config.cameras["back"].ffmpeg.hwaccel_args == "preset-nvidia"
+        assert not metrics["back"].hwaccel_fallback.value
+
+    def test_vaapi_is_tried_without_vainfo(self):
+        config = self.frigate_config("preset-vaapi")
+        metrics = self.select(
+            config,
+            {"rtsp://10.0.0.1:554/video": "h264", "rtsp://10.0.0.2:554/video": "h264"},
+            lambda path, cmd: (
+                path == "rtsp://10.0.0.2:554/video" or "vaapi" not in " ".join(cmd)
+            ),
+            vainfo=OSError(),
+        )
+
+        assert config.cameras["front"].ffmpeg.hwaccel_args == ""
+        assert metrics["front"].hwaccel_fallback.value
+        assert config.cameras["back"].ffmpeg.hwaccel_args == "preset-vaapi"
+        assert not metrics["back"].hwaccel_fallback.value
+
+    def test_probes_stop_at_timeout(self):
+        config = self.frigate_config("preset-nvidia")
+        metrics = self.select(
+            config,
+            {"rtsp://10.0.0.1:554/video": "h264"},
+            lambda path, cmd: False,
+            probe_timeout=0,
+        )
+
+        # unverified cameras keep the detected preset
+        assert config.cameras["front"].ffmpeg.hwaccel_args == "preset-nvidia"
+        assert not metrics["front"].hwaccel_fallback.value
+        assert config.cameras["back"].ffmpeg.hwaccel_args == "preset-nvidia"
+
+    def test_configured_hwaccel_is_not_changed(self):
+        self.config["ffmpeg"] = {"hwaccel_args": "preset-vaapi"}
+        self.config["cameras"]["back"]["ffmpeg"]["hwaccel_args"] = "preset-nvidia"
+        config = self.frigate_config("preset-nvidia")
+        self.select(config, {}, lambda path, cmd: False)
+
+        assert config.cameras["front"].ffmpeg.hwaccel_args == "preset-vaapi"
+        assert config.cameras["back"].ffmpeg.hwaccel_args == "preset-nvidia"
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+from frigate.camera import PTZMetrics
+from frigate.config import MotionConfig
+from frigate.motion.improved_motion import ImprovedMotionDetector, contrast_limits
+
+
+class TestImprovedMotion(unittest.TestCase):
+    def setUp(self):
+        self.height, self.width = 720, 1280
+        self.rng = np.random.default_rng(1)
+        self.config = MotionConfig()
+        self.config.mask = np.full((self.height, self.width), 255, np.uint8)
+        self.config.mask[:300, :] = 0
+        self.config.improve_contrast = False
+        self.background = np.clip(
+            self.rng.normal(100, 30, (self.height, self.width)), 0, 255
+        ).astype(np.uint8)
+
+    def frame(self, box_x: int = None) -> np.ndarray:
+        frame = np.clip(
+            self.background.astype(np.int16)
+            + self.rng.integers(-3, 4, (self.height, self.width)),
+            0,
+            255,
+        ).astype(np.uint8)
+
+        if box_x is not None:
+            frame[400:480, box_x : box_x + 60] = 230
+
+        return np.vstack([frame, np.zeros((self.height // 2, self.width), np.uint8)])
+
+    def detector(self, skip_static_frames: bool) -> ImprovedMotionDetector:
+        return ImprovedMotionDetector(
+            (self.height, self.width),
+            self.config,
+            5,
+            PTZMetrics(autotracker_enabled=False),
+            skip_static_frames=skip_static_frames,
+        )
+
+    def test_contrast_limits_match_percentiles(self):
+        for _ in range(20):
+            frame = self.rng.integers(0, 256, (150, 267), dtype=np.uint8)
+            assert contrast_limits(frame, 4, 96) == (
+                int(np.percentile(frame, 4).astype(np.uint8)),
+                int(np.percentile(frame, 96).astype(np.uint8)),
+            )
+
+    def test_static_frames_are_skipped(self):
+        skipping = self.detector(True)
+        full = self.detector(False)
+        skipped = 0
+
+        for _ in range(60):
+            frame = self.frame()
+            skipped_frames = skipping.skipped_frames
+            boxes = skipping.detect(frame)
+            assert boxes == full.detect(frame)
+            assert boxes == [] or skipping.is_calibrating()
+            skipped += skipping.skipped_frames > skipped_frames
+
+        # once calibrated, most idle frames skip detection but one per second is
+        # still fully processed
+        assert not skipping.is_calibrating()
+        assert skipped > 0
+        assert skipping.skipped_frames <= skipping.max_skipped_frames
+
+        for i in range(1, 10):
+            assert len(skipping.detect(self.frame(100 + i * 20))) > 0
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from frigate.comms import inter_process
+from frigate.comms.inter_process import (
+    TELEMETRY_HWM,
+    InterProcessTelemetryCommunicator,
+    InterProcessTelemetryPublisher,
+)
+
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.patcher = patch.object(
+            inter_process,
+            "SOCKET_PUSH_PULL",
+            f"ipc://{os.path.join(self.tmp_dir.name, 'telemetry')}",
+        )
+        self.patcher.start()
+        self.dispatched: list[tuple[str, int]] = []
+        self.dispatched_event = threading.Event()
+        self.communicator = None
+        self.publisher = InterProcessTelemetryPublisher()
+
+    def tearDown(self):
+        self.publisher.stop()
+
+        if self.communicator is not None:
+            if hasattr(self.communicator, "reader_thread"):
+                self.communicator.stop()
+            else:
+                self.communicator.socket.close()
+                self.communicator.context.destroy()
+
+        self.patcher.stop()
+        self.tmp_dir.cleanup()
+
+    def dispatch(self, topic: str, value: int) -> None:
+        self.dispatched.append((topic, value))
+        self.dispatched_event.set()
+
+    def wait_for_dispatch(self) -> None:
+        assert self.dispatched_event.wait(5)
+        # the queued values are dispatched together
+        time.sleep(0.1)
+
+    def test_only_latest_value_per_topic_is_dispatched(self):
+        self.communicator = InterProcessTelemetryCommunicator()
+
+        for i in range(3):
+            self.publisher.send_data("front/fps", i)
+
+        self.publisher.send_data("back/fps", 10)
+        # the values queue up until the reader starts
+        time.sleep(0.2)
+        self.communicator.subscribe(self.dispatch)
+        self.wait_for_dispatch()
+
+        assert sorted(self.dispatched) == [("back/fps", 10), ("front/fps", 2)]
+
+    def test_unsent_value_is_retried_with_next_send(self):
+        # nothing is bound yet, the queue fills up to the high water mark
+        for i in range(TELEMETRY_HWM * 10):
+            self.publisher.send_data(f"camera_{i}/fps", i)
+
+            if self.publisher.pending:
+                break
+
+        assert list(self.publisher.pending) == [f"camera_{i}/fps"]
+
+        self.communicator = InterProcessTelemetryCommunicator()
+        self.communicator.subscribe(self.dispatch)
+
+        for _ in range(50):
+            self.publisher.send_data("front/fps", 5)
+
+            if not self.publisher.pending:
+                break
+
+            time.sleep(0.1)
+
+        self.wait_for_dispatch()
+
+        assert (f"camera_{i}/fps", i) in self.dispatched
+        assert ("front/fps", 5) in self.dispatched
+
+    def test_send_does_not_block_without_reader(self):
+        # bound but never read
+        self.communicator = InterProcessTelemetryCommunicator()
+        # let the publisher reconnect, so the queue doesn't drain during the sends
+        time.sleep(0.5)
+        # large enough values to fill the zmq queues and the socket buffer
+        value = "0" * 1000
+        start = time.monotonic()
+
+        for i in range(TELEMETRY_HWM * 100):
+            self.publisher.send_data(f"camera_{i % 10}/stats", value)
+
+        assert time.monotonic() - start < 5
+        # unsent values are coalesced to one per topic
+        assert 0 < len(self.publisher.pending) <= 10
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
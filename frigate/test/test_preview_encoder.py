@@ -0,0 +1,125 @@
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from frigate.config import RecordQualityEnum
+from frigate.const import INSERT_PREVIEW
+from frigate.models import Previews
+from frigate.output import preview
+from frigate.output.preview import (
+    PREVIEW_WRITE_QUEUE_SIZE,
+    PreviewEncoder,
+    PreviewFrameIndex,
+)
+
+# stands in for ffmpeg by writing the raw frames it is sent to the output path
+FAKE_FFMPEG = """#!/bin/sh
+for last; do :; done
+cat > "$last"
+"""
+
+WIDTH = 64
+HEIGHT = 32
+
+
+class TestPreviewEncoder(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        clips_dir = os.path.join(self.tmp_dir.name, "clips")
+        cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        os.makedirs(os.path.join(clips_dir, "previews", "front"))
+        os.makedirs(os.path.join(cache_dir, "preview_frames"))
+        self.patchers = [
+            patch.object(preview, "CLIPS_DIR", clips_dir),
+            patch.object(preview, "CACHE_DIR", cache_dir),
+        ]
+
+        for patcher in self.patchers:
+            patcher.start()
+
+        self.fake_ffmpeg = os.path.join(self.tmp_dir.name, "ffmpeg")
+
+        with open(self.fake_ffmpeg, "w") as f:
+            f.write(FAKE_FFMPEG)
+
+        os.chmod(self.fake_ffmpeg, stat.S_IRWXU)
+        self.requestor = MagicMock()
+        self.frame_index = PreviewFrameIndex()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+        self.tmp_dir.cleanup()
+
+    def create_encoder(self, ffmpeg_path: str) -> PreviewEncoder:
+        config = SimpleNamespace(
+            name="front",
+            ffmpeg=SimpleNamespace(ffmpeg_path=ffmpeg_path),
+            record=SimpleNamespace(
+                preview=SimpleNamespace(quality=RecordQualityEnum.medium)
+            ),
+        )
+        return PreviewEncoder(
+            config, self.requestor, WIDTH, HEIGHT, [], self.frame_index
+        )
+
+    def frame(self, value: int) -> np.ndarray:
+        return np.full((HEIGHT * 3 // 2, WIDTH), value, np.uint8)
+
+    def encode_segment(self, encoder: PreviewEncoder) -> dict:
+        """Stream a few frames with gaps into a segment and get the inserted preview."""
+        encoder.start()
+        encoder.write_frame(1000.0, self.frame(10))
+        encoder.write_frame(1001.0, self.frame(20))
+        # camera went offline, the last frame is repeated
+        encoder.write_frame(1002.5, None)
+        encoder.end_segment()
+        encoder.stop()
+
+        self.requestor.send_data.assert_called_once()
+        topic, data = self.requestor.send_data.call_args.args
+        assert topic == INSERT_PREVIEW
+        return data
+
+    def test_streamed_frames_are_encoded_at_constant_rate(self):
+        data = self.encode_segment(self.create_encoder(self.fake_ffmpeg))
+
+        assert data[Previews.start_time.name] == 1000.0
+        assert data[Previews.end_time.name] == 1002.5
+        assert data[Previews.path.name].endswith("1000.0-1002.5.mp4")
+
+        # 2 fps stream, gaps are filled by repeating the previous frame
+        with open(data[Previews.path.name], "rb") as f:
+            frames = np.frombuffer(f.read(), np.uint8).reshape(
+                -1, WIDTH * HEIGHT * 3 // 2
+            )
+
+        assert [int(f[0]) for f in frames] == [10, 10, 20, 20, 20, 20]
+
+        # the stills of the finished segment are removed except for the last one
+        assert self.frame_index.get_frame_times("front", 0, 2000) == [1002.5]
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg is not installed")
+    def test_segment_is_encoded_by_ffmpeg(self):
+        data = self.encode_segment(self.create_encoder(shutil.which("ffmpeg")))
+
+        assert os.path.getsize(data[Previews.path.name]) > 0
+
+    def test_frames_are_dropped_when_encoder_is_behind(self):
+        encoder = self.create_encoder(self.fake_ffmpeg)
+
+        for i in range(PREVIEW_WRITE_QUEUE_SIZE):
+            assert encoder.write_frame(1000.0 + i, self.frame(10))
+
+        assert not encoder.write_frame(1000.0 + PREVIEW_WRITE_QUEUE_SIZE, None)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
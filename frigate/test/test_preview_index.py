@@ -0,0 +1,102 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from frigate.comms import preview_updater
+from frigate.comms.preview_updater import (
+    PreviewFramesRequestor,
+    get_preview_frame_files,
+)
+from frigate.output.preview import PreviewFrameIndex
+
+
+class TestPreviewFrameIndex(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        os.mkdir(os.path.join(self.cache_dir.name, "preview_frames"))
+        self.patchers = [
+            patch.object(preview_updater, "CACHE_DIR", self.cache_dir.name),
+            patch.object(
+                preview_updater,
+                "SOCKET_REP_REQ",
+                f"ipc://{self.cache_dir.name}/preview_frames.sock",
+            ),
+            patch.object(preview_updater, "REQUEST_TIMEOUT", 50),
+        ]
+
+        for patcher in self.patchers:
+            patcher.start()
+
+        self.index = PreviewFrameIndex()
+
+        for frame_time in [1000.5, 1001.5, 1002.25, 1003.0]:
+            self.index.add("front", frame_time)
+            open(
+                os.path.join(
+                    self.cache_dir.name,
+                    f"preview_frames/preview_front-{frame_time}.webp",
+                ),
+                "w",
+            ).close()
+
+        self.index.add("back", 1001.0)
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+        self.cache_dir.cleanup()
+
+    def test_range_lookup(self):
+        self.index.add("front", 999.0)
+        self.index.add("front", 1001.5)
+
+        assert self.index.get_frame_times("front", 1000, 1002.25) == [
+            1000.5,
+            1001.5,
+            1002.25,
+        ]
+        assert self.index.get_frame_times("front", 0, 1000) == [999.0]
+        assert self.index.get_frame_times("side", 0, 2000) == []
+
+        self.index.remove("front", [999.0, 1000.5, 1001.5])
+        assert self.index.get_frame_times("front", 0, 2000) == [1002.25, 1003.0]
+
+    def test_api_queries_output_process(self):
+        stop_event = threading.Event()
+        server = threading.Thread(target=self.index.serve, args=(stop_event,))
+        server.start()
+        requestor = PreviewFramesRequestor()
+
+        try:
+            assert get_preview_frame_files(requestor, "front", 1001, 1003) == [
+                "preview_front-1001.5.webp",
+                "preview_front-1002.25.webp",
+                "preview_front-1003.0.webp",
+            ]
+            assert requestor.get_frame_times("back", 0, 2000) == [1001.0]
+        finally:
+            stop_event.set()
+            server.join()
+            requestor.stop()
+
+    def test_falls_back_to_listing_cache(self):
+        requestor = PreviewFramesRequestor()
+
+        try:
+            # nothing answers, the requestor must still work afterwards
+            assert requestor.get_frame_times("front", 0, 2000) is None
+            assert requestor.get_frame_times("front", 0, 2000) is None
+            assert get_preview_frame_files(requestor, "front", 1001, 1003) == [
+                "preview_front-1001.5.webp",
+                "preview_front-1002.25.webp",
+                "preview_front-1003.0.webp",
+            ]
+        finally:
+            requestor.stop()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,78 @@
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from frigate.data_processing.real_time import worker
+from frigate.data_processing.real_time.worker import RealTimeProcessorWorker
+from frigate.data_processing.types import RealTimeProcessorMetrics
+
+
+class TestRealTimeProcessorWorker(unittest.TestCase):
+    def setUp(self):
+        self.metrics = RealTimeProcessorMetrics()
+        self.worker = RealTimeProcessorWorker(
+            "test", Mock(), Mock(), self.metrics, Mock(is_set=lambda: False)
+        )
+
+    def test_newer_update_supersedes_pending(self):
+        frames = [np.zeros((3, 2), np.uint8), np.ones((3, 2), np.uint8)]
+        self.worker.submit("obj1", "front", frames[0], {"id": "obj1"})
+        self.worker.submit("obj2", "front", frames[0], {"id": "obj2"})
+        self.worker.submit("obj1", "front", frames[1], {"id": "obj1"})
+
+        assert list(self.worker.pending.keys()) == ["obj2", "obj1"]
+        assert self.worker.pending["obj1"].frame is frames[1]
+        assert self.metrics.dropped.value == 1
+        assert self.metrics.queued.value == 2
+
+    def test_full_queue_drops_oldest_update_but_keeps_expirations(self):
+        with patch.object(worker, "MAX_PENDING_UPDATES", 2):
+            self.worker.expire("obj0", "front")
+            self.worker.submit("obj1", "front", None, {})
+            self.worker.submit("obj2", "front", None, {})
+
+        assert list(self.worker.pending.keys()) == ["obj0", "obj2"]
+        assert self.metrics.dropped.value == 1
+
+    def test_expire_discards_pending_update(self):
+        self.worker.submit("obj1", "front", None, {})
+        self.worker.expire("obj1", "front")
+
+        key, update = self.worker.pending.popitem(last=False)
+        self.worker._process(key, update)
+        self.worker.processor.expire_object.assert_called_once_with("obj1", "front")
+        self.worker.processor.process_frame.assert_not_called()
+
+    def test_submitted_frame_is_processed(self):
+        frame = np.zeros((3, 2), np.uint8)
+        self.worker.submit("obj1", "front", frame, {"id": "obj1"})
+
+        key, update = self.worker.pending.popitem(last=False)
+        self.worker._process(key, update)
+        self.worker.processor.process_frame.assert_called_once_with(
+            {"id": "obj1"}, frame
+        )
+
+    def test_shared_lock_blocks_processing(self):
+        lock = threading.Lock()
+        shared = RealTimeProcessorWorker(
+            "lpr", Mock(), Mock(), self.metrics, Mock(is_set=lambda: False), lock
+        )
+        shared.submit("front", "front", np.zeros((3, 2), np.uint8), None, True)
+        key, update = shared.pending.popitem(last=False)
+
+        with lock:
+            processing = threading.Thread(target=shared._process, args=(key, update))
+            processing.start()
+            processing.join(0.1)
+            assert processing.is_alive()
+            shared.processor.process_frame.assert_not_called()
+
+        processing.join(1)
+        shared.processor.process_frame.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,7 +1,17 @@
 import unittest
 
-from frigate.config import RetainModeEnum
+import numpy as np
+
+from frigate.config import RecordConfig, RetainModeEnum
 from frigate.record.maintainer import SegmentInfo
+from frigate.record.retention import (
+    RecordingSegments,
+    get_previews_to_keep,
+    get_recordings_to_keep,
+    get_review_intervals,
+    overlaps_any,
+    to_array,
+)
 
 
 class TestRecordRetention(unittest.TestCase):
@@ -31,3 +41,76 @@ class TestRecordRetention(unittest.TestCase):
         )
         assert not segment_info.should_discard_segment(RetainModeEnum.motion)
         assert segment_info.should_discard_segment(RetainModeEnum.active_objects)
+
+
+class TestRetentionEngine(unittest.TestCase):
+    def setUp(self):
+        self.record_config = RecordConfig(
+            alerts={"pre_capture": 0, "post_capture": 0, "retain": {"mode": "all"}},
+            detections={
+                "pre_capture": 5,
+                "post_capture": 5,
+                "retain": {"mode": "motion"},
+            },
+        )
+
+    def segments(self, *rows: tuple) -> RecordingSegments:
+        """Segments from (start_time, motion, objects, dBFS) rows, 10s each."""
+        start_times, motion, objects, dBFS = zip(*rows)
+        start_times = to_array(start_times)
+        return RecordingSegments(
+            start_times,
+            start_times + 10,
+            to_array(motion),
+            to_array(objects),
+            to_array(dBFS),
+        )
+
+    def test_overlaps_merged_intervals(self):
+        starts = to_array([0, 15, 35, 100])
+        ends = starts + 5
+        overlaps = overlaps_any(
+            starts,
+            ends,
+            to_array([18, 10, 30, 60]),
+            to_array([22, 15, 30, np.inf]),
+        )
+        assert overlaps.tolist() == [False, True, False, True]
+        assert not overlaps_any(starts, ends, to_array([]), to_array([])).any()
+
+    def test_recordings_kept_by_review_retain_mode(self):
+        segments = self.segments(
+            (0, 0, 0, 0),  # alert, retain all
+            (100, 0, 0, 0),  # detection without motion
+            (110, 5, 0, 0),  # detection with motion
+            (200, 0, 0, 0),  # no review
+            (300, -1, -1, -1),  # backfill
+            (400, 0, 0, 0),  # alert and detection
+            (500, 0, 0, 0),  # pre capture of an in progress detection
+        )
+        reviews = get_review_intervals(
+            [
+                (2, 8, "alert"),
+                (100, 120, "detection"),
+                (395, 405, "detection"),
+                (402, 404, "alert"),
+                (512, None, "detection"),
+            ]
+        )
+
+        kept = get_recordings_to_keep(self.record_config, segments, reviews)
+
+        assert kept.tolist() == [True, False, True, False, True, True, False]
+
+        self.record_config.detections.retain.mode = RetainModeEnum.all
+        kept = get_recordings_to_keep(self.record_config, segments, reviews)
+
+        assert kept.tolist() == [True, True, True, False, True, True, True]
+
+    def test_previews_kept_with_recordings(self):
+        segments = self.segments((0, 1, 1, 0), (3600, 1, 1, 0))
+        kept = np.array([True, False])
+
+        assert get_previews_to_keep(
+            to_array([-100, 3590]), to_array([0, 3700]), segments, kept
+        ).tolist() == [True, False]
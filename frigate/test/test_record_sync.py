@@ -0,0 +1,115 @@
+import datetime
+import logging
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from peewee_migrate import Router
+from playhouse.sqlite_ext import SqliteExtDatabase
+
+from frigate.models import Recordings, RecordingsRollup
+from frigate.record.util import get_recording_files, sync_recordings
+from frigate.test.const import TEST_DB, TEST_DB_CLEANUPS
+
+
+class TestSyncRecordings(unittest.TestCase):
+    def setUp(self):
+        self.db = SqliteExtDatabase(TEST_DB)
+        del logging.getLogger("peewee_migrate").handlers[:]
+        Router(self.db).run()
+        self.db.bind([Recordings, RecordingsRollup])
+        self.record_dir = tempfile.TemporaryDirectory()
+        self.patcher = patch("frigate.record.util.RECORD_DIR", self.record_dir.name)
+        self.patcher.start()
+        self.now = datetime.datetime.now(datetime.timezone.utc)
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.record_dir.cleanup()
+
+        if not self.db.is_closed():
+            self.db.close()
+
+        for file in TEST_DB_CLEANUPS:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    def add_recording(
+        self, id: str, hours_ago: int, file: bool = True, row: bool = True
+    ) -> str:
+        start_time = self.now - datetime.timedelta(hours=hours_ago)
+        directory = os.path.join(
+            self.record_dir.name, start_time.strftime("%Y-%m-%d/%H"), "front"
+        )
+        path = os.path.join(directory, f"{id}.mp4")
+
+        if file:
+            os.makedirs(directory, exist_ok=True)
+            open(path, "w").close()
+
+        if row:
+            Recordings.insert(
+                id=id,
+                camera="front",
+                path=path,
+                start_time=start_time.timestamp(),
+                end_time=start_time.timestamp() + 10,
+                duration=10,
+                motion=0,
+                objects=0,
+                segment_size=1,
+            ).execute()
+
+        return path
+
+    def test_sync_removes_both_differences(self):
+        kept = [self.add_recording(f"rec{i}", i) for i in range(3)]
+        missing_file = self.add_recording("missing", 2, file=False)
+        orphans = [
+            self.add_recording("orphan1", 1, row=False),
+            self.add_recording("orphan2", 100, row=False),
+        ]
+
+        assert get_recording_files() == sorted(kept + orphans)
+
+        sync_recordings(limited=False)
+
+        assert [r.path for r in Recordings.select().order_by(Recordings.path)] == (
+            sorted(kept)
+        )
+        assert not any(os.path.exists(path) for path in orphans)
+        assert not Recordings.select().where(Recordings.path == missing_file).exists()
+
+    def test_limited_sync_only_checks_recent_hours(self):
+        for i in range(3):
+            self.add_recording(f"rec{i}", i)
+
+        recent_orphan = self.add_recording("recent", 1, row=False)
+        old_orphan = self.add_recording("old", 100, row=False)
+        self.add_recording("old_missing", 100, file=False)
+
+        sync_recordings(limited=True)
+
+        assert not os.path.exists(recent_orphan)
+        assert os.path.exists(old_orphan)
+        assert Recordings.select().where(Recordings.id == "old_missing").exists()
+
+    def test_sync_aborts_when_most_files_are_missing(self):
+        self.add_recording("rec", 0)
+
+        for i in range(3):
+            self.add_recording(f"missing{i}", 0, file=False)
+
+        orphan = self.add_recording("orphan", 0, row=False)
+
+        sync_recordings(limited=False)
+
+        assert Recordings.select().count() == 4
+        assert os.path.exists(orphan)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from frigate import embeddings
+from frigate.config.classification import SemanticSearchModelEnum
+from frigate.embeddings import EmbeddingsContext
+from frigate.embeddings.util import TextEmbeddingCache
+from frigate.util.builtin import serialize
+
+
+class TestTextEmbeddingCache(unittest.TestCase):
+    def test_keys_are_whitespace_normalized(self):
+        cache = TextEmbeddingCache(2)
+        cache.put("jinav1-small", "  red   car\n", b"red")
+
+        assert cache.get("jinav1-small", "red car") == b"red"
+        assert cache.get("jinav1-small", "red  car ") == b"red"
+        assert cache.get("jinav1-large", "red car") is None
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TextEmbeddingCache(2)
+        cache.put("m", "a", b"a")
+        cache.put("m", "b", b"b")
+        cache.get("m", "a")
+        cache.put("m", "c", b"c")
+
+        assert cache.get("m", "a") == b"a"
+        assert cache.get("m", "b") is None
+        assert cache.get("m", "c") == b"c"
+
+    def test_round_trip_keeps_newest_entries(self):
+        cache = TextEmbeddingCache(3)
+
+        for text in ["a", "b", "c"]:
+            cache.put("m", text, text.encode() * 4)
+
+        data = json.loads(json.dumps(cache.to_dict()))
+        restored = TextEmbeddingCache(2).from_dict(data)
+
+        assert list(restored.entries) == ["m:b", "m:c"]
+        assert restored.get("m", "c") == b"cccc"
+        assert restored.get("m", "a") is None
+
+
+class TestEmbeddingsContextSearch(unittest.TestCase):
+    def setUp(self):
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.patchers = [
+            patch.object(embeddings, "CONFIG_DIR", self.config_dir.name),
+            patch.object(embeddings, "EmbeddingsRequestor"),
+        ]
+
+        for patcher in self.patchers:
+            patcher.start()
+
+        self.config = SimpleNamespace(
+            semantic_search=SimpleNamespace(
+                model=SemanticSearchModelEnum.jinav1, model_size="small"
+            )
+        )
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+        self.config_dir.cleanup()
+
+    def test_corrupt_cache_file_is_ignored(self):
+        with open(os.path.join(self.config_dir.name, ".search_embeddings.json"), "w") as f:
+            f.write('{"jinav1-small:car": ')
+
+        context = EmbeddingsContext(None, self.config)
+
+        assert len(context.search_embeddings.entries) == 0
+
+    def test_cached_search_text_is_not_sent_to_model(self):
+        context = EmbeddingsContext(None, self.config)
+        context.requestor.send_data.return_value = [0.5, 0.25]
+
+        assert context._get_search_embedding("red car") == serialize([0.5, 0.25])
+        assert context._get_search_embedding(" red  car") == serialize([0.5, 0.25])
+        context.requestor.send_data.assert_called_once()
+
+        # the cache is kept across restarts
+        context.stop()
+        context.requestor.reset_mock()
+        restarted = EmbeddingsContext(None, self.config)
+
+        assert restarted._get_search_embedding("red car") == serialize([0.5, 0.25])
+        restarted.requestor.send_data.assert_not_called()
+
+    def test_failed_embedding_is_not_cached(self):
+        context = EmbeddingsContext(None, self.config)
+        context.requestor.send_data.return_value = None
+
+        assert context._get_search_embedding("red car") is None
+        assert context._get_search_embedding("red car") is None
+        assert context.requestor.send_data.call_count == 2
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,76 @@
+import datetime
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from frigate.camera import CameraMetrics
+from frigate.record.segment_index import (
+    get_newest_segment_time,
+    publish_cache_segments,
+    scan_cache_segments,
+)
+
+
+class TestSegmentIndex(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.patcher = patch(
+            "frigate.record.segment_index.CACHE_DIR", self.cache_dir.name
+        )
+        self.patcher.start()
+
+        for name in [
+            "front_door@20250101120010+0000.mp4",
+            "front_door@20250101120000+0000.mp4",
+            "door@20250101120020+0000.mp4",
+            "preview_front_door-1735732800.mp4",
+            "front_door@20250101115950+0000.tmp",
+        ]:
+            open(os.path.join(self.cache_dir.name, name), "w").close()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.cache_dir.cleanup()
+
+    def test_scan_groups_segments_by_camera(self):
+        segments = scan_cache_segments()
+
+        assert sorted(segments.keys()) == ["door", "front_door"]
+        assert [s["start_time"] for s in segments["front_door"]] == [
+            datetime.datetime(2025, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2025, 1, 1, 12, 0, 10, tzinfo=datetime.timezone.utc),
+        ]
+
+    def test_newest_segment_time_uses_published_scan(self):
+        metrics = {"front_door": CameraMetrics(), "back_yard": CameraMetrics()}
+        publish_cache_segments(scan_cache_segments(), metrics)
+
+        # files added after the scan are not seen until the next scan
+        open(
+            os.path.join(self.cache_dir.name, "front_door@20250101120030+0000.mp4"),
+            "w",
+        ).close()
+
+        front_door = metrics["front_door"]
+        assert get_newest_segment_time(
+            "front_door", front_door.cache_segment_time, front_door.cache_scan_time
+        ) == datetime.datetime(2025, 1, 1, 12, 0, 10, tzinfo=datetime.timezone.utc)
+        back_yard = metrics["back_yard"]
+        assert (
+            get_newest_segment_time(
+                "back_yard", back_yard.cache_segment_time, back_yard.cache_scan_time
+            )
+            is None
+        )
+
+        # a stale scan falls back to scanning the cache
+        front_door.cache_scan_time.value = time.time() - 60
+        assert get_newest_segment_time(
+            "front_door", front_door.cache_segment_time, front_door.cache_scan_time
+        ) == datetime.datetime(2025, 1, 1, 12, 0, 30, tzinfo=datetime.timezone.utc)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,53 @@
+import unittest
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from frigate.util.zone import ZoneRaster, get_zone_raster
+
+
+class TestZoneRaster(unittest.TestCase):
+    def setUp(self):
+        self.contours = {
+            "driveway": np.array([[10, 10], [90, 10], [90, 60], [10, 60]]),
+            "porch": np.array([[50, 30], [120, 20], [110, 90], [40, 80]]),
+        }
+
+    def test_matches_point_polygon_test(self):
+        raster = ZoneRaster((100, 160), self.contours)
+
+        for y in range(100):
+            for x in range(160):
+                mask = raster.mask_at((x, y))
+
+                for name, contour in self.contours.items():
+                    assert bool(mask & raster.bits[name]) == (
+                        cv2.pointPolygonTest(contour, (x, y), False) >= 0
+                    ), (name, x, y)
+
+    def test_point_outside_frame(self):
+        raster = ZoneRaster((100, 160), self.contours)
+        assert raster.mask_at((160, 50)) is None
+        assert raster.mask_at((-1, 50)) is None
+
+    def test_rebuilt_when_zones_update(self):
+        zones = {
+            name: SimpleNamespace(contour=contour)
+            for name, contour in self.contours.items()
+        }
+        camera_config = SimpleNamespace(
+            name="zone_raster_test", zones=zones, frame_shape=(100, 160)
+        )
+
+        raster = get_zone_raster(camera_config)
+        assert get_zone_raster(camera_config) is raster
+
+        zones["porch"] = SimpleNamespace(contour=np.array([[0, 0], [5, 0], [5, 5]]))
+        updated = get_zone_raster(camera_config)
+        assert updated is not raster
+        assert updated.mask_at((80, 70)) == 0
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -198,6 +198,8 @@ class TrackedObjectProcessor(threading.Thread):
 
             if not last_activity or activity != last_activity:
                 self.camera_activity[camera] = activity
+                # activity changes rarely, an unsent value would only be sent
+                # with the next change so it goes through the requestor
                 self.requestor.send_data(UPDATE_CAMERA_ACTIVITY, self.camera_activity)
 
         for camera in self.config.cameras.keys():
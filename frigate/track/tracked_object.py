@@ -28,6 +28,7 @@ from frigate.util.image import (
 )
 from frigate.util.object import box_inside
 from frigate.util.velocity import calculate_real_world_speed
+from frigate.util.zone import get_zone_raster
 
 logger = logging.getLogger(__name__)
 
@@ -175,6 +176,10 @@ class TrackedObject:
         in_loitering_zone = False
         in_speed_zone = False
 
+        # look up the zones under the object once instead of testing each contour
+        zone_raster = get_zone_raster(self.camera_config)
+        zone_mask = zone_raster.mask_at(bottom_center) if zone_raster else None
+
         # check each zone
         for name, zone in self.camera_config.zones.items():
             # if the zone is not for this object type, skip
@@ -184,7 +189,12 @@ class TrackedObject:
             zone_score = self.zone_presence.get(name, 0) + 1
 
             # check if the object is in the zone
-            if cv2.pointPolygonTest(contour, bottom_center, False) >= 0:
+            if zone_mask is not None:
+                in_zone = bool(zone_mask & zone_raster.bits[name])
+            else:
+                in_zone = cv2.pointPolygonTest(contour, bottom_center, False) >= 0
+
+            if in_zone:
                 # if the object passed the filters once, dont apply again
                 if name in self.current_zones or not zone_filtered(self, zone.filters):
                     # Calculate speed first if this is a speed zone
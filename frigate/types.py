@@ -3,6 +3,7 @@ from typing import TypedDict
 
 from frigate.camera import CameraMetrics
 from frigate.data_processing.types import DataProcessorMetrics
+from frigate.db.maintainer import DatabaseMaintainer
 from frigate.object_detection.base import ObjectDetectProcess
 
 
@@ -14,6 +15,7 @@ class StatsTrackingTypes(TypedDict):
     latest_frigate_version: str
     last_updated: int
     processes: dict[str, int]
+    database_maintainer: DatabaseMaintainer | None
 
 
 class ModelStatusTypesEnum(str, Enum):
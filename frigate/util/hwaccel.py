@@ -0,0 +1,220 @@
+"""Select and verify the hwaccel decode preset of each camera."""
+
+import logging
+import os
+import subprocess as sp
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from frigate.camera import CameraMetrics
+from frigate.config import CameraConfig, FrigateConfig
+from frigate.const import FFMPEG_HWACCEL_NVIDIA, FFMPEG_HWACCEL_VAAPI
+from frigate.util.services import ffprobe_video_codec, vainfo_hwaccel
+
+logger = logging.getLogger(__name__)
+
+# frames that have to be decoded for a preset to be used
+TRIAL_FRAMES = 10
+TRIAL_TIMEOUT = 20
+MAX_TRIAL_WORKERS = 8
+# camera startup waits for the probes of all cameras at most this long
+PROBE_TIMEOUT = 30
+
+# vainfo profile prefix of each codec reported by ffprobe
+VAAPI_PROFILES = {
+    "h264": "VAProfileH264",
+    "hevc": "VAProfileHEVC",
+    "mjpeg": "VAProfileJPEG",
+}
+NVIDIA_PRESETS = {
+    "h264": "preset-nvidia-h264",
+    "hevc": "preset-nvidia-h265",
+    "mjpeg": "preset-nvidia-mjpeg",
+}
+QSV_PRESETS = {
+    "h264": "preset-intel-qsv-h264",
+    "hevc": "preset-intel-qsv-h265",
+}
+
+
+def get_vaapi_decode_codecs(vainfo_output: str) -> set[str]:
+    """Get the codecs vainfo lists a decode entrypoint for."""
+    codecs = set()
+
+    for line in vainfo_output.splitlines():
+        if "VAEntrypointVLD" not in line:
+            continue
+
+        profile = line.split(":")[0].strip()
+
+        for codec, prefix in VAAPI_PROFILES.items():
+            if profile.startswith(prefix):
+                codecs.add(codec)
+
+    return codecs
+
+
+def get_hwaccel_candidates(
+    detected: str, codec: Optional[str], vainfo_output: str
+) -> list[str]:
+    """Get the presets to try for a stream, best first."""
+    if detected == FFMPEG_HWACCEL_NVIDIA:
+        return [NVIDIA_PRESETS.get(codec, FFMPEG_HWACCEL_NVIDIA)]
+
+    if detected != FFMPEG_HWACCEL_VAAPI:
+        return []
+
+    candidates = []
+
+    # when the codec or the driver profiles are unknown the trial decode decides
+    if (
+        codec is None
+        or not vainfo_output
+        or codec in get_vaapi_decode_codecs(vainfo_output)
+    ):
+        candidates.append(FFMPEG_HWACCEL_VAAPI)
+
+    if "Intel iHD driver" in vainfo_output and codec in QSV_PRESETS:
+        candidates.append(QSV_PRESETS[codec])
+
+    return candidates
+
+
+def get_trial_decode_cmd(camera_config: CameraConfig, hwaccel_args: str) -> list[str]:
+    """Get the detect ffmpeg command of a camera with other hwaccel args, limited
+    to a few frames and without outputs for other roles."""
+    trial_config = camera_config.model_copy(deep=True)
+    trial_config.ffmpeg.hwaccel_args = hwaccel_args
+    trial_config.record.enabled = False
+    detect_input = next(i for i in trial_config.ffmpeg.inputs if "detect" in i.roles)
+    cmd = trial_config._get_ffmpeg_cmd(detect_input)
+    cmd[-1:] = ["-frames:v", str(TRIAL_FRAMES), "-y", os.devnull]
+    return cmd
+
+
+def trial_decode(
+    camera_config: CameraConfig, hwaccel_args: str, deadline: float
+) -> Optional[bool]:
+    """Check that the detect stream can be decoded with the hwaccel args,
+    None when the probe deadline passed before the trial could run."""
+    timeout = min(TRIAL_TIMEOUT, deadline - time.monotonic())
+
+    if timeout <= 0:
+        return None
+
+    try:
+        p = sp.run(
+            get_trial_decode_cmd(camera_config, hwaccel_args),
+            capture_output=True,
+            timeout=timeout,
+        )
+    except sp.TimeoutExpired:
+        return False
+
+    return p.returncode == 0
+
+
+def select_camera_hwaccel(
+    camera_config: CameraConfig, detected: str, vainfo_output: str, deadline: float
+) -> tuple[str, bool]:
+    """Get the hwaccel args for a camera and if it fell back to CPU decoding."""
+    if time.monotonic() >= deadline:
+        logger.warning(
+            f"Unable to verify hwaccel for {camera_config.name} before the probe timeout"
+        )
+        return detected, False
+
+    detect_input = next(i for i in camera_config.ffmpeg.inputs if "detect" in i.roles)
+    codec = ffprobe_video_codec(camera_config.ffmpeg, detect_input.path)
+    candidates = get_hwaccel_candidates(detected, codec, vainfo_output)
+
+    if not candidates:
+        return "", False
+
+    for preset in candidates:
+        decoded = trial_decode(camera_config, preset, deadline)
+
+        if decoded is None:
+            break
+
+        if decoded:
+            logger.info(f"Using {preset} to decode {camera_config.name} ({codec})")
+            return preset, False
+
+    # an unreachable stream can't verify any preset
+    cpu_decoded = trial_decode(camera_config, "", deadline)
+
+    if cpu_decoded is None:
+        logger.warning(
+            f"Unable to verify hwaccel for {camera_config.name} before the probe timeout"
+        )
+        return candidates[0], False
+
+    if not cpu_decoded:
+        logger.warning(
+            f"Unable to verify hwaccel for {camera_config.name}, the stream could not be decoded"
+        )
+        return candidates[0], False
+
+    logger.warning(
+        f"Hwaccel decoding failed for {camera_config.name} ({codec}), falling back to CPU decoding"
+    )
+    return "", True
+
+
+def select_hwaccel(
+    config: FrigateConfig, camera_metrics: dict[str, CameraMetrics]
+) -> None:
+    """Verify the auto detected hwaccel of each camera and regenerate its ffmpeg
+    commands when a different preset is used."""
+    detected = config.ffmpeg.hwaccel_args
+
+    if not isinstance(detected, str) or not detected:
+        return
+
+    cameras = [
+        camera_config
+        for camera_config in config.cameras.values()
+        if camera_config.enabled_in_config
+        and camera_config.ffmpeg._auto_hwaccel
+        and not any(
+            i.hwaccel_args for i in camera_config.ffmpeg.inputs if "detect" in i.roles
+        )
+    ]
+
+    if not cameras:
+        return
+
+    vainfo_output = ""
+
+    if detected == FFMPEG_HWACCEL_VAAPI:
+        try:
+            p = vainfo_hwaccel()
+        except OSError:
+            logger.debug("vainfo is not available")
+        else:
+            if p.returncode == 0:
+                vainfo_output = p.stdout.decode()
+
+    # every trial is cut short at the deadline so a slow or unreachable
+    # camera can't hold up the startup of the others
+    deadline = time.monotonic() + PROBE_TIMEOUT
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(cameras), MAX_TRIAL_WORKERS)
+    ) as executor:
+        results = list(
+            executor.map(
+                lambda c: select_camera_hwaccel(c, detected, vainfo_output, deadline),
+                cameras,
+            )
+        )
+
+    for camera_config, (hwaccel_args, fallback) in zip(cameras, results):
+        if camera_config.name in camera_metrics:
+            camera_metrics[camera_config.name].hwaccel_fallback.value = fallback
+
+        if hwaccel_args != camera_config.ffmpeg.hwaccel_args:
+            camera_config.ffmpeg.hwaccel_args = hwaccel_args
+            camera_config.create_ffmpeg_cmds()
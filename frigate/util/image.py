@@ -527,6 +527,75 @@ def yuv_to_3_channel_yuv(yuv_frame):
     return all_yuv_data
 
 
+def get_yuv_position_copies(
+    destination_frame_shape,
+    destination_offset,
+    destination_shape,
+    source_frame_shape,
+    source_channel_dim,
+) -> list[tuple[tuple[slice, slice], tuple[slice, slice], tuple[int, int]]]:
+    """Get the (destination slices, source slices, resize dimensions) of each
+    channel to copy a yuv frame into a position, maintaining the aspect ratio."""
+    # get the coordinates of the channels for this position in the layout
+    destination_channels = get_yuv_crop(
+        destination_frame_shape,
+        (
+            destination_offset[1],
+            destination_offset[0],
+            destination_offset[1] + destination_shape[1],
+            destination_offset[0] + destination_shape[0],
+        ),
+    )
+
+    # calculate the resized frame, maintaining the aspect ratio
+    source_aspect_ratio = source_frame_shape[1] / (source_frame_shape[0] // 3 * 2)
+    dest_aspect_ratio = destination_shape[1] / destination_shape[0]
+
+    if source_aspect_ratio <= dest_aspect_ratio:
+        y_resize_height = int(destination_shape[0] // 4 * 4)
+        y_resize_width = int((y_resize_height * source_aspect_ratio) // 4 * 4)
+    else:
+        y_resize_width = int(destination_shape[1] // 4 * 4)
+        y_resize_height = int((y_resize_width / source_aspect_ratio) // 4 * 4)
+
+    uv_resize_width = int(y_resize_width // 2)
+    uv_resize_height = int(y_resize_height // 4)
+
+    y_y_offset = int((destination_shape[0] - y_resize_height) / 4 // 4 * 4)
+    y_x_offset = int((destination_shape[1] - y_resize_width) / 2 // 4 * 4)
+
+    uv_y_offset = y_y_offset // 4
+    uv_x_offset = y_x_offset // 2
+
+    copies = []
+
+    for channel, destination in zip(
+        ["y", "u1", "u2", "v1", "v2"], destination_channels
+    ):
+        if channel == "y":
+            y_offset, x_offset = y_y_offset, y_x_offset
+            width, height = y_resize_width, y_resize_height
+        else:
+            y_offset, x_offset = uv_y_offset, uv_x_offset
+            width, height = uv_resize_width, uv_resize_height
+
+        source = source_channel_dim[channel]
+        copies.append(
+            (
+                (
+                    slice(
+                        destination[1] + y_offset, destination[1] + y_offset + height
+                    ),
+                    slice(destination[0] + x_offset, destination[0] + x_offset + width),
+                ),
+                (slice(source[1], source[3]), slice(source[0], source[2])),
+                (width, height),
+            )
+        )
+
+    return copies
+
+
 def copy_yuv_to_position(
     destination_frame,
     destination_offset,
@@ -562,87 +631,17 @@ def copy_yuv_to_position(
     destination_frame[v2[1] : v2[3], v2[0] : v2[2]] = 128
 
     if source_frame is not None:
-        # calculate the resized frame, maintaining the aspect ratio
-        source_aspect_ratio = source_frame.shape[1] / (source_frame.shape[0] // 3 * 2)
-        dest_aspect_ratio = destination_shape[1] / destination_shape[0]
-
-        if source_aspect_ratio <= dest_aspect_ratio:
-            y_resize_height = int(destination_shape[0] // 4 * 4)
-            y_resize_width = int((y_resize_height * source_aspect_ratio) // 4 * 4)
-        else:
-            y_resize_width = int(destination_shape[1] // 4 * 4)
-            y_resize_height = int((y_resize_width / source_aspect_ratio) // 4 * 4)
-
-        uv_resize_width = int(y_resize_width // 2)
-        uv_resize_height = int(y_resize_height // 4)
-
-        y_y_offset = int((destination_shape[0] - y_resize_height) / 4 // 4 * 4)
-        y_x_offset = int((destination_shape[1] - y_resize_width) / 2 // 4 * 4)
-
-        uv_y_offset = y_y_offset // 4
-        uv_x_offset = y_x_offset // 2
-
-        # resize/copy y channel
-        destination_frame[
-            y[1] + y_y_offset : y[1] + y_y_offset + y_resize_height,
-            y[0] + y_x_offset : y[0] + y_x_offset + y_resize_width,
-        ] = cv2.resize(
-            source_frame[
-                source_channel_dim["y"][1] : source_channel_dim["y"][3],
-                source_channel_dim["y"][0] : source_channel_dim["y"][2],
-            ],
-            dsize=(y_resize_width, y_resize_height),
-            interpolation=interpolation,
-        )
-
-        # resize/copy u1
-        destination_frame[
-            u1[1] + uv_y_offset : u1[1] + uv_y_offset + uv_resize_height,
-            u1[0] + uv_x_offset : u1[0] + uv_x_offset + uv_resize_width,
-        ] = cv2.resize(
-            source_frame[
-                source_channel_dim["u1"][1] : source_channel_dim["u1"][3],
-                source_channel_dim["u1"][0] : source_channel_dim["u1"][2],
-            ],
-            dsize=(uv_resize_width, uv_resize_height),
-            interpolation=interpolation,
-        )
-        # resize/copy u2
-        destination_frame[
-            u2[1] + uv_y_offset : u2[1] + uv_y_offset + uv_resize_height,
-            u2[0] + uv_x_offset : u2[0] + uv_x_offset + uv_resize_width,
-        ] = cv2.resize(
-            source_frame[
-                source_channel_dim["u2"][1] : source_channel_dim["u2"][3],
-                source_channel_dim["u2"][0] : source_channel_dim["u2"][2],
-            ],
-            dsize=(uv_resize_width, uv_resize_height),
-            interpolation=interpolation,
-        )
-        # resize/copy v1
-        destination_frame[
-            v1[1] + uv_y_offset : v1[1] + uv_y_offset + uv_resize_height,
-            v1[0] + uv_x_offset : v1[0] + uv_x_offset + uv_resize_width,
-        ] = cv2.resize(
-            source_frame[
-                source_channel_dim["v1"][1] : source_channel_dim["v1"][3],
-                source_channel_dim["v1"][0] : source_channel_dim["v1"][2],
-            ],
-            dsize=(uv_resize_width, uv_resize_height),
-            interpolation=interpolation,
-        )
-        # resize/copy v2
-        destination_frame[
-            v2[1] + uv_y_offset : v2[1] + uv_y_offset + uv_resize_height,
-            v2[0] + uv_x_offset : v2[0] + uv_x_offset + uv_resize_width,
-        ] = cv2.resize(
-            source_frame[
-                source_channel_dim["v2"][1] : source_channel_dim["v2"][3],
-                source_channel_dim["v2"][0] : source_channel_dim["v2"][2],
-            ],
-            dsize=(uv_resize_width, uv_resize_height),
-            interpolation=interpolation,
-        )
+        # resize/copy each channel
+        for destination, source, dsize in get_yuv_position_copies(
+            destination_frame.shape,
+            destination_offset,
+            destination_shape,
+            source_frame.shape,
+            source_channel_dim,
+        ):
+            destination_frame[destination] = cv2.resize(
+                source_frame[source], dsize=dsize, interpolation=interpolation
+            )
 
 
 def get_blank_yuv_frame(width: int, height: int) -> np.ndarray:
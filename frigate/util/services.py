@@ -531,6 +531,33 @@ def ffprobe_stream(ffmpeg, path: str) -> sp.CompletedProcess:
     return sp.run(ffprobe_cmd, capture_output=True)
 
 
+def ffprobe_video_codec(ffmpeg, path: str) -> Optional[str]:
+    """Get the codec of the first video stream."""
+    clean_path = escape_special_characters(path)
+    ffprobe_cmd = [
+        ffmpeg.ffprobe_path,
+        "-timeout",
+        "1000000",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=codec_name",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        "-loglevel",
+        "quiet",
+        clean_path,
+    ]
+
+    try:
+        p = sp.run(ffprobe_cmd, capture_output=True, timeout=10)
+    except sp.TimeoutExpired:
+        return None
+
+    codec = p.stdout.decode().strip()
+    return codec if p.returncode == 0 and codec else None
+
+
 def vainfo_hwaccel(device_name: Optional[str] = None) -> sp.CompletedProcess:
     """Run vainfo."""
     ffprobe_cmd = (
@@ -768,3 +795,12 @@ def set_file_limit() -> None:
     logger.info(
         f"File limit set. New soft limit: {new_soft}, Hard limit remains: {current_hard}"
     )
+
+
+def lower_priority(io_priority: Optional[int] = None) -> None:
+    """Lower the cpu and optionally the best effort io priority of the current
+    process, used as the preexec_fn of background ffmpeg processes."""
+    os.nice(10)
+
+    if io_priority is not None:
+        psutil.Process().ionice(psutil.IOPRIO_CLASS_BE, io_priority)
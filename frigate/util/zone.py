@@ -0,0 +1,95 @@
+"""Zone membership lookups."""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from frigate.config import CameraConfig
+
+# cameras with more zones than this use the contour checks
+MAX_RASTER_ZONES = 64
+
+
+class ZoneRaster:
+    """Bitmask of the zones that contain each pixel at detect resolution."""
+
+    def __init__(self, frame_shape: tuple[int, int], contours: dict[str, np.ndarray]):
+        self.height, self.width = frame_shape
+        self.bits: dict[str, int] = {}
+
+        if len(contours) <= 8:
+            dtype = np.uint8
+        elif len(contours) <= 16:
+            dtype = np.uint16
+        elif len(contours) <= 32:
+            dtype = np.uint32
+        else:
+            dtype = np.uint64
+
+        self.raster = np.zeros(frame_shape, dtype)
+        zone_mask = np.zeros(frame_shape, np.uint8)
+        edge_mask = np.zeros(frame_shape, np.uint8)
+
+        for index, (name, contour) in enumerate(contours.items()):
+            bit = 1 << index
+            self.bits[name] = bit
+
+            if contour.size == 0:
+                continue
+
+            polygon = [contour.reshape(-1, 1, 2).astype(np.int32)]
+            zone_mask[:] = 0
+            cv2.fillPoly(zone_mask, polygon, 1)
+
+            # rasterized edges can cover pixels just outside the polygon,
+            # so resolve those exactly to match pointPolygonTest(...) >= 0
+            edge_mask[:] = 0
+            cv2.polylines(edge_mask, polygon, True, 1)
+
+            for y, x in zip(*np.nonzero(edge_mask)):
+                zone_mask[y, x] = (
+                    cv2.pointPolygonTest(contour, (int(x), int(y)), False) >= 0
+                )
+
+            self.raster[zone_mask > 0] |= dtype(bit)
+
+    def mask_at(self, point: tuple[int, int]) -> Optional[int]:
+        """Get the zone bitmask at a point, None if the point is outside the frame."""
+        x, y = int(point[0]), int(point[1])
+
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return None
+
+        return int(self.raster[y, x])
+
+
+# camera name -> (contours the raster was built from, raster)
+_zone_rasters: dict[str, tuple[list[np.ndarray], ZoneRaster]] = {}
+
+
+def get_zone_raster(camera_config: CameraConfig) -> Optional[ZoneRaster]:
+    """Get the zone raster for a camera, rebuilt when its zones are updated."""
+    zones = camera_config.zones
+
+    if not zones or len(zones) > MAX_RASTER_ZONES:
+        return None
+
+    contours = [zone.contour for zone in zones.values()]
+    cached = _zone_rasters.get(camera_config.name)
+
+    # the cache holds a reference to each contour so identity checks are safe
+    if (
+        cached is not None
+        and len(cached[0]) == len(contours)
+        and all(a is b for a, b in zip(cached[0], contours))
+        and (cached[1].height, cached[1].width) == camera_config.frame_shape
+    ):
+        return cached[1]
+
+    raster = ZoneRaster(
+        camera_config.frame_shape,
+        {name: zone.contour for name, zone in zones.items()},
+    )
+    _zone_rasters[camera_config.name] = (contours, raster)
+    return raster
@@ -1,8 +1,8 @@
 import datetime
 import logging
 import multiprocessing as mp
-import os
 import queue
+import select
 import signal
 import subprocess as sp
 import threading
@@ -21,16 +21,13 @@ from frigate.comms.config_updater import ConfigSubscriber
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.config import CameraConfig, DetectConfig, ModelConfig
 from frigate.config.camera.camera import CameraTypeEnum
-from frigate.const import (
-    CACHE_DIR,
-    CACHE_SEGMENT_FORMAT,
-    REQUEST_REGION_GRID,
-)
+from frigate.const import REQUEST_REGION_GRID
 from frigate.log import LogPipe
 from frigate.motion import MotionDetector
 from frigate.motion.improved_motion import ImprovedMotionDetector
 from frigate.object_detection.base import RemoteObjectDetector
 from frigate.ptz.autotrack import ptz_moving_at_frame_time
+from frigate.record.segment_index import get_newest_segment_time
 from frigate.track import ObjectTracker
 from frigate.track.norfair_tracker import NorfairTracker
 from frigate.track.tracked_object import TrackedObjectAttribute
@@ -56,6 +53,9 @@ from frigate.util.services import listen
 
 logger = logging.getLogger(__name__)
 
+# max seconds to wait for a standby ffmpeg to decode its first frame after a camera switch
+STANDBY_FIRST_FRAME_TIMEOUT = 15
+
 
 def stop_ffmpeg(ffmpeg_process, logger):
     logger.info("Terminating the existing ffmpeg process...")
@@ -176,6 +176,9 @@ class CameraWatchdog(threading.Thread):
         camera_fps,
         skipped_fps,
         ffmpeg_pid,
+        switch_first_frame,
+        cache_segment_time,
+        cache_scan_time,
         stop_event,
     ):
         threading.Thread.__init__(self)
@@ -190,6 +193,9 @@ class CameraWatchdog(threading.Thread):
         self.camera_fps = camera_fps
         self.skipped_fps = skipped_fps
         self.ffmpeg_pid = ffmpeg_pid
+        self.switch_first_frame = switch_first_frame
+        self.cache_segment_time = cache_segment_time
+        self.cache_scan_time = cache_scan_time
         self.frame_queue = frame_queue
         self.frame_shape = self.config.frame_shape_yuv
         self.frame_size = self.frame_shape[0] * self.frame_shape[1]
@@ -205,6 +211,11 @@ class CameraWatchdog(threading.Thread):
         # Cache last known status for each role to implement edge-triggered publishing
         self.last_statuses = {}
 
+        # held while ffmpeg processes are replaced so the watchdog doesn't restart them too
+        self.ffmpeg_lock = threading.Lock()
+        # held while a camera switch is handled, duplicate switch requests are dropped
+        self.switch_lock = threading.Lock()
+
         # Initialize camera switch detection if enabled per camera
         self.camera_switch_detector = None
         if (
@@ -262,33 +273,87 @@ class CameraWatchdog(threading.Thread):
 
     def _handle_camera_switch(self, camera_name: str, reason: str):
         """Handle camera switch detection by resetting streams."""
-        self.logger.warning(f"Camera switch detected for {camera_name}: {reason}")
-        self.logger.info(f"Resetting camera processes for {camera_name} due to switch")
+        if not self.switch_lock.acquire(blocking=False):
+            self.logger.info(
+                f"Camera switch for {camera_name} is already being handled, skipping"
+            )
+            return
 
-        # Reset capture thread to clear any corrupted buffers
-        self.reset_capture_thread()
+        try:
+            if not self.config.enabled:
+                return
 
-        # Reset other ffmpeg processes as well
-        for p in self.ffmpeg_other_processes:
-            try:
-                self.logger.info(f"Terminating {p['roles']} process for camera switch")
-                p["process"].terminate()
-                p["process"].wait(timeout=10)
-            except Exception as e:
-                self.logger.warning(f"Error terminating process: {e}")
-                try:
-                    p["process"].kill()
-                except Exception:
-                    pass
+            switch_time = datetime.datetime.now().timestamp()
+            self.logger.warning(f"Camera switch detected for {camera_name}: {reason}")
+            self.logger.info(
+                f"Resetting camera processes for {camera_name} due to switch"
+            )
 
-        # Clear the process list and restart
-        self.ffmpeg_other_processes.clear()
+            # the current detect process keeps running until the standby has a frame
+            if not self._swap_in_standby_detect():
+                with self.ffmpeg_lock:
+                    self.reset_capture_thread()
+
+            # for the fallback this is the time until detect was restarted
+            self.switch_first_frame.value = (
+                datetime.datetime.now().timestamp() - switch_time
+            )
+            self.logger.info(
+                f"Detect for {camera_name} resumed {self.switch_first_frame.value:.2f} seconds after the switch"
+            )
+
+            # Reset other ffmpeg processes as well
+            with self.ffmpeg_lock:
+                for p in self.ffmpeg_other_processes:
+                    self.logger.info(
+                        f"Restarting {p['roles']} process for camera switch"
+                    )
+                    p["process"] = start_or_restart_ffmpeg(
+                        p["cmd"],
+                        self.logger,
+                        p["logpipe"],
+                        ffmpeg_process=p["process"],
+                    )
+        finally:
+            self.switch_lock.release()
+
+    def _swap_in_standby_detect(self) -> bool:
+        """Start a new detect ffmpeg and swap it in once it has decoded a frame."""
+        ffmpeg_cmd = [
+            c["cmd"] for c in self.config.ffmpeg_cmds if "detect" in c["roles"]
+        ][0]
+        standby_process = start_or_restart_ffmpeg(
+            ffmpeg_cmd, self.logger, self.logpipe, self.frame_size
+        )
+
+        # raw frames are only written after the first keyframe has been decoded
+        ready, _, _ = select.select(
+            [standby_process.stdout], [], [], STANDBY_FIRST_FRAME_TIMEOUT
+        )
+
+        if not ready or standby_process.poll() is not None:
+            self.logger.warning(
+                f"Standby ffmpeg for {self.camera_name} produced no frames within {STANDBY_FIRST_FRAME_TIMEOUT} seconds, restarting detect instead"
+            )
+            stop_ffmpeg(standby_process, self.logger)
+            return False
+
+        with self.ffmpeg_lock:
+            # the old capture thread must exit before the new one reuses the frame buffers
+            stop_ffmpeg(self.ffmpeg_detect_process, self.logger)
+            self.capture_thread.join(timeout=5)
 
-        # Wait a moment for streams to stabilize
-        time.sleep(2)
+            if self.capture_thread.is_alive():
+                self.logger.warning(
+                    f"Capture thread for {self.camera_name} did not exit, restarting detect instead"
+                )
+                stop_ffmpeg(standby_process, self.logger)
+                return False
+
+            self.start_capture_thread(standby_process)
 
-        # Restart all ffmpeg processes
-        self.start_all_ffmpeg()
+        self.logger.info(f"Swapped in standby ffmpeg for {self.camera_name}")
+        return True
 
     def reset_capture_thread(
         self, terminate: bool = True, drain_output: bool = True
@@ -341,78 +406,81 @@ class CameraWatchdog(threading.Thread):
             if not enabled:
                 continue
 
-            now = datetime.datetime.now().timestamp()
-
-            if not self.capture_thread.is_alive():
-                self._set_status("detect", "offline")
-                self.camera_fps.value = 0
-                self.logger.error(
-                    f"Ffmpeg process crashed unexpectedly for {self.camera_name}."
-                )
-                self.reset_capture_thread(terminate=False)
-            elif self.camera_fps.value >= (self.config.detect.fps + 10):
-                self.fps_overflow_count += 1
+            with self.ffmpeg_lock:
+                now = datetime.datetime.now().timestamp()
 
-                if self.fps_overflow_count == 3:
+                if not self.capture_thread.is_alive():
                     self._set_status("detect", "offline")
-                    self.fps_overflow_count = 0
                     self.camera_fps.value = 0
-                    self.logger.info(
-                        f"{self.camera_name} exceeded fps limit. Exiting ffmpeg..."
+                    self.logger.error(
+                        f"Ffmpeg process crashed unexpectedly for {self.camera_name}."
                     )
-                    self.reset_capture_thread(drain_output=False)
-            elif now - self.capture_thread.current_frame.value > 20:
-                self._set_status("detect", "offline")
-                self.camera_fps.value = 0
-                self.logger.info(
-                    f"No frames received from {self.camera_name} in 20 seconds. Exiting ffmpeg..."
-                )
-                self.reset_capture_thread()
-            else:
-                # process is running normally
-                self._set_status("detect", "online")
-                self.fps_overflow_count = 0
-
-            for p in self.ffmpeg_other_processes:
-                poll = p["process"].poll()
-
-                if self.config.record.enabled and "record" in p["roles"]:
-                    latest_segment_time = self.get_latest_segment_datetime(
-                        p.get(
-                            "latest_segment_time",
-                            datetime.datetime.now().astimezone(datetime.timezone.utc),
+                    self.reset_capture_thread(terminate=False)
+                elif self.camera_fps.value >= (self.config.detect.fps + 10):
+                    self.fps_overflow_count += 1
+
+                    if self.fps_overflow_count == 3:
+                        self._set_status("detect", "offline")
+                        self.fps_overflow_count = 0
+                        self.camera_fps.value = 0
+                        self.logger.info(
+                            f"{self.camera_name} exceeded fps limit. Exiting ffmpeg..."
                         )
+                        self.reset_capture_thread(drain_output=False)
+                elif now - self.capture_thread.current_frame.value > 20:
+                    self._set_status("detect", "offline")
+                    self.camera_fps.value = 0
+                    self.logger.info(
+                        f"No frames received from {self.camera_name} in 20 seconds. Exiting ffmpeg..."
                     )
+                    self.reset_capture_thread()
+                else:
+                    # process is running normally
+                    self._set_status("detect", "online")
+                    self.fps_overflow_count = 0
 
-                    if datetime.datetime.now().astimezone(datetime.timezone.utc) > (
-                        latest_segment_time + datetime.timedelta(seconds=120)
-                    ):
-                        self.logger.error(
-                            f"No new recording segments were created for {self.camera_name} in the last 120s. restarting the ffmpeg record process..."
-                        )
-                        p["process"] = start_or_restart_ffmpeg(
-                            p["cmd"],
-                            self.logger,
-                            p["logpipe"],
-                            ffmpeg_process=p["process"],
+                for p in self.ffmpeg_other_processes:
+                    poll = p["process"].poll()
+
+                    if self.config.record.enabled and "record" in p["roles"]:
+                        latest_segment_time = self.get_latest_segment_datetime(
+                            p.get(
+                                "latest_segment_time",
+                                datetime.datetime.now().astimezone(
+                                    datetime.timezone.utc
+                                ),
+                            )
                         )
-                        for role in p["roles"]:
-                            self._set_status(role, "offline")
-                        continue
-                    else:
-                        self._set_status("record", "online")
-                        p["latest_segment_time"] = latest_segment_time
 
-                if poll is None:
-                    continue
+                        if datetime.datetime.now().astimezone(datetime.timezone.utc) > (
+                            latest_segment_time + datetime.timedelta(seconds=120)
+                        ):
+                            self.logger.error(
+                                f"No new recording segments were created for {self.camera_name} in the last 120s. restarting the ffmpeg record process..."
+                            )
+                            p["process"] = start_or_restart_ffmpeg(
+                                p["cmd"],
+                                self.logger,
+                                p["logpipe"],
+                                ffmpeg_process=p["process"],
+                            )
+                            for role in p["roles"]:
+                                self._set_status(role, "offline")
+                            continue
+                        else:
+                            self._set_status("record", "online")
+                            p["latest_segment_time"] = latest_segment_time
+
+                    if poll is None:
+                        continue
 
-                for role in p["roles"]:
-                    self._set_status(role, "offline")
+                    for role in p["roles"]:
+                        self._set_status(role, "offline")
 
-                p["logpipe"].dump()
-                p["process"] = start_or_restart_ffmpeg(
-                    p["cmd"], self.logger, p["logpipe"], ffmpeg_process=p["process"]
-                )
+                    p["logpipe"].dump()
+                    p["process"] = start_or_restart_ffmpeg(
+                        p["cmd"], self.logger, p["logpipe"], ffmpeg_process=p["process"]
+                    )
 
         self.stop_all_ffmpeg()
         self.logpipe.close()
@@ -422,9 +490,14 @@ class CameraWatchdog(threading.Thread):
         ffmpeg_cmd = [
             c["cmd"] for c in self.config.ffmpeg_cmds if "detect" in c["roles"]
         ][0]
-        self.ffmpeg_detect_process = start_or_restart_ffmpeg(
-            ffmpeg_cmd, self.logger, self.logpipe, self.frame_size
+        self.start_capture_thread(
+            start_or_restart_ffmpeg(
+                ffmpeg_cmd, self.logger, self.logpipe, self.frame_size
+            )
         )
+
+    def start_capture_thread(self, ffmpeg_detect_process: sp.Popen[Any]):
+        self.ffmpeg_detect_process = ffmpeg_detect_process
         self.ffmpeg_pid.value = self.ffmpeg_detect_process.pid
         self.capture_thread = CameraCapture(
             self.config,
@@ -516,26 +589,12 @@ class CameraWatchdog(threading.Thread):
         self, latest_segment: datetime.datetime
     ) -> datetime.datetime:
         """Checks if ffmpeg is still writing recording segments to cache."""
-        cache_files = sorted(
-            [
-                d
-                for d in os.listdir(CACHE_DIR)
-                if os.path.isfile(os.path.join(CACHE_DIR, d))
-                and d.endswith(".mp4")
-                and not d.startswith("preview_")
-            ]
+        newest_segment_time = get_newest_segment_time(
+            self.camera_name, self.cache_segment_time, self.cache_scan_time
         )
-        newest_segment_time = latest_segment
-
-        for file in cache_files:
-            if self.camera_name in file:
-                basename = os.path.splitext(file)[0]
-                _, date = basename.rsplit("@", maxsplit=1)
-                segment_time = datetime.datetime.strptime(
-                    date, CACHE_SEGMENT_FORMAT
-                ).astimezone(datetime.timezone.utc)
-                if segment_time > newest_segment_time:
-                    newest_segment_time = segment_time
+
+        if newest_segment_time is None or newest_segment_time < latest_segment:
+            return latest_segment
 
         return newest_segment_time
 
@@ -606,6 +665,9 @@ def capture_camera(
         camera_metrics.camera_fps,
         camera_metrics.skipped_fps,
         camera_metrics.ffmpeg_pid,
+        camera_metrics.switch_first_frame,
+        camera_metrics.cache_segment_time,
+        camera_metrics.cache_scan_time,
         stop_event,
     )
     camera_watchdog.start()
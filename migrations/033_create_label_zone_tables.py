@@ -0,0 +1,105 @@
+"""Peewee migrations -- 033_create_label_zone_tables.py.
+
+This migration creates lookup tables for the labels and zones of review segments
+and the zones of events so they can be filtered with an index instead of matching
+the json text, and backfills them from the existing rows.
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['model_name']            # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.python(func, *args, **kwargs)        # Run python code
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.drop_index(model, *col_names)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+
+"""
+
+import peewee as pw
+
+SQL = pw.SQL
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    migrator.sql(
+        """
+        CREATE TABLE IF NOT EXISTS "review_segment_label" (
+            "review_segment_id" VARCHAR(30) NOT NULL,
+            "label" VARCHAR(100) NOT NULL,
+            PRIMARY KEY ("review_segment_id", "label"),
+            FOREIGN KEY ("review_segment_id") REFERENCES "reviewsegment" ("id") ON DELETE CASCADE
+        )
+        """
+    )
+    migrator.sql(
+        'CREATE INDEX IF NOT EXISTS "review_segment_label_label_review_segment_id" ON "review_segment_label" ("label", "review_segment_id")'
+    )
+    migrator.sql(
+        """
+        CREATE TABLE IF NOT EXISTS "review_segment_zone" (
+            "review_segment_id" VARCHAR(30) NOT NULL,
+            "zone" VARCHAR(100) NOT NULL,
+            PRIMARY KEY ("review_segment_id", "zone"),
+            FOREIGN KEY ("review_segment_id") REFERENCES "reviewsegment" ("id") ON DELETE CASCADE
+        )
+        """
+    )
+    migrator.sql(
+        'CREATE INDEX IF NOT EXISTS "review_segment_zone_zone_review_segment_id" ON "review_segment_zone" ("zone", "review_segment_id")'
+    )
+    migrator.sql(
+        """
+        CREATE TABLE IF NOT EXISTS "event_zone" (
+            "event_id" VARCHAR(30) NOT NULL,
+            "zone" VARCHAR(100) NOT NULL,
+            PRIMARY KEY ("event_id", "zone"),
+            FOREIGN KEY ("event_id") REFERENCES "event" ("id") ON DELETE CASCADE
+        )
+        """
+    )
+    migrator.sql(
+        'CREATE INDEX IF NOT EXISTS "event_zone_zone_event_id" ON "event_zone" ("zone", "event_id")'
+    )
+
+    # backfill from the json columns, labels include both objects and audio
+    for path in ("$.objects", "$.audio"):
+        migrator.sql(
+            f"""
+            INSERT OR IGNORE INTO "review_segment_label" ("review_segment_id", "label")
+            SELECT "reviewsegment"."id", j.value
+            FROM "reviewsegment", json_each("reviewsegment"."data", '{path}') AS j
+            WHERE j.type = 'text'
+            """
+        )
+    migrator.sql(
+        """
+        INSERT OR IGNORE INTO "review_segment_zone" ("review_segment_id", "zone")
+        SELECT "reviewsegment"."id", j.value
+        FROM "reviewsegment", json_each("reviewsegment"."data", '$.zones') AS j
+        WHERE j.type = 'text'
+        """
+    )
+    migrator.sql(
+        """
+        INSERT OR IGNORE INTO "event_zone" ("event_id", "zone")
+        SELECT "event"."id", j.value
+        FROM "event", json_each("event"."zones") AS j
+        WHERE j.type = 'text'
+        """
+    )
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.sql('DROP TABLE IF EXISTS "review_segment_label"')
+    migrator.sql('DROP TABLE IF EXISTS "review_segment_zone"')
+    migrator.sql('DROP TABLE IF EXISTS "event_zone"')
@@ -0,0 +1,60 @@
+"""Peewee migrations -- 034_add_camera_time_indexes.py.
+
+Adds (camera, start_time) and (camera, end_time) indexes for the queries that filter
+a camera by a time range.
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['model_name']            # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.python(func, *args, **kwargs)        # Run python code
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.drop_index(model, *col_names)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+
+"""
+
+import peewee as pw
+
+SQL = pw.SQL
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    # recordings already has a (camera, start_time, end_time) index
+    migrator.sql(
+        'CREATE INDEX IF NOT EXISTS "recordings_camera_end_time" ON "recordings" ("camera", "end_time" DESC)'
+    )
+    migrator.sql(
+        'CREATE INDEX IF NOT EXISTS "previews_camera_start_time_end_time" ON "previews" ("camera", "start_time" DESC, "end_time" DESC)'
+    )
+    migrator.sql(
+        'CREATE INDEX IF NOT EXISTS "previews_camera_end_time" ON "previews" ("camera", "end_time" DESC)'
+    )
+    migrator.sql(
+        'CREATE INDEX IF NOT EXISTS "review_segment_camera_start_time" ON "reviewsegment" ("camera", "start_time" DESC)'
+    )
+    migrator.sql(
+        'CREATE INDEX IF NOT EXISTS "review_segment_camera_end_time" ON "reviewsegment" ("camera", "end_time" DESC)'
+    )
+    migrator.sql(
+        'CREATE INDEX IF NOT EXISTS "event_camera_start_time" ON "event" ("camera", "start_time" DESC)'
+    )
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.sql('DROP INDEX IF EXISTS "recordings_camera_end_time"')
+    migrator.sql('DROP INDEX IF EXISTS "previews_camera_start_time_end_time"')
+    migrator.sql('DROP INDEX IF EXISTS "previews_camera_end_time"')
+    migrator.sql('DROP INDEX IF EXISTS "review_segment_camera_start_time"')
+    migrator.sql('DROP INDEX IF EXISTS "review_segment_camera_end_time"')
+    migrator.sql('DROP INDEX IF EXISTS "event_camera_start_time"')
@@ -0,0 +1,76 @@
+"""Peewee migrations -- 035_create_recordings_rollup_table.py.
+
+Creates the hourly recordings rollup used by the recordings summaries.
+
+Some examples (model - class or model name)::
+
+    > Model = migrator.orm['model_name']            # Return model in current state by name
+
+    > migrator.sql(sql)                             # Run custom SQL
+    > migrator.python(func, *args, **kwargs)        # Run python code
+    > migrator.create_model(Model)                  # Create a model (could be used as decorator)
+    > migrator.remove_model(model, cascade=True)    # Remove a model
+    > migrator.add_fields(model, **fields)          # Add fields to a model
+    > migrator.change_fields(model, **fields)       # Change fields
+    > migrator.remove_fields(model, *field_names, cascade=True)
+    > migrator.rename_field(model, old_field_name, new_field_name)
+    > migrator.rename_table(model, new_table_name)
+    > migrator.add_index(model, *col_names, unique=False)
+    > migrator.drop_index(model, *col_names)
+    > migrator.add_not_null(model, *field_names)
+    > migrator.drop_not_null(model, *field_names)
+    > migrator.add_default(model, field_name, default)
+
+"""
+
+import peewee as pw
+
+SQL = pw.SQL
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    migrator.sql(
+        """
+        CREATE TABLE IF NOT EXISTS "recordings_rollup" (
+            "camera" VARCHAR(20) NOT NULL,
+            "utc_hour" INTEGER NOT NULL,
+            "segments" INTEGER NOT NULL DEFAULT 0,
+            "duration" REAL NOT NULL DEFAULT 0,
+            "motion" INTEGER NOT NULL DEFAULT 0,
+            "objects" INTEGER NOT NULL DEFAULT 0,
+            "event_count" INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY ("camera", "utc_hour")
+        )
+        """
+    )
+
+    # backfill from the existing recordings and events
+    migrator.sql(
+        """
+        INSERT OR REPLACE INTO "recordings_rollup"
+            ("camera", "utc_hour", "segments", "duration", "motion", "objects")
+        SELECT
+            "camera",
+            CAST("start_time" AS INTEGER) / 3600,
+            COUNT(*),
+            SUM("duration"),
+            COALESCE(SUM("motion"), 0),
+            COALESCE(SUM("objects"), 0)
+        FROM "recordings"
+        GROUP BY 1, 2
+        """
+    )
+    migrator.sql(
+        """
+        INSERT INTO "recordings_rollup" ("camera", "utc_hour", "event_count")
+        SELECT "camera", CAST("start_time" AS INTEGER) / 3600, COUNT(*)
+        FROM "event"
+        WHERE "has_clip"
+        GROUP BY 1, 2
+        ON CONFLICT ("camera", "utc_hour") DO UPDATE SET "event_count" = excluded."event_count"
+        """
+    )
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.sql('DROP TABLE IF EXISTS "recordings_rollup"')